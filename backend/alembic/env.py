@@ -43,12 +43,13 @@ from models.core import Directive, Project, Task, ContextDocument, SearchHistory
 from models.workflow import WorkflowProfile, WorkflowVersion, WorkflowExecution
 
 # DeepAgent models
-from models.deep_agent import DeepAgentTemplate, AgentExport, ChatSession
+from models.deep_agent import DeepAgentTemplate, AgentExport, ChatSession, ChatMessageRecord
 
 # System models
 from models.audit_log import AuditLog
 from models.settings import Settings
 from models.execution_event import ExecutionEvent
+from models.agent_usage import AgentUsageRollup
 from models.background_task import BackgroundTask
 from models.custom_tool import CustomTool, ToolExecutionLog
 from models.pii_profile import PIIProfile
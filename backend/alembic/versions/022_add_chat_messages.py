@@ -0,0 +1,155 @@
+"""move chat history into an append-only chat_messages table
+
+Revision ID: 022_add_chat_messages
+Revises: 021_add_agent_runtimes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "022_add_chat_messages"
+down_revision = "021_add_agent_runtimes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+
+def _table_exists(conn, table: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM information_schema.tables WHERE table_name = :table"
+        ")"
+    ), {"table": table})
+    return bool(result.scalar())
+
+
+def _column_exists(conn, table: str, column: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM information_schema.columns "
+        "  WHERE table_name = :table AND column_name = :column"
+        ")"
+    ), {"table": table, "column": column})
+    return bool(result.scalar())
+
+
+def _as_json(value):
+    return None if value is None else json.dumps(value)
+
+
+def upgrade() -> None:
+    """Create chat_messages and copy every session's JSON history into it.
+
+    Each turn used to rewrite the whole chat_sessions.messages JSON list; now
+    a turn is one INSERT. message_count tracks the next message_index. The
+    legacy column is emptied (not dropped) so downgrade can rebuild it.
+    """
+    conn = op.get_bind()
+
+    if not _table_exists(conn, "chat_messages"):
+        op.create_table(
+            "chat_messages",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column(
+                "session_id", sa.String(100),
+                sa.ForeignKey("chat_sessions.session_id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("message_index", sa.Integer(), nullable=False),
+            sa.Column("role", sa.String(32), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False, server_default=""),
+            sa.Column("timestamp", sa.String(64), nullable=True),
+            sa.Column("thinking", sa.Text(), nullable=True),
+            sa.Column("artifacts", sa.JSON(), nullable=True),
+            sa.Column("content_blocks", sa.JSON(), nullable=True),
+            sa.Column("has_multimodal", sa.Boolean(), nullable=True),
+            sa.Column("banked", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+            sa.Column("token_count", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index(
+            "ix_chat_messages_session_index",
+            "chat_messages",
+            ["session_id", "message_index"],
+            unique=True,
+        )
+
+    if not _column_exists(conn, "chat_sessions", "message_count"):
+        op.add_column(
+            "chat_sessions",
+            sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    insert = sa.text(
+        "INSERT INTO chat_messages (session_id, message_index, role, content, timestamp, "
+        "thinking, artifacts, content_blocks, has_multimodal, banked) VALUES "
+        "(:session_id, :message_index, :role, :content, :timestamp, :thinking, "
+        "CAST(:artifacts AS JSON), CAST(:content_blocks AS JSON), :has_multimodal, :banked)"
+    )
+
+    # Page through sessions that still carry a JSON history
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, session_id, messages FROM chat_sessions "
+            "WHERE id > :last_id AND json_array_length(messages) > 0 "
+            "ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+
+        for row_id, session_id, messages in rows:
+            last_id = row_id
+            if isinstance(messages, str):
+                messages = json.loads(messages)
+            params = []
+            for msg in messages or []:
+                if not isinstance(msg, dict):
+                    continue
+                content = msg.get("content", "")
+                params.append({
+                    "session_id": session_id,
+                    "message_index": len(params),
+                    "role": msg.get("role") or "user",
+                    "content": content if isinstance(content, str) else json.dumps(content),
+                    "timestamp": msg.get("timestamp"),
+                    "thinking": msg.get("thinking"),
+                    "artifacts": _as_json(msg.get("artifacts")),
+                    "content_blocks": _as_json(msg.get("content_blocks")),
+                    "has_multimodal": msg.get("has_multimodal"),
+                    "banked": bool(msg.get("banked", False)),
+                })
+            if params:
+                conn.execute(insert, params)
+            conn.execute(sa.text(
+                "UPDATE chat_sessions SET message_count = :count, messages = '[]'::json WHERE id = :id"
+            ), {"count": len(params), "id": row_id})
+
+        print(f"Migrated chat history for sessions up to id {last_id}")
+
+
+def downgrade() -> None:
+    """Rebuild chat_sessions.messages from chat_messages, then drop the table."""
+    conn = op.get_bind()
+
+    if _table_exists(conn, "chat_messages"):
+        conn.execute(sa.text(
+            "UPDATE chat_sessions AS s SET messages = COALESCE(("
+            "  SELECT json_agg(json_strip_nulls(json_build_object("
+            "    'role', m.role, 'content', m.content, 'timestamp', m.timestamp,"
+            "    'thinking', m.thinking, 'artifacts', m.artifacts,"
+            "    'content_blocks', m.content_blocks, 'has_multimodal', m.has_multimodal,"
+            "    'banked', m.banked"
+            "  )) ORDER BY m.message_index)"
+            "  FROM chat_messages m WHERE m.session_id = s.session_id"
+            "), '[]'::json)"
+        ))
+        op.drop_index("ix_chat_messages_session_index", table_name="chat_messages")
+        op.drop_table("chat_messages")
+
+    if _column_exists(conn, "chat_sessions", "message_count"):
+        op.drop_column("chat_sessions", "message_count")
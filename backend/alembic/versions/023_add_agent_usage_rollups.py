@@ -0,0 +1,69 @@
+"""add agent_usage_rollups for persisted cost tracking
+
+Revision ID: 023_add_agent_usage_rollups
+Revises: 022_add_chat_messages
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "023_add_agent_usage_rollups"
+down_revision = "022_add_chat_messages"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(conn, table: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM information_schema.tables WHERE table_name = :table"
+        ")"
+    ), {"table": table})
+    return bool(result.scalar())
+
+
+def upgrade() -> None:
+    """Create the hourly usage rollup table written by CostTrackingMiddleware."""
+    conn = op.get_bind()
+
+    if _table_exists(conn, "agent_usage_rollups"):
+        return
+
+    op.create_table(
+        "agent_usage_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "workflow_id", sa.Integer(),
+            sa.ForeignKey("workflow_profiles.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("agent", sa.String(255), nullable=False),
+        sa.Column("model", sa.String(255), nullable=True),
+        sa.Column("tool", sa.String(255), nullable=True),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_agent_usage_rollups_id", "agent_usage_rollups", ["id"])
+    op.create_index("ix_agent_usage_rollups_task_id", "agent_usage_rollups", ["task_id"])
+    op.create_index(
+        "ix_agent_usage_rollups_workflow_bucket",
+        "agent_usage_rollups",
+        ["workflow_id", "bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    if _table_exists(conn, "agent_usage_rollups"):
+        op.drop_index("ix_agent_usage_rollups_workflow_bucket", table_name="agent_usage_rollups")
+        op.drop_index("ix_agent_usage_rollups_task_id", table_name="agent_usage_rollups")
+        op.drop_index("ix_agent_usage_rollups_id", table_name="agent_usage_rollups")
+        op.drop_table("agent_usage_rollups")
@@ -0,0 +1,55 @@
+"""add delta storage columns to file_versions
+
+Revision ID: 024_add_file_version_deltas
+Revises: 023_add_agent_usage_rollups
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "024_add_file_version_deltas"
+down_revision = "023_add_agent_usage_rollups"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(conn, table: str, column: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM information_schema.columns "
+        "  WHERE table_name = :table AND column_name = :column"
+        ")"
+    ), {"table": table, "column": column})
+    return bool(result.scalar())
+
+
+def upgrade() -> None:
+    """Add keyframe/delta storage for file versions.
+
+    storage_mode is NULL for rows written before this migration, which keep
+    reading content_snapshot as before (see services/file_version_store.py).
+    """
+    conn = op.get_bind()
+
+    if not _column_exists(conn, "file_versions", "storage_mode"):
+        op.add_column(
+            "file_versions",
+            sa.Column("storage_mode", sa.String(20), nullable=True),
+        )
+
+    if not _column_exists(conn, "file_versions", "content_delta"):
+        op.add_column(
+            "file_versions",
+            sa.Column("content_delta", sa.LargeBinary(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    if _column_exists(conn, "file_versions", "content_delta"):
+        op.drop_column("file_versions", "content_delta")
+
+    if _column_exists(conn, "file_versions", "storage_mode"):
+        op.drop_column("file_versions", "storage_mode")
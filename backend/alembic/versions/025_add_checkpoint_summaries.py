@@ -0,0 +1,116 @@
+"""add checkpoint_summaries for indexed checkpoint listing
+
+Revision ID: 025_add_checkpoint_summaries
+Revises: 024_add_file_version_deltas
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "025_add_checkpoint_summaries"
+down_revision = "024_add_file_version_deltas"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(conn, table: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM information_schema.tables WHERE table_name = :table"
+        ")"
+    ), {"table": table})
+    return bool(result.scalar())
+
+
+# Latest root-graph checkpoint per thread from the LangGraph checkpoint table
+# (checkpoint IDs are time-ordered, so the greatest ID is the latest)
+BACKFILL_SQL = """
+INSERT INTO checkpoint_summaries (
+    thread_id, task_id, workflow_id, latest_checkpoint_id, latest_step, current_step,
+    status, hitl_pending, hitl_reason, error_message, retry_count, checkpoint_count,
+    created_at, updated_at
+)
+SELECT DISTINCT ON (c.thread_id)
+    c.thread_id,
+    COALESCE(
+        CASE WHEN c.checkpoint->'channel_values'->>'task_id' ~ '^[0-9]+$'
+             THEN (c.checkpoint->'channel_values'->>'task_id')::int END,
+        (substring(c.thread_id FROM 'task_([0-9]+)$'))::int
+    ),
+    (substring(c.thread_id FROM '^workflow_([0-9]+)_'))::int,
+    c.checkpoint_id,
+    CASE WHEN c.metadata->>'step' ~ '^-?[0-9]+$' THEN (c.metadata->>'step')::int END,
+    c.checkpoint->'channel_values'->>'current_step',
+    c.checkpoint->'channel_values'->>'workflow_status',
+    COALESCE(c.checkpoint->'channel_values'->>'workflow_status' IN ('AWAITING_HITL', 'HITL_REVIEWING'), false),
+    c.checkpoint->'channel_values'->>'hitl_reason',
+    c.checkpoint->'channel_values'->>'error_message',
+    CASE WHEN c.checkpoint->'channel_values'->>'retry_count' ~ '^[0-9]+$'
+         THEN (c.checkpoint->'channel_values'->>'retry_count')::int ELSE 0 END,
+    COUNT(*) OVER (PARTITION BY c.thread_id),
+    COALESCE((c.checkpoint->>'ts')::timestamptz, now()),
+    COALESCE((c.checkpoint->>'ts')::timestamptz, now())
+FROM checkpoints c
+WHERE c.checkpoint_ns = ''
+ORDER BY c.thread_id, c.checkpoint_id DESC
+ON CONFLICT (thread_id) DO NOTHING
+"""
+
+
+def upgrade() -> None:
+    """Create the per-thread checkpoint summary table and backfill it."""
+    conn = op.get_bind()
+
+    if not _table_exists(conn, "checkpoint_summaries"):
+        op.create_table(
+            "checkpoint_summaries",
+            sa.Column("thread_id", sa.String(255), primary_key=True),
+            sa.Column("task_id", sa.Integer(), nullable=True),
+            sa.Column("workflow_id", sa.Integer(), nullable=True),
+            sa.Column("latest_checkpoint_id", sa.String(255), nullable=False),
+            sa.Column("latest_step", sa.Integer(), nullable=True),
+            sa.Column("current_step", sa.String(255), nullable=True),
+            sa.Column("status", sa.String(50), nullable=True),
+            sa.Column("hitl_pending", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("hitl_reason", sa.Text(), nullable=True),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("retry_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("checkpoint_count", sa.Integer(), nullable=False, server_default="1"),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_checkpoint_summaries_task_id", "checkpoint_summaries", ["task_id"])
+        op.create_index("ix_checkpoint_summaries_updated_at", "checkpoint_summaries", ["updated_at"])
+        op.create_index(
+            "ix_checkpoint_summaries_workflow_updated",
+            "checkpoint_summaries",
+            ["workflow_id", "updated_at"],
+        )
+        op.create_index(
+            "ix_checkpoint_summaries_status_updated",
+            "checkpoint_summaries",
+            ["status", "updated_at", "checkpoint_count"],
+        )
+        op.create_index(
+            "ix_checkpoint_summaries_hitl_pending",
+            "checkpoint_summaries",
+            ["updated_at"],
+            postgresql_where=sa.text("hitl_pending"),
+        )
+
+    # LangGraph creates its tables at runtime, so a fresh database has none
+    if _table_exists(conn, "checkpoints"):
+        conn.execute(sa.text(BACKFILL_SQL))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    if _table_exists(conn, "checkpoint_summaries"):
+        op.drop_index("ix_checkpoint_summaries_hitl_pending", table_name="checkpoint_summaries")
+        op.drop_index("ix_checkpoint_summaries_status_updated", table_name="checkpoint_summaries")
+        op.drop_index("ix_checkpoint_summaries_workflow_updated", table_name="checkpoint_summaries")
+        op.drop_index("ix_checkpoint_summaries_updated_at", table_name="checkpoint_summaries")
+        op.drop_index("ix_checkpoint_summaries_task_id", table_name="checkpoint_summaries")
+        op.drop_table("checkpoint_summaries")
@@ -0,0 +1,59 @@
+"""track checkpoint compaction on checkpoint_summaries
+
+Revision ID: 026_add_checkpoint_compaction
+Revises: 025_add_checkpoint_summaries
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "026_add_checkpoint_compaction"
+down_revision = "025_add_checkpoint_summaries"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(conn, table: str, column: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM information_schema.columns"
+        "  WHERE table_name = :table AND column_name = :column"
+        ")"
+    ), {"table": table, "column": column})
+    return bool(result.scalar())
+
+
+def upgrade() -> None:
+    """Add compacted_at / bytes_reclaimed and cover bytes_reclaimed in the status index."""
+    conn = op.get_bind()
+
+    if not _column_exists(conn, "checkpoint_summaries", "compacted_at"):
+        op.add_column("checkpoint_summaries", sa.Column("compacted_at", sa.DateTime(timezone=True), nullable=True))
+    if not _column_exists(conn, "checkpoint_summaries", "bytes_reclaimed"):
+        op.add_column(
+            "checkpoint_summaries",
+            sa.Column("bytes_reclaimed", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+
+    op.drop_index("ix_checkpoint_summaries_status_updated", table_name="checkpoint_summaries")
+    op.create_index(
+        "ix_checkpoint_summaries_status_updated",
+        "checkpoint_summaries",
+        ["status", "updated_at", "checkpoint_count", "bytes_reclaimed"],
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    op.drop_index("ix_checkpoint_summaries_status_updated", table_name="checkpoint_summaries")
+    op.create_index(
+        "ix_checkpoint_summaries_status_updated",
+        "checkpoint_summaries",
+        ["status", "updated_at", "checkpoint_count"],
+    )
+    if _column_exists(conn, "checkpoint_summaries", "bytes_reclaimed"):
+        op.drop_column("checkpoint_summaries", "bytes_reclaimed")
+    if _column_exists(conn, "checkpoint_summaries", "compacted_at"):
+        op.drop_column("checkpoint_summaries", "compacted_at")
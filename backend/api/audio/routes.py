@@ -108,7 +108,7 @@ async def transcribe_audio(
         )
 
     try:
-        from tools.audio_transcribe_tool import transcribe_audio_file
+        from tools.audio_transcribe_tool import transcribe_audio as run_transcription
     except ImportError:
         raise HTTPException(
             503,
@@ -128,33 +128,14 @@ async def transcribe_audio(
             tmp.write(content)
             tmp_path = tmp.name
 
-        # Transcribe (single pass — collects transcript + metadata)
-        import asyncio
-        from tools.audio_transcribe_tool import _get_model
-
-        def _transcribe_with_metadata(path, model_sz, lang):
-            model = _get_model(model_sz)
-            segments, info = model.transcribe(
-                path, language=lang, beam_size=5, vad_filter=True,
-            )
-            lines = []
-            seg_count = 0
-            for seg in segments:
-                mins = int(seg.start // 60)
-                secs = int(seg.start % 60)
-                lines.append(f"[{mins:02d}:{secs:02d}] {seg.text.strip()}")
-                seg_count += 1
-            return "\n".join(lines), info.duration, info.language, seg_count
-
-        transcript, duration, lang_detected, seg_count = await asyncio.to_thread(
-            _transcribe_with_metadata, tmp_path, model_size, language
-        )
+        # Transcribe (long audio is chunked across worker processes)
+        result = await run_transcription(tmp_path, model_size, language)
 
         return TranscriptionResponse(
-            transcript=transcript,
-            duration_seconds=round(duration, 1),
-            language=lang_detected,
-            segment_count=seg_count,
+            transcript=result.transcript,
+            duration_seconds=round(result.duration, 1),
+            language=result.language or language,
+            segment_count=len(result.segments),
         )
 
     except FileNotFoundError:
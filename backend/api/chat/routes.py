@@ -12,10 +12,10 @@ This module provides a complete chat interface for testing DeepAgents before exp
 
 The chat system uses **dual storage** for conversation history:
 
-1. **PostgreSQL JSON Column** (`chat_sessions.messages`)
+1. **PostgreSQL chat_messages table** (`services/chat_message_store.py`)
    - Used for: UI display, conversation context service, session list
-   - Format: `[{role, content, timestamp, banked}, ...]`
-   - Must use `flag_modified()` when updating
+   - One row per message `{role, content, timestamp, banked, ...}`, append-only
+   - `chat_sessions.message_count` is the next message index
 
 2. **LangGraph Checkpointer** (PostgreSQL checkpoint tables)
    - Used for: Agent runtime memory, automatic compaction
@@ -62,6 +62,7 @@ import json
 
 from db.database import get_db
 from models.deep_agent import DeepAgentTemplate, ChatSession, DeepAgentConfig, SessionDocument
+from services import chat_message_store
 from models.core import DocumentType, IndexingStatus
 from services.deepagent_factory import DeepAgentFactory
 from core.runtimes import get_runtime
@@ -208,10 +209,12 @@ class ChatSessionResponse(BaseModel):
 
 
 class ChatHistoryResponse(BaseModel):
-    """Response with chat history."""
+    """Response with chat history (one page when offset/limit are given)."""
     session_id: str
     messages: List[ChatMessage]
     metrics: Dict[str, Any]
+    total_count: int = 0
+    offset: int = 0
 
 
 # =============================================================================
@@ -272,7 +275,7 @@ async def start_chat_session(
             project_id=request.project_id or getattr(agent, "project_id", None),
             user_id=request.user_id,
             runtime=agent_runtime,
-            messages=[],
+            message_count=0,
             metrics={
                 "total_tokens": 0,
                 "tool_calls": 0,
@@ -296,7 +299,7 @@ async def start_chat_session(
             project_id=session.project_id,
             agent_name=agent.name,
             is_active=session.is_active,
-            message_count=len(session.messages),
+            message_count=session.message_count or 0,
             created_at=session.created_at.isoformat(),
             updated_at=session.updated_at.isoformat(),
             runtime=session.runtime or "langgraph"
@@ -328,9 +331,9 @@ async def send_message(
     ``runtime.invoke()`` capability can absorb it cleanly.
 
     Storage Flow:
-    1. Append user message to session.messages (PostgreSQL JSON)
+    1. Append user message to chat_messages
     2. Invoke agent with thread_id (LangGraph loads previous messages from checkpointer)
-    3. Append assistant response to session.messages
+    3. Append assistant response to chat_messages
     4. Both storages are updated atomically
 
     Returns:
@@ -358,16 +361,13 @@ async def send_message(
 
         # Add user message to history
         from datetime import datetime
-        from sqlalchemy.orm.attributes import flag_modified
         user_message_timestamp = datetime.utcnow().isoformat()
-        user_message_index = len(session.messages)
-        session.messages.append({
+        user_message_index = chat_message_store.append_message(db, session, {
             "role": "user",
             "content": request.message,
             "timestamp": user_message_timestamp,
             "banked": False
-        })
-        flag_modified(session, "messages")
+        }).message_index
 
         # Get or create agent instance
         agent_instance = get_cached_agent(request.session_id)
@@ -416,18 +416,17 @@ async def send_message(
 
         # Add assistant message to history
         assistant_message_timestamp = datetime.utcnow().isoformat()
-        assistant_message_index = len(session.messages)
-        session.messages.append({
+        assistant_message_index = chat_message_store.append_message(db, session, {
             "role": "assistant",
             "content": response_text,
             "timestamp": assistant_message_timestamp,
             "banked": False
-        })
-        flag_modified(session, "messages")
+        }).message_index
 
         # Update metrics
-        session.metrics["total_tokens"] = session.metrics.get("total_tokens", 0) + len(request.message) + len(response_text)
-        flag_modified(session, "metrics")
+        metrics = dict(session.metrics or {})
+        metrics["total_tokens"] = metrics.get("total_tokens", 0) + len(request.message) + len(response_text)
+        session.metrics = metrics
 
         # Extract tool calls and subagent activity from result
         tool_calls = []
@@ -438,7 +437,6 @@ async def send_message(
 
         # Save session
         db.commit()
-        db.refresh(session)
 
         # Store messages in vector store for semantic search (if project_id available)
         # Note: Chat sessions currently don't have project association, but we'll add it later
@@ -551,16 +549,13 @@ async def send_message_stream(
                     yield f"data: {json.dumps({'type': 'error', 'message': 'Session not found'})}\n\n"
                     return
 
-                logger.info(f"Before adding user message: total_messages={len(fresh_session.messages)}")
-                fresh_session.messages.append({
+                chat_message_store.append_message(db, fresh_session, {
                     "role": "user",
                     "content": request.message,
                     "timestamp": current_timestamp()
                 })
-                flag_modified(fresh_session, "messages")
                 db.commit()  # Commit user message immediately
-                db.refresh(fresh_session)  # Refresh to confirm save
-                logger.info(f"✓ User message saved to DB: session={session_id}, total_messages={len(fresh_session.messages)}")
+                logger.info(f"✓ User message saved to DB: session={session_id}, total_messages={fresh_session.message_count}")
 
                 project_id = session_project_id or agent_project_id
 
@@ -668,8 +663,6 @@ async def send_message_stream(
                         ).first()
 
                         if final_session:
-                            logger.info(f"Before adding assistant message: total_messages={len(final_session.messages)}")
-
                             assistant_message = {
                                 "role": "assistant",
                                 "content": full_response,
@@ -681,8 +674,7 @@ async def send_message_stream(
                             # Thinking is stored separately and never merged into content
                             if thinking_response:
                                 assistant_message["thinking"] = thinking_response
-                            final_session.messages.append(assistant_message)
-                            flag_modified(final_session, "messages")
+                            chat_message_store.append_message(db, final_session, assistant_message)
 
                             # Update metrics with RAG token tracking
                             rough_tokens = len(request.message) + len(full_response)
@@ -697,8 +689,7 @@ async def send_message_stream(
                                 pass  # Column doesn't exist yet
 
                             db.commit()
-                            db.refresh(final_session)  # Refresh to confirm save
-                            logger.info(f"✓ Assistant message saved to DB: session={session_id}, total_messages={len(final_session.messages)}, rag_tokens={rag_tokens_used}")
+                            logger.info(f"✓ Assistant message saved to DB: session={session_id}, total_messages={final_session.message_count}, rag_tokens={rag_tokens_used}")
                         else:
                             logger.error(f"❌ Session {session_id} not found when saving assistant message")
                     except Exception as save_error:
@@ -725,12 +716,16 @@ async def send_message_stream(
 @router.get("/{session_id}/history", response_model=ChatHistoryResponse)
 async def get_chat_history(
     session_id: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get the full chat history for a session.
+    Get the chat history for a session.
 
-    Loads from PostgreSQL session.messages (not from checkpointer).
+    Loads from the chat_messages table (not from checkpointer). Without
+    offset/limit the full history is returned; with them, one page in
+    conversation order (total_count is always the full message count).
     """
     session = db.query(ChatSession).filter(
         ChatSession.session_id == session_id
@@ -739,10 +734,17 @@ async def get_chat_history(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPException(status_code=400, detail="offset and limit must be non-negative")
+
+    records = chat_message_store.get_messages(db, session_id, offset=offset, limit=limit)
+
     return ChatHistoryResponse(
         session_id=session.session_id,
-        messages=[ChatMessage(**msg) for msg in session.messages],
-        metrics=session.metrics
+        messages=[ChatMessage(**record.to_dict()) for record in records],
+        metrics=session.metrics,
+        total_count=session.message_count or 0,
+        offset=offset
     )
 
 
@@ -799,7 +801,7 @@ async def get_session_metrics(
         "tool_calls": session.tool_calls,
         "subagent_spawns": session.subagent_spawns,
         "context_operations": session.context_operations,
-        "message_count": len(session.messages),
+        "message_count": session.message_count or 0,
         "is_active": session.is_active,
         "duration_seconds": (session.updated_at - session.created_at).total_seconds()
     }
@@ -961,6 +963,9 @@ async def list_chat_sessions(
     # Order by updated_at so most recently used conversations appear first
     sessions = query.order_by(ChatSession.updated_at.desc()).limit(limit).all()
 
+    # Last message previews (truncated to 60 chars) for all sessions in one query
+    previews = chat_message_store.last_message_previews(db, sessions, length=60)
+
     result = []
     for session in sessions:
         # Get agent safely (might have been deleted)
@@ -968,13 +973,7 @@ async def list_chat_sessions(
             DeepAgentTemplate.id == session.agent_id
         ).first()
 
-        # Get last message preview
-        last_message_preview = None
-        if session.messages and len(session.messages) > 0:
-            last_msg = session.messages[-1]
-            content = last_msg.get("content", "")
-            # Truncate to 60 chars for preview
-            last_message_preview = content[:60] + "..." if len(content) > 60 else content
+        last_message_preview = previews.get(session.session_id)
 
         result.append({
             "session_id": session.session_id,
@@ -982,7 +981,7 @@ async def list_chat_sessions(
             "project_id": session.project_id,
             "agent_name": agent.name if agent else "Unknown Agent",
             "is_active": session.is_active,
-            "message_count": len(session.messages),
+            "message_count": session.message_count or 0,
             "last_message_preview": last_message_preview,
             "created_at": session.created_at.isoformat(),
             "updated_at": session.updated_at.isoformat(),
@@ -1009,7 +1008,7 @@ async def get_chat_health(db: Session = Depends(get_db)):
 
     inconsistencies = []
     for session in active_sessions:
-        db_message_count = len(session.messages) if session.messages else 0
+        db_message_count = session.message_count or 0
 
         # Check if session is cached
         cached_agent = manager.get_agent(session.session_id)
@@ -1083,7 +1082,7 @@ async def recover_messages_from_checkpoint(
                 "session_id": session_id,
                 "recovered": False,
                 "message": "No checkpoint data found for this session",
-                "db_messages": len(session.messages) if session.messages else 0
+                "db_messages": session.message_count or 0
             }
 
         # Decode checkpoint data (it's stored as binary/pickle)
@@ -1104,7 +1103,7 @@ async def recover_messages_from_checkpoint(
                         })
 
             # Compare with DB messages
-            db_message_count = len(session.messages) if session.messages else 0
+            db_message_count = session.message_count or 0
             checkpoint_message_count = len(recovered_messages)
 
             return {
@@ -1124,7 +1123,7 @@ async def recover_messages_from_checkpoint(
                 "session_id": session_id,
                 "recovered": False,
                 "message": f"Found checkpoint but failed to decode: {str(decode_error)}",
-                "db_messages": len(session.messages) if session.messages else 0
+                "db_messages": session.message_count or 0
             }
 
     except Exception as e:
@@ -1159,9 +1158,7 @@ async def restore_messages_from_checkpoint(
             raise HTTPException(status_code=404, detail="Session not found")
 
         # Restore messages
-        from sqlalchemy.orm.attributes import flag_modified
-        session.messages = recovery_data["recovered_data"]
-        flag_modified(session, "messages")
+        chat_message_store.replace_messages(db, session, recovery_data["recovered_data"])
         db.commit()
 
         logger.info(f"✓ Restored {len(recovery_data['recovered_data'])} messages for session {session_id}")
@@ -1230,16 +1227,15 @@ async def delete_chat_message(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if message_index < 0 or not session.messages or message_index >= len(session.messages):
+    message = chat_message_store.get_message(db, session_id, message_index)
+    if message is None:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    message = session.messages[message_index]
-    if message.get("role") != "user":
+    if message.role != "user":
         raise HTTPException(status_code=400, detail="Only user messages can be deleted")
 
-    from sqlalchemy.orm.attributes import flag_modified
-
-    removed_message = session.messages.pop(message_index)
+    removed_role = message.role
+    chat_message_store.delete_message(db, session, message)
 
     # Keep document attachments aligned with the shifted message indexes.
     session_docs = db.query(SessionDocument).filter(
@@ -1255,7 +1251,6 @@ async def delete_chat_message(
 
     session.is_active = False
     session.ended_at = datetime.utcnow()
-    flag_modified(session, "messages")
     db.commit()
 
     manager = get_session_manager()
@@ -1284,7 +1279,7 @@ async def delete_chat_message(
         "status": "success",
         "session_id": session_id,
         "message_index": message_index,
-        "deleted_role": removed_message.get("role"),
+        "deleted_role": removed_role,
         "runtime_reset": True,
         "session_active": False,
         "checkpoints_cleaned": cleanup_success,
@@ -1310,13 +1305,9 @@ async def bank_message(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if not session.messages or message_index >= len(session.messages):
-        raise HTTPException(status_code=404, detail="Message not found")
-
     # Mark message as banked
-    from sqlalchemy.orm.attributes import flag_modified
-    session.messages[message_index]["banked"] = True
-    flag_modified(session, "messages")
+    if not chat_message_store.set_banked(db, session_id, message_index, True):
+        raise HTTPException(status_code=404, detail="Message not found")
     db.commit()
 
     logger.info(f"Banked message {message_index} in session {session_id}")
@@ -1343,13 +1334,9 @@ async def unbank_message(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if not session.messages or message_index >= len(session.messages):
-        raise HTTPException(status_code=404, detail="Message not found")
-
     # Unmark message
-    from sqlalchemy.orm.attributes import flag_modified
-    session.messages[message_index]["banked"] = False
-    flag_modified(session, "messages")
+    if not chat_message_store.set_banked(db, session_id, message_index, False):
+        raise HTTPException(status_code=404, detail="Message not found")
     db.commit()
 
     logger.info(f"Unbanked message {message_index} in session {session_id}")
@@ -1599,7 +1586,7 @@ async def upload_file_to_session(
         mime_type=file.content_type,
         document_type=document_type,
         indexing_status=IndexingStatus.NOT_INDEXED,
-        message_index=len(session.messages) if session.messages else 0
+        message_index=session.message_count or 0
     )
     db.add(doc)
     db.commit()
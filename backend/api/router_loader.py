@@ -0,0 +1,344 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Router Loader - Eager or lazy registration of API router groups.
+
+Router modules pull in LangChain, LlamaIndex, sentence-transformers,
+unstructured and the ADK runtime at import time. In lazy mode the app
+only registers the router *table*; each group is imported on the first
+request that hits one of its URL prefixes, so the server can answer
+/health long before the heavy stacks are loaded.
+
+Enable with LAZY_ROUTERS=true. /docs, /redoc and /openapi.json load every
+group first so the schema is always complete.
+
+Import-time reporting:
+    # Per-group wall time as groups load (also in GET /health/startup)
+    get_router_loader().stats()
+
+    # -X importtime summary per router group, each in a fresh interpreter
+    python -m api.router_loader --importtime
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "false").lower() in ("true", "1", "yes")
+
+# Paths that need every router registered (full OpenAPI schema)
+SCHEMA_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """A single router to include: module, attribute and include_router kwargs."""
+    module: str
+    attr: str = "router"
+    prefix: Optional[str] = None
+    tags: Optional[Tuple[str, ...]] = None
+
+    def include_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {}
+        if self.prefix:
+            kwargs["prefix"] = self.prefix
+        if self.tags:
+            kwargs["tags"] = list(self.tags)
+        return kwargs
+
+
+@dataclass
+class RouterGroup:
+    """
+    Routers that are loaded together.
+
+    ``paths`` must list every URL prefix the group's routers serve; the lazy
+    loader uses it to decide which group a request needs.
+    """
+    name: str
+    paths: Tuple[str, ...]
+    routers: Tuple[RouterSpec, ...]
+    loaded: bool = False
+    import_seconds: Optional[float] = None
+    modules_imported: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def matches(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in self.paths)
+
+
+def _groups() -> List[RouterGroup]:
+    """Router table. Order within a group is registration order."""
+    R = RouterSpec
+    return [
+        RouterGroup("workflows", ("/api/workflows", "/api/orchestration", "/api/hitl", "/api/checkpoints", "/api/memory"), (
+            R("api.workflows.routes"),
+            R("api.workflows.execution"),  # Simplified orchestration
+            R("api.hitl.routes"),  # Human-in-the-loop approval endpoints
+            R("api.workflows.checkpoints"),  # Checkpoint management endpoints
+            R("api.knowledge.store"),  # Store (long-term memory) management endpoints
+            R("api.memory.routes"),  # Agent memory management and viewing
+        )),
+        RouterGroup("projects", ("/api/projects", "/api/tasks", "/api/background-tasks"), (
+            R("api.projects.routes"),
+            R("api.tasks.routes"),
+            R("api.system.background_tasks"),  # Background task queue management
+        )),
+        RouterGroup("knowledge", ("/api/rag", "/api/repositories"), (
+            R("api.knowledge.rag"),
+            R("api.repositories.routes"),  # Git repository browser + knowledge-base ingestion
+        )),
+        RouterGroup("workspace", ("/api/workspace",), (
+            R("api.workspace.routes"),  # Workspace file management
+        )),
+        RouterGroup("system", ("/api/settings", "/api/debug"), (
+            R("api.system.settings"),
+            R("api.system.debug"),  # Debug endpoints for development
+        )),
+        RouterGroup("models", ("/api/local-models", "/api/model-servers", "/api/models"), (
+            R("api.models.local", prefix="/api/local-models", tags=("local-models",)),
+            R("api.models.servers", prefix="/api/model-servers", tags=("model-servers",)),
+            R("api.models.capabilities", prefix="/api/models", tags=("models",)),
+        )),
+        RouterGroup("agents", ("/api/agents", "/api/action-presets", "/api/deepagents", "/api/generation"), (
+            R("api.agents.routes"),  # Agent templates (preset agents)
+            R("api.presets.actions"),  # Action presets library
+            R("api.agents.deep_agents"),  # DeepAgents configuration and export
+            R("api.agents.generator"),  # AI-powered agent generation
+        )),
+        RouterGroup("tools", ("/api/custom-tools",), (
+            R("api.tools.routes"),  # Custom user-defined tools
+        )),
+        RouterGroup("skills", ("/api/skills",), (
+            R("api.skills.routes"),  # Skills system
+        )),
+        RouterGroup("images", ("/api/images",), (
+            R("api.images.routes"),  # Image storage and serving
+        )),
+        RouterGroup("chat", ("/api/chat",), (
+            R("api.chat.routes"),  # DeepAgents chat testing
+        )),
+        RouterGroup("schemas", ("/api/output-schemas",), (
+            R("api.schemas.routes"),  # Structured output schemas
+        )),
+        RouterGroup("presentations", ("/api/auth/google", "/api/presentations"), (
+            R("api.auth.google"),  # Google OAuth for presentations
+            R("api.presentations.routes"),  # Presentation generation
+        )),
+        RouterGroup("automation", ("/api/schedules", "/api/triggers", "/api/webhooks"), (
+            R("api.schedules.routes"),  # Workflow cron scheduling
+            R("api.triggers.routes"),  # Workflow event triggers (file watch, etc.)
+            R("api.webhooks.routes"),  # Webhook receiver endpoints
+        )),
+        RouterGroup("audio", ("/api/audio",), (
+            R("api.audio.routes"),  # Local audio upload/transcription
+        )),
+        RouterGroup("pii_profiles", ("/api/pii-profiles",), (
+            R("api.pii_profiles.routes"),  # PII redaction profiles
+        )),
+    ]
+
+
+class RouterLoader:
+    """
+    Registers router groups on a FastAPI app, eagerly or on first use.
+
+    Usage:
+        loader = get_router_loader()
+        loader.install(app, lazy=LAZY_ROUTERS)
+    """
+
+    def __init__(self):
+        self.groups: List[RouterGroup] = _groups()
+        self.lazy = False
+        self._app = None
+
+    def install(self, app, lazy: bool = False):
+        """Register all groups now, or add the lazy-loading middleware."""
+        self._app = app
+        self.lazy = lazy
+        if lazy:
+            app.add_middleware(LazyRouterMiddleware, loader=self)
+            logger.info(f"Lazy router loading enabled ({len(self.groups)} groups deferred)")
+        else:
+            for group in self.groups:
+                self._load_group(group)
+
+    def group_for(self, path: str) -> Optional[RouterGroup]:
+        for group in self.groups:
+            if group.matches(path):
+                return group
+        return None
+
+    async def ensure_loaded(self, group: RouterGroup):
+        """Import and register a group once, off the event loop thread."""
+        if group.loaded:
+            return
+        async with group.lock:
+            if group.loaded:
+                return
+            modules = await asyncio.to_thread(self._import_group, group)
+            self._register(group, modules)
+
+    async def ensure_all_loaded(self):
+        for group in self.groups:
+            await self.ensure_loaded(group)
+
+    def _load_group(self, group: RouterGroup):
+        self._register(group, self._import_group(group))
+
+    def _import_group(self, group: RouterGroup) -> List[Any]:
+        before = len(sys.modules)
+        start = time.perf_counter()
+        modules = [importlib.import_module(spec.module) for spec in group.routers]
+        group.import_seconds = time.perf_counter() - start
+        group.modules_imported = len(sys.modules) - before
+        return modules
+
+    def _register(self, group: RouterGroup, modules: List[Any]):
+        for spec, module in zip(group.routers, modules):
+            self._app.include_router(getattr(module, spec.attr), **spec.include_kwargs())
+        # Routes changed; let FastAPI regenerate the schema on next request
+        self._app.openapi_schema = None
+        group.loaded = True
+        log = logger.info if self.lazy else logger.debug
+        log(
+            f"Router group '{group.name}' loaded in {group.import_seconds * 1000:.0f}ms "
+            f"({group.modules_imported} new modules)"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-group load state and import cost, in load order."""
+        return {
+            "lazy": self.lazy,
+            "groups": [
+                {
+                    "name": g.name,
+                    "loaded": g.loaded,
+                    "import_ms": round(g.import_seconds * 1000, 1) if g.import_seconds is not None else None,
+                    "modules_imported": g.modules_imported,
+                    "paths": list(g.paths),
+                }
+                for g in self.groups
+            ],
+        }
+
+
+class LazyRouterMiddleware:
+    """Pure ASGI middleware that loads a router group before its first request."""
+
+    def __init__(self, app, loader: RouterLoader):
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope.get("path", "")
+            if path in SCHEMA_PATHS:
+                await self.loader.ensure_all_loaded()
+            else:
+                group = self.loader.group_for(path)
+                if group is not None and not group.loaded:
+                    await self.loader.ensure_loaded(group)
+        await self.app(scope, receive, send)
+
+
+# =============================================================================
+# -X importtime report
+# =============================================================================
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth)."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarize_importtime(rows: List[Tuple[str, int, int, int]], top: int = 10) -> Dict[str, Any]:
+    """Total import cost plus the heaviest top-level packages."""
+    by_package: Dict[str, int] = {}
+    for module, self_us, _, _ in rows:
+        package = module.split(".", 1)[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    heaviest = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(r[1] for r in rows) / 1000, 1),
+        "modules": len(rows),
+        "top_packages": [{"package": p, "self_ms": round(us / 1000, 1)} for p, us in heaviest],
+    }
+
+
+def importtime_report(group_names: Optional[List[str]] = None, top: int = 10) -> Dict[str, Dict[str, Any]]:
+    """
+    Run each router group's imports under ``-X importtime`` in a fresh
+    interpreter and summarize. Each group is measured standalone, so shared
+    dependencies are counted in every group that needs them.
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    report = {}
+    for group in _groups():
+        if group_names and group.name not in group_names:
+            continue
+        code = "; ".join(f"import {spec.module}" for spec in group.routers)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=backend_dir,
+            capture_output=True,
+            text=True,
+        )
+        summary = summarize_importtime(parse_importtime(result.stderr), top=top)
+        if result.returncode != 0:
+            summary["error"] = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+        report[group.name] = summary
+    return report
+
+
+_loader: Optional[RouterLoader] = None
+
+
+def get_router_loader() -> RouterLoader:
+    """Get the global router loader instance."""
+    global _loader
+    if _loader is None:
+        _loader = RouterLoader()
+    return _loader
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Router group import-time report")
+    parser.add_argument("--importtime", action="store_true", help="Run -X importtime per router group")
+    parser.add_argument("--group", action="append", help="Limit to a group (repeatable)")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages to list per group")
+    args = parser.parse_args()
+
+    if args.importtime:
+        results = importtime_report(args.group, top=args.top)
+        for name, summary in sorted(results.items(), key=lambda kv: kv[1]["total_ms"], reverse=True):
+            print(f"{name:<15} {summary['total_ms']:>9.1f} ms  {summary['modules']:>5} modules"
+                  + (f"  ERROR: {summary['error']}" if "error" in summary else ""))
+            for pkg in summary["top_packages"]:
+                print(f"    {pkg['package']:<30} {pkg['self_ms']:>9.1f} ms")
+    else:
+        print(json.dumps([{"name": g.name, "paths": list(g.paths)} for g in _groups()], indent=2))
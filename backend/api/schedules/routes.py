@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
 from db.database import get_db
+from services.scheduler_service import notify_schedule_changed
 
 logger = logging.getLogger(__name__)
 
@@ -181,6 +182,10 @@ async def create_schedule(
     db.commit()
     db.refresh(db_schedule)
 
+    notify_schedule_changed(
+        db_schedule.id, db_schedule.next_run_at if db_schedule.enabled else None
+    )
+
     logger.info(f"Created schedule {db_schedule.id} for workflow {schedule.workflow_id}")
 
     return _schedule_to_response(db_schedule)
@@ -281,6 +286,8 @@ async def update_schedule(
     db.commit()
     db.refresh(schedule)
 
+    notify_schedule_changed(schedule.id, schedule.next_run_at if schedule.enabled else None)
+
     logger.info(f"Updated schedule {schedule_id}")
 
     return _schedule_to_response(schedule)
@@ -308,6 +315,8 @@ async def delete_schedule(
     db.delete(schedule)
     db.commit()
 
+    notify_schedule_changed(schedule_id, None)
+
     logger.info(f"Deleted schedule {schedule_id}")
 
     return {"status": "success", "message": f"Schedule {schedule_id} deleted"}
@@ -12,6 +12,8 @@ Endpoints:
 - GET /health - Basic health check (fast, for load balancers)
 - GET /health/detailed - Detailed system diagnostics
 - GET /health/metrics - Performance metrics
+- GET /health/latency - Latency histograms per route template
+- GET /health/startup - Startup phase timings and router import costs
 
 Usage:
     # Basic health check
@@ -22,6 +24,12 @@ Usage:
 
     # Performance metrics
     curl http://localhost:8000/health/metrics
+
+    # Latency histograms (p50/p90/p99 + buckets) per route
+    curl http://localhost:8000/health/latency
+
+    # Startup breakdown (lifespan phases + per-router-group import time)
+    curl http://localhost:8000/health/startup
 """
 
 import logging
@@ -204,6 +212,57 @@ async def get_performance_metrics():
     return PerformanceMetricsResponse(**metrics)
 
 
+@router.get("/latency")
+async def get_latency_histograms():
+    """
+    Get latency histograms per route template, slowest p99 first.
+
+    Durations cover the full response, including streamed bodies; bucket
+    keys are upper bounds in milliseconds.
+
+    Example:
+        {
+            "routes": {
+                "POST /api/chat/stream": {
+                    "count": 42, "avg_ms": 5120.4, "min_ms": 820.1, "max_ms": 20311.0,
+                    "p50_ms": 3900.0, "p90_ms": 9800.0, "p99_ms": 19400.0,
+                    "buckets": {"le_5": 0, "le_10": 0, "...": 0, "le_inf": 0}
+                }
+            }
+        }
+    """
+    return {"routes": performance_metrics.get_histograms()}
+
+
+@router.get("/startup")
+async def get_startup_timings():
+    """
+    Get the startup-phase breakdown and router group import costs.
+
+    Phases cover the lifespan steps (db_init, checkpointing, mcp, task_queue,
+    scheduler, file_watchers). With LAZY_ROUTERS enabled, router groups show
+    loaded=false until their first request.
+
+    Example:
+        {
+            "phases": [{"name": "db_init", "duration_ms": 84.2, "status": "ok"}],
+            "total_phase_ms": 1432.0,
+            "ready_after_ms": 2210.5,
+            "routers": {
+                "lazy": true,
+                "groups": [{"name": "chat", "loaded": false, "import_ms": null}]
+            }
+        }
+    """
+    from core.utils.startup_timing import startup_timer
+    from api.router_loader import get_router_loader
+
+    return {
+        **startup_timer.summary(),
+        "routers": get_router_loader().stats(),
+    }
+
+
 # =============================================================================
 # Health Check Helpers
 # =============================================================================
@@ -44,6 +44,11 @@ class FileWatchConfig(BaseModel):
     events: List[str] = Field(default_factory=lambda: ["created"])
     debounce_seconds: int = 5
     input_mapping: dict = Field(default_factory=dict)
+    # Batching (None = server default from FILE_WATCH_* env vars)
+    batch_window_seconds: Optional[float] = None
+    batch_max_files: Optional[int] = None
+    max_concurrent_runs: Optional[int] = None
+    max_held_files: Optional[int] = None
 
 
 class TriggerCreate(BaseModel):
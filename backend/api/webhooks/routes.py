@@ -19,6 +19,7 @@ Features:
 import hashlib
 import hmac
 import ipaddress
+import json
 import logging
 from datetime import datetime, timezone
 from typing import Optional
@@ -323,3 +324,25 @@ async def test_webhook_endpoint(
         "trigger_count": trigger.trigger_count,
         "last_triggered_at": trigger.last_triggered_at.isoformat() if trigger.last_triggered_at else None
     }
+
+
+@router.post("/tool-callback/{token}")
+async def receive_tool_callback(token: str, request: Request):
+    """
+    Receive the result of a job started by an API tool in callback mode.
+
+    The URL is one-shot: the token is issued per tool call and expires when
+    the call completes or times out (see core.tools.polling).
+    """
+    from core.tools.polling import get_callback_registry
+
+    body = await request.body()
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        payload = body.decode("utf-8", errors="replace")
+
+    if not get_callback_registry().resolve(token, payload):
+        raise HTTPException(status_code=404, detail="Unknown or expired callback")
+
+    return {"status": "received"}
@@ -111,11 +111,10 @@ async def list_checkpoints(
         # Get checkpoint manager
         manager = await get_checkpoint_manager()
 
-        # Query checkpoints for this workflow
-        # Thread ID pattern: workflow_{workflow_id}_task_{task_id}
-        thread_id_pattern = f"workflow_{workflow_id}"
+        # Latest checkpoint of each thread of this workflow
+        # (thread ID pattern: workflow_{workflow_id}_task_{task_id})
         checkpoint_list = await manager.list_checkpoints(
-            thread_id=thread_id_pattern,
+            workflow_id=workflow_id,
             limit=limit
         )
 
@@ -126,7 +125,7 @@ async def list_checkpoints(
                 checkpoint_id=cp["checkpoint_id"],
                 workflow_id=workflow_id,
                 task_id=cp.get("task_id"),
-                thread_id=cp["checkpoint_id"],  # checkpoint_id contains thread_id
+                thread_id=cp["thread_id"],
                 created_at=cp.get("created_at", datetime.utcnow().isoformat()),
                 step_name=cp.get("current_step"),
                 message_count=0,  # TODO: Extract from state if needed
@@ -381,9 +380,8 @@ async def get_latest_checkpoint(
         manager = await get_checkpoint_manager()
 
         # Get latest checkpoint for this workflow
-        thread_id_pattern = f"workflow_{workflow_id}"
         checkpoint_list = await manager.list_checkpoints(
-            thread_id=thread_id_pattern,
+            workflow_id=workflow_id,
             limit=1
         )
 
@@ -399,7 +397,7 @@ async def get_latest_checkpoint(
             checkpoint_id=cp["checkpoint_id"],
             workflow_id=workflow_id,
             task_id=cp.get("task_id"),
-            thread_id=cp["checkpoint_id"],
+            thread_id=cp["thread_id"],
             created_at=cp.get("created_at", datetime.utcnow().isoformat()),
             step_name=cp.get("current_step"),
             message_count=0,
@@ -9,7 +9,7 @@ Simple Orchestration API for LangConfig
 Executes user-created workflows from the frontend.
 No complex blueprints - just run the workflow the user is looking at.
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
@@ -810,6 +810,44 @@ async def get_task_execution_events(
     }
 
 
+@router.get("/tasks/{task_id}/profile")
+async def get_task_profile(
+    task_id: int,
+    top: int = Query(20, ge=1, le=500),
+    output_format: str = "json"
+):
+    """
+    Timing profile for a recent task execution.
+
+    Returns the span tree recorded while the task ran (workflow -> nodes ->
+    LLM calls / tools / subagents, plus agent construction, tool loading and
+    RAG retrieval), merged by name so repeated calls show as one entry with a
+    count. Per-event work such as event persistence is aggregated under
+    "timings" (count, total and max per name) instead of one span per call.
+
+    Profiles are kept in memory for the last SPAN_RECORDER_MAX_TASKS runs of
+    this worker process only; older or foreign tasks return 404.
+
+    Query Parameters:
+        - top: Number of slowest individual spans to include (default: 20, max: 500)
+        - output_format: "json" (default) or "folded" for flamegraph.pl / speedscope input
+    """
+    from fastapi.responses import PlainTextResponse
+    from core.workflows.events.spans import get_recorder
+
+    if output_format not in ("json", "folded"):
+        raise HTTPException(status_code=400, detail="output_format must be 'json' or 'folded'")
+
+    recorder = get_recorder(task_id)
+    if recorder is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this task")
+
+    summary = recorder.summary(top=top)
+    if output_format == "folded":
+        return PlainTextResponse("\n".join(summary["folded"]) + "\n")
+    return summary
+
+
 @router.get("/workflows/{workflow_id}/events")
 async def get_workflow_execution_events(
     workflow_id: int,
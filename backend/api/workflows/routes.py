@@ -1671,29 +1671,49 @@ async def get_workflow_cost_metrics(
     # If no workflow_executions exist, aggregate from execution_events (LLM_END events)
     # This is the primary data source for workflows using the custom tracing system
     if not executions:
+        # Count completed tasks as execution count
+        from models.core import Task
+        completed_tasks = db.query(Task).filter(
+            Task.workflow_profile_id == workflow_id,
+            Task.status == 'completed',
+            Task.completed_at >= cutoff_date
+        ).count()
+
+        # Prefer the usage rollups written by CostTrackingMiddleware: a few
+        # grouped rows instead of every LLM_END event in the period. Events
+        # are only read for runs the rollups don't cover (older runs, or
+        # runs whose usage hasn't been flushed yet).
+        from services.usage_store import (
+            is_rolled_up_hour, rolled_up_hours, rolled_up_tasks, workflow_usage_summary
+        )
+        usage = workflow_usage_summary(db, workflow_id, cutoff_date)
+
+        event_filters = [
+            ExecutionEvent.workflow_id == workflow_id,
+            ExecutionEvent.timestamp >= cutoff_date
+        ]
+        covered_hours = set()
+        if usage is not None:
+            event_filters.append(ExecutionEvent.task_id.notin_(rolled_up_tasks(workflow_id, cutoff_date)))
+            covered_hours = rolled_up_hours(db, workflow_id, cutoff_date)
+
         logger.info(f"No workflow_executions found for workflow {workflow_id}, aggregating from execution_events")
 
         # Query LLM_END events for token/cost data
         llm_events = db.query(ExecutionEvent).filter(
-            ExecutionEvent.workflow_id == workflow_id,
-            ExecutionEvent.event_type == "LLM_END",
-            ExecutionEvent.timestamp >= cutoff_date
+            *event_filters,
+            ExecutionEvent.event_type == "LLM_END"
         ).all()
 
         # Query tool events for tool usage tracking
         tool_events = db.query(ExecutionEvent).filter(
-            ExecutionEvent.workflow_id == workflow_id,
-            ExecutionEvent.event_type == "on_tool_start",
-            ExecutionEvent.timestamp >= cutoff_date
+            *event_filters,
+            ExecutionEvent.event_type == "on_tool_start"
         ).all()
 
-        # Count completed tasks as execution count
-        from models.core import Task
-        completed_tasks = db.query(Task).filter(
-            Task.workflow_profile_id == workflow_id,
-            Task.status == 'completed',
-            Task.completed_at >= cutoff_date
-        ).count()
+        if covered_hours:
+            llm_events = [e for e in llm_events if not is_rolled_up_hour(e.timestamp, covered_hours)]
+            tool_events = [e for e in tool_events if not is_rolled_up_hour(e.timestamp, covered_hours)]
 
         # Aggregate tokens and costs by agent
         for event in llm_events:
@@ -1732,6 +1752,17 @@ async def get_workflow_cost_metrics(
             data["cost"] = round(agent_cost, 4)
             total_cost += agent_cost
 
+        if usage is not None:
+            total_cost += usage["total_cost"]
+            total_tokens += usage["total_tokens"]
+            prompt_tokens += usage["prompt_tokens"]
+            completion_tokens += usage["completion_tokens"]
+            for agent_name, data in usage["agents"].items():
+                agent_costs[agent_name]["cost"] = round(agent_costs[agent_name]["cost"] + data["cost"], 4)
+                agent_costs[agent_name]["tokens"] += data["tokens"]
+            for tool_name, count in usage["tools"].items():
+                tool_usage[tool_name] += count
+
         total_cost = round(total_cost, 4)
 
         # Convert to response format
@@ -1747,7 +1778,10 @@ async def get_workflow_cost_metrics(
         ]
         tools_list.sort(key=lambda x: x.count, reverse=True)
 
-        logger.info(f"Aggregated from events: {len(llm_events)} LLM calls, {len(tool_events)} tool calls, {total_tokens} tokens, ${total_cost}")
+        logger.info(
+            f"Aggregated {'rollups plus ' if usage is not None else ''}events: {len(llm_events)} LLM calls, "
+            f"{len(tool_events)} tool calls, {total_tokens} tokens, ${total_cost}"
+        )
 
         return WorkflowCostMetrics(
             workflow_id=workflow_id,
@@ -2203,38 +2237,18 @@ async def export_workflow_package(
         "blueprint": workflow.blueprint or {},
     }
 
-    # DEBUG: Log what's being passed to the exporter
-    config = workflow.configuration or {}
-    nodes = config.get("nodes", [])
-    logger.info(f"[EXPORT DEBUG] Workflow {workflow_id} has {len(nodes)} nodes in configuration")
-    logger.info(f"[EXPORT DEBUG] Export mode: {export_mode}")
-    for i, node in enumerate(nodes[:3]):  # First 3 nodes
-        node_config = node.get("config", {})
-        logger.info(f"[EXPORT DEBUG] Node {i} ({node.get('id')}): config.model={node_config.get('model')}")
-        logger.info(f"[EXPORT DEBUG] Node {i} ({node.get('id')}): config.system_prompt={node_config.get('system_prompt', '')[:50]}...")
+    # Generate export with specified mode
+    exporter = ExecutableWorkflowExporter(
+        workflow=workflow_dict,
+        project_id=workflow.project_id or 0,
+        export_mode=export_mode
+    )
 
+    # Pull the first chunk before responding so generator failures still
+    # surface as a 500 instead of a truncated download
+    stream = exporter.stream_zip()
     try:
-        # Generate export with specified mode
-        exporter = ExecutableWorkflowExporter(
-            workflow=workflow_dict,
-            project_id=workflow.project_id or 0,
-            export_mode=export_mode
-        )
-
-        zip_bytes = await exporter.export_to_zip()
-
-        # Return as downloadable file
-        safe_name = workflow.name.lower().replace(" ", "_").replace("-", "_")
-        filename = f"workflow_{safe_name}_{workflow_id}.zip"
-
-        return StreamingResponse(
-            io.BytesIO(zip_bytes),
-            media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
-        )
-
+        first_chunk = await stream.__anext__()
     except Exception as e:
         logger.error(f"Failed to export workflow {workflow_id}: {e}", exc_info=True)
         raise HTTPException(
@@ -2242,6 +2256,22 @@ async def export_workflow_package(
             detail=f"Export failed: {str(e)}"
         )
 
+    async def body():
+        yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    # Return as downloadable file
+    filename = f"{exporter.package_name}.zip"
+
+    return StreamingResponse(
+        body(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
 
 @router.get("/{workflow_id}/export/config")
 async def export_workflow_config(
@@ -8,6 +8,7 @@ API endpoints for workspace file management.
 
 Provides access to files created by agents during workflow execution.
 """
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import FileResponse
@@ -1932,6 +1933,7 @@ async def get_file_versions(
     """
     from models.workspace_file import WorkspaceFile
     from models.file_version import FileVersion
+    from services.file_version_store import has_stored_content
 
     file_record = db.query(WorkspaceFile).filter(WorkspaceFile.id == file_id).first()
     if not file_record:
@@ -1952,7 +1954,7 @@ async def get_file_versions(
             lines_added=v.lines_added,
             lines_removed=v.lines_removed,
             created_at=v.created_at.isoformat() if v.created_at else None,
-            has_content_snapshot=v.content_snapshot is not None
+            has_content_snapshot=has_stored_content(v)
         )
         for v in versions
     ]
@@ -1985,7 +1987,8 @@ async def get_file_diff(
     """
     from models.workspace_file import WorkspaceFile
     from models.file_version import FileVersion
-    from services.diff_service import generate_unified_diff, generate_side_by_side, get_diff_stats
+    from services.diff_service import generate_file_diff
+    from services.file_version_store import get_version_content as load_content
 
     file_record = db.query(WorkspaceFile).filter(WorkspaceFile.id == file_id).first()
     if not file_record:
@@ -2005,40 +2008,26 @@ async def get_file_diff(
     if not version1 or not version2:
         raise HTTPException(status_code=404, detail="Version not found")
 
-    # Get content for comparison
-    # For edit operations, we need to reconstruct content
-    old_content = ""
-    new_content = ""
-
-    if version1.content_snapshot:
-        old_content = version1.content_snapshot
-    elif version1.operation == "edit":
-        # For edits, we'd need to reconstruct from the chain
-        # For now, use an empty string if no snapshot
-        old_content = ""
-
-    if version2.content_snapshot:
-        new_content = version2.content_snapshot
-    elif version2.operation == "edit" and version2.old_string and version2.new_string:
+    # Get content for comparison (snapshot, or rebuilt from keyframe + deltas)
+    old_content = load_content(db, version1) or ""
+    new_content = load_content(db, version2)
+
+    if new_content is None and version2.operation == "edit" and version2.old_string and version2.new_string:
+        # Legacy edit rows store no content
         # Apply the edit to previous content
         if old_content:
             new_content = old_content.replace(version2.old_string, version2.new_string, 1)
-        else:
-            new_content = ""
+    new_content = new_content or ""
 
-    # Generate diffs
-    unified = generate_unified_diff(old_content, new_content, file_record.filename)
-    side_by_side = generate_side_by_side(old_content, new_content)
-    stats = get_diff_stats(old_content, new_content)
+    # Generate diffs off the event loop (CPU-bound on large files)
+    diff = await asyncio.to_thread(generate_file_diff, old_content, new_content, file_record.filename)
 
     return FileDiffResponse(
         file_id=file_id,
         filename=file_record.filename,
         v1=v1,
         v2=v2,
-        unified_diff=unified,
-        side_by_side=side_by_side,
-        stats=stats
+        **diff
     )
 
 
@@ -2051,10 +2040,12 @@ async def get_version_content(
     """
     Get the content of a specific file version.
 
-    Returns the full content snapshot if available.
+    Returns the full content snapshot (or the content rebuilt from its
+    keyframe and deltas) if available.
     """
     from models.workspace_file import WorkspaceFile
     from models.file_version import FileVersion
+    from services.file_version_store import get_version_content as load_content
 
     file_record = db.query(WorkspaceFile).filter(WorkspaceFile.id == file_id).first()
     if not file_record:
@@ -2068,7 +2059,8 @@ async def get_version_content(
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
 
-    if not version.content_snapshot:
+    content = load_content(db, version)
+    if content is None:
         return {
             "file_id": file_id,
             "version_number": version_number,
@@ -2081,7 +2073,7 @@ async def get_version_content(
         "file_id": file_id,
         "version_number": version_number,
         "has_content": True,
-        "content": version.content_snapshot,
+        "content": content,
         "operation": version.operation,
         "agent_label": version.agent_label
     }
@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Offline benchmarks for the workflow execution hot path.
+
+Runs the executor, event emitter and event bus against a scripted fake chat
+model and fake tools (no network, no PostgreSQL), and compares the results
+with a stored baseline.
+
+Usage (from backend/):
+    python -m benchmarks                    # all scenarios vs baseline.json
+    python -m benchmarks executor --quick   # one scenario, smaller sizes
+    python -m benchmarks --save-baseline    # record a new baseline
+
+--quick runs are compared with a separate quick baseline (recorded with
+--quick --save-baseline), never with the full-size one.
+
+The RAG retrieval benchmark (needs PostgreSQL + pgvector) is separate:
+    python -m benchmarks.rag --help
+
+FileVersion keyframe/delta storage size and read latency (SQLite, offline):
+    python -m benchmarks.file_versions --help
+"""
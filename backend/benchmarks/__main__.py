@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Command-line entry point: ``python -m benchmarks``.
+
+Each scenario runs in its own subprocess so peak RSS is per scenario and
+one scenario's allocations don't skew the next.
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.harness import (
+    BASELINE_PATH,
+    DEFAULT_TOLERANCE,
+    compare,
+    format_report,
+    load_baseline,
+    save_baseline,
+)
+from benchmarks.scenarios import SCENARIOS, run_scenario
+
+
+def _run_isolated(name: str, quick: bool) -> dict:
+    cmd = [sys.executable, "-m", "benchmarks", name, "--child"] + (["--quick"] if quick else [])
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=Path(__file__).parent.parent)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Scenario '{name}' failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="Offline workflow execution benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for smoke runs")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative regression tolerated before failing (default 0.25)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    # The hot path logs heavily at INFO; measure the code, not the log handler
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.child:
+        print(json.dumps(run_scenario(args.scenarios[0], quick=args.quick)))
+        return 0
+
+    results = {name: _run_isolated(name, args.quick) for name in args.scenarios or SCENARIOS}
+    # Quick runs only compare against a quick baseline
+    mode = "quick" if args.quick else "full"
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline, mode)
+        print(f"Saved {mode} baseline to {args.baseline}")
+
+    baseline = load_baseline(args.baseline, mode)
+    if not baseline:
+        print(f"No {mode} baseline in {args.baseline}; results are not compared", file=sys.stderr)
+    comparison = compare(results, baseline, args.tolerance)
+    if args.json:
+        print(json.dumps({"results": results, "comparison": comparison}, indent=2))
+    else:
+        print(format_report(results, comparison))
+
+    regressions = [row for row in comparison if row["regressed"]]
+    if regressions and not args.save_baseline:
+        print(f"\n{len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Deterministic stand-ins for the LLM, tools and I/O boundaries.
+
+Everything here is scripted: a model turn either calls the next fake tool or
+streams a fixed number of tokens, and tools sleep for a fixed latency. That
+keeps benchmark runs offline and comparable between releases.
+"""
+
+import asyncio
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import BaseTool, StructuredTool
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """
+    Chat model that calls each bound tool in turn, then streams tokens.
+
+    A "node run" starts at the last HumanMessage: the model issues
+    ``tool_calls_per_run`` tool calls (one per turn), then answers with
+    ``tokens_per_turn`` streamed tokens.
+    """
+
+    tokens_per_turn: int = 200
+    tool_calls_per_run: int = 1
+    token_delay: float = 0.0
+    tool_names: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming"
+
+    def bind_tools(self, tools, **kwargs):
+        names = [t.name if isinstance(t, BaseTool) else t["name"] for t in tools]
+        return self.model_copy(update={"tool_names": names})
+
+    def _tool_calls_made(self, messages: List[BaseMessage]) -> int:
+        made = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, ToolMessage):
+                made += 1
+        return made
+
+    def _next_tool_call(self, messages: List[BaseMessage]) -> Optional[Dict[str, Any]]:
+        made = self._tool_calls_made(messages)
+        if not self.tool_names or made >= self.tool_calls_per_run:
+            return None
+        return {
+            "name": self.tool_names[made % len(self.tool_names)],
+            "args": {"query": f"step {made}"},
+            "id": f"call_{len(messages)}_{made}",
+        }
+
+    def _usage(self, messages: List[BaseMessage]) -> Dict[str, int]:
+        prompt_tokens = sum(len(str(m.content)) // 4 for m in messages)
+        return {
+            "input_tokens": prompt_tokens,
+            "output_tokens": self.tokens_per_turn,
+            "total_tokens": prompt_tokens + self.tokens_per_turn,
+        }
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tool_call = self._next_tool_call(messages)
+        if tool_call:
+            message = AIMessage(content="", tool_calls=[tool_call])
+        else:
+            message = AIMessage(
+                content="".join(f"tok{i} " for i in range(self.tokens_per_turn)),
+                usage_metadata=self._usage(messages),
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ):
+        tool_call = self._next_tool_call(messages)
+        if tool_call:
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[{**tool_call, "args": f'{{"query": "{tool_call["args"]["query"]}"}}', "index": 0}],
+            ))
+            return
+
+        for i in range(self.tokens_per_turn):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"tok{i} "))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(messages)))
+
+
+def make_fake_tools(count: int = 2, latency: float = 0.0, result_bytes: int = 512) -> List[BaseTool]:
+    """Tools that sleep for ``latency`` seconds and return a fixed payload."""
+    payload = ("x" * result_bytes)
+
+    def _make(index: int) -> BaseTool:
+        async def run(query: str) -> str:
+            if latency:
+                await asyncio.sleep(latency)
+            return f"[fake_tool_{index}] {query}: {payload}"
+
+        return StructuredTool.from_function(
+            coroutine=run,
+            name=f"fake_tool_{index}",
+            description=f"Deterministic benchmark tool #{index}",
+        )
+
+    return [_make(i) for i in range(count)]
+
+
+@contextmanager
+def offline_executor(model: FakeStreamingChatModel, tools: List[BaseTool]) -> Iterator[None]:
+    """
+    Patch the executor's external boundaries for an offline run.
+
+    - AgentFactory.create_agent builds a real LangChain agent around ``model``
+    - MCP setup and tool validation are skipped
+    - Execution events are not persisted, and the summary query runs
+      against an empty in-memory SQLite table instead of PostgreSQL
+    """
+    from langchain.agents import create_agent
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from models.execution_event import ExecutionEvent
+
+    async def fake_create_agent(agent_config, *args, **kwargs):
+        agent = create_agent(model, tools, system_prompt=agent_config.get("system_prompt"))
+        return agent, tools, []
+
+    async def noop(*args, **kwargs):
+        return None
+
+    engine = create_engine("sqlite://")
+    ExecutionEvent.__table__.create(engine)
+
+    with ExitStack() as stack:
+        stack.enter_context(patch("core.agents.factory.AgentFactory.create_agent", new=fake_create_agent))
+        stack.enter_context(patch("services.mcp_manager.get_mcp_manager", new=noop))
+        stack.enter_context(patch("core.workflows.executor.SimpleWorkflowExecutor._validate_and_init_tools", new=noop))
+        stack.enter_context(patch(
+            "core.workflows.events.emitter.ExecutionEventCallbackHandler._persist_event_to_database", new=noop
+        ))
+        stack.enter_context(patch("db.database.SessionLocal", sessionmaker(bind=engine)))
+        yield
+    engine.dispose()
+
+
+__all__ = [
+    "FakeStreamingChatModel",
+    "make_fake_tools",
+    "offline_executor",
+]
@@ -0,0 +1,206 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Table size and read latency benchmark for FileVersion storage.
+
+Writes a synthetic file (1 MB by default) through a series of small
+agent-style edits (1,000 revisions by default) with the real
+services.file_version_store code, into a throwaway SQLite file, and reports
+for "full" storage and for keyframe + delta storage at each keyframe
+interval:
+
+- table size on disk
+- write throughput (versions/s, including delta encoding)
+- p50/p95 latency of reading a random version's full content
+
+Full storage keeps a snapshot per version, so only ``--full-sample``
+versions are written and its size is extrapolated per row.
+
+Usage (from backend/):
+    python -m benchmarks.file_versions --size-kb 1024 --revisions 1000 --intervals 10,20,50
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.harness import Stopwatch
+from benchmarks.rag import percentile
+
+logger = logging.getLogger(__name__)
+
+_WORDS = (
+    "def return value config result request handler session record index cache "
+    "update delete create query worker queue token stream buffer offset"
+).split()
+
+
+def make_revisions(size_kb: int, revisions: int, seed: int = 7):
+    """Yield the initial content and then ``revisions`` edited versions of it."""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < size_kb * 1024:
+        line = "    " + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 10))) + "\n"
+        lines.append(line)
+        size += len(line)
+    yield "".join(lines)
+
+    for i in range(revisions - 1):
+        # Mostly edits of a few lines, with the odd insert/delete of a block
+        at = rng.randrange(len(lines))
+        roll = rng.random()
+        if roll < 0.8:
+            for j in range(at, min(at + rng.randint(1, 3), len(lines))):
+                lines[j] = f"    {rng.choice(_WORDS)} = {i}  # revised\n"
+        elif roll < 0.9:
+            lines[at:at] = [f"    # added in revision {i}: {rng.choice(_WORDS)}\n" for _ in range(rng.randint(1, 20))]
+        else:
+            del lines[at:at + rng.randint(1, 20)]
+        yield "".join(lines)
+
+
+def _session(path: str):
+    from models import FileVersion  # registers the FK target tables too
+
+    engine = create_engine(f"sqlite:///{path}")
+    FileVersion.__table__.create(engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def bench_storage(
+    mode: str,
+    interval: int,
+    versions: List[str],
+    reads: int,
+    seed: int,
+    workdir: str
+) -> Dict[str, Any]:
+    """Write ``versions`` with one storage mode, then time random reads."""
+    from models import FileVersion
+    from services import file_version_store as store
+
+    path = os.path.join(workdir, f"{mode}_{interval}.db")
+    engine, db = _session(path)
+    try:
+        with patch.object(store, "FILE_VERSION_STORAGE", mode), \
+                patch.object(store, "FILE_VERSION_KEYFRAME_INTERVAL", interval):
+            previous = None
+            watch = Stopwatch()
+            for number, content in enumerate(versions, start=1):
+                storage = store.build_version_storage(
+                    db, 1, number, "create" if number == 1 else "replace", content,
+                    previous_content=previous
+                )
+                db.add(FileVersion(
+                    workspace_file_id=1,
+                    version_number=number,
+                    content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                    operation="create" if number == 1 else "replace",
+                    **storage
+                ))
+                db.commit()
+                previous = content
+            write_seconds = watch.elapsed
+
+        rng = random.Random(seed)
+        latencies = []
+        for _ in range(reads):
+            number = rng.randint(1, len(versions))
+            db.expunge_all()
+            watch = Stopwatch()
+            row = db.query(FileVersion).filter(
+                FileVersion.workspace_file_id == 1,
+                FileVersion.version_number == number
+            ).first()
+            content = store.get_version_content(db, row)
+            latencies.append(watch.ms)
+            if content != versions[number - 1]:
+                raise AssertionError(f"{mode}/{interval}: version {number} read back wrong")
+
+        db.execute(text("VACUUM"))
+        table_bytes = os.path.getsize(path)
+        return {
+            "mode": mode,
+            "interval": interval if mode == "delta" else None,
+            "versions_written": len(versions),
+            "table_bytes": table_bytes,
+            "versions_per_sec": len(versions) / write_seconds,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+        }
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def run(args) -> List[Dict[str, Any]]:
+    versions = list(make_revisions(args.size_kb, args.revisions, args.seed))
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        full = bench_storage("full", 1, versions[:args.full_sample], args.reads, args.seed, workdir)
+        full["table_bytes"] = full["table_bytes"] * args.revisions // full["versions_written"]
+        full["extrapolated"] = True
+        rows.append(full)
+        logger.warning(f"storage {full}")
+
+        for interval in args.intervals:
+            rows.append(bench_storage("delta", interval, versions, args.reads, args.seed, workdir))
+            logger.warning(f"storage {rows[-1]}")
+    return rows
+
+
+def format_rows(rows: List[Dict[str, Any]]) -> str:
+    lines = ["mode   interval  table MB  versions/s  p50 ms  p95 ms"]
+    lines += [
+        f"{r['mode']:<6} {r['interval'] or '-':>8}  {r['table_bytes'] / 1e6:>8.1f}{'*' if r.get('extrapolated') else ' '}"
+        f" {r['versions_per_sec']:>10.1f}  {r['p50_ms']:>6.2f}  {r['p95_ms']:>6.2f}"
+        for r in rows
+    ]
+    lines.append("* extrapolated from --full-sample versions")
+    return "\n".join(lines)
+
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="FileVersion storage size and read latency benchmark")
+    parser.add_argument("--size-kb", type=int, default=1024, help="Size of the synthetic file")
+    parser.add_argument("--revisions", type=int, default=1000, help="Versions to write")
+    parser.add_argument("--intervals", type=_ints, default=[20], help="Keyframe intervals to compare")
+    parser.add_argument("--full-sample", type=int, default=50, help="Versions written in full mode")
+    parser.add_argument("--reads", type=int, default=200, help="Random version reads to time")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = run(args)
+    print(json.dumps(rows, indent=2) if args.json else format_rows(rows))
+    return 0
+
+
+__all__ = [
+    "make_revisions",
+    "bench_storage",
+    "run",
+]
+
+
+if __name__ == "__main__":
+    exit(main())
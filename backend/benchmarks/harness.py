@@ -0,0 +1,130 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Result collection and baseline comparison for the benchmark suite.
+
+Each scenario returns a flat ``{metric: value}`` dict. Metric names carry
+their direction: ``*_per_sec`` is higher-is-better, everything else
+(``*_ms``, ``*_mb``) is lower-is-better.
+
+The baseline file keeps one result set per mode (``full`` / ``quick``), since
+``--quick`` sizes aren't comparable with full-size runs.
+"""
+
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Relative change tolerated before a metric is reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Stopwatch:
+    """Monotonic timer; ``elapsed`` / ``ms`` read the time since start."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def ms(self) -> float:
+        return self.elapsed * 1000
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def load_baseline(path: Path = BASELINE_PATH, mode: str = "full") -> Dict[str, Dict[str, float]]:
+    """Baseline results recorded for ``mode``; empty if there are none."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get(mode, {})
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path = BASELINE_PATH, mode: str = "full"):
+    """Store ``results`` as the baseline for ``mode``, keeping the other modes."""
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+    baselines[mode] = results
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> List[Dict[str, Any]]:
+    """
+    Compare results against a baseline.
+
+    Returns:
+        One row per metric present in both, with the relative change
+        (positive = better) and whether it is outside the tolerance.
+    """
+    rows = []
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(scenario, {}).get(metric)
+            if not base:
+                continue
+            change = (value - base) / base
+            if not higher_is_better(metric):
+                change = -change
+            rows.append({
+                "scenario": scenario,
+                "metric": metric,
+                "baseline": base,
+                "value": value,
+                "change": change,
+                "regressed": change < -tolerance,
+            })
+    return rows
+
+
+def format_report(
+    results: Dict[str, Dict[str, float]],
+    comparison: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """Plain-text table of results, with baseline deltas when given."""
+    deltas = {(r["scenario"], r["metric"]): r for r in comparison or []}
+    lines = []
+    for scenario, metrics in results.items():
+        lines.append(scenario)
+        for metric, value in metrics.items():
+            line = f"  {metric:<28} {value:>14,.2f}"
+            row = deltas.get((scenario, metric))
+            if row:
+                flag = "  REGRESSED" if row["regressed"] else ""
+                line += f"   {row['change']:+7.1%} vs {row['baseline']:,.2f}{flag}"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+__all__ = [
+    "BASELINE_PATH",
+    "DEFAULT_TOLERANCE",
+    "Stopwatch",
+    "peak_rss_mb",
+    "load_baseline",
+    "save_baseline",
+    "compare",
+    "format_report",
+]
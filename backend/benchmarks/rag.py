@@ -0,0 +1,380 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Retrieval quality and latency benchmark for the RAG stack.
+
+Builds a synthetic, labeled corpus and runs it through the real
+ContextDocumentIndexer and ContextRetriever with a deterministic hashing
+embedding model (no model downloads, no API calls). It reports:
+
+- indexing throughput of ContextDocumentIndexer.index_document per chunk size
+- p50/p95/p99 latency of ContextRetriever.retrieve_context
+- recall@k against the labeled queries
+
+swept over HNSW m / ef_search, chunk size and HyDE on/off. The winning
+settings map onto PGVECTOR_HNSW_* in .env.
+
+Requires a PostgreSQL database with pgvector (DATABASE_URL) and the
+llama-index extras. Rows and tables it creates are removed afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.rag --docs 200 --queries 100 \\
+        --hnsw-m 8,16,32 --ef-search 20,40,100 --chunk-sizes 512,1024 --hyde off,on
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import math
+import random
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from unittest.mock import patch
+
+from benchmarks.harness import Stopwatch
+
+logger = logging.getLogger(__name__)
+
+EMBED_DIM = 384
+FILE_PATTERN = re.compile(r"File: (doc_\d+)\.txt")
+
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "qu", "ba", "do", "fi", "gu", "ha", "jo"]
+_FILLER = (
+    "the service stores records and returns results after validating the request "
+    "with configuration loaded from the environment while workers process queued jobs"
+).split()
+
+
+# =============================================================================
+# Synthetic corpus (pure Python, deterministic for a given seed)
+# =============================================================================
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 4)))
+
+
+def make_corpus(
+    num_docs: int = 200,
+    num_queries: int = 100,
+    paragraphs: int = 6,
+    seed: int = 7
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate documents that each own a few unique terms, and queries
+    labeled with the document they were drawn from.
+
+    Returns:
+        {"docs": [{"name", "text", "terms"}], "queries": [{"text", "doc"}]}
+    """
+    rng = random.Random(seed)
+    vocabulary = set()
+    docs = []
+    for i in range(num_docs):
+        terms = []
+        while len(terms) < 5:
+            word = _word(rng)
+            if word not in vocabulary:
+                vocabulary.add(word)
+                terms.append(word)
+
+        body = []
+        for _ in range(paragraphs):
+            sentences = []
+            for _ in range(4):
+                words = rng.sample(_FILLER, 8) + rng.sample(terms, 2)
+                rng.shuffle(words)
+                sentences.append(" ".join(words).capitalize() + ".")
+            body.append(" ".join(sentences))
+        docs.append({"name": f"doc_{i:05d}", "text": "\n\n".join(body), "terms": terms})
+
+    queries = []
+    for _ in range(num_queries):
+        doc = rng.choice(docs)
+        a, b, c = rng.sample(doc["terms"], 3)
+        queries.append({"text": f"Where are {a} and {b} records validated for {c}?", "doc": doc["name"]})
+
+    return {"docs": docs, "queries": queries}
+
+
+def hash_embedding(text: str, dim: int = EMBED_DIM) -> List[float]:
+    """Signed feature hashing of lowercase word tokens, L2-normalized."""
+    vector = [0.0] * dim
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def percentile(samples: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def retrieved_docs(context_package: Dict[str, Any]) -> List[str]:
+    """Document names of the chunks in a retrieve_context() result, in rank order."""
+    names = []
+    for chunk in context_package.get("components", {}).get("code_chunks", []):
+        match = FILE_PATTERN.search(chunk["content"])
+        if match and match.group(1) not in names:
+            names.append(match.group(1))
+    return names
+
+
+# =============================================================================
+# LlamaIndex-backed runs
+# =============================================================================
+
+def _hashing_embed_model():
+    from llama_index.core.embeddings import BaseEmbedding
+
+    class HashingEmbedding(BaseEmbedding):
+        """Deterministic local embedding for benchmarks."""
+
+        def _get_text_embedding(self, text: str) -> List[float]:
+            return hash_embedding(text)
+
+        def _get_query_embedding(self, query: str) -> List[float]:
+            return hash_embedding(query)
+
+        async def _aget_query_embedding(self, query: str) -> List[float]:
+            return hash_embedding(query)
+
+    return HashingEmbedding(model_name="hashing-benchmark")
+
+
+def _hnsw(m: int, ef_search: int) -> Dict[str, int]:
+    from services import llama_config
+    return {"hnsw_m": m, "hnsw_ef_construction": llama_config.PGVECTOR_HNSW_EF_CONSTRUCTION, "hnsw_ef_search": ef_search}
+
+
+async def bench_indexing(docs: List[Dict[str, Any]], workdir: Path, chunk_size: int) -> Dict[str, float]:
+    """Index every document through ContextDocumentIndexer.index_document."""
+    from sqlalchemy import delete
+
+    from db.database import AsyncSessionLocal
+    from models.core import ContextDocument, DocumentType
+    from services.context_document_indexer import ContextDocumentIndexer
+
+    async with AsyncSessionLocal() as db:
+        rows = []
+        for doc in docs:
+            path = workdir / f"{doc['name']}.txt"
+            rows.append(ContextDocument(
+                filename=path.name, original_filename=path.name, file_path=str(path),
+                file_size=path.stat().st_size, mime_type="text/plain", document_type=DocumentType.TEXT,
+                description="rag benchmark",
+            ))
+        db.add_all(rows)
+        await db.commit()
+        ids = [row.id for row in rows]
+
+    indexer = ContextDocumentIndexer()
+    chunks = 0
+    clock = Stopwatch()
+    try:
+        for doc_id, doc in zip(ids, docs):
+            result = await indexer.index_document(
+                doc_id, str(workdir / f"{doc['name']}.txt"),
+                chunk_size=chunk_size, chunk_overlap=chunk_size // 5
+            )
+            chunks += result["chunks_created"]
+        elapsed = clock.elapsed
+    finally:
+        for doc_id in ids:
+            await indexer.delete_document_embeddings(doc_id)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(ContextDocument).where(ContextDocument.id.in_(ids)))
+            await db.commit()
+
+    return {"docs_per_sec": len(docs) / elapsed, "chunks_per_sec": chunks / elapsed, "chunks": chunks}
+
+
+async def _create_project_index(docs: List[Dict[str, Any]], chunk_size: int, hnsw_m: int) -> int:
+    """Create a READY project and fill its vector table with the chunked corpus."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from llama_index.core.schema import TextNode
+
+    from db.database import AsyncSessionLocal
+    from models.core import IndexingStatus, Project
+    from services.llama_config import get_vector_store
+
+    async with AsyncSessionLocal() as db:
+        project = Project(
+            name=f"rag-benchmark-{chunk_size}-{hnsw_m}", description="rag benchmark",
+            indexing_status=IndexingStatus.READY, embedding_dimension=EMBED_DIM,
+        )
+        db.add(project)
+        await db.commit()
+        project_id = project.id
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_size // 5, separators=["\n\n", "\n", ". ", " ", ""]
+    )
+    nodes = []
+    for doc in docs:
+        for i, chunk in enumerate(splitter.split_text(doc["text"])):
+            nodes.append(TextNode(
+                id_=f"{doc['name']}_{i}", text=chunk, embedding=hash_embedding(chunk),
+                metadata={"relative_path": f"{doc['name']}.txt", "chunk_type": "text", "chunk_name": str(i)},
+            ))
+
+    vector_store = get_vector_store(project_id, embed_dim=EMBED_DIM, hnsw_kwargs=_hnsw(hnsw_m, 40))
+    vector_store.add(nodes)
+    return project_id
+
+
+async def _drop_project_index(project_id: int):
+    from sqlalchemy import delete, text
+
+    from db.database import AsyncSessionLocal
+    from models.core import Project
+
+    async with AsyncSessionLocal() as db:
+        # PGVectorStore prefixes its tables with "data_"
+        for table in (f"data_project_index_{project_id}", f"data_data_project_index_{project_id}"):
+            await db.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+        await db.execute(delete(Project).where(Project.id == project_id))
+        await db.commit()
+
+
+async def bench_retrieval(
+    project_id: int,
+    queries: List[Dict[str, Any]],
+    k: int,
+    hnsw_m: int,
+    ef_search: int,
+    use_hyde: bool
+) -> Dict[str, float]:
+    """Run every labeled query through ContextRetriever.retrieve_context."""
+    from services import llama_config
+    from services.context_retrieval import ContextRetriever
+
+    retriever = ContextRetriever()
+    latencies, hits = [], 0
+    with patch.object(llama_config, "PGVECTOR_HNSW_M", hnsw_m), \
+            patch.object(llama_config, "PGVECTOR_HNSW_EF_SEARCH", ef_search):
+        for query in queries:
+            clock = Stopwatch()
+            package = await retriever.retrieve_context(
+                project_id, query["text"], similarity_top_k=k, include_dna_in_context=False, use_hyde=use_hyde
+            )
+            latencies.append(clock.ms)
+            hits += query["doc"] in retrieved_docs(package)[:k]
+
+    return {
+        "recall_at_k": hits / len(queries),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    from llama_index.core import Settings
+    from llama_index.core.llms import MockLLM
+
+    from services import llama_config
+
+    corpus = make_corpus(args.docs, args.queries, seed=args.seed)
+
+    # Deterministic models; mark LlamaIndex initialized so nothing is downloaded
+    Settings.embed_model = _hashing_embed_model()
+    Settings.llm = MockLLM()
+    rows = []
+    with patch.object(llama_config, "_initialized", True), \
+            patch.object(llama_config, "_multimodal_enabled", False), \
+            tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for doc in corpus["docs"]:
+            (workdir / f"{doc['name']}.txt").write_text(doc["text"])
+
+        for chunk_size in args.chunk_sizes:
+            indexing = await bench_indexing(corpus["docs"], workdir, chunk_size)
+            rows.append({"phase": "index", "chunk_size": chunk_size, **indexing})
+            logger.warning(f"index chunk_size={chunk_size}: {indexing['docs_per_sec']:.1f} docs/s")
+
+            for hnsw_m in args.hnsw_m:
+                project_id = await _create_project_index(corpus["docs"], chunk_size, hnsw_m)
+                try:
+                    for ef_search, use_hyde in itertools.product(args.ef_search, args.hyde):
+                        metrics = await bench_retrieval(
+                            project_id, corpus["queries"], args.k, hnsw_m, ef_search, use_hyde
+                        )
+                        rows.append({
+                            "phase": "retrieve", "chunk_size": chunk_size, "hnsw_m": hnsw_m,
+                            "ef_search": ef_search, "hyde": use_hyde, **metrics,
+                        })
+                        logger.warning(f"retrieve {rows[-1]}")
+                finally:
+                    await _drop_project_index(project_id)
+    return rows
+
+
+def format_rows(rows: List[Dict[str, Any]], k: int) -> str:
+    lines = ["chunk  docs/s  chunks/s"]
+    lines += [f"{r['chunk_size']:>5}  {r['docs_per_sec']:>6.1f}  {r['chunks_per_sec']:>8.1f}"
+              for r in rows if r["phase"] == "index"]
+    lines += ["", f"chunk  m   ef   hyde  recall@{k}  p50 ms  p95 ms  p99 ms"]
+    lines += [
+        f"{r['chunk_size']:>5}  {r['hnsw_m']:<3} {r['ef_search']:<4} {'on ' if r['hyde'] else 'off'}   "
+        f"{r['recall_at_k']:>8.3f}  {r['p50_ms']:>6.1f}  {r['p95_ms']:>6.1f}  {r['p99_ms']:>6.1f}"
+        for r in rows if r["phase"] == "retrieve"
+    ]
+    return "\n".join(lines)
+
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _switches(value: str) -> List[bool]:
+    return [v.strip().lower() in ("on", "true", "1") for v in value.split(",") if v]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="RAG retrieval quality and latency benchmark")
+    parser.add_argument("--docs", type=int, default=200, help="Synthetic documents to index")
+    parser.add_argument("--queries", type=int, default=100, help="Labeled queries to run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--k", type=int, default=5, help="similarity_top_k and recall cutoff")
+    parser.add_argument("--hnsw-m", type=_ints, default=[16])
+    parser.add_argument("--ef-search", type=_ints, default=[40])
+    parser.add_argument("--chunk-sizes", type=_ints, default=[1024])
+    parser.add_argument("--hyde", type=_switches, default=[False], help="Comma list of off/on")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = asyncio.run(run(args))
+    print(json.dumps(rows, indent=2) if args.json else format_rows(rows, args.k))
+    return 0
+
+
+__all__ = [
+    "make_corpus",
+    "hash_embedding",
+    "percentile",
+    "retrieved_docs",
+    "bench_indexing",
+    "bench_retrieval",
+    "run",
+]
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,211 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark scenarios for the workflow execution hot path.
+
+- event_bus:  EventBus.publish fan-out to concurrently draining subscribers
+- emitter:    ExecutionEventCallbackHandler token/tool events onto the bus
+- executor:   SimpleWorkflowExecutor.execute_workflow over a chain of fake
+              agent nodes, several workflows at once
+
+Every scenario takes ``quick`` (smaller sizes for CI smoke runs) and returns
+a flat metrics dict (see harness.py for naming).
+"""
+
+import asyncio
+import statistics
+import uuid
+from typing import Any, Callable, Dict
+
+from benchmarks.harness import Stopwatch, peak_rss_mb
+
+
+async def _drain(queue: asyncio.Queue, counts: Dict[str, Any], stop: asyncio.Event, clock: Stopwatch):
+    """Consume a subscriber queue, counting events and noting the first token."""
+    while not (stop.is_set() and queue.empty()):
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=0.05)
+        except asyncio.TimeoutError:
+            continue
+        counts["events"] += 1
+        if counts.get("first_token_ms") is None and event.get("type") == "on_chat_model_stream":
+            counts["first_token_ms"] = clock.ms
+
+
+async def bench_event_bus(quick: bool = False) -> Dict[str, float]:
+    from services.event_bus import EventBus
+
+    events = 5_000 if quick else 50_000
+    subscribers = 4
+    bus = EventBus()
+    channel = "workflow:bench"
+    queues = [await bus.subscribe(channel, maxsize=events) for _ in range(subscribers)]
+    stop = asyncio.Event()
+    counts = [{"events": 0} for _ in queues]
+
+    clock = Stopwatch()
+    consumers = [asyncio.create_task(_drain(q, c, stop, clock)) for q, c in zip(queues, counts)]
+    publish_clock = Stopwatch()
+    for i in range(events):
+        await bus.publish(channel, {"type": "on_chat_model_stream", "data": {"content": f"tok{i} "}})
+    publish_elapsed = publish_clock.elapsed
+    stop.set()
+    await asyncio.gather(*consumers)
+
+    delivered = sum(c["events"] for c in counts)
+    return {
+        "events_per_sec": events / publish_elapsed,
+        "deliveries_per_sec": delivered / clock.elapsed,
+        "publish_us": publish_elapsed / events * 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def bench_emitter(quick: bool = False) -> Dict[str, float]:
+    from langchain_core.messages import AIMessageChunk
+
+    from benchmarks.fakes import offline_executor
+    from core.workflows.events.emitter import ExecutionEventCallbackHandler
+    from services.event_bus import get_event_bus, reset_event_bus
+
+    tokens = 2_000 if quick else 20_000
+    tool_calls = 100 if quick else 1_000
+
+    reset_event_bus()
+    with offline_executor(model=None, tools=[]):
+        handler = ExecutionEventCallbackHandler(
+            project_id=1, task_id=1, workflow_id=1, node_metadata={"agent-0": {"label": "Agent 0"}}
+        )
+        queue = await get_event_bus().subscribe("workflow:1", maxsize=tokens + 4 * tool_calls)
+        stop = asyncio.Event()
+        counts = {"events": 0}
+        clock = Stopwatch()
+        consumer = asyncio.create_task(_drain(queue, counts, stop, clock))
+
+        parent = uuid.uuid4()
+        await handler.on_chain_start({"name": "agent-0"}, {}, run_id=parent, metadata={"langgraph_node": "agent-0"})
+
+        stream_clock = Stopwatch()
+        llm_run = uuid.uuid4()
+        for i in range(tokens):
+            await handler.on_chat_model_stream(AIMessageChunk(content=f"tok{i} "), run_id=llm_run, parent_run_id=parent)
+        stream_elapsed = stream_clock.elapsed
+
+        tool_clock = Stopwatch()
+        for i in range(tool_calls):
+            run_id = uuid.uuid4()
+            await handler.on_tool_start(
+                {"name": "fake_tool_0"}, f'{{"query": "step {i}"}}', run_id=run_id, parent_run_id=parent
+            )
+            await handler.on_tool_end(f"result {i}", run_id=run_id, parent_run_id=parent, name="fake_tool_0")
+        tool_elapsed = tool_clock.elapsed
+
+        await handler.flush_pending_persists()
+        stop.set()
+        await consumer
+
+    return {
+        "stream_events_per_sec": tokens / stream_elapsed,
+        "tool_calls_per_sec": tool_calls / tool_elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _chain_workflow(workflow_id: int, nodes: int):
+    from models.workflow import WorkflowProfile
+
+    node_ids = [f"agent-{i}" for i in range(nodes)]
+    return WorkflowProfile(
+        id=workflow_id,
+        name=f"bench-chain-{workflow_id}",
+        configuration={
+            "nodes": [
+                {"id": node_id, "type": "default",
+                 "data": {"agentType": "researcher", "label": f"Agent {i}"},
+                 "config": {"model": "gpt-5.4-mini", "system_prompt": "You are a benchmark agent."}}
+                for i, node_id in enumerate(node_ids)
+            ],
+            "edges": [
+                {"id": f"e{i}", "source": source, "target": target}
+                for i, (source, target) in enumerate(zip(node_ids, node_ids[1:]))
+            ],
+        },
+        debug_mode=False,
+    )
+
+
+async def bench_executor(quick: bool = False) -> Dict[str, float]:
+    from benchmarks.fakes import FakeStreamingChatModel, make_fake_tools, offline_executor
+    from core.workflows.executor import SimpleWorkflowExecutor
+    from services.event_bus import get_event_bus, reset_event_bus
+
+    nodes = 3 if quick else 6
+    workflows = 2 if quick else 4
+    tokens = 100 if quick else 300
+    tool_calls = 2
+    tool_latency = 0.005
+    token_delay = 0.0
+
+    model = FakeStreamingChatModel(tokens_per_turn=tokens, tool_calls_per_run=tool_calls, token_delay=token_delay)
+    tools = make_fake_tools(count=2, latency=tool_latency)
+
+    reset_event_bus()
+    bus = get_event_bus()
+    with offline_executor(model, tools):
+        stop = asyncio.Event()
+        counts = [{"events": 0} for _ in range(workflows)]
+        queues = [await bus.subscribe(f"workflow:{9000 + i}", maxsize=100_000) for i in range(workflows)]
+
+        clock = Stopwatch()
+        consumers = [asyncio.create_task(_drain(q, c, stop, clock)) for q, c in zip(queues, counts)]
+        results = await asyncio.gather(*[
+            SimpleWorkflowExecutor().execute_workflow(
+                _chain_workflow(9000 + i, nodes), {"query": "Benchmark the executor."},
+                project_id=1, task_id=9000 + i
+            )
+            for i in range(workflows)
+        ])
+        wall = clock.elapsed
+        stop.set()
+        await asyncio.gather(*consumers)
+
+    failed = [r.get("error") for r in results if r.get("error")]
+    if failed:
+        raise RuntimeError(f"Executor benchmark workflows failed: {failed[0]}")
+
+    # Time the fakes spend sleeping along one workflow's chain; the rest of
+    # the wall time is executor overhead, shared by every node run
+    scripted = nodes * (tool_calls * tool_latency + tokens * token_delay)
+    events = sum(c["events"] for c in counts)
+    first_tokens = [c["first_token_ms"] for c in counts if c.get("first_token_ms") is not None]
+    return {
+        "wall_ms": wall * 1000,
+        "events_per_sec": events / wall,
+        "node_overhead_ms": (wall - scripted) / (nodes * workflows) * 1000,
+        "time_to_first_token_ms": statistics.median(first_tokens) if first_tokens else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+SCENARIOS: Dict[str, Callable[..., Any]] = {
+    "event_bus": bench_event_bus,
+    "emitter": bench_emitter,
+    "executor": bench_executor,
+}
+
+
+def run_scenario(name: str, quick: bool = False) -> Dict[str, float]:
+    metrics = asyncio.run(SCENARIOS[name](quick=quick))
+    return {key: round(float(value), 3) for key, value in metrics.items()}
+
+
+__all__ = [
+    "SCENARIOS",
+    "run_scenario",
+    "bench_event_bus",
+    "bench_emitter",
+    "bench_executor",
+]
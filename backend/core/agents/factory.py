@@ -39,6 +39,7 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from tools.native_tools import load_native_tools
 from core.agents.memory import AgentMemorySystem
 from config import settings
+from core.workflows.events.spans import traced
 
 try:
     from langfuse.callback import CallbackHandler
@@ -277,6 +278,7 @@ class AgentFactory:
         return errors
 
     @staticmethod
+    @traced("agent_factory.create_agent", kind="agent_build")
     async def create_agent(
         agent_config: Dict[str, Any],
         project_id: int,
@@ -1134,6 +1136,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
             return context
 
     @staticmethod
+    @traced("agent_factory.create_llm", kind="agent_build")
     async def _create_llm_with_fallbacks(
         primary_model: str,
         fallback_models: Sequence[str],
@@ -1427,6 +1430,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
 
 
     @staticmethod
+    @traced("agent_factory.load_native_tools", kind="tool_load")
     async def _load_native_tools(
         native_tool_names: List[str],
         workspace_context: Optional[Dict[str, Any]] = None,
@@ -1537,6 +1541,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
         return wrapped_tools
 
     @staticmethod
+    @traced("agent_factory.load_cli_tools", kind="tool_load")
     async def _load_cli_tools(cli_tool_names: List[str]) -> List[BaseTool]:
         """
         Helper to load CLI-based tools (e.g., Jira CLI tools).
@@ -1569,6 +1574,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
             return []
 
     @staticmethod
+    @traced("agent_factory.load_custom_tools", kind="tool_load")
     async def _load_custom_tools(custom_tool_ids: List[str], project_id: int) -> List[BaseTool]:
         """
         Load user-defined custom tools from database.
@@ -1660,6 +1666,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
             return []
 
     @staticmethod
+    @traced("agent_factory.load_memory_tools", kind="tool_load")
     async def _load_memory_tools(vector_store, project_id: int, task_id: int) -> List[BaseTool]:
         """Helper to load and validate memory tools."""
         if vector_store is None:
@@ -1683,6 +1690,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
             return []
 
     @staticmethod
+    @traced("agent_factory.load_rag_tools", kind="tool_load")
     async def _load_rag_tools(vector_store, project_id: int) -> List[BaseTool]:
         """Helper to load RAG (codebase search) tools using LlamaIndex."""
         try:
@@ -1698,6 +1706,7 @@ You have been equipped with the following tools: {', '.join(tool_names)}
             return []
 
     @staticmethod
+    @traced("agent_factory.setup_middleware", kind="agent_build")
     async def _setup_middleware(
         middleware_list: List[Any],
         enable_default_middleware: bool,
@@ -0,0 +1,146 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Content-addressed on-disk cache for generated export packages.
+
+Exports are keyed by a hash of everything that affects their bytes (workflow
+configuration, export options, generator version), so an unchanged workflow
+is never regenerated: repeated downloads stream the cached archive straight
+from disk.
+
+Writers stage into a temp file and atomically rename on commit, so a
+half-written archive is never served.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "./data/exports/workflows"
+DEFAULT_MAX_ENTRIES = 200
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def content_key(payload: Any) -> str:
+    """Stable SHA-256 over a JSON-serializable payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ExportCacheWriter:
+    """Staging file for a cache entry; call commit() once fully written."""
+
+    def __init__(self, cache: "ExportCache", key: str):
+        self._cache = cache
+        self._key = key
+        fd, self._tmp_path = tempfile.mkstemp(dir=cache.cache_dir, suffix=".partial")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def commit(self) -> Path:
+        self._file.close()
+        path = self._cache.path_for(self._key)
+        os.replace(self._tmp_path, path)
+        self._cache.prune()
+        return path
+
+    def abort(self):
+        try:
+            self._file.close()
+        finally:
+            try:
+                os.unlink(self._tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+class ExportCache:
+    """
+    Directory of ``{key}.zip`` files, pruned least-recently-used.
+
+    Usage:
+        cache = get_export_cache()
+        if cache.has(key):
+            async for chunk in cache.stream(key):
+                ...
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.zip"
+
+    def has(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached archive path (and mark it recently used), or None."""
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return path
+
+    def writer(self, key: str) -> ExportCacheWriter:
+        return ExportCacheWriter(self, key)
+
+    async def stream(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yield a cached archive in chunks without loading it into memory."""
+        path = self.get(key)
+        if path is None:
+            raise KeyError(key)
+        async with aiofiles.open(path, "rb") as f:
+            while True:
+                chunk = await f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def prune(self):
+        """Drop least-recently-used entries beyond max_entries."""
+        try:
+            entries = sorted(self.cache_dir.glob("*.zip"), key=lambda p: p.stat().st_mtime)
+        except OSError:
+            return
+        for path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.zip"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+_export_cache: Optional[ExportCache] = None
+
+
+def get_export_cache() -> ExportCache:
+    """Get the global export cache instance."""
+    global _export_cache
+    if _export_cache is None:
+        _export_cache = ExportCache()
+    return _export_cache
@@ -11,7 +11,7 @@ Generates custom tool implementations defined by users.
 
 import logging
 from textwrap import dedent
-from typing import Any, Dict, Set
+from typing import Any, Dict, List, Set
 
 logger = logging.getLogger(__name__)
 
@@ -381,6 +381,29 @@ class CustomToolGenerators:
         else:
             return CustomToolGenerators.generate_default_tool(safe_name, name, description)
 
+    @staticmethod
+    def custom_tools_fingerprint(used_custom_tools: Set[str]) -> List[List[str]]:
+        """
+        Return [tool_id, updated_at] pairs for the used custom tools.
+
+        Part of the export cache key, so editing a custom tool invalidates
+        cached packages that embed it.
+        """
+        if not used_custom_tools:
+            return []
+
+        from db.database import SessionLocal
+        from models.custom_tool import CustomTool
+
+        db = SessionLocal()
+        try:
+            rows = db.query(CustomTool.tool_id, CustomTool.updated_at).filter(
+                CustomTool.tool_id.in_(list(used_custom_tools))
+            ).all()
+        finally:
+            db.close()
+        return sorted([tool_id, updated_at.isoformat() if updated_at else ""] for tool_id, updated_at in rows)
+
     @staticmethod
     async def generate_custom_tools_module(
         used_custom_tools: Set[str],
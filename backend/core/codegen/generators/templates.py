@@ -10,7 +10,6 @@ Generates static template files like README, requirements, settings, etc.
 """
 
 import logging
-from datetime import datetime
 from textwrap import dedent
 from typing import Any, Dict, List, Set
 
@@ -81,7 +80,7 @@ class TemplateGenerators:
         return dedent(f'''
             # {workflow_name}
 
-            Exported from LangConfig on {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC.
+            Exported from LangConfig.
 
             ## Setup
 
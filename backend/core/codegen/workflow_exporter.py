@@ -12,10 +12,11 @@ that can be dropped into any repository and run immediately.
 Uses LangChain v1.1 / LangGraph v1.x / DeepAgents v2.x APIs.
 """
 
-import io
+import asyncio
 import logging
+import time
 import zipfile
-from typing import Any, Dict, Set
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 
 from .generators import (
     NodeGenerators,
@@ -29,9 +30,16 @@ from .generators import (
     CONFIGURABLE_AVAILABLE,
 )
 from .generators.nodes_configurable import ConfigurableNodeGenerators
+from .export_cache import ExportCache, content_key, get_export_cache
 
 logger = logging.getLogger(__name__)
 
+# Bump when generator output changes so cached packages are regenerated
+EXPORT_FORMAT_VERSION = 1
+
+# Fixed entry timestamp keeps archives byte-identical for identical inputs
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
 
 class ExecutableWorkflowExporter:
     """
@@ -122,7 +130,6 @@ class ExecutableWorkflowExporter:
             )
             if model:
                 self._used_models.add(model)
-                logger.info(f"Detected model: {model}")
 
             # Detect native tools
             native_tools = node_config.get("native_tools", [])
@@ -136,7 +143,7 @@ class ExecutableWorkflowExporter:
             if node_config.get("use_deepagents") or node_data.get("subagents"):
                 self._has_deepagents = True
 
-        logger.info(f"Workflow analysis: models={self._used_models}, native_tools={self._used_native_tools}")
+        logger.debug(f"Workflow analysis: models={self._used_models}, native_tools={self._used_native_tools}")
 
     def _sanitize_name(self, name: str) -> str:
         """Sanitize name for filesystem and Python identifiers."""
@@ -144,35 +151,16 @@ class ExecutableWorkflowExporter:
         sanitized = "".join(c if c.isalnum() or c == "_" else "" for c in sanitized)
         return sanitized or "workflow"
 
-    async def export_to_zip(self) -> bytes:
+    def _generator_jobs(self) -> List[Tuple[str, Callable[[], Dict[str, str]]]]:
         """
-        Export workflow as a ZIP file containing all necessary files.
+        Independent file generators, each producing a {path: content} dict.
 
-        Returns:
-            ZIP file as bytes
+        Jobs share no state, so they run concurrently; their entries are
+        streamed into the archive in job order as soon as each job and all
+        earlier ones have finished.
         """
-        logger.info(f"Exporting workflow {self.workflow_id}: {self.workflow_name}")
-        logger.info(f"Workflow has {len(self.nodes)} nodes, {len(self.edges)} edges")
-
-        # Debug: Log raw node structure to understand data format
-        for i, node in enumerate(self.nodes[:3]):  # First 3 nodes
-            logger.info(f"[EXPORT DEBUG] Node {i}: {node.get('id')}")
-            logger.info(f"[EXPORT DEBUG]   Top-level keys: {list(node.keys())}")
-            top_config = node.get("config", {})
-            logger.info(f"[EXPORT DEBUG]   node.config: {top_config}")
-            logger.info(f"[EXPORT DEBUG]   node.config.model: {top_config.get('model')}")
-            logger.info(f"[EXPORT DEBUG]   node.config.system_prompt: {top_config.get('system_prompt', '')[:50]}...")
-
-        # Create in-memory ZIP file
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            # Sanitize workflow name for folder
-            safe_name = self._sanitize_name(self.workflow_name)
-            base_path = f"workflow_{safe_name}_{self.workflow_id}"
-
-            # Generate and add all files using generators
-            files = {
+        def templates() -> Dict[str, str]:
+            return {
                 "README.md": TemplateGenerators.generate_readme(
                     self.workflow_name,
                     self.nodes,
@@ -202,69 +190,215 @@ class ExecutableWorkflowExporter:
                     self._sanitize_name
                 ),
                 "workflow/state.py": TemplateGenerators.generate_state_module(),
-                "workflow/nodes.py": (
-                    ConfigurableNodeGenerators.generate_nodes_module(
-                        self.nodes,
-                        self._used_models,
-                        self._sanitize_name
-                    ) if self.export_mode == "configurable" else
-                    NodeGenerators.generate_nodes_module(
-                        self.nodes,
-                        self._used_models,
-                        self._sanitize_name
-                    )
-                ),
+                "agents/__init__.py": TemplateGenerators.generate_agents_init(),
+                "agents/factory.py": TemplateGenerators.generate_agents_module(),
+                "config/__init__.py": "",
+                "config/settings.py": TemplateGenerators.generate_settings_module(),
+            }
+
+        def nodes() -> Dict[str, str]:
+            generator = (
+                ConfigurableNodeGenerators if self.export_mode == "configurable" else NodeGenerators
+            )
+            return {
+                "workflow/nodes.py": generator.generate_nodes_module(
+                    self.nodes,
+                    self._used_models,
+                    self._sanitize_name
+                )
+            }
+
+        def routing() -> Dict[str, str]:
+            return {
                 "workflow/routing.py": RoutingGenerators.generate_routing_module(
                     self.nodes,
                     self._sanitize_name
-                ),
-                "agents/__init__.py": TemplateGenerators.generate_agents_init(),
-                "agents/factory.py": TemplateGenerators.generate_agents_module(),
+                )
+            }
+
+        def tools() -> Dict[str, str]:
+            return {
                 "tools/__init__.py": ToolGenerators.generate_tools_init(),
                 "tools/native.py": ToolGenerators.generate_native_tools_module(
                     self._used_native_tools
                 ),
-                "tools/custom.py": await CustomToolGenerators.generate_custom_tools_module(
+            }
+
+        def custom_tools() -> Dict[str, str]:
+            # Fetches tool definitions with a sync DB session; runs on a worker thread
+            return {
+                "tools/custom.py": asyncio.run(CustomToolGenerators.generate_custom_tools_module(
                     self._used_custom_tools,
                     self._sanitize_name
-                ),
-                "config/__init__.py": "",
-                "config/settings.py": TemplateGenerators.generate_settings_module(),
+                ))
             }
 
-            # Add Streamlit UI if enabled
-            if self.include_ui:
-                if self.export_mode == "configurable" and CONFIGURABLE_AVAILABLE:
-                    files["streamlit_app.py"] = ConfigurableStreamlitGenerator.generate(
-                        self.workflow_name,
-                        self.nodes,
-                        self.edges
-                    )
-                elif self.export_mode == "configurable":
+        def streamlit() -> Dict[str, str]:
+            if self.export_mode == "configurable" and CONFIGURABLE_AVAILABLE:
+                content = ConfigurableStreamlitGenerator.generate(
+                    self.workflow_name,
+                    self.nodes,
+                    self.edges
+                )
+            else:
+                if self.export_mode == "configurable":
                     # Fallback if configurable not available
                     logger.warning("ConfigurableStreamlitGenerator not available, using standard")
-                    files["streamlit_app.py"] = StreamlitAppGenerator.generate_streamlit_app(
-                        self.workflow_name,
-                        self.nodes,
-                        self.edges
-                    )
-                else:
-                    files["streamlit_app.py"] = StreamlitAppGenerator.generate_streamlit_app(
-                        self.workflow_name,
-                        self.nodes,
-                        self.edges
-                    )
-
-            # Add FastAPI server if enabled
-            if self.include_api:
-                files["api_server.py"] = ApiServerGenerator.generate_api_server(
+                content = StreamlitAppGenerator.generate_streamlit_app(
+                    self.workflow_name,
+                    self.nodes,
+                    self.edges
+                )
+            return {"streamlit_app.py": content}
+
+        def api_server() -> Dict[str, str]:
+            return {
+                "api_server.py": ApiServerGenerator.generate_api_server(
                     self.workflow_name,
                     self.nodes,
                     self.edges
                 )
+            }
+
+        jobs = [
+            ("templates", templates),
+            ("nodes", nodes),
+            ("routing", routing),
+            ("tools", tools),
+            ("custom_tools", custom_tools),
+        ]
+        # Add Streamlit UI / FastAPI server if enabled
+        if self.include_ui:
+            jobs.append(("streamlit", streamlit))
+        if self.include_api:
+            jobs.append(("api_server", api_server))
+        return jobs
+
+    async def export_key(self) -> str:
+        """
+        Content address of this export: workflow graph, export options,
+        generator version and the definitions of any custom tools it embeds.
+        """
+        try:
+            custom_tools = await asyncio.to_thread(
+                CustomToolGenerators.custom_tools_fingerprint, self._used_custom_tools
+            )
+        except Exception as e:
+            # Can't verify tool freshness; make the key unique so we never serve stale code
+            logger.warning(f"Could not fingerprint custom tools, bypassing export cache: {e}")
+            custom_tools = [["uncacheable", str(time.time_ns())]]
+
+        return content_key({
+            "format": EXPORT_FORMAT_VERSION,
+            "workflow": {
+                "id": self.workflow_id,
+                "name": self.workflow_name,
+                "nodes": self.nodes,
+                "edges": self.edges,
+            },
+            "options": {
+                "include_ui": self.include_ui,
+                "include_api": self.include_api,
+                "export_mode": self.export_mode,
+                "configurable_available": CONFIGURABLE_AVAILABLE,
+            },
+            "custom_tools": custom_tools,
+        })
+
+    @property
+    def package_name(self) -> str:
+        """Top-level folder / archive name for the exported package."""
+        return f"workflow_{self._sanitize_name(self.workflow_name)}_{self.workflow_id}"
+
+    async def stream_zip(self, cache: Optional[ExportCache] = None) -> AsyncIterator[bytes]:
+        """
+        Stream the export as ZIP bytes.
+
+        Served straight from the content-addressed cache when this exact
+        configuration was exported before. Otherwise generators run
+        concurrently and each job's files are compressed and yielded in a
+        fixed order (job order, then path) as soon as that job and all
+        earlier ones finish, so the same workflow always produces the same
+        bytes. A copy is written to the cache.
+        """
+        cache = cache or get_export_cache()
+        key = await self.export_key()
+
+        if cache.has(key):
+            logger.info(f"Export cache hit for workflow {self.workflow_id} ({key[:12]})")
+            async for chunk in cache.stream(key):
+                yield chunk
+            return
+
+        logger.info(f"Exporting workflow {self.workflow_id}: {self.workflow_name}")
+        logger.debug(f"Workflow has {len(self.nodes)} nodes, {len(self.edges)} edges")
+
+        writer = cache.writer(key)
+        sink = _ZipChunkSink()
+        file_count = 0
+        try:
+            with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+                tasks = [
+                    asyncio.create_task(asyncio.to_thread(job), name=f"export:{name}")
+                    for name, job in self._generator_jobs()
+                ]
+                try:
+                    for task in tasks:
+                        files = await task
+                        for filepath in sorted(files):
+                            info = zipfile.ZipInfo(f"{self.package_name}/{filepath}", date_time=_ZIP_EPOCH)
+                            info.compress_type = zipfile.ZIP_DEFLATED
+                            info.external_attr = 0o644 << 16
+                            zf.writestr(info, files[filepath])
+                            file_count += 1
+                            chunk = sink.drain()
+                            if chunk:
+                                writer.write(chunk)
+                                yield chunk
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+
+            # Central directory is written when the ZipFile closes
+            chunk = sink.drain()
+            if chunk:
+                writer.write(chunk)
+                yield chunk
+        except BaseException:
+            writer.abort()
+            raise
+
+        writer.commit()
+        logger.info(f"Export complete: {file_count} files generated ({key[:12]} cached)")
+
+    async def export_to_zip(self) -> bytes:
+        """
+        Export workflow as a ZIP file containing all necessary files.
+
+        Prefer stream_zip() for HTTP responses; this buffers the archive.
+
+        Returns:
+            ZIP file as bytes
+        """
+        chunks = [chunk async for chunk in self.stream_zip()]
+        return b"".join(chunks)
+
+
+class _ZipChunkSink:
+    """Write-only, non-seekable buffer so ZipFile emits a streamable archive."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
 
-            for filepath, content in files.items():
-                zf.writestr(f"{base_path}/{filepath}", content)
+    def flush(self):
+        pass
 
-        logger.info(f"Export complete: {len(files)} files generated")
-        return zip_buffer.getvalue()
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -9,6 +9,10 @@ HTTP Bridge for Executor API Communication
 This module provides asynchronous HTTP client utilities for communicating
 with Executor API services, replacing the Celery task dispatch mechanism.
 
+Executor calls share keep-alive connections (one pool per executor, sized
+to EXECUTOR_MAX_CONCURRENT), and executions can stream partial output as
+Server-Sent Events.
+
 Supports multiple deployment environments:
 - Kubernetes (internal DNS)
 - Docker Compose (service names)
@@ -19,9 +23,12 @@ import httpx
 import asyncio
 import os
 import logging
-from typing import Dict, Any, Optional
+import json
+from typing import Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Tuple, Union
 from enum import Enum
 
+from .clients import HttpClientRegistry, pooled_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +69,9 @@ K8S_SERVICE_NAME = os.getenv("K8S_SERVICE_NAME", "executor-api-svc")
 # Docker Compose service name pattern
 DOCKER_SERVICE_NAME = os.getenv("DOCKER_SERVICE_NAME", "executor-{project_id}")
 
+# Parallel executions per executor; also the size of its connection pool
+EXECUTOR_MAX_CONCURRENT = int(os.getenv("EXECUTOR_MAX_CONCURRENT", "5"))
+
 
 # Configure retries for transient network issues
 MAX_RETRIES = 3
@@ -72,7 +82,7 @@ TIMEOUT_EXECUTION = httpx.Timeout(
     connect=10.0,  # 10 seconds to establish connection
     read=1800.0,   # 30 minutes for task execution
     write=10.0,    # 10 seconds for request writing
-    pool=10.0      # 10 seconds for connection pool
+    pool=None      # queue for an execution slot (see EXECUTOR_MAX_CONCURRENT)
 )
 
 TIMEOUT_VALIDATION = httpx.Timeout(
@@ -284,6 +294,106 @@ async def _retry_with_backoff(
 # HTTP Client Functions
 # ============================================================================
 
+# Shared keep-alive connections to executors, one pool per executor host
+# sized to the parallel execution limit. /execute calls can hold a
+# connection for up to 30 minutes, so they get their own pool and the short
+# /validate and /index calls never queue behind them. The transport retries
+# failed connection attempts.
+_execution_clients = HttpClientRegistry(
+    max_connections=EXECUTOR_MAX_CONCURRENT,
+    max_keepalive=EXECUTOR_MAX_CONCURRENT,
+    http2=False,
+    retries=MAX_RETRIES
+)
+_executor_clients = HttpClientRegistry(
+    max_connections=EXECUTOR_MAX_CONCURRENT,
+    max_keepalive=EXECUTOR_MAX_CONCURRENT,
+    http2=False,
+    retries=MAX_RETRIES
+)
+
+
+def _clients_for(endpoint: str) -> HttpClientRegistry:
+    return _execution_clients if endpoint == "/execute" else _executor_clients
+
+
+def _executor_headers(accept: str = "application/json") -> Dict[str, str]:
+    return {
+        "X-Executor-Token": EXECUTOR_API_SECRET,
+        "Content-Type": "application/json",
+        "Accept": accept
+    }
+
+
+def _executor_error(e: Exception, url: str, timeout_config: httpx.Timeout) -> ExecutorError:
+    """Translate an httpx error into the matching ExecutorError."""
+    if isinstance(e, httpx.HTTPStatusError):
+        # Extract detailed error information from response
+        try:
+            error_response = e.response.json()
+            error_detail = error_response.get("detail", e.response.text)
+
+            # Include additional error context if available
+            error_context = {
+                "status_code": e.response.status_code,
+                "detail": error_detail,
+                "url": str(e.request.url),
+                "method": e.request.method
+            }
+
+            # Add executor-specific error info if present
+            if isinstance(error_response, dict):
+                if "error_type" in error_response:
+                    error_context["error_type"] = error_response["error_type"]
+                if "traceback" in error_response:
+                    error_context["traceback"] = error_response["traceback"]
+
+        except Exception:
+            error_detail = e.response.text
+            error_context = {
+                "status_code": e.response.status_code,
+                "detail": error_detail,
+                "url": str(e.request.url)
+            }
+
+        logger.error(
+            f"[HTTP Bridge] CRITICAL: Executor API returned error: "
+            f"{e.response.status_code} - {error_detail}"
+        )
+
+        # Categorize error by status code
+        if 400 <= e.response.status_code < 500:
+            return ExecutorValidationError(
+                f"Executor validation error: {error_detail}",
+                status_code=e.response.status_code,
+                detail=str(error_context)
+            )
+        return ExecutorServerError(
+            f"Executor server error: {error_detail}",
+            status_code=e.response.status_code,
+            detail=str(error_context)
+        )
+
+    if isinstance(e, httpx.TimeoutException):
+        logger.error(
+            f"[HTTP Bridge] CRITICAL: Request timeout after {timeout_config.read}s: {e}"
+        )
+        return ExecutorTimeoutError(
+            f"Executor timeout after {timeout_config.read}s. "
+            f"Task may still be running. Check executor logs.",
+            detail=str(e)
+        )
+
+    logger.error(
+        f"[HTTP Bridge] CRITICAL: Failed to connect to Executor API at {url}: {e}"
+    )
+    return ExecutorConnectionError(
+        f"Executor connection error: {type(e).__name__}. "
+        f"Check K8s Service, Network Policies, and executor availability.",
+        detail=str(e)
+    )
+
+
 async def call_executor_api(
     project_id: int,
     endpoint: str,
@@ -294,18 +404,18 @@ async def call_executor_api(
 ) -> Dict[str, Any]:
     """
     Makes an asynchronous HTTP POST request to the Executor API.
-    
+
     Args:
         project_id: Project identifier for URL resolution
         endpoint: API endpoint path (e.g., '/execute', '/validate')
         payload: Request body as dictionary
         timeout_config: HTTP timeout configuration
         environment: Optional environment override
-        enable_retries: Whether to enable automatic retries
-        
+        enable_retries: Whether to retry retryable responses
+
     Returns:
         Response JSON as dictionary
-        
+
     Raises:
         ExecutorConnectionError: If connection to executor fails
         ExecutorTimeoutError: If request times out
@@ -314,103 +424,24 @@ async def call_executor_api(
     """
     base_url = get_executor_url(project_id, environment)
     url = f"{base_url}{endpoint}"
-    
-    headers = {
-        "X-Executor-Token": EXECUTOR_API_SECRET,
-        "Content-Type": "application/json"
-    }
-    
+
     logger.info(f"[HTTP Bridge] Calling Executor API: POST {url}")
     logger.debug(f"[HTTP Bridge] Payload: {payload}")
-    
-    # Configure transport with connection pooling
-    transport = httpx.AsyncHTTPTransport(
-        retries=MAX_RETRIES if enable_retries else 0
-    )
-    
+
     async def _make_request():
-        async with httpx.AsyncClient(
-            timeout=timeout_config,
-            transport=transport
-        ) as client:
-            try:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()  # Raise exception for 4xx/5xx errors
-                
-                result = response.json()
-                logger.info(f"[HTTP Bridge] Success: {response.status_code}")
-                logger.debug(f"[HTTP Bridge] Response: {result}")
-                
-                return result
-                
-            except httpx.HTTPStatusError as e:
-                # Extract detailed error information from response
-                try:
-                    error_response = e.response.json()
-                    error_detail = error_response.get("detail", e.response.text)
-                    
-                    # Include additional error context if available
-                    error_context = {
-                        "status_code": e.response.status_code,
-                        "detail": error_detail,
-                        "url": str(e.request.url),
-                        "method": e.request.method
-                    }
-                    
-                    # Add executor-specific error info if present
-                    if isinstance(error_response, dict):
-                        if "error_type" in error_response:
-                            error_context["error_type"] = error_response["error_type"]
-                        if "traceback" in error_response:
-                            error_context["traceback"] = error_response["traceback"]
-                    
-                except Exception:
-                    error_detail = e.response.text
-                    error_context = {
-                        "status_code": e.response.status_code,
-                        "detail": error_detail,
-                        "url": str(e.request.url)
-                    }
-                
-                logger.error(
-                    f"[HTTP Bridge] CRITICAL: Executor API returned error: "
-                    f"{e.response.status_code} - {error_detail}"
-                )
-                
-                # Categorize error by status code
-                if 400 <= e.response.status_code < 500:
-                    raise ExecutorValidationError(
-                        f"Executor validation error: {error_detail}",
-                        status_code=e.response.status_code,
-                        detail=str(error_context)
-                    )
-                else:
-                    raise ExecutorServerError(
-                        f"Executor server error: {error_detail}",
-                        status_code=e.response.status_code,
-                        detail=str(error_context)
-                    )
-                
-            except httpx.TimeoutException as e:
-                logger.error(
-                    f"[HTTP Bridge] CRITICAL: Request timeout after {timeout_config.read}s: {e}"
-                )
-                raise ExecutorTimeoutError(
-                    f"Executor timeout after {timeout_config.read}s. "
-                    f"Task may still be running. Check executor logs.",
-                    detail=str(e)
-                )
-                
-            except httpx.RequestError as e:
-                logger.error(
-                    f"[HTTP Bridge] CRITICAL: Failed to connect to Executor API at {url}: {e}"
-                )
-                raise ExecutorConnectionError(
-                    f"Executor connection error: {type(e).__name__}. "
-                    f"Check K8s Service, Network Policies, and executor availability.",
-                    detail=str(e)
-                )
-    
+        try:
+            async with _clients_for(endpoint).lease(url) as client:
+                response = await client.post(url, json=payload, headers=_executor_headers(), timeout=timeout_config)
+            response.raise_for_status()  # Raise exception for 4xx/5xx errors
+        except (httpx.HTTPStatusError, httpx.TimeoutException, httpx.RequestError) as e:
+            raise _executor_error(e, url, timeout_config)
+
+        result = response.json()
+        logger.info(f"[HTTP Bridge] Success: {response.status_code}")
+        logger.debug(f"[HTTP Bridge] Response: {result}")
+
+        return result
+
     # Execute with retry logic if enabled
     if enable_retries:
         return await _retry_with_backoff(_make_request)
@@ -418,6 +449,65 @@ async def call_executor_api(
         return await _make_request()
 
 
+async def stream_executor_api(
+    project_id: int,
+    endpoint: str,
+    payload: Dict[str, Any],
+    timeout_config: httpx.Timeout,
+    environment: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    POST to the Executor API and yield its output as it arrives.
+
+    Asks for Server-Sent Events (``Accept: text/event-stream``) and yields
+    each event as ``{"type": <event>, "data": <decoded data>}``: partial
+    output as ``output`` events, then ``complete`` (data is the result) or
+    ``error``. An executor that answers with plain JSON yields a single
+    ``complete`` event. Streams are not retried, since output may already
+    have been consumed.
+
+    Raises:
+        Same as call_executor_api
+    """
+    base_url = get_executor_url(project_id, environment)
+    url = f"{base_url}{endpoint}"
+
+    logger.info(f"[HTTP Bridge] Streaming Executor API: POST {url}")
+
+    try:
+        async with _clients_for(endpoint).lease(url) as client:
+            async with client.stream(
+                "POST", url, json=payload, headers=_executor_headers("text/event-stream"), timeout=timeout_config
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+
+                if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                    await response.aread()
+                    yield {"type": "complete", "data": response.json()}
+                    return
+
+                event_type, data_lines = "message", []
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event_type = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+                    elif not line and data_lines:
+                        data = "\n".join(data_lines)
+                        try:
+                            data = json.loads(data)
+                        except ValueError:
+                            pass
+                        yield {"type": event_type, "data": data}
+                        if event_type in ("complete", "error"):
+                            return
+                        event_type, data_lines = "message", []
+    except (httpx.HTTPStatusError, httpx.TimeoutException, httpx.RequestError) as e:
+        raise _executor_error(e, url, timeout_config)
+
+
 # ============================================================================
 # High-Level API Functions
 # ============================================================================
@@ -428,7 +518,8 @@ async def execute_development_task(
     directive: str,
     context_package: Optional[str] = None,
     classification: str = "CODE_ASSISTANT",
-    feature_branch_name: Optional[str] = None
+    feature_branch_name: Optional[str] = None,
+    on_output: Optional[Callable[[Dict[str, Any]], Optional[Awaitable[None]]]] = None
 ) -> Dict[str, Any]:
     """
     Execute a development task on the Executor API.
@@ -440,11 +531,82 @@ async def execute_development_task(
         context_package: Optional context data
         classification: Task classification
         feature_branch_name: Optional branch name
+        on_output: Optional callback (sync or async) for partial output events;
+            when given, the execution is streamed (see stream_development_task)
         
     Returns:
         Execution result dictionary
     """
-    payload = {
+    if on_output is None:
+        logger.info(
+            f"[HTTP Bridge] Executing development task {task_id} "
+            f"for project {project_id}"
+        )
+
+        return await call_executor_api(
+            project_id=project_id,
+            endpoint="/execute",
+            payload=_execution_payload(
+                project_id, task_id, directive, context_package, classification, feature_branch_name
+            ),
+            timeout_config=TIMEOUT_EXECUTION
+        )
+
+    async for event in stream_development_task(
+        project_id, task_id, directive, context_package, classification, feature_branch_name
+    ):
+        if event["type"] == "complete":
+            return event["data"]
+        if event["type"] == "error":
+            data = event["data"]
+            detail = data.get("detail", data) if isinstance(data, dict) else data
+            raise ExecutorServerError(f"Executor error: {detail}", detail=str(data))
+        result = on_output(event)
+        if asyncio.iscoroutine(result):
+            await result
+
+    raise ExecutorServerError(f"Executor stream for task {task_id} ended without a result")
+
+
+async def stream_development_task(
+    project_id: int,
+    task_id: int,
+    directive: str,
+    context_package: Optional[str] = None,
+    classification: str = "CODE_ASSISTANT",
+    feature_branch_name: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Execute a development task and yield executor output as it arrives.
+
+    Yields stream_executor_api events; the last one is "complete" (with the
+    execution result) or "error".
+    """
+    logger.info(
+        f"[HTTP Bridge] Streaming development task {task_id} "
+        f"for project {project_id}"
+    )
+
+    async for event in stream_executor_api(
+        project_id=project_id,
+        endpoint="/execute",
+        payload=_execution_payload(
+            project_id, task_id, directive, context_package, classification, feature_branch_name
+        ),
+        timeout_config=TIMEOUT_EXECUTION
+    ):
+        yield event
+
+
+def _execution_payload(
+    project_id: int,
+    task_id: int,
+    directive: str,
+    context_package: Optional[str],
+    classification: str,
+    feature_branch_name: Optional[str]
+) -> Dict[str, Any]:
+    return {
         "task_id": task_id,
         "project_id": project_id,
         "directive": directive,
@@ -452,18 +614,6 @@ async def execute_development_task(
         "classification": classification,
         "feature_branch_name": feature_branch_name
     }
-    
-    logger.info(
-        f"[HTTP Bridge] Executing development task {task_id} "
-        f"for project {project_id}"
-    )
-    
-    return await call_executor_api(
-        project_id=project_id,
-        endpoint="/execute",
-        payload=payload,
-        timeout_config=TIMEOUT_EXECUTION
-    )
 
 
 async def validate_code_changes(
@@ -554,10 +704,11 @@ async def check_executor_health(
     
     logger.debug(f"[HTTP Bridge] Checking executor health: {url}")
     
-    timeout = httpx.Timeout(connect=5.0, read=5.0)
+    timeout = httpx.Timeout(5.0)
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        # General pool, so health checks don't queue behind running executions
+        async with pooled_http_client(timeout=timeout) as client:
             response = await client.get(url)
             response.raise_for_status()
             
@@ -578,29 +729,49 @@ async def check_executor_health(
 
 async def execute_tasks_parallel(
     tasks: list[Dict[str, Any]],
-    max_concurrent: int = 5
-) -> list[Dict[str, Any]]:
+    max_concurrent: Optional[int] = None,
+    on_output: Optional[Callable[[int, Dict[str, Any]], Optional[Awaitable[None]]]] = None
+) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
     """
     Execute multiple tasks in parallel with concurrency limit.
-    
+
+    Results are yielded as each task finishes, not in task order.
+
     Args:
         tasks: List of task dictionaries with execution parameters
-        max_concurrent: Maximum concurrent executions
-        
-    Returns:
-        List of execution results
+        max_concurrent: Maximum concurrent executions (default and upper
+            bound: EXECUTOR_MAX_CONCURRENT, the connection pool size)
+        on_output: Optional callback ``(task_index, event)`` for partial
+            output; streams each execution
+
+    Yields:
+        ``(task_index, result)`` tuples; result is the exception if the task failed
+
+    Usage:
+        async for index, result in execute_tasks_parallel(tasks):
+            ...
     """
+    max_concurrent = min(max_concurrent or EXECUTOR_MAX_CONCURRENT, EXECUTOR_MAX_CONCURRENT)
     semaphore = asyncio.Semaphore(max_concurrent)
-    
-    async def execute_with_semaphore(task: Dict[str, Any]) -> Dict[str, Any]:
+
+    async def execute_with_semaphore(index: int, task: Dict[str, Any]):
         async with semaphore:
-            return await execute_development_task(**task)
-    
+            try:
+                if on_output is None:
+                    return index, await execute_development_task(**task)
+                return index, await execute_development_task(
+                    **task, on_output=lambda event: on_output(index, event)
+                )
+            except Exception as e:
+                return index, e
+
     logger.info(f"[HTTP Bridge] Executing {len(tasks)} tasks in parallel (max {max_concurrent})")
-    
-    results = await asyncio.gather(
-        *[execute_with_semaphore(task) for task in tasks],
-        return_exceptions=True
-    )
-    
-    return results
+
+    pending = [asyncio.ensure_future(execute_with_semaphore(i, task)) for i, task in enumerate(tasks)]
+    try:
+        for finished in asyncio.as_completed(pending):
+            yield await finished
+    finally:
+        # Caller stopped iterating early
+        for future in pending:
+            future.cancel()
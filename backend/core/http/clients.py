@@ -0,0 +1,243 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Shared keep-alive HTTP clients for generated tools.
+
+Tools built by core.tools.factory used to open an ``httpx.AsyncClient`` per
+call (and the API tool's polling loop one per poll), paying DNS, TCP and TLS
+setup every time. They now borrow a ``PooledHttpClient`` instead:
+
+    async with pooled_http_client(timeout=timeout) as client:
+        response = await client.post(url, json=payload)
+
+Each request is routed to one long-lived ``httpx.AsyncClient`` per origin
+(scheme, host, port), so repeated calls reuse warm connections. The borrowing
+tool's timeout is applied per request, leaving the shared client untouched.
+Shared clients never store cookies, so one tool's session cannot leak into
+another's requests. HTTP/2 is negotiated when the optional ``h2`` package is
+installed.
+
+Other callers with their own limits (e.g. the executor bridge) create their
+own ``HttpClientRegistry``. httpx connections belong to the event loop that
+opened them, so clients are kept per loop; ``close_http_clients()`` closes
+the running loop's clients of every registry and is called on application
+shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST", "20"))
+HTTP_CLIENT_KEEPALIVE_SECONDS = float(os.getenv("HTTP_CLIENT_KEEPALIVE_SECONDS", "30"))
+HTTP_CLIENT_MAX_HOSTS = int(os.getenv("HTTP_CLIENT_MAX_HOSTS", "64"))
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+
+try:
+    import h2  # noqa: F401  (httpx's optional HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT = 30.0
+
+Origin = Tuple[str, str, int]
+
+# Every registry, so shutdown can close them all
+_registries: "weakref.WeakSet[HttpClientRegistry]" = weakref.WeakSet()
+
+
+def _no_cookies() -> CookieJar:
+    """Cookie jar that rejects every cookie."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _origin(url: Any) -> Origin:
+    url = httpx.URL(url)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    return url.scheme, url.host, port
+
+
+class HttpClientRegistry:
+    """
+    Per-origin ``httpx.AsyncClient``s, kept per event loop and LRU-capped.
+
+    Clients are borrowed with ``lease()``; an evicted client is closed once
+    its last lease ends, so in-flight requests are never cut off.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive: int = HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry: float = HTTP_CLIENT_KEEPALIVE_SECONDS,
+        max_hosts: int = HTTP_CLIENT_MAX_HOSTS,
+        http2: Optional[bool] = None,
+        retries: int = 0
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_hosts = max_hosts
+        self.http2 = (HTTP_CLIENT_HTTP2 if http2 is None else http2) and HTTP2_AVAILABLE
+        self.retries = retries  # connection attempts retried by the transport
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OrderedDict[Origin, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._leases: Dict[httpx.AsyncClient, int] = {}
+        self._retired: set = set()
+        _registries.add(self)
+
+    def _clients(self) -> "OrderedDict[Origin, httpx.AsyncClient]":
+        loop = asyncio.get_running_loop()
+        clients = self._loops.get(loop)
+        if clients is None:
+            clients = self._loops[loop] = OrderedDict()
+        return clients
+
+    @asynccontextmanager
+    async def lease(self, url: Any) -> AsyncIterator[httpx.AsyncClient]:
+        """Borrow the shared client for ``url``'s origin on the running event loop."""
+        client = await self._acquire(url)
+        try:
+            yield client
+        finally:
+            await self._release(client)
+
+    async def _acquire(self, url: Any) -> httpx.AsyncClient:
+        clients = self._clients()
+        origin = _origin(url)
+        client = clients.get(origin)
+        if client is None or client.is_closed:
+            client = clients[origin] = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2, retries=self.retries),
+                timeout=DEFAULT_TIMEOUT,
+                cookies=_no_cookies(),
+            )
+            logger.debug(f"Opened pooled HTTP client for {origin[0]}://{origin[1]}:{origin[2]} (http2={self.http2})")
+        clients.move_to_end(origin)
+        self._leases[client] = self._leases.get(client, 0) + 1
+
+        while len(clients) > self.max_hosts:
+            _, evicted = clients.popitem(last=False)
+            if self._leases.get(evicted):
+                self._retired.add(evicted)  # closed when its last lease ends
+            else:
+                await evicted.aclose()
+        return client
+
+    async def _release(self, client: httpx.AsyncClient) -> None:
+        self._leases[client] -= 1
+        if self._leases[client]:
+            return
+        del self._leases[client]
+        if client in self._retired:
+            self._retired.discard(client)
+            await client.aclose()
+
+    async def close(self) -> None:
+        """Close the running loop's clients."""
+        clients = self._loops.pop(asyncio.get_running_loop(), None) or {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing pooled HTTP client: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            clients = self._loops.get(asyncio.get_running_loop()) or {}
+        except RuntimeError:
+            clients = {}
+        return {
+            "hosts": [f"{scheme}://{host}:{port}" for scheme, host, port in clients],
+            "http2": self.http2,
+            "max_connections_per_host": self.limits.max_connections,
+        }
+
+
+class PooledHttpClient:
+    """
+    A tool's view of the shared registry, with that tool's timeout.
+
+    Mirrors the ``httpx.AsyncClient`` request methods used by tools and can
+    be used with ``async with``; leaving the block does not close anything.
+    """
+
+    def __init__(self, registry: HttpClientRegistry, timeout: Any = DEFAULT_TIMEOUT):
+        self._registry = registry
+        self.timeout = timeout
+
+    async def __aenter__(self) -> "PooledHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    async def request(self, method: str, url: Any, **kwargs) -> httpx.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        async with self._registry.lease(url) as client:
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url: Any, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: Any, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: Any, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: Any, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: Any, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+
+# Global registry instance
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_client_registry() -> HttpClientRegistry:
+    """Get the global HTTP client registry."""
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry()
+    return _registry
+
+
+def pooled_http_client(timeout: Any = DEFAULT_TIMEOUT) -> PooledHttpClient:
+    """Borrow the shared keep-alive clients with a per-call timeout."""
+    return PooledHttpClient(get_http_client_registry(), timeout=timeout)
+
+
+async def close_http_clients() -> None:
+    """Close pooled HTTP clients of all registries (called on application shutdown)."""
+    for registry in list(_registries):
+        await registry.close()
+
+
+__all__ = [
+    "HTTP2_AVAILABLE",
+    "HttpClientRegistry",
+    "PooledHttpClient",
+    "get_http_client_registry",
+    "pooled_http_client",
+    "close_http_clients",
+]
@@ -33,8 +33,11 @@ Example:
     ... )
 """
 
+import asyncio
+import bisect
 import logging
 import time
+from collections import OrderedDict, deque
 from typing import Any, Dict, List, Optional, Callable
 from datetime import datetime
 from abc import ABC, abstractmethod
@@ -519,16 +522,66 @@ class LoggingMiddleware(AgentMiddleware):
         return None
 
 
+def _same_message(a: Any, b: Any) -> bool:
+    """Whether two entries are the same message (by identity or message id)."""
+    if a is b:
+        return True
+    a_id = getattr(a, 'id', None)
+    return a_id is not None and a_id == getattr(b, 'id', None)
+
+
+def _log_prefetch_failure(task: asyncio.Task) -> None:
+    """Retrieve a prefetch's exception so an unawaited failure is logged, not warned about."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Background summarization failed: {task.exception()}")
+
+
+# Tokens-per-call histogram bucket upper bounds (last bucket is open-ended)
+COST_TOKEN_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144)
+
+
+class _UsageCounter:
+    """Fixed-size counters for one (agent, model) pair."""
+
+    __slots__ = ("calls", "prompt_tokens", "completion_tokens", "total_tokens", "cost", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.cost = 0.0
+        self.histogram = [0] * (len(COST_TOKEN_BUCKETS) + 1)
+
+    def add(self, prompt_tokens: int, completion_tokens: int, total_tokens: int, cost: float):
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.total_tokens += total_tokens
+        self.cost += cost
+        self.histogram[bisect.bisect_left(COST_TOKEN_BUCKETS, total_tokens)] += 1
+
+
 class CostTrackingMiddleware(AgentMiddleware):
     """
     Comprehensive cost tracking for model usage, tools, and per-agent breakdowns.
 
     Tracks:
     - Total costs and token usage
-    - Per-agent costs and token breakdowns
-    - Tool usage costs (if tools have costs)
+    - Per-agent and per-model costs, token breakdowns and tokens-per-call histograms
+    - Tool call counts per tool and per agent
     - Prompt vs completion token ratios
-    - Cost trends over time
+    - Recent cost trend (last ``history_size`` calls)
+
+    Work per model call is proportional to the messages added since the
+    previous call: a cursor remembers how far the message list has been
+    scanned, so tool calls are counted once instead of once per turn. All
+    state is fixed-size counters plus bounded deques, so long-running agents
+    don't grow memory.
+
+    When ``persist`` is enabled, deltas are flushed to agent_usage_rollups
+    every ``flush_every`` model calls or ``flush_interval`` seconds, and when
+    the agent finishes. The workflow cost endpoint reads that table.
 
     Example:
         >>> cost_tracker = CostTrackingMiddleware()
@@ -539,7 +592,13 @@ class CostTrackingMiddleware(AgentMiddleware):
         >>> print(f"By agent: {stats['cost_by_agent']}")
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        history_size: int = 100,
+        persist: bool = True,
+        flush_every: int = 25,
+        flush_interval: float = 30.0,
+    ):
         super().__init__()
         self.total_cost = 0.0
         self.call_count = 0
@@ -547,35 +606,81 @@ class CostTrackingMiddleware(AgentMiddleware):
         # Detailed tracking
         self.cost_by_agent = {}  # {agent_id: cost}
         self.tokens_by_agent = {}  # {agent_id: {'prompt': x, 'completion': y, 'total': z}}
-        self.tool_calls = []  # [{tool: str, agent: str, timestamp: float}]
-        self.cost_history = []  # [{timestamp, agent, cost, tokens}]
+        self.usage_by_model = {}  # {(agent, model): _UsageCounter}
+        self.tool_counts = {}  # {(agent, tool): count}
+        self.tool_calls = deque(maxlen=history_size)  # recent [{tool, agent, timestamp}]
+        self.cost_history = deque(maxlen=history_size)  # recent [{timestamp, agent, cost, tokens}]
+
+        # Message cursor: messages[:_cursor] have been scanned for tool calls.
+        # _anchor is the last scanned message, used to detect rewrites
+        # (e.g. summarization replacing the history).
+        self._cursor = 0
+        self._anchor = None
+        self._seen_tool_call_ids = OrderedDict()
+        self._seen_limit = 4096
+
+        # Unflushed deltas, keyed like usage_by_model / tool_counts
+        self.persist = persist
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending_models = {}
+        self._pending_tools = {}
+        self._pending_calls = 0
+        self._last_flush = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Message scanning
+    # ------------------------------------------------------------------
+
+    def _unscanned(self, messages: List[Any]) -> List[Any]:
+        """Messages added since the last scan."""
+        start = self._cursor
+        if start and (start > len(messages) or not _same_message(messages[start - 1], self._anchor)):
+            # History was rewritten; find where we left off, else rescan
+            # (tool call ids dedupe anything already counted).
+            start = 0
+            for i in range(len(messages) - 1, -1, -1):
+                if _same_message(messages[i], self._anchor):
+                    start = i + 1
+                    break
+
+        self._cursor = len(messages)
+        self._anchor = messages[-1] if messages else None
+        return messages[start:]
+
+    def _scan_tool_calls(self, messages: List[Any], agent: str):
+        for msg in self._unscanned(messages):
+            for tool_call in getattr(msg, 'tool_calls', None) or ():
+                call_id = tool_call.get('id')
+                if call_id:
+                    if call_id in self._seen_tool_call_ids:
+                        continue
+                    self._seen_tool_call_ids[call_id] = None
+                    if len(self._seen_tool_call_ids) > self._seen_limit:
+                        self._seen_tool_call_ids.popitem(last=False)
+
+                tool_name = tool_call.get('name', 'unknown')
+                key = (agent, tool_name)
+                self.tool_counts[key] = self.tool_counts.get(key, 0) + 1
+                self._pending_tools[key] = self._pending_tools.get(key, 0) + 1
+                self.tool_calls.append({
+                    "tool": tool_name,
+                    "agent": agent,
+                    "timestamp": time.time()
+                })
 
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
 
     def before_model(self, state: Dict[str, Any], runtime: Any) -> Optional[Dict[str, Any]]:
         """Track call and tool usage."""
-        import time
-
         self.call_count += 1
-
-        # Track tool calls if present in messages
-        messages = state.get("messages", [])
-        current_agent = state.get("current_step", "unknown")
-
-        for msg in messages:
-            if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                for tool_call in msg.tool_calls:
-                    self.tool_calls.append({
-                        "tool": tool_call.get('name', 'unknown'),
-                        "agent": current_agent,
-                        "timestamp": time.time()
-                    })
-
+        self._scan_tool_calls(state.get("messages", []), state.get("current_step", "unknown"))
         return None
 
     def after_model(self, state: Dict[str, Any], runtime: Any) -> Optional[Dict[str, Any]]:
         """Calculate comprehensive cost and token breakdown."""
-        import time
-
         messages = state.get("messages", [])
         if not messages:
             return None
@@ -596,6 +701,7 @@ class CostTrackingMiddleware(AgentMiddleware):
                 model_name = getattr(runtime, 'model', 'gpt-5.4')
                 if hasattr(model_name, 'model_name'):
                     model_name = model_name.model_name
+                model_name = str(model_name)
 
                 from core.models.registry import model_registry
                 cost_per_1k = model_registry.get_blended_cost_per_1k(model_name, default=0.0025)
@@ -618,7 +724,15 @@ class CostTrackingMiddleware(AgentMiddleware):
                 self.tokens_by_agent[current_agent]['completion'] += completion_tokens
                 self.tokens_by_agent[current_agent]['total'] += total_tokens
 
-                # Track cost history
+                # Track per-model counters (lifetime and unflushed)
+                key = (current_agent, model_name)
+                for counters in (self.usage_by_model, self._pending_models):
+                    if key not in counters:
+                        counters[key] = _UsageCounter()
+                    counters[key].add(prompt_tokens, completion_tokens, total_tokens, call_cost)
+                self._pending_calls += 1
+
+                # Track recent cost history
                 self.cost_history.append({
                     'timestamp': time.time(),
                     'agent': current_agent,
@@ -635,8 +749,73 @@ class CostTrackingMiddleware(AgentMiddleware):
                     f"| Total: ${self.total_cost:.6f}"
                 )
 
+                if (self._pending_calls >= self.flush_every
+                        or time.monotonic() - self._last_flush >= self.flush_interval):
+                    self.flush()
+
+        return None
+
+    def after_agent(self, state: Dict[str, Any], runtime: Any) -> Optional[Dict[str, Any]]:
+        """Count trailing tool calls and flush whatever is pending."""
+        self._scan_tool_calls(state.get("messages", []), state.get("current_step", "unknown"))
+        self.flush()
         return None
 
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        rows = [
+            {
+                "agent": agent,
+                "model": model,
+                "calls": c.calls,
+                "prompt_tokens": c.prompt_tokens,
+                "completion_tokens": c.completion_tokens,
+                "total_tokens": c.total_tokens,
+                "cost_usd": c.cost,
+            }
+            for (agent, model), c in self._pending_models.items()
+        ]
+        rows.extend(
+            {"agent": agent, "tool": tool, "calls": count}
+            for (agent, tool), count in self._pending_tools.items()
+        )
+        self._pending_models = {}
+        self._pending_tools = {}
+        self._pending_calls = 0
+        self._last_flush = time.monotonic()
+        return rows
+
+    def flush(self) -> int:
+        """
+        Persist usage accumulated since the last flush.
+
+        The write runs in the default executor when called from an event
+        loop, so the agent loop never waits on the database.
+
+        Returns:
+            Number of rollup rows handed to the writer
+        """
+        rows = self._take_pending()
+        if not rows or not self.persist:
+            return len(rows)
+
+        from core.workflows.events.progress import get_execution_context
+        from services.usage_store import record_usage
+
+        ctx = get_execution_context() or {}
+        args = (rows, ctx.get('workflow_id'), ctx.get('task_id'))
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            record_usage(*args)
+        else:
+            loop.run_in_executor(None, record_usage, *args)
+        return len(rows)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive cost statistics with breakdowns."""
         # Calculate most expensive agent
@@ -649,13 +828,27 @@ class CostTrackingMiddleware(AgentMiddleware):
         total_completion_tokens = sum(t['completion'] for t in self.tokens_by_agent.values())
         total_tokens = sum(t['total'] for t in self.tokens_by_agent.values())
 
-        # Group tool calls by tool name
+        # Group tool calls by tool name and by agent
         tool_counts = {}
-        for tc in self.tool_calls:
-            tool_name = tc['tool']
-            if tool_name not in tool_counts:
-                tool_counts[tool_name] = 0
-            tool_counts[tool_name] += 1
+        tool_calls_by_agent = {}
+        for (agent, tool_name), count in self.tool_counts.items():
+            tool_counts[tool_name] = tool_counts.get(tool_name, 0) + count
+            tool_calls_by_agent.setdefault(agent, {})[tool_name] = count
+
+        bucket_labels = [f"le_{b}" for b in COST_TOKEN_BUCKETS] + ["inf"]
+        usage_by_model = [
+            {
+                "agent": agent,
+                "model": model,
+                "calls": c.calls,
+                "cost": c.cost,
+                "prompt_tokens": c.prompt_tokens,
+                "completion_tokens": c.completion_tokens,
+                "total_tokens": c.total_tokens,
+                "tokens_per_call": dict(zip(bucket_labels, c.histogram)),
+            }
+            for (agent, model), c in self.usage_by_model.items()
+        ]
 
         return {
             # Overall metrics
@@ -676,14 +869,16 @@ class CostTrackingMiddleware(AgentMiddleware):
                 "name": most_expensive_agent[0],
                 "cost": most_expensive_agent[1]
             } if most_expensive_agent else None,
+            "usage_by_model": usage_by_model,
 
             # Tool usage
-            "tool_calls_count": len(self.tool_calls),
+            "tool_calls_count": sum(tool_counts.values()),
             "tool_calls_by_name": tool_counts,
-            "tool_calls_details": self.tool_calls,
+            "tool_calls_by_agent": tool_calls_by_agent,
+            "tool_calls_details": list(self.tool_calls),
 
-            # Cost history for trends
-            "cost_history": self.cost_history
+            # Recent cost history for trends
+            "cost_history": list(self.cost_history)
         }
 
 
@@ -700,6 +895,17 @@ class SummarizationMiddleware(AgentMiddleware):
     - Summarizing old messages when threshold reached
     - Preserving recent messages for continuity
 
+    The summary is rolling: each time the threshold trips, only the messages
+    that aged out since the previous summary are summarized, on top of that
+    summary, instead of re-summarizing the whole history.
+
+    In async agents (abefore_model) the summarizer is awaited rather than
+    blocking the event loop. With ``background=True`` a summary is started
+    ahead of time once history reaches ``prefetch_ratio`` of the threshold,
+    so it is usually ready when the threshold trips. A prefetch that no
+    longer matches the history is cancelled and replaced, and any pending
+    prefetch is cancelled when the agent finishes.
+
     Example:
         >>> middleware = [
         ...     SummarizationMiddleware(
@@ -709,18 +915,32 @@ class SummarizationMiddleware(AgentMiddleware):
         ... ]
     """
 
+    SUMMARY_MESSAGE_ID = "summarization-middleware-summary"
+
     def __init__(
         self,
         model: str,
         max_tokens_before_summary: int = 1000,
-        keep_last_n_messages: int = 5
+        keep_last_n_messages: int = 5,
+        background: bool = False,
+        prefetch_ratio: float = 0.8
     ):
         super().__init__()
         self.model = model
         self.max_tokens_before_summary = max_tokens_before_summary
         self.keep_last_n_messages = keep_last_n_messages
+        self.background = background
+        self.prefetch_ratio = prefetch_ratio
         self._summarizer = None
 
+        # Rolling summary and the last message folded into it
+        self._summary: Optional[str] = None
+        self._anchor: Optional[BaseMessage] = None
+
+        # Background summary task, resolves to (summary, anchor)
+        self._prefetch: Optional[asyncio.Task] = None
+        self._prefetch_anchor: Optional[BaseMessage] = None
+
     def _get_summarizer(self):
         """Lazy init summarizer model."""
         if self._summarizer is None:
@@ -732,6 +952,64 @@ class SummarizationMiddleware(AgentMiddleware):
         total_chars = sum(len(m.content) for m in messages if hasattr(m, 'content'))
         return total_chars // 4
 
+    def _is_summary(self, msg: Any) -> bool:
+        return getattr(msg, 'id', None) == self.SUMMARY_MESSAGE_ID
+
+    def _aged_out(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Messages outside the keep window not yet folded into the summary."""
+        end = len(messages) - self.keep_last_n_messages
+        start = 0
+
+        if self._anchor is not None:
+            for i in range(end - 1, -1, -1):
+                if _same_message(messages[i], self._anchor):
+                    start = i + 1
+                    break
+            else:
+                if not any(self._is_summary(m) for m in messages[:end]):
+                    # Unrelated conversation: start a fresh summary
+                    self._summary = None
+                    self._anchor = None
+
+        return [m for m in messages[start:end] if not self._is_summary(m)]
+
+    @staticmethod
+    def _summary_prompt(previous: Optional[str], messages: List[BaseMessage]) -> str:
+        transcript = "\n\n".join(f"{m.__class__.__name__}: {m.content}" for m in messages)
+        if previous:
+            return (
+                "Here is a summary of the conversation so far:\n\n"
+                f"{previous}\n\n"
+                "Extend it with the following new messages, keeping it concise "
+                "and preserving key information and context:\n\n"
+                f"{transcript}"
+            )
+        return (
+            "Summarize the following conversation history concisely, "
+            "preserving key information and context:\n\n"
+            f"{transcript}"
+        )
+
+    def _summarize(self, previous: Optional[str], messages: List[BaseMessage]) -> str:
+        prompt = self._summary_prompt(previous, messages)
+        return self._get_summarizer().invoke([HumanMessage(content=prompt)]).content
+
+    async def _asummarize(self, previous: Optional[str], messages: List[BaseMessage]) -> str:
+        prompt = self._summary_prompt(previous, messages)
+        response = await self._get_summarizer().ainvoke([HumanMessage(content=prompt)])
+        return response.content
+
+    def _updated_messages(self, messages: List[BaseMessage]) -> Optional[Dict[str, Any]]:
+        if not self._summary:
+            return None
+
+        summary_msg = SystemMessage(
+            content=f"[Summary of previous conversation]\n{self._summary}",
+            id=self.SUMMARY_MESSAGE_ID
+        )
+        to_keep = messages[-self.keep_last_n_messages:]
+        return {"messages": [summary_msg] + to_keep}
+
     def before_model(self, state: Dict[str, Any], runtime: Any) -> Optional[Dict[str, Any]]:
         """Summarize if conversation is too long."""
 
@@ -745,33 +1023,71 @@ class SummarizationMiddleware(AgentMiddleware):
         if estimated_tokens < self.max_tokens_before_summary:
             return None
 
-        logger.info(f"🔄 Summarizing conversation (~{estimated_tokens} tokens)")
+        to_summarize = self._aged_out(messages)
+        if to_summarize:
+            logger.info(f"🔄 Summarizing {len(to_summarize)} messages (~{estimated_tokens} tokens)")
+            self._summary = self._summarize(self._summary, to_summarize)
+            self._anchor = to_summarize[-1]
 
-        # Split: messages to summarize vs keep
-        to_summarize = messages[:-self.keep_last_n_messages]
-        to_keep = messages[-self.keep_last_n_messages:]
+        return self._updated_messages(messages)
 
-        # Create summary
-        summary_prompt = (
-            "Summarize the following conversation history concisely, "
-            "preserving key information and context:\n\n"
-        )
-        for msg in to_summarize:
-            summary_prompt += f"{msg.__class__.__name__}: {msg.content}\n\n"
+    async def abefore_model(self, state: Dict[str, Any], runtime: Any) -> Optional[Dict[str, Any]]:
+        """Async summarization; optionally prefetches the summary in the background."""
+        messages = state.get("messages", [])
 
-        summarizer = self._get_summarizer()
-        summary_response = summarizer.invoke([HumanMessage(content=summary_prompt)])
+        if len(messages) <= self.keep_last_n_messages:
+            return None
 
-        # Create new message list with summary
-        summary_msg = SystemMessage(
-            content=f"[Summary of previous conversation]\n{summary_response.content}"
-        )
+        estimated_tokens = self._estimate_tokens(messages)
 
-        updated_messages = [summary_msg] + to_keep
+        if estimated_tokens < self.max_tokens_before_summary:
+            if (self.background and not self._prefetch_matches(messages)
+                    and estimated_tokens >= self.max_tokens_before_summary * self.prefetch_ratio):
+                to_summarize = self._aged_out(messages)
+                if to_summarize:
+                    logger.info(f"🔄 Prefetching summary of {len(to_summarize)} messages")
+                    self._cancel_prefetch()
+                    self._prefetch = asyncio.create_task(
+                        self._prefetch_summary(self._summary, to_summarize)
+                    )
+                    self._prefetch.add_done_callback(_log_prefetch_failure)
+                    self._prefetch_anchor = to_summarize[-1]
+            return None
 
-        logger.info(f"✓ Summarized {len(to_summarize)} messages → 1 summary")
+        if self._prefetch is not None:
+            prefetch, self._prefetch, self._prefetch_anchor = self._prefetch, None, None
+            try:
+                summary, anchor = await prefetch
+            except Exception as e:
+                logger.warning(f"Background summarization failed, summarizing inline: {e}")
+            else:
+                if any(_same_message(m, anchor) for m in messages):
+                    self._summary, self._anchor = summary, anchor
 
-        return {"messages": updated_messages}
+        to_summarize = self._aged_out(messages)
+        if to_summarize:
+            logger.info(f"🔄 Summarizing {len(to_summarize)} messages (~{estimated_tokens} tokens)")
+            self._summary = await self._asummarize(self._summary, to_summarize)
+            self._anchor = to_summarize[-1]
+
+        return self._updated_messages(messages)
+
+    async def aafter_agent(self, state: Dict[str, Any], runtime: Any) -> Optional[Dict[str, Any]]:
+        """Cancel a prefetch that the finished run never consumed."""
+        self._cancel_prefetch()
+        return None
+
+    async def _prefetch_summary(self, previous: Optional[str], messages: List[BaseMessage]):
+        return await self._asummarize(previous, messages), messages[-1]
+
+    def _prefetch_matches(self, messages: List[BaseMessage]) -> bool:
+        """Whether the pending prefetch summarizes part of this history."""
+        return self._prefetch is not None and any(_same_message(m, self._prefetch_anchor) for m in messages)
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch, self._prefetch_anchor = None, None
 
 
 class HumanInTheLoopMiddleware(AgentMiddleware):
@@ -1154,7 +1470,8 @@ def create_middleware_from_config(middleware_config: Dict[str, Any]) -> AgentMid
         return SummarizationMiddleware(
             model=middleware_config.get("model", "gpt-5.4-mini"),
             max_tokens_before_summary=middleware_config.get("max_tokens_before_summary", 1000),
-            keep_last_n_messages=middleware_config.get("keep_last_n_messages", 5)
+            keep_last_n_messages=middleware_config.get("keep_last_n_messages", 5),
+            background=middleware_config.get("background", False)
         )
 
     elif middleware_type == "hitl" or middleware_type == "human_in_the_loop":
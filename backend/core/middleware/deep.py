@@ -11,13 +11,20 @@ with LangConfig's existing architecture.
 """
 
 import logging
+import re
 from typing import Dict, Any, List, Optional, Callable
 from langchain_core.tools import BaseTool, StructuredTool
 from pydantic import BaseModel, Field
 from models.enums import MiddlewareType
+from services.spill_store import SpillStore, get_spill_store
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds on what one evicted-result read can pull back into context
+EVICTED_READ_BYTES = 20000
+EVICTED_READ_LINES = 500
+EVICTED_GREP_LINE_CHARS = 500
+
 
 # =============================================================================
 # Todo List Middleware
@@ -194,7 +201,8 @@ class FilesystemMiddleware:
     def __init__(
         self,
         mcp_manager=None,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        spill_store: Optional[SpillStore] = None
     ):
         """
         Initialize Filesystem middleware.
@@ -202,18 +210,27 @@ class FilesystemMiddleware:
         Args:
             mcp_manager: MCP manager for loading filesystem tools
             config: Configuration including auto_eviction settings
+            spill_store: Where evicted results are written (default: shared store)
         """
         self.mcp_manager = mcp_manager
         self.config = config or {}
         self.auto_eviction = self.config.get("auto_eviction", True)
         self.eviction_threshold = self.config.get("eviction_threshold_bytes", 1000000)  # 1MB
-        self.evicted_results = {}
+        self.evicted_results = {}  # {result_id: {digest, tool, bytes}}
+        self._spill_store = spill_store
 
         logger.info(
             f"FilesystemMiddleware initialized "
             f"(auto_eviction={self.auto_eviction}, threshold={self.eviction_threshold})"
         )
 
+    @property
+    def spill_store(self) -> SpillStore:
+        """Spill store for evicted results, resolved on first eviction."""
+        if self._spill_store is None:
+            self._spill_store = get_spill_store()
+        return self._spill_store
+
     async def create_tools(self) -> List[BaseTool]:
         """Create filesystem tools from MCP manager."""
         tools = []
@@ -229,28 +246,98 @@ class FilesystemMiddleware:
         except Exception as e:
             logger.error(f"Error loading filesystem tools: {e}")
 
-        # Add eviction management tool
-        def get_evicted_result(result_id: str) -> str:
+        # Add eviction management tools. Evicted results live in the spill
+        # store on disk; these read windows of them rather than the whole blob.
+        def _lookup(result_id: str):
+            entry = self.evicted_results.get(result_id)
+            if entry is None or entry["digest"] not in self.spill_store:
+                return None
+            return entry
+
+        def get_evicted_result(result_id: str, offset: int = 0, length: int = EVICTED_READ_BYTES) -> str:
+            """
+            Read a byte window of a previously evicted large result.
+
+            Args:
+                result_id: ID of the evicted result
+                offset: Byte offset to start reading at
+                length: Number of bytes to read
+
+            Returns:
+                The requested window of the evicted result
+            """
+            entry = _lookup(result_id)
+            if entry is None:
+                return f"Error: No evicted result found with ID '{result_id}'"
+            length = min(max(0, length), EVICTED_READ_BYTES)
+            content = self.spill_store.read_range(entry["digest"], offset, length)
+            end = min(offset + length, entry["bytes"])
+            header = f"Evicted Result [{result_id}] bytes {offset}-{end} of {entry['bytes']}"
+            if end < entry["bytes"]:
+                header += f" (continue with offset={end})"
+            return f"{header}:\n{content}"
+
+        def read_evicted_lines(result_id: str, start_line: int = 0, num_lines: int = 200) -> str:
             """
-            Retrieve a previously evicted large result.
+            Read a window of lines from a previously evicted large result.
 
             Args:
                 result_id: ID of the evicted result
+                start_line: First line to read (0-based)
+                num_lines: Number of lines to read
 
             Returns:
-                The evicted result content
+                The requested lines of the evicted result
             """
-            if result_id in self.evicted_results:
-                return f"Evicted Result [{result_id}]:\n{self.evicted_results[result_id]}"
-            return f"Error: No evicted result found with ID '{result_id}'"
+            entry = _lookup(result_id)
+            if entry is None:
+                return f"Error: No evicted result found with ID '{result_id}'"
+            num_lines = min(max(0, num_lines), EVICTED_READ_LINES)
+            content, total = self.spill_store.read_lines(entry["digest"], start_line, num_lines)
+            end = min(start_line + num_lines, total)
+            return f"Evicted Result [{result_id}] lines {start_line}-{end} of {total}:\n{content}"
+
+        def grep_evicted_result(result_id: str, pattern: str, max_matches: int = 50) -> str:
+            """
+            Search a previously evicted large result with a regular expression.
 
-        tools.append(
+            Args:
+                result_id: ID of the evicted result
+                pattern: Regular expression matched against each line
+                max_matches: Maximum number of matching lines to return
+
+            Returns:
+                Matching lines prefixed with their 0-based line numbers
+            """
+            entry = _lookup(result_id)
+            if entry is None:
+                return f"Error: No evicted result found with ID '{result_id}'"
+            try:
+                matches = self.spill_store.grep(entry["digest"], pattern, min(max_matches, EVICTED_READ_LINES))
+            except re.error as e:
+                return f"Error: Invalid pattern '{pattern}': {e}"
+            if not matches:
+                return f"No lines in [{result_id}] match '{pattern}'"
+            lines = "\n".join(f"{line_no}: {line[:EVICTED_GREP_LINE_CHARS]}" for line_no, line in matches)
+            return f"{len(matches)} matching lines in [{result_id}]:\n{lines}"
+
+        tools.extend([
             StructuredTool.from_function(
                 func=get_evicted_result,
                 name="get_evicted_result",
-                description="Retrieve a large result that was automatically evicted to save context"
-            )
-        )
+                description="Read a byte window of a large result that was automatically evicted to save context"
+            ),
+            StructuredTool.from_function(
+                func=read_evicted_lines,
+                name="read_evicted_lines",
+                description="Read a range of lines from an evicted large result"
+            ),
+            StructuredTool.from_function(
+                func=grep_evicted_result,
+                name="grep_evicted_result",
+                description="Search an evicted large result with a regex and return matching lines"
+            ),
+        ])
 
         return tools
 
@@ -271,9 +358,14 @@ class FilesystemMiddleware:
         result_size = len(result.encode('utf-8'))
 
         if result_size > self.eviction_threshold:
-            # Evict to storage
-            result_id = f"{tool_name}_{len(self.evicted_results)}"
-            self.evicted_results[result_id] = result
+            # Spill to disk; only the reference stays in memory
+            digest = self.spill_store.put(result)
+            result_id = f"{tool_name}_{digest[:12]}"
+            self.evicted_results[result_id] = {
+                "digest": digest,
+                "tool": tool_name,
+                "bytes": result_size
+            }
 
             logger.info(
                 f"Evicted large result from {tool_name} "
@@ -282,21 +374,28 @@ class FilesystemMiddleware:
 
             return (
                 f"[Large result evicted - {result_size} bytes]\n"
-                f"Use get_evicted_result('{result_id}') to retrieve it.\n"
+                f"Use get_evicted_result('{result_id}', offset, length), "
+                f"read_evicted_lines('{result_id}', start_line, num_lines) or "
+                f"grep_evicted_result('{result_id}', pattern) to page through it.\n"
                 f"Preview (first 500 chars):\n{result[:500]}..."
             )
 
         return result
 
     def get_state(self) -> Dict[str, Any]:
-        """Get current middleware state."""
+        """Get current middleware state (references only; content is on disk)."""
         return {
             "evicted_results": self.evicted_results
         }
 
     def set_state(self, state: Dict[str, Any]):
         """Restore middleware state."""
-        self.evicted_results = state.get("evicted_results", {})
+        self.evicted_results = {
+            result_id: entry
+            for result_id, entry in state.get("evicted_results", {}).items()
+            # Pre-spill state held raw strings, which can't be restored by reference
+            if isinstance(entry, dict) and "digest" in entry
+        }
 
 
 # =============================================================================
@@ -244,6 +244,12 @@ MIDDLEWARE_CATALOG: Dict[str, Dict[str, Any]] = {
                 "min": 1,
                 "max": 20,
                 "description": "Keep recent N messages without summarizing"
+            },
+            {
+                "name": "background",
+                "type": "boolean",
+                "default": False,
+                "description": "Start summarizing in the background before the threshold is reached"
             }
         ],
         "performance_impact": "Medium (LLM call for summarization)",
@@ -9,10 +9,12 @@ Skills System - Modular, context-aware capabilities for agents.
 Inspired by Claude Code's skills model, this module provides:
 - SkillLoader: Parse and validate SKILL.md files
 - SkillRegistry: In-memory cache with database persistence
+- SkillEmbeddingIndex: Precomputed embedding matrix for semantic matching
 - SkillMatcher: Context-aware skill selection and matching
 """
 
 from core.skills.loader import SkillLoader, ParsedSkill
+from core.skills.embeddings import SkillEmbeddingIndex
 from core.skills.registry import SkillRegistry, get_skill_registry
 from core.skills.matcher import SkillMatcher, SkillMatch, get_skill_matcher
 
@@ -21,6 +23,7 @@ __all__ = [
     "ParsedSkill",
     "SkillRegistry",
     "get_skill_registry",
+    "SkillEmbeddingIndex",
     "SkillMatcher",
     "SkillMatch",
     "get_skill_matcher",
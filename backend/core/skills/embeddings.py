@@ -0,0 +1,397 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Skill Embedding Index - Precomputed embedding matrix for semantic matching.
+
+Responsible for:
+- Embedding all skill descriptions in one batched call
+- Keeping a normalized float32 matrix (one row per skill) in memory
+- Persisting the matrix to disk so restarts don't re-embed
+- Incremental row updates when skills are created, updated or reloaded
+
+Matching is a single matrix-vector product followed by an argpartition
+top-k, so selection cost stays flat as the number of skills grows.
+
+Incremental updates persist after SAVE_DELAY_SECONDS of quiet, written on a
+worker thread; a save lost at shutdown only means re-embedding those skills
+on the next start.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.skill import Skill
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "./data/skills/skill_embeddings.npz"
+
+# Quiet period before incremental updates are written to disk (coalesces bursts)
+SAVE_DELAY_SECONDS = 2.0
+
+
+def skill_embedding_text(skill: Skill) -> str:
+    """Build the text that represents a skill in embedding space."""
+    text = f"{skill.name}: {skill.description}"
+    if skill.tags:
+        text += f" Tags: {', '.join(skill.tags)}"
+    return text
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving zero rows as zeros."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class SkillEmbeddingIndex:
+    """
+    Normalized embedding matrix over all registered skills.
+
+    Rows are kept in insertion order; ``_row`` maps skill_id -> row index.
+    Each row remembers the hash of the text it was computed from so a
+    persisted index can be reused across restarts and only stale rows are
+    re-embedded.
+
+    Usage:
+        index = SkillEmbeddingIndex()
+        await index.build(registry.list_all())
+
+        query_vec = await index.embed_query("write pytest tests")
+        for skill_id, score in index.search(query_vec, k=5):
+            ...
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = "text-embedding-3-small",
+        index_path: Optional[str] = DEFAULT_INDEX_PATH,
+        embeddings: Any = None,
+        save_delay: float = SAVE_DELAY_SECONDS
+    ):
+        """
+        Args:
+            embedding_model: OpenAI embedding model name
+            index_path: Where to persist the matrix (None disables persistence)
+            embeddings: Optional pre-built LangChain embeddings client
+            save_delay: Seconds of quiet before incremental updates are saved
+        """
+        self._embedding_model = embedding_model
+        self._index_path = Path(index_path) if index_path else None
+        self._embeddings = embeddings  # None = not yet initialized, False = unavailable
+        self._save_delay = save_delay
+        self._save_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        self._snapshots = 0  # sequence of the last snapshot taken
+        self._written = 0  # sequence of the last snapshot on disk
+
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._hashes: List[str] = []
+        self._matrix: Optional[np.ndarray] = None  # (n_skills, dim) float32, row-normalized
+
+    @property
+    def embedding_model(self) -> str:
+        return self._embedding_model
+
+    # ------------------------------------------------------------------
+    # Embeddings client
+    # ------------------------------------------------------------------
+
+    def get_embeddings(self):
+        """Lazy initialize embeddings client."""
+        if self._embeddings is None:
+            try:
+                from langchain_openai import OpenAIEmbeddings
+                self._embeddings = OpenAIEmbeddings(model=self._embedding_model)
+            except Exception as e:
+                logger.warning(f"Could not initialize embeddings: {e}")
+                self._embeddings = False  # Mark as failed
+        return self._embeddings if self._embeddings else None
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        """Embed a query and return it as a normalized float32 vector."""
+        embeddings = self.get_embeddings()
+        if not embeddings:
+            raise RuntimeError("Embeddings not available")
+
+        result = await embeddings.aembed_query(text)
+        return _normalize(np.asarray(result, dtype=np.float32))
+
+    async def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        embeddings = self.get_embeddings()
+        if not embeddings:
+            raise RuntimeError("Embeddings not available")
+
+        result = await embeddings.aembed_documents(texts)
+        return _normalize(np.asarray(result, dtype=np.float32))
+
+    # ------------------------------------------------------------------
+    # Building and incremental updates
+    # ------------------------------------------------------------------
+
+    async def build(self, skills: Iterable[Skill]) -> int:
+        """
+        (Re)build the matrix for the given skills.
+
+        Rows already present (in memory or in the persisted file) with an
+        unchanged text hash are reused; everything else is embedded in a
+        single batched call. Skills not in ``skills`` are dropped.
+
+        Returns:
+            Number of skills that had to be embedded
+        """
+        skills = list(skills)
+        if self._matrix is None:
+            self._load()
+
+        texts = {s.skill_id: skill_embedding_text(s) for s in skills}
+        wanted = {sid: _text_hash(text) for sid, text in texts.items()}
+
+        reusable = {
+            sid: self._matrix[row]
+            for sid, row in self._row.items()
+            if self._matrix is not None and wanted.get(sid) == self._hashes[row]
+        }
+        missing = [sid for sid in wanted if sid not in reusable]
+
+        fresh: Dict[str, np.ndarray] = {}
+        if missing:
+            vectors = await self._embed_documents([texts[sid] for sid in missing])
+            fresh = dict(zip(missing, vectors))
+            logger.info(f"Embedded {len(missing)} skill(s) in one batch")
+
+        ids = list(wanted.keys())
+        rows = [reusable[sid] if sid in reusable else fresh[sid] for sid in ids]
+        self._set_rows(ids, [wanted[sid] for sid in ids], rows)
+        await self.flush()
+        return len(missing)
+
+    async def ensure(self, skills: Iterable[Skill]) -> int:
+        """Embed any of ``skills`` not yet in the index, in one batch."""
+        skills = [s for s in skills if s.skill_id not in self._row]
+        if not skills:
+            return 0
+        if self._matrix is None:
+            self._load()
+            skills = [s for s in skills if s.skill_id not in self._row]
+            if not skills:
+                return 0
+
+        vectors = await self._embed_documents([skill_embedding_text(s) for s in skills])
+        for skill, vector in zip(skills, vectors):
+            self._put_row(skill.skill_id, _text_hash(skill_embedding_text(skill)), vector)
+        self._schedule_save()
+        return len(skills)
+
+    async def upsert(self, skill: Skill) -> bool:
+        """
+        Add or refresh a single skill's row.
+
+        Returns True if the skill had to be (re-)embedded.
+        """
+        text = skill_embedding_text(skill)
+        text_hash = _text_hash(text)
+        row = self._row.get(skill.skill_id)
+        if row is not None and self._hashes[row] == text_hash:
+            return False
+
+        vector = (await self._embed_documents([text]))[0]
+        self._put_row(skill.skill_id, text_hash, vector)
+        self._schedule_save()
+        return True
+
+    def remove(self, skill_id: str) -> bool:
+        """Drop a skill's row. Returns True if it was present."""
+        row = self._row.get(skill_id)
+        if row is None:
+            return False
+
+        keep = [i for i in range(len(self._ids)) if i != row]
+        self._set_rows(
+            [self._ids[i] for i in keep],
+            [self._hashes[i] for i in keep],
+            self._matrix[keep] if keep else []
+        )
+        self._schedule_save()
+        return True
+
+    def clear(self):
+        """Drop the in-memory matrix and the persisted copy."""
+        self._cancel_save()
+        self._ids, self._hashes, self._row = [], [], {}
+        self._matrix = None
+        if self._index_path and self._index_path.exists():
+            try:
+                self._index_path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove skill embedding index: {e}")
+
+    def _put_row(self, skill_id: str, text_hash: str, vector: np.ndarray):
+        row = self._row.get(skill_id)
+        if row is not None and self._matrix is not None and self._matrix.shape[1] == vector.shape[0]:
+            self._matrix[row] = vector
+            self._hashes[row] = text_hash
+            return
+
+        if self._matrix is not None and self._matrix.shape[1] != vector.shape[0]:
+            # Embedding model changed dimension; stale rows are unusable
+            logger.warning("Skill embedding dimension changed, discarding existing rows")
+            self._ids, self._hashes, self._row, self._matrix = [], [], {}, None
+
+        if self._matrix is None:
+            self._matrix = vector.reshape(1, -1).astype(np.float32, copy=True)
+        else:
+            self._matrix = np.vstack([self._matrix, vector.reshape(1, -1)])
+        self._row[skill_id] = len(self._ids)
+        self._ids.append(skill_id)
+        self._hashes.append(text_hash)
+
+    def _set_rows(self, ids: List[str], hashes: List[str], rows):
+        self._ids = list(ids)
+        self._hashes = list(hashes)
+        self._row = {sid: i for i, sid in enumerate(self._ids)}
+        self._matrix = np.vstack(rows).astype(np.float32, copy=False) if len(rows) else None
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        min_score: float = 0.0,
+        restrict_to: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Return the top-k (skill_id, cosine similarity) pairs, best first.
+
+        Args:
+            query_vector: Normalized query embedding (see embed_query)
+            k: Maximum number of results
+            min_score: Drop results scoring at or below this similarity
+            restrict_to: Optional set of skill_ids to consider
+        """
+        if self._matrix is None or k <= 0:
+            return []
+        if query_vector.shape[-1] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Query dimension {query_vector.shape[-1]} does not match "
+                f"index dimension {self._matrix.shape[1]}"
+            )
+
+        scores = self._matrix @ query_vector.astype(np.float32, copy=False)
+        if restrict_to is not None and len(restrict_to) < len(self._ids):
+            mask = np.fromiter((sid in restrict_to for sid in self._ids), dtype=bool, count=len(self._ids))
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (self._ids[i], float(scores[i]))
+            for i in top
+            if scores[i] > min_score
+        ]
+
+    def __contains__(self, skill_id: str) -> bool:
+        return skill_id in self._row
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> bool:
+        """Load the persisted matrix if it was built with the same model."""
+        if not self._index_path or not self._index_path.exists():
+            return False
+        try:
+            with np.load(self._index_path, allow_pickle=False) as data:
+                if str(data["model"]) != self._embedding_model:
+                    logger.info("Persisted skill embeddings use a different model, ignoring")
+                    return False
+                ids = [str(x) for x in data["ids"]]
+                hashes = [str(x) for x in data["hashes"]]
+                matrix = data["matrix"].astype(np.float32, copy=False)
+            self._set_rows(ids, hashes, matrix)
+            logger.debug(f"Loaded {len(ids)} skill embeddings from {self._index_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load skill embedding index: {e}")
+            return False
+
+    async def flush(self):
+        """Persist the matrix now (on a worker thread), replacing any pending save."""
+        if not self._index_path:
+            return
+        self._cancel_save()
+        await asyncio.to_thread(self._write, self._snapshot())
+
+    def _schedule_save(self):
+        """Save after ``save_delay`` seconds of quiet; later changes join the pending save."""
+        if not self._index_path:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._snapshot())  # No event loop to defer to
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._delayed_save())
+
+    async def _delayed_save(self):
+        await asyncio.sleep(self._save_delay)
+        # Detach first so changes made while writing schedule another save
+        self._save_task = None
+        await asyncio.to_thread(self._write, self._snapshot())
+
+    def _cancel_save(self):
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+
+    def _snapshot(self) -> Tuple[int, Dict[str, np.ndarray]]:
+        """Numbered copy of the persisted state, taken on the event loop thread."""
+        self._snapshots += 1
+        dim = self._matrix.shape[1] if self._matrix is not None else 0
+        return self._snapshots, {
+            "model": np.array(self._embedding_model),
+            "ids": np.array(self._ids, dtype=str),
+            "hashes": np.array(self._hashes, dtype=str),
+            "matrix": self._matrix.copy() if self._matrix is not None else np.zeros((0, dim), dtype=np.float32),
+        }
+
+    def _write(self, snapshot: Tuple[int, Dict[str, np.ndarray]]):
+        """Atomically persist a snapshot next to the other app data, unless a newer one is there."""
+        sequence, arrays = snapshot
+        with self._write_lock:
+            if sequence <= self._written:
+                return
+            try:
+                self._index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._index_path.with_suffix(".tmp.npz")
+                np.savez(tmp_path, **arrays)
+                os.replace(tmp_path, self._index_path)
+                self._written = sequence
+            except Exception as e:
+                logger.warning(f"Could not persist skill embedding index: {e}")
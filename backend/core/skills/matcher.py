@@ -10,10 +10,10 @@ Responsible for:
 - Semantic matching of user context to skills
 - Evaluating trigger conditions
 - Ranking skills by relevance
-- Caching embeddings for performance
+- Scoring against the registry's precomputed skill embedding matrix
 
 Matching Strategies:
-1. Semantic: Compare context embedding to skill description embeddings
+1. Semantic: One matrix-vector product against all skill embeddings
 2. Trigger: Evaluate skill trigger conditions against context
 3. Tag: Match context keywords to skill tags
 4. Explicit: Direct skill invocation by name
@@ -24,9 +24,8 @@ import re
 from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 
-import numpy as np
-
 from models.skill import Skill
+from core.skills.embeddings import SkillEmbeddingIndex
 from core.skills.registry import get_skill_registry
 
 logger = logging.getLogger(__name__)
@@ -69,23 +68,22 @@ class SkillMatcher:
         Initialize matcher with optional embedding model.
 
         Args:
-            embedding_model: OpenAI embedding model name for semantic matching
+            embedding_model: OpenAI embedding model name for semantic matching.
+                The registry's shared index is used when it has this model;
+                otherwise the matcher keeps its own in-memory index.
         """
         self._embedding_model = embedding_model
-        self._embeddings = None  # Lazy initialization
         self._registry = get_skill_registry()
-        self._embedding_cache: Dict[str, np.ndarray] = {}
+        # Skill embeddings live in the registry so they're built once at
+        # startup and kept in sync on create/update/reload.
+        self._index = self._registry.embedding_index
+        self._own_index = self._index.embedding_model != embedding_model
+        if self._own_index:
+            self._index = SkillEmbeddingIndex(embedding_model=embedding_model, index_path=None)
 
     def _get_embeddings(self):
-        """Lazy initialize embeddings client."""
-        if self._embeddings is None:
-            try:
-                from langchain_openai import OpenAIEmbeddings
-                self._embeddings = OpenAIEmbeddings(model=self._embedding_model)
-            except Exception as e:
-                logger.warning(f"Could not initialize embeddings: {e}")
-                self._embeddings = False  # Mark as failed
-        return self._embeddings if self._embeddings else None
+        """Get the embeddings client (None if unavailable)."""
+        return self._index.get_embeddings()
 
     async def find_relevant_skills(
         self,
@@ -170,26 +168,27 @@ class SkillMatcher:
             return self._keyword_match(query, skills, max_results)
 
         try:
-            # Get query embedding
-            query_embedding = await self._get_embedding(query)
-
-            matches = []
-            for skill in skills:
-                # Get or compute skill description embedding
-                skill_embedding = await self._get_skill_embedding(skill)
-
-                # Compute cosine similarity
-                similarity = self._cosine_similarity(query_embedding, skill_embedding)
-
-                if similarity > 0.3:  # Basic threshold before scoring
-                    matches.append(SkillMatch(
-                        skill=skill,
-                        score=similarity,
-                        match_reason='semantic'
-                    ))
-
-            matches.sort(key=lambda m: m.score, reverse=True)
-            return matches[:max_results]
+            if self._own_index:
+                # Not kept in sync by the registry: re-embed new or changed skills
+                await self._index.build(skills)
+            else:
+                # Embed any skills the registry hasn't indexed yet (single batch)
+                await self._index.ensure(skills)
+
+            query_embedding = await self._index.embed_query(query)
+
+            by_id = {skill.skill_id: skill for skill in skills}
+            ranked = self._index.search(
+                query_embedding,
+                k=max_results,
+                min_score=0.3,  # Basic threshold before scoring
+                restrict_to=set(by_id)
+            )
+
+            return [
+                SkillMatch(skill=by_id[skill_id], score=score, match_reason='semantic')
+                for skill_id, score in ranked
+            ]
 
         except Exception as e:
             logger.warning(f"Semantic embedding failed, using keyword fallback: {e}")
@@ -417,39 +416,9 @@ class SkillMatcher:
 
         return list(set(tags))  # Deduplicate
 
-    async def _get_embedding(self, text: str) -> np.ndarray:
-        """Get embedding for text."""
-        embeddings = self._get_embeddings()
-        if not embeddings:
-            raise RuntimeError("Embeddings not available")
-
-        result = await embeddings.aembed_query(text)
-        return np.array(result)
-
-    async def _get_skill_embedding(self, skill: Skill) -> np.ndarray:
-        """Get or compute embedding for skill description."""
-        if skill.skill_id not in self._embedding_cache:
-            # Create rich text for embedding
-            text = f"{skill.name}: {skill.description}"
-            if skill.tags:
-                text += f" Tags: {', '.join(skill.tags)}"
-
-            embedding = await self._get_embedding(text)
-            self._embedding_cache[skill.skill_id] = embedding
-
-        return self._embedding_cache[skill.skill_id]
-
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Compute cosine similarity between two vectors."""
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return float(np.dot(a, b) / (norm_a * norm_b))
-
     def clear_cache(self):
-        """Clear the embedding cache."""
-        self._embedding_cache.clear()
+        """Clear the skill embedding matrix (rebuilt on next match)."""
+        self._index.clear()
 
 
 # Singleton instance
@@ -11,6 +11,7 @@ Responsible for:
 - Syncing with database on changes
 - Providing query APIs (by ID, by tags, semantic search)
 - Managing skill lifecycle (load, reload, invalidate)
+- Keeping the skill embedding matrix in sync for semantic matching
 """
 
 import asyncio
@@ -23,6 +24,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.skill import Skill, SkillExecution, SkillSourceType, SkillInvocationType
 from core.skills.loader import SkillLoader, ParsedSkill, SkillDiscoveryResult
+from core.skills.embeddings import SkillEmbeddingIndex
 from db.database import get_async_session, AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
@@ -51,6 +53,7 @@ class SkillRegistry:
         self._loader = SkillLoader()
         self._initialized = False
         self._lock = asyncio.Lock()
+        self._embedding_index = SkillEmbeddingIndex()
 
     @classmethod
     def get_instance(cls) -> 'SkillRegistry':
@@ -103,6 +106,13 @@ class SkillRegistry:
 
             self._initialized = True
             logger.info(f"Skill registry initialized with {loaded_count} skills")
+
+            # Precompute the embedding matrix (one batched call for cold skills)
+            try:
+                await self._embedding_index.build(self._skills.values())
+            except Exception as e:
+                logger.warning(f"Skill embeddings unavailable, semantic matching will fall back: {e}")
+
             return loaded_count
 
     async def _load_and_index_skill(
@@ -275,7 +285,10 @@ class SkillRegistry:
                     None  # project_path not tracked on reload
                 )
                 await session.commit()
-                return success
+
+            if success:
+                await self._refresh_embedding(self._skills[skill_id])
+            return success
 
     async def reload_all(self, project_paths: Optional[List[str]] = None) -> int:
         """
@@ -325,13 +338,21 @@ class SkillRegistry:
                 # Update in-memory cache
                 self._skills[skill.skill_id] = skill
                 logger.info(f"Updated skill '{skill.skill_id}'")
-                return True
-
             except Exception as e:
                 logger.error(f"Failed to update skill '{skill.skill_id}': {e}")
                 await session.rollback()
                 return False
 
+        await self._refresh_embedding(skill)
+        return True
+
+    async def _refresh_embedding(self, skill: Skill):
+        """Update a single skill's row in the embedding matrix (non-fatal)."""
+        try:
+            await self._embedding_index.upsert(skill)
+        except Exception as e:
+            logger.warning(f"Could not refresh embedding for skill '{skill.skill_id}': {e}")
+
     async def delete_skill(self, skill_id: str) -> bool:
         """
         Delete a skill from the database and in-memory cache.
@@ -357,6 +378,7 @@ class SkillRegistry:
                     # Still remove from memory if present
                     if skill_id in self._skills:
                         del self._skills[skill_id]
+                    self._embedding_index.remove(skill_id)
                     return True
 
                 # Delete from database
@@ -366,6 +388,7 @@ class SkillRegistry:
                 # Remove from in-memory cache
                 if skill_id in self._skills:
                     del self._skills[skill_id]
+                self._embedding_index.remove(skill_id)
 
                 logger.info(f"Deleted skill '{skill_id}'")
                 return True
@@ -431,7 +454,9 @@ class SkillRegistry:
                 self._by_tag[tag_lower].add(skill_id)
 
             logger.info(f"Created new skill '{skill_id}'")
-            return skill
+
+        await self._refresh_embedding(skill)
+        return skill
 
     async def record_execution(
         self,
@@ -522,6 +547,11 @@ class SkillRegistry:
         """Get number of registered skills."""
         return len(self._skills)
 
+    @property
+    def embedding_index(self) -> SkillEmbeddingIndex:
+        """Precomputed embedding matrix used by SkillMatcher."""
+        return self._embedding_index
+
 
 # Singleton accessor
 _registry_instance: Optional[SkillRegistry] = None
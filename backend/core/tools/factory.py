@@ -29,6 +29,8 @@ from langchain_core.tools import StructuredTool, BaseTool
 from pydantic import BaseModel as PydanticBaseModel, create_model as create_pydantic_model, Field as PydanticField
 
 from models.custom_tool import ToolType, ToolTemplateType
+from core.http.clients import pooled_http_client
+from core.tools.polling import PollPolicy, PollTimeout, follow_location, get_callback_registry, poll_until_complete
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -557,26 +559,40 @@ class ToolFactory:
                 logger.error(f"API tool URL failed SSRF validation: {e}")
                 raise ValueError(f"URL validation failed: {e}")
 
+        response_parser = impl_config.get("response_parser", {})
+        parses_json = response_parser.get("type") == "json_path"
+
+        def parse_result(data: Any, text: str) -> str:
+            """Apply the response parser to a completed result."""
+            if parses_json:
+                # Simple JSON path extraction (e.g., "data.result")
+                result = data
+                for key in response_parser.get("path", "").split("."):
+                    result = result.get(key, {})
+                return str(result)
+            return text
+
         # Create async function for API call with polling support
         async def api_call_impl(**kwargs) -> str:
             """Execute the API call with provided parameters.
 
-            Supports long-running operations with polling:
+            Supports long-running operations (see core.tools.polling):
             - Auto-detects 202 Accepted responses with Location header (Smart Polling)
-            - Manual polling configuration via polling config
-            - Configurable timeout and poll intervals
+            - Manual polling configuration via polling config, with exponential
+              backoff and jitter, Retry-After, Location and progress hints
+            - Callback mode: the job POSTs its result back instead of being polled
             """
-            import asyncio
-            import time
-
             # Extract polling configuration
             polling_config = impl_config.get("polling", {})
-            poll_url_template = polling_config.get("url", "")
-            poll_interval = polling_config.get("interval", 5)
-            poll_timeout = polling_config.get("timeout", 300)
-            completion_condition = polling_config.get("completion_condition", "")
+            callback_mode = polling_config.get("mode") == "callback"
+            callbacks = get_callback_registry()
+            callback_token = None
 
             try:
+                if callback_mode:
+                    callback_token, callback_future = callbacks.register()
+                    kwargs = {**kwargs, "callback_url": callbacks.url(callback_token)}
+
                 # Substitute variables in URL
                 url = url_template.format(**kwargs)
 
@@ -597,11 +613,14 @@ class ToolFactory:
                 if method in ["POST", "PUT", "PATCH"] and body_template:
                     if isinstance(body_template, str):
                         body = body_template.format(**kwargs)
+                    elif callback_mode:
+                        callback_field = polling_config.get("callback_field", "callback_url")
+                        body = json.dumps({**body_template, callback_field: kwargs["callback_url"]})
                     else:
                         body = json.dumps(body_template)
 
                 # Make the initial request
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.request(
                         method=method,
                         url=url,
@@ -613,120 +632,72 @@ class ToolFactory:
                     # Check for errors
                     response.raise_for_status()
 
-                    # If no polling configured, return result immediately
-                    if not polling_config:
+                    if callback_mode:
+                        policy = PollPolicy.from_config(polling_config)
+                        logger.info(f"API call accepted, waiting for callback (timeout={policy.timeout:g}s)")
+                        payload = await callbacks.wait(callback_token, callback_future, policy.timeout)
+                        return parse_result(payload, payload if isinstance(payload, str) else json.dumps(payload))
+
+                    location = response.headers.get("location")
+                    smart = not polling_config
+                    poll_headers = formatted_headers
+                    if smart:
                         # Check for "Smart Polling" (202 Accepted)
-                        if response.status_code == 202:
-                            location = response.headers.get("location") or response.headers.get("Location")
-                            if location:
-                                logger.info(f"Smart Polling: Detected 202 Accepted with Location header. Starting auto-polling.")
-                                # Configure ad-hoc polling
-                                poll_url_template = location
-                                # If location is relative, construct absolute URL
-                                if poll_url_template.startswith("/"):
-                                    parsed_base = urlparse(url)
-                                    base_url = f"{parsed_base.scheme}://{parsed_base.netloc}"
-                                    poll_url_template = f"{base_url}{poll_url_template}"
-
-                                poll_interval = 2  # Default to 2s for smart polling
-                                poll_timeout = 300 # Default to 5m
-                                completion_condition = "status_code != 202" # Stop when not 202
-
-                                # Proceed to polling logic below
-                                polling_config = {"smart": True}
-                            else:
-                                # 202 but no location, return as is
-                                return response.text
-                        else:
+                        if response.status_code != 202:
                             # Standard response
-                            response_parser = impl_config.get("response_parser", {})
-                            if response_parser.get("type") == "json_path":
-                                json_data = response.json()
-                                path = response_parser.get("path", "")
-                                # Simple JSON path extraction (e.g., "data.result")
-                                result = json_data
-                                for key in path.split("."):
-                                    result = result.get(key, {})
-                                return str(result)
-                            else:
-                                return response.text
-
-                    # --- Polling Logic ---
-                    logger.info(f"API call successful, starting polling (timeout={poll_timeout}s)")
-                    start_time = time.time()
-
-                    # Helper to check completion condition
-                    def check_completion(data: Any, status: int, condition: str) -> bool:
-                        # Smart polling condition
-                        if condition == "status_code != 202":
-                            return status != 202
-
-                        # Simple implementation: "field == value"
-                        if "==" in condition:
-                            key, value = condition.split("==", 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-
-                            # Extract key from data
-                            current = data
-                            for k in key.split("."):
-                                if isinstance(current, dict):
-                                    current = current.get(k)
-                                else:
-                                    return False
-
-                            return str(current) == value
-                        return False
-
-                    # Polling loop
-                    while time.time() - start_time < poll_timeout:
-                        # Wait before next poll (wait first for 202s to give time)
-                        await asyncio.sleep(poll_interval)
-
-                        # Make polling request
-                        # For smart polling, the URL is fixed from Location header
-                        # For manual polling, re-format template
-                        if polling_config.get("smart"):
-                            poll_url = poll_url_template
-                        else:
-                            poll_url = poll_url_template.format(**kwargs) if poll_url_template else url
-
-                        async with httpx.AsyncClient(timeout=timeout) as poll_client:
-                            response = await poll_client.get(
-                                url=poll_url,
-                                headers=formatted_headers
+                            return parse_result(response.json() if parses_json else None, response.text)
+                        if not location:
+                            # 202 but no location, return as is
+                            return response.text
+                        logger.info("Smart Polling: Detected 202 Accepted with Location header. Starting auto-polling.")
+                        poll_url, poll_headers = await follow_location(
+                            response.url, location, url, formatted_headers, ToolFactory._validate_url_ssrf
+                        )
+                        completion_condition = "status_code != 202"  # Stop when not 202
+                    else:
+                        poll_url_template = polling_config.get("url", "")
+                        if poll_url_template:
+                            poll_url = poll_url_template.format(**kwargs)
+                        elif location and response.status_code == 202:
+                            poll_url, poll_headers = await follow_location(
+                                response.url, location, url, formatted_headers, ToolFactory._validate_url_ssrf
                             )
-                            # Don't raise for status immediately on smart polling as 202 is expected
-                            if not polling_config.get("smart"):
-                                response.raise_for_status()
-
-                        try:
-                            json_data = response.json()
-                        except:
-                            json_data = {}
-
-                        # Check if complete
-                        if check_completion(json_data, response.status_code, completion_condition):
-                            logger.info("Polling complete: Condition met")
-
-                            # Parse final response
-                            response_parser = impl_config.get("response_parser", {})
-                            if response_parser.get("type") == "json_path":
-                                path = response_parser.get("path", "")
-                                result = json_data
-                                for key in path.split("."):
-                                    result = result.get(key, {})
-                                return str(result)
-                            else:
-                                return response.text
+                        else:
+                            poll_url = url
+                        completion_condition = polling_config.get("completion_condition", "")
 
-                    return "Error: Polling timed out before completion condition was met"
+                    # --- Polling Logic ---
+                    # Polls reuse the pooled client of the initial request
+                    policy = PollPolicy.from_config(polling_config, smart=smart)
+                    logger.info(f"API call successful, starting polling (timeout={policy.timeout:g}s)")
+                    outcome = await poll_until_complete(
+                        client,
+                        poll_url,
+                        poll_headers,
+                        policy,
+                        completion_condition,
+                        # Don't raise for status on smart polling as 202 is expected
+                        raise_for_status=not smart,
+                        progress_path=polling_config.get("progress_path"),
+                        retry_after=response.headers.get("retry-after"),
+                        # Location hops are checked like the tool's own URL
+                        validate_url=ToolFactory._validate_url_ssrf,
+                        trusted_url=url
+                    )
+                    logger.info(f"Polling complete after {outcome.polls} polls ({outcome.elapsed:.1f}s)")
+                    return parse_result(outcome.data, outcome.response.text)
+            except PollTimeout as e:
+                logger.warning(f"API call did not complete: {e}")
+                return "Error: Polling timed out before completion condition was met"
             except httpx.TimeoutException:
                 logger.error(f"API call timed out after {timeout}s")
                 return f"Error: Request timed out after {timeout} seconds"
             except Exception as e:
                 logger.error(f"API call failed: {e}")
                 return f"Error: {str(e)}"
+            finally:
+                if callback_token:
+                    callbacks.discard(callback_token)
 
         # Create args schema
         args_schema = ToolFactory._create_pydantic_args_schema(
@@ -813,7 +784,7 @@ class ToolFactory:
                     payload["channel"] = default_channel
 
                 # Send to Slack
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.post(
                         webhook_url,
                         json=payload
@@ -946,7 +917,7 @@ class ToolFactory:
                     payload["embeds"] = [embed]
 
                 # Send to Discord
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.post(
                         target_webhook,
                         json=payload
@@ -1076,7 +1047,7 @@ class ToolFactory:
                         if tag_ids:
                             payload["tags"] = tag_ids
 
-                    async with httpx.AsyncClient(timeout=timeout) as client:
+                    async with pooled_http_client(timeout=timeout) as client:
                         response = await client.post(
                             f"{api_base}/posts",
                             headers=headers,
@@ -1104,7 +1075,7 @@ class ToolFactory:
                     if status:
                         payload["status"] = status
 
-                    async with httpx.AsyncClient(timeout=timeout) as client:
+                    async with pooled_http_client(timeout=timeout) as client:
                         response = await client.post(
                             f"{api_base}/posts/{post_id}",
                             headers=headers,
@@ -1120,7 +1091,7 @@ class ToolFactory:
                     if not post_id:
                         return "Error: post_id is required for publish_post action"
 
-                    async with httpx.AsyncClient(timeout=timeout) as client:
+                    async with pooled_http_client(timeout=timeout) as client:
                         response = await client.post(
                             f"{api_base}/posts/{post_id}",
                             headers=headers,
@@ -1136,7 +1107,7 @@ class ToolFactory:
                     if not post_id:
                         return "Error: post_id is required for delete_post action"
 
-                    async with httpx.AsyncClient(timeout=timeout) as client:
+                    async with pooled_http_client(timeout=timeout) as client:
                         response = await client.delete(
                             f"{api_base}/posts/{post_id}",
                             headers=headers
@@ -1150,7 +1121,7 @@ class ToolFactory:
                     if not post_id:
                         return "Error: post_id is required for get_post action"
 
-                    async with httpx.AsyncClient(timeout=timeout) as client:
+                    async with pooled_http_client(timeout=timeout) as client:
                         response = await client.get(
                             f"{api_base}/posts/{post_id}",
                             headers=headers
@@ -1180,7 +1151,7 @@ class ToolFactory:
             """Convert category names to IDs"""
             try:
                 cat_ids = []
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     for cat in category_names:
                         if isinstance(cat, int):
                             cat_ids.append(cat)
@@ -1203,7 +1174,7 @@ class ToolFactory:
             """Convert tag names to IDs, creating new tags if needed"""
             try:
                 tag_ids = []
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     for tag in tag_names:
                         if isinstance(tag, int):
                             tag_ids.append(tag)
@@ -1341,7 +1312,7 @@ class ToolFactory:
             }
 
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.post(
                         "https://api.openai.com/v1/images/generations",
                         json=payload,
@@ -1433,7 +1404,7 @@ class ToolFactory:
                 }
 
                 # Call OpenAI API
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.post(
                         "https://api.openai.com/v1/images/generations",
                         json=payload,
@@ -1516,7 +1487,7 @@ class ToolFactory:
                 }
 
                 # Call OpenAI Sora API (endpoint subject to change)
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.post(
                         "https://api.openai.com/v1/videos/generations",
                         json=payload,
@@ -1694,7 +1665,7 @@ class ToolFactory:
                     url = endpoint
 
                 # Call the appropriate API
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with pooled_http_client(timeout=timeout) as client:
                     response = await client.post(
                         url,
                         json=payload,
@@ -1902,7 +1873,7 @@ class ToolFactory:
                 logger.info(f"Calling Veo API: mode={mode}, model={model}, endpoint=predictLongRunning")
 
                 # Call Google AI Studio API - this starts an async operation
-                async with httpx.AsyncClient(timeout=60) as client:
+                async with pooled_http_client(timeout=60) as client:
                     response = await client.post(
                         endpoint,
                         json=payload,
@@ -0,0 +1,343 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Completion of long-running jobs started by API tools.
+
+ToolFactory's API tools hand off here when a call starts a job instead of
+returning its result, either through a ``polling`` block in the tool's
+implementation_config or a 202 Accepted response with a Location header
+("smart polling").
+
+Polling waits between requests with exponential backoff and jitter, and
+follows server hints:
+
+- ``Retry-After`` (seconds or HTTP date) on any poll response sets the next
+  delay
+- a 202 with a new ``Location`` moves polling to that URL
+- a 301/302/303/307/308 with ``Location`` means done; the result is fetched
+  from there
+- every Location-derived URL goes through the tool's SSRF validator, and
+  credential headers are only sent to the tool's own origin
+- a progress value (``progress_path``, 0-1 or 0-100) estimates the time
+  left, so polls land near the expected completion
+
+polling config keys: ``interval`` (first delay), ``max_interval``,
+``backoff`` (1 keeps a fixed interval), ``jitter`` (fraction),
+``timeout``, ``url``, ``completion_condition``, ``progress_path``.
+
+With ``"mode": "callback"`` the tool does not poll: a one-shot callback URL
+is passed to the job (``{callback_url}`` in the URL/header/body templates,
+or ``callback_field`` of a JSON body) and the tool waits until the service
+POSTs its result to /api/webhooks/tool-callback/{token}. Waiters live in
+process memory, so callbacks must reach the worker that started the job.
+"""
+
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Base URL external services use to reach this API for tool callbacks
+TOOL_CALLBACK_BASE_URL = os.getenv("TOOL_CALLBACK_BASE_URL", "http://localhost:8765").rstrip("/")
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Headers still sent when a Location points at another origin
+CROSS_ORIGIN_HEADERS = {"accept", "accept-encoding", "accept-language", "content-type", "user-agent"}
+
+
+class PollTimeout(Exception):
+    """The job did not complete within the polling timeout."""
+
+
+@dataclass
+class PollPolicy:
+    """Delays between polls: exponential backoff with jitter, capped."""
+    interval: float = 1.0
+    max_interval: float = 30.0
+    backoff: float = 2.0
+    jitter: float = 0.2
+    timeout: float = 300.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], smart: bool = False) -> "PollPolicy":
+        """Policy from a tool's ``polling`` config; smart polling starts faster."""
+        defaults = cls(interval=0.5, max_interval=10.0) if smart else cls()
+        return cls(
+            interval=float(config.get("interval", defaults.interval)),
+            max_interval=float(config.get("max_interval", defaults.max_interval)),
+            backoff=float(config.get("backoff", defaults.backoff)),
+            jitter=float(config.get("jitter", defaults.jitter)),
+            timeout=float(config.get("timeout", defaults.timeout)),
+        )
+
+    def delay(self, attempt: int, rng: random.Random = random) -> float:
+        """Delay before poll number ``attempt`` (0-based)."""
+        base = min(self.max_interval, self.interval * self.backoff ** attempt)
+        return self._jittered(base, rng)
+
+    def estimated_delay(self, remaining: float, rng: random.Random = random) -> float:
+        """Delay aimed at an estimated completion ``remaining`` seconds away."""
+        return self._jittered(max(self.interval, remaining), rng)
+
+    def _jittered(self, base: float, rng: random.Random = random) -> float:
+        if self.jitter:
+            base *= 1 + rng.uniform(-self.jitter, self.jitter)
+        return max(0.0, min(base, self.max_interval))
+
+
+@dataclass
+class PollOutcome:
+    response: httpx.Response
+    data: Any
+    polls: int
+    elapsed: float
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def _origin(url: httpx.URL):
+    return url.scheme, url.host, url.port
+
+
+async def follow_location(
+    response_url: Any,
+    location: str,
+    trusted_url: Any,
+    headers: Dict[str, str],
+    validate_url: Optional[Callable[[str], Any]] = None
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Resolve a Location header to the next URL and the headers to send there.
+
+    ``validate_url`` (e.g. ToolFactory._validate_url_ssrf) runs on the
+    resolved URL and raises to refuse it. Headers other than
+    CROSS_ORIGIN_HEADERS are dropped unless the URL shares
+    ``trusted_url``'s origin, so credentials never follow a redirect to
+    another host.
+    """
+    url = httpx.URL(str(response_url)).join(location)
+    if validate_url is not None:
+        await asyncio.to_thread(validate_url, str(url))
+    if _origin(url) != _origin(httpx.URL(str(trusted_url))):
+        headers = {k: v for k, v in headers.items() if k.lower() in CROSS_ORIGIN_HEADERS}
+    return str(url), headers
+
+
+def extract_path(data: Any, path: str) -> Any:
+    """Dotted-path lookup ("data.result") in decoded JSON."""
+    current = data
+    for key in path.split("."):
+        if not isinstance(current, dict):
+            return None
+        current = current.get(key)
+    return current
+
+
+def response_json(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return {}
+
+
+def check_completion(data: Any, status: int, condition: str) -> bool:
+    """Evaluate a completion condition: "status_code != 202" or "field == value"."""
+    if condition == "status_code != 202":
+        return status != 202
+
+    if "==" in condition:
+        key, value = condition.split("==", 1)
+        value = value.strip().strip('"').strip("'")
+        current = extract_path(data, key.strip())
+        return current is not None and str(current) == value
+    return False
+
+
+def _progress(data: Any, path: str) -> Optional[float]:
+    try:
+        value = float(extract_path(data, path))
+    except (TypeError, ValueError):
+        return None
+    if value > 1:
+        value /= 100
+    return value if 0 < value < 1 else None
+
+
+async def poll_until_complete(
+    client: Any,
+    url: str,
+    headers: Dict[str, str],
+    policy: PollPolicy,
+    condition: str,
+    raise_for_status: bool = True,
+    progress_path: Optional[str] = None,
+    retry_after: Optional[str] = None,
+    validate_url: Optional[Callable[[str], Any]] = None,
+    trusted_url: Optional[str] = None,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+) -> PollOutcome:
+    """
+    Poll ``url`` until ``condition`` holds, honoring server hints.
+
+    Args:
+        client: A PooledHttpClient (or httpx.AsyncClient)
+        url: First URL to poll (absolute)
+        headers: Headers sent with each poll
+        policy: Backoff policy and overall timeout
+        condition: Completion condition, see check_completion()
+        raise_for_status: Raise on error statuses (off for smart polling,
+            where 202 is expected)
+        progress_path: Optional dotted path of a progress value
+        retry_after: Retry-After of the response that started the job
+        validate_url: SSRF check for URLs taken from Location headers
+        trusted_url: URL whose origin may receive ``headers`` unfiltered
+            (default: ``url``); see follow_location()
+
+    Raises:
+        PollTimeout: If the condition is not met within policy.timeout
+    """
+    trusted_url = trusted_url or url
+    started = time.monotonic()
+    deadline = started + policy.timeout
+    hint = parse_retry_after(retry_after)
+    polls = 0
+
+    while True:
+        delay = hint if hint is not None else policy.delay(polls)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise PollTimeout(f"Polling timed out after {polls} polls ({policy.timeout:g}s)")
+        await sleep(min(delay, remaining))
+
+        response = await client.get(url, headers=headers)
+        polls += 1
+
+        location = response.headers.get("location")
+        if location and response.status_code in REDIRECT_STATUSES:
+            # Job finished; the result lives at Location
+            result_url, result_headers = await follow_location(
+                response.url, location, trusted_url, headers, validate_url
+            )
+            response = await client.get(result_url, headers=result_headers)
+            response.raise_for_status()
+            return PollOutcome(response, response_json(response), polls, time.monotonic() - started)
+
+        if raise_for_status:
+            response.raise_for_status()
+
+        data = response_json(response)
+        if check_completion(data, response.status_code, condition):
+            return PollOutcome(response, data, polls, time.monotonic() - started)
+
+        if location and response.status_code == 202:
+            url, headers = await follow_location(response.url, location, trusted_url, headers, validate_url)
+
+        hint = parse_retry_after(response.headers.get("retry-after"))
+        if hint is None and progress_path:
+            progress = _progress(data, progress_path)
+            if progress is not None:
+                # Aim the next poll at the estimated completion time
+                estimate = (time.monotonic() - started) * (1 - progress) / progress
+                hint = policy.estimated_delay(estimate)
+
+
+class CallbackRegistry:
+    """One-shot waiters for job results POSTed back by external services."""
+
+    def __init__(self, base_url: str = TOOL_CALLBACK_BASE_URL):
+        self.base_url = base_url
+        self._waiters: Dict[str, asyncio.Future] = {}
+
+    def register(self) -> Tuple[str, asyncio.Future]:
+        """New token and the future its callback resolves."""
+        token = secrets.token_urlsafe(24)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[token] = future
+        return token, future
+
+    def url(self, token: str) -> str:
+        return f"{self.base_url}/api/webhooks/tool-callback/{token}"
+
+    def resolve(self, token: str, payload: Any) -> bool:
+        """Deliver a callback payload; False if the token is unknown or expired."""
+        future = self._waiters.pop(token, None)
+        if future is None:
+            return False
+
+        def _set():
+            if not future.done():
+                future.set_result(payload)
+
+        # Callbacks may arrive on another thread or event loop
+        future.get_loop().call_soon_threadsafe(_set)
+        return True
+
+    def discard(self, token: str) -> None:
+        self._waiters.pop(token, None)
+
+    async def wait(self, token: str, future: asyncio.Future, timeout: float) -> Any:
+        """Wait for the callback, raising PollTimeout after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise PollTimeout(f"No callback received within {timeout:g}s")
+        finally:
+            self.discard(token)
+
+
+# Global callback registry instance
+_callback_registry: Optional[CallbackRegistry] = None
+
+
+def get_callback_registry() -> CallbackRegistry:
+    """Get the global tool callback registry."""
+    global _callback_registry
+    if _callback_registry is None:
+        _callback_registry = CallbackRegistry()
+    return _callback_registry
+
+
+__all__ = [
+    "PollTimeout",
+    "PollPolicy",
+    "PollOutcome",
+    "parse_retry_after",
+    "follow_location",
+    "extract_path",
+    "check_completion",
+    "poll_until_complete",
+    "CallbackRegistry",
+    "get_callback_registry",
+]
@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Startup Phase Timing
+
+Records how long each lifespan startup step takes (DB init, checkpointing,
+MCP, task queue, scheduler, file watchers) so slow boots can be attributed
+without attaching a profiler. Exposed via GET /health/startup.
+
+Usage:
+    from core.utils.startup_timing import startup_timer
+
+    with startup_timer.phase("db_init"):
+        await async_init_db()
+
+    startup_timer.log_summary()
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Collects named phase durations in the order they ran."""
+
+    def __init__(self):
+        self._process_start = time.perf_counter()
+        self._phases: List[Dict[str, Any]] = []
+        self._ready_at: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase. Failures are recorded and re-raised."""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            self._phases.append({
+                "name": name,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "status": status,
+            })
+
+    def mark_ready(self):
+        """Mark the point where the app starts serving requests."""
+        self._ready_at = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "phases": list(self._phases),
+            "total_phase_ms": round(sum(p["duration_ms"] for p in self._phases), 1),
+            "ready_after_ms": (
+                round((self._ready_at - self._process_start) * 1000, 1)
+                if self._ready_at is not None else None
+            ),
+        }
+
+    def log_summary(self):
+        summary = self.summary()
+        breakdown = ", ".join(f"{p['name']}={p['duration_ms']:.0f}ms" for p in summary["phases"])
+        logger.info(f"Startup phases: {breakdown} (ready after {summary['ready_after_ms']:.0f}ms)")
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,362 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Checkpoint compaction for finished workflow threads.
+
+A long workflow leaves one LangGraph checkpoint per superstep (hundreds with
+recursion_limit 500), plus pending writes and channel blobs, and none of the
+intermediate ones is read again once the thread has finished. The compactor
+picks finished threads from checkpoint_summaries that have been idle for
+CHECKPOINT_COMPACTION_MIN_IDLE_MINUTES and keeps, per thread:
+
+- the latest checkpoint (what resume / get_state reads)
+- anchors, per CHECKPOINT_COMPACTION_ANCHORS:
+    hitl   checkpoints in a HITL status or with a pending interrupt
+    node   the last checkpoint of each WorkflowState.current_step run
+    input  checkpoints created from graph input (metadata source "input")
+
+Everything else in the root namespace is deleted, with its pending writes
+and the channel blobs no kept checkpoint references. Deletes run in
+CHECKPOINT_COMPACTION_BATCH_SIZE batches, one short transaction each, so no
+lock is held for long. Reclaimed bytes (JSON text + blob sizes, an
+estimate of the on-disk size) are added to the thread's summary row and
+reported by CheckpointManager.get_checkpoint_count().
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from models.checkpoint_summary import CheckpointSummary
+from ..state import WorkflowStatus
+from .summary import HITL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Seconds between compaction runs (0 disables the background job)
+CHECKPOINT_COMPACTION_INTERVAL_SECONDS = int(os.getenv("CHECKPOINT_COMPACTION_INTERVAL_SECONDS", "3600"))
+# Finished threads are left alone until idle this long
+CHECKPOINT_COMPACTION_MIN_IDLE_MINUTES = int(os.getenv("CHECKPOINT_COMPACTION_MIN_IDLE_MINUTES", "60"))
+# Comma list of anchors kept besides the latest checkpoint: hitl, node, input
+CHECKPOINT_COMPACTION_ANCHORS = os.getenv("CHECKPOINT_COMPACTION_ANCHORS", "hitl,node")
+# Rows deleted per transaction
+CHECKPOINT_COMPACTION_BATCH_SIZE = int(os.getenv("CHECKPOINT_COMPACTION_BATCH_SIZE", "500"))
+# Threads compacted per run
+CHECKPOINT_COMPACTION_MAX_THREADS = int(os.getenv("CHECKPOINT_COMPACTION_MAX_THREADS", "200"))
+
+FINISHED_STATUSES = (
+    WorkflowStatus.PASSED.value,
+    WorkflowStatus.FAILED_EXECUTION.value,
+    WorkflowStatus.FAILED_VALIDATION.value,
+    WorkflowStatus.TERMINATED.value,
+    WorkflowStatus.HITL_REJECTED.value,
+)
+
+ANCHOR_TYPES = ("hitl", "node", "input")
+
+INTERRUPT_CHANNEL = "__interrupt__"
+
+
+@dataclass
+class CompactionResult:
+    """Totals of one compaction run."""
+    threads: int = 0
+    checkpoints_deleted: int = 0
+    writes_deleted: int = 0
+    blobs_deleted: int = 0
+    bytes_reclaimed: int = 0
+    batches: int = 0
+
+    def add(self, other: "CompactionResult"):
+        for field, value in asdict(other).items():
+            setattr(self, field, getattr(self, field) + value)
+
+
+def parse_anchors(value: str) -> Set[str]:
+    anchors = {a.strip().lower() for a in value.split(",") if a.strip()}
+    unknown = anchors - set(ANCHOR_TYPES)
+    if unknown:
+        logger.warning(f"Ignoring unknown checkpoint compaction anchors: {sorted(unknown)}")
+    return anchors & set(ANCHOR_TYPES)
+
+
+def _json(value: Any) -> Dict[str, Any]:
+    # JSONB comes back as dict from psycopg; as text from other drivers
+    if isinstance(value, (str, bytes)):
+        return json.loads(value)
+    return value or {}
+
+
+def select_kept_checkpoints(
+    checkpoints: Sequence[Dict[str, Any]],
+    interrupted: Set[str],
+    anchors: Set[str]
+) -> Set[str]:
+    """
+    IDs of the checkpoints to keep for one thread.
+
+    Args:
+        checkpoints: Rows ordered oldest first, each with "checkpoint_id",
+            "checkpoint" and "metadata" (decoded JSON)
+        interrupted: IDs of checkpoints with a pending interrupt write
+        anchors: Anchor types to keep (see ANCHOR_TYPES)
+
+    Returns:
+        Set of checkpoint IDs (always includes the latest)
+    """
+    if not checkpoints:
+        return set()
+
+    kept = {checkpoints[-1]["checkpoint_id"]}
+    previous_step = None
+    for index, row in enumerate(checkpoints):
+        values = row["checkpoint"].get("channel_values") or {}
+        checkpoint_id = row["checkpoint_id"]
+
+        if "hitl" in anchors and (checkpoint_id in interrupted or values.get("workflow_status") in HITL_STATUSES):
+            kept.add(checkpoint_id)
+        if "input" in anchors and row["metadata"].get("source") == "input":
+            kept.add(checkpoint_id)
+        if "node" in anchors:
+            step = values.get("current_step")
+            # Last checkpoint before current_step changes = state at the node boundary
+            if index and step != previous_step:
+                kept.add(checkpoints[index - 1]["checkpoint_id"])
+            previous_step = step
+
+    return kept
+
+
+def _batches(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CheckpointCompactor:
+    """Deletes intermediate checkpoints of finished threads in bounded batches."""
+
+    def __init__(
+        self,
+        engine=None,
+        anchors: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        min_idle_minutes: Optional[int] = None,
+        max_threads: Optional[int] = None,
+        interval_seconds: Optional[int] = None
+    ):
+        if engine is None:
+            from db.database import engine
+        self.engine = engine
+        self.anchors = parse_anchors(CHECKPOINT_COMPACTION_ANCHORS if anchors is None else anchors)
+        self.batch_size = max(1, batch_size or CHECKPOINT_COMPACTION_BATCH_SIZE)
+        self.min_idle_minutes = CHECKPOINT_COMPACTION_MIN_IDLE_MINUTES if min_idle_minutes is None else min_idle_minutes
+        self.max_threads = max_threads or CHECKPOINT_COMPACTION_MAX_THREADS
+        self.interval_seconds = CHECKPOINT_COMPACTION_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self._is_running = False
+        self.last_result: Optional[CompactionResult] = None
+
+    def find_candidates(self) -> List[str]:
+        """Finished, idle threads with checkpoints written since their last compaction."""
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=self.min_idle_minutes)
+        with Session(bind=self.engine) as db:
+            rows = db.query(CheckpointSummary.thread_id).filter(
+                CheckpointSummary.status.in_(FINISHED_STATUSES),
+                CheckpointSummary.updated_at < cutoff,
+                CheckpointSummary.checkpoint_count > 1,
+                (CheckpointSummary.compacted_at.is_(None)) |
+                (CheckpointSummary.compacted_at < CheckpointSummary.updated_at)
+            ).order_by(CheckpointSummary.updated_at).limit(self.max_threads).all()
+        return [row.thread_id for row in rows]
+
+    def compact_thread(self, thread_id: str) -> CompactionResult:
+        """Compact one thread's root namespace."""
+        result = CompactionResult(threads=1)
+        params = {"thread_id": thread_id}
+
+        with self.engine.connect() as conn:
+            checkpoints = [
+                {
+                    "checkpoint_id": row.checkpoint_id,
+                    "checkpoint": _json(row.checkpoint),
+                    "metadata": _json(row.metadata),
+                }
+                for row in conn.execute(text(
+                    "SELECT checkpoint_id, checkpoint, metadata FROM checkpoints "
+                    "WHERE thread_id = :thread_id AND checkpoint_ns = '' ORDER BY checkpoint_id"
+                ), params)
+            ]
+            interrupted = {
+                row.checkpoint_id for row in conn.execute(text(
+                    "SELECT DISTINCT checkpoint_id FROM checkpoint_writes "
+                    "WHERE thread_id = :thread_id AND checkpoint_ns = '' AND channel = :channel"
+                ), {**params, "channel": INTERRUPT_CHANNEL})
+            }
+
+        kept = select_kept_checkpoints(checkpoints, interrupted, self.anchors)
+        doomed = [row for row in checkpoints if row["checkpoint_id"] not in kept]
+
+        delete_writes = text(
+            "DELETE FROM checkpoint_writes WHERE thread_id = :thread_id AND checkpoint_ns = '' "
+            "AND checkpoint_id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        writes_size = text(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(blob)), 0) FROM checkpoint_writes "
+            "WHERE thread_id = :thread_id AND checkpoint_ns = '' AND checkpoint_id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        delete_checkpoints = text(
+            "DELETE FROM checkpoints WHERE thread_id = :thread_id AND checkpoint_ns = '' "
+            "AND checkpoint_id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+
+        for batch in _batches(doomed, self.batch_size):
+            ids = [row["checkpoint_id"] for row in batch]
+            with self.engine.begin() as conn:
+                writes, write_bytes = conn.execute(writes_size, {**params, "ids": ids}).one()
+                conn.execute(delete_writes, {**params, "ids": ids})
+                conn.execute(delete_checkpoints, {**params, "ids": ids})
+            result.batches += 1
+            result.checkpoints_deleted += len(ids)
+            result.writes_deleted += writes
+            result.bytes_reclaimed += int(write_bytes) + sum(
+                len(json.dumps(row["checkpoint"])) + len(json.dumps(row["metadata"])) for row in batch
+            )
+
+        # Blobs referenced by no kept checkpoint
+        referenced = {
+            (channel, str(version))
+            for row in checkpoints if row["checkpoint_id"] in kept
+            for channel, version in (row["checkpoint"].get("channel_versions") or {}).items()
+        }
+        with self.engine.connect() as conn:
+            orphans = [
+                (row.channel, row.version, int(row.size or 0))
+                for row in conn.execute(text(
+                    "SELECT channel, version, LENGTH(blob) AS size FROM checkpoint_blobs "
+                    "WHERE thread_id = :thread_id AND checkpoint_ns = ''"
+                ), params)
+                if (row.channel, str(row.version)) not in referenced
+            ]
+
+        delete_blob = text(
+            "DELETE FROM checkpoint_blobs WHERE thread_id = :thread_id AND checkpoint_ns = '' "
+            "AND channel = :channel AND version = :version"
+        )
+        for batch in _batches(orphans, self.batch_size):
+            with self.engine.begin() as conn:
+                conn.execute(delete_blob, [
+                    {**params, "channel": channel, "version": version} for channel, version, _ in batch
+                ])
+            result.batches += 1
+            result.blobs_deleted += len(batch)
+            result.bytes_reclaimed += sum(size for _, _, size in batch)
+
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "UPDATE checkpoint_summaries SET checkpoint_count = :kept, compacted_at = :now, "
+                "bytes_reclaimed = bytes_reclaimed + :bytes WHERE thread_id = :thread_id"
+            ), {
+                **params,
+                "kept": len(kept),
+                "now": datetime.datetime.now(datetime.timezone.utc),
+                "bytes": result.bytes_reclaimed,
+            })
+
+        return result
+
+    def compact(self) -> CompactionResult:
+        """Run one compaction pass over the candidate threads."""
+        total = CompactionResult()
+        for thread_id in self.find_candidates():
+            try:
+                total.add(self.compact_thread(thread_id))
+            except Exception as e:
+                logger.error(f"Checkpoint compaction failed for thread {thread_id}: {e}")
+
+        if total.threads:
+            logger.info(
+                f"Compacted {total.threads} checkpoint threads: {total.checkpoints_deleted} checkpoints, "
+                f"{total.writes_deleted} writes, {total.blobs_deleted} blobs, "
+                f"{total.bytes_reclaimed / 1e6:.1f} MB reclaimed"
+            )
+        self.last_result = total
+        return total
+
+    async def _run_loop(self):
+        while self._is_running:
+            try:
+                await asyncio.sleep(self.interval_seconds)
+                await asyncio.to_thread(self.compact)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in checkpoint compaction loop: {e}", exc_info=True)
+
+    async def start(self):
+        """Start periodic compaction (no-op if the interval is 0)."""
+        if self._is_running or self.interval_seconds <= 0:
+            return
+        self._is_running = True
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info(f"Checkpoint compaction started (every {self.interval_seconds}s, anchors: {sorted(self.anchors)})")
+
+    async def stop(self):
+        """Stop periodic compaction."""
+        if not self._is_running:
+            return
+        self._is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Checkpoint compaction stopped")
+
+
+# Global compactor instance
+_compactor: Optional[CheckpointCompactor] = None
+
+
+def get_checkpoint_compactor() -> CheckpointCompactor:
+    """Get the global checkpoint compactor."""
+    global _compactor
+    if _compactor is None:
+        _compactor = CheckpointCompactor()
+    return _compactor
+
+
+async def start_checkpoint_compaction():
+    """Start the global checkpoint compactor."""
+    await get_checkpoint_compactor().start()
+
+
+async def stop_checkpoint_compaction():
+    """Stop the global checkpoint compactor."""
+    global _compactor
+    if _compactor:
+        await _compactor.stop()
+        _compactor = None
+
+
+__all__ = [
+    "FINISHED_STATUSES",
+    "ANCHOR_TYPES",
+    "CompactionResult",
+    "CheckpointCompactor",
+    "select_kept_checkpoints",
+    "get_checkpoint_compactor",
+    "start_checkpoint_compaction",
+    "stop_checkpoint_compaction",
+]
@@ -127,8 +127,10 @@ async def initialize_checkpointer() -> PostgresSaver:
         await _connection_pool.open()
         logger.info("✓ Connection pool created and opened")
 
-        # Create checkpointer with the connection pool
-        _checkpointer = PostgresSaver(_connection_pool)
+        # Create checkpointer with the connection pool (also maintains
+        # the checkpoint_summaries table read by CheckpointManager)
+        from .summary import SummarizingCheckpointer
+        _checkpointer = SummarizingCheckpointer(_connection_pool)
 
         # Setup checkpoint tables (idempotent - safe to always call)
         logger.info("Creating/verifying checkpoint tables (with migrations)...")
@@ -0,0 +1,162 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Checkpoint summary maintenance.
+
+SummarizingCheckpointer is the AsyncPostgresSaver used by manager.py: after
+each root-graph checkpoint write it upserts the thread's row in
+checkpoint_summaries (models/checkpoint_summary.py) on the same connection
+pool, so CheckpointManager can list threads, pending HITL and failures
+without decoding the LangGraph checkpoint tables.
+
+A failed summary write is logged and never fails the checkpoint itself; the
+row is corrected by the thread's next checkpoint.
+"""
+
+import datetime
+import logging
+import re
+from typing import Any, Dict, Optional
+
+try:
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+except ImportError:  # optional, see manager.CHECKPOINTING_AVAILABLE
+    AsyncPostgresSaver = None
+
+from ..state import WorkflowStatus
+
+logger = logging.getLogger(__name__)
+
+HITL_STATUSES = (WorkflowStatus.AWAITING_HITL.value, WorkflowStatus.HITL_REVIEWING.value)
+FAILED_STATUSES = (
+    WorkflowStatus.FAILED_EXECUTION.value,
+    WorkflowStatus.FAILED_VALIDATION.value,
+    WorkflowStatus.TERMINATED.value,
+)
+
+# Thread IDs: "workflow_{workflow_id}_task_{task_id}" (executor) or "task_{task_id}"
+_THREAD_ID = re.compile(r"^(?:workflow_(\d+)_)?task_(\d+)$")
+
+# psycopg named parameters. Checkpoint IDs are time-ordered (uuid6), so the
+# WHERE keeps a late or replayed write of an older checkpoint from winning.
+UPSERT_SUMMARY_SQL = """
+INSERT INTO checkpoint_summaries (
+    thread_id, task_id, workflow_id, latest_checkpoint_id, latest_step, current_step,
+    status, hitl_pending, hitl_reason, error_message, retry_count, checkpoint_count,
+    created_at, updated_at
+) VALUES (
+    %(thread_id)s, %(task_id)s, %(workflow_id)s, %(checkpoint_id)s, %(step)s, %(current_step)s,
+    %(status)s, %(hitl_pending)s, %(hitl_reason)s, %(error_message)s, %(retry_count)s, 1,
+    %(ts)s, %(ts)s
+)
+ON CONFLICT (thread_id) DO UPDATE SET
+    task_id = COALESCE(excluded.task_id, checkpoint_summaries.task_id),
+    workflow_id = COALESCE(excluded.workflow_id, checkpoint_summaries.workflow_id),
+    latest_checkpoint_id = excluded.latest_checkpoint_id,
+    latest_step = excluded.latest_step,
+    current_step = excluded.current_step,
+    status = excluded.status,
+    hitl_pending = excluded.hitl_pending,
+    hitl_reason = excluded.hitl_reason,
+    error_message = excluded.error_message,
+    retry_count = excluded.retry_count,
+    checkpoint_count = checkpoint_summaries.checkpoint_count + CASE
+        WHEN checkpoint_summaries.latest_checkpoint_id = excluded.latest_checkpoint_id THEN 0 ELSE 1 END,
+    updated_at = excluded.updated_at
+WHERE excluded.latest_checkpoint_id >= checkpoint_summaries.latest_checkpoint_id
+"""
+
+DELETE_SUMMARY_SQL = "DELETE FROM checkpoint_summaries WHERE thread_id = %(thread_id)s"
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.value if isinstance(value, WorkflowStatus) else str(value)
+
+
+def summarize_checkpoint(thread_id: str, checkpoint: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summary row parameters for UPSERT_SUMMARY_SQL.
+
+    Workflow fields come from the checkpoint's channel values (WorkflowState);
+    task/workflow IDs fall back to the thread ID pattern.
+    """
+    values = checkpoint.get("channel_values") or {}
+    match = _THREAD_ID.match(thread_id)
+    status = _as_text(values.get("workflow_status"))
+
+    ts = checkpoint.get("ts")
+    try:
+        ts = datetime.datetime.fromisoformat(ts) if ts else None
+    except ValueError:
+        ts = None
+
+    return {
+        "thread_id": thread_id,
+        "task_id": _as_int(values.get("task_id")) or (int(match.group(2)) if match else None),
+        "workflow_id": _as_int(values.get("workflow_id")) or (_as_int(match.group(1)) if match else None),
+        "checkpoint_id": checkpoint["id"],
+        "step": _as_int((metadata or {}).get("step")),
+        "current_step": _as_text(values.get("current_step")),
+        "status": status,
+        "hitl_pending": status in HITL_STATUSES,
+        "hitl_reason": _as_text(values.get("hitl_reason")),
+        "error_message": _as_text(values.get("error_message")),
+        "retry_count": _as_int(values.get("retry_count")) or 0,
+        "ts": ts or datetime.datetime.now(datetime.timezone.utc),
+    }
+
+
+if AsyncPostgresSaver is not None:
+
+    class SummarizingCheckpointer(AsyncPostgresSaver):
+        """AsyncPostgresSaver that keeps checkpoint_summaries up to date."""
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            next_config = await super().aput(config, checkpoint, metadata, new_versions)
+
+            configurable = config["configurable"]
+            # Subgraph checkpoints (non-empty namespace) don't describe the workflow
+            if not configurable.get("checkpoint_ns"):
+                try:
+                    params = summarize_checkpoint(str(configurable["thread_id"]), checkpoint, metadata)
+                    async with self._cursor() as cur:
+                        await cur.execute(UPSERT_SUMMARY_SQL, params)
+                except Exception as e:
+                    logger.warning(f"Failed to update checkpoint summary for {configurable.get('thread_id')}: {e}")
+
+            return next_config
+
+        async def adelete_thread(self, thread_id: str) -> None:
+            await super().adelete_thread(thread_id)
+            # The checkpoints are gone either way; a missing summaries table
+            # (migration not applied yet) must not fail the delete
+            try:
+                async with self._cursor() as cur:
+                    await cur.execute(DELETE_SUMMARY_SQL, {"thread_id": str(thread_id)})
+            except Exception as e:
+                logger.warning(f"Failed to delete checkpoint summary for {thread_id}: {e}")
+
+else:
+    SummarizingCheckpointer = None
+
+
+__all__ = [
+    "HITL_STATUSES",
+    "FAILED_STATUSES",
+    "UPSERT_SUMMARY_SQL",
+    "DELETE_SUMMARY_SQL",
+    "summarize_checkpoint",
+    "SummarizingCheckpointer",
+]
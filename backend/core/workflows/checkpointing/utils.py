@@ -13,26 +13,50 @@ This module provides tools for:
 - Managing HITL workflows
 """
 
+import asyncio
 import logging
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import text
+from sqlalchemy import text, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import engine, get_db
+from db import engine, get_db, SessionLocal
+from models.checkpoint_summary import CheckpointSummary
 from .manager import get_checkpointer
+from .summary import FAILED_STATUSES
 from ..state import WorkflowState, WorkflowStatus
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver as PostgresSaver
 
 logger = logging.getLogger(__name__)
 
 
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
 class CheckpointManager:
-    """Manager for workflow checkpoint operations."""
+    """
+    Manager for workflow checkpoint operations.
+
+    Listing, HITL, failure and statistics queries read the per-thread
+    checkpoint_summaries table (kept current by SummarizingCheckpointer)
+    instead of scanning the LangGraph checkpoint tables.
+    """
 
-    def __init__(self):
+    def __init__(self, session_factory=None):
         self.checkpointer = None
+        self._session_factory = session_factory or SessionLocal
+
+    async def _query(self, fn):
+        """Run a sync summary query off the event loop."""
+        def run():
+            db = self._session_factory()
+            try:
+                return fn(db)
+            finally:
+                db.close()
+        return await asyncio.to_thread(run)
 
     async def initialize(self):
         """Initialize the checkpoint manager."""
@@ -106,64 +130,52 @@ class CheckpointManager:
         self,
         thread_id: Optional[str] = None,
         status: Optional[WorkflowStatus] = None,
-        limit: int = 50
+        limit: int = 50,
+        workflow_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
-        List checkpoints matching the given criteria.
+        List the latest checkpoint of each workflow thread matching the criteria.
 
         Args:
-            thread_id: Optional filter by thread ID
+            thread_id: Optional filter by thread ID (exact, or prefix of "<thread_id>_...")
             status: Optional filter by workflow status
             limit: Maximum number of results
+            workflow_id: Optional filter by workflow
 
         Returns:
-            List of checkpoint summaries
+            List of checkpoint summaries, most recently updated first
         """
-        try:
-            async with engine.begin() as conn:
-                query = """
-                    SELECT
-                        checkpoint_id,
-                        checkpoint->'channel_values'->>'task_id' as task_id,
-                        checkpoint->'channel_values'->>'workflow_status' as workflow_status,
-                        checkpoint->'channel_values'->>'current_step' as current_step,
-                        checkpoint->'channel_values'->>'retry_count' as retry_count,
-                        created_at,
-                        metadata
-                    FROM checkpoints
-                    WHERE checkpoint_namespace = 'langconfig_workflows'
-                """
-
-                params = {}
+        def query(db):
+            q = db.query(CheckpointSummary)
+            if thread_id:
+                q = q.filter(or_(
+                    CheckpointSummary.thread_id == thread_id,
+                    CheckpointSummary.thread_id.like(f"{thread_id}\\_%", escape="\\")
+                ))
+            if workflow_id is not None:
+                q = q.filter(CheckpointSummary.workflow_id == workflow_id)
+            if status:
+                q = q.filter(CheckpointSummary.status == status.value)
+            return q.order_by(CheckpointSummary.updated_at.desc()).limit(limit).all()
 
-                if thread_id:
-                    query += " AND checkpoint_id LIKE :thread_pattern"
-                    params["thread_pattern"] = f"{thread_id}%"
-
-                if status:
-                    query += " AND checkpoint->'channel_values'->>'workflow_status' = :status"
-                    params["status"] = status.value
-
-                query += " ORDER BY created_at DESC LIMIT :limit"
-                params["limit"] = limit
-
-                result = await conn.execute(text(query), params)
-                rows = result.fetchall()
-
-                checkpoints = []
-                for row in rows:
-                    checkpoints.append({
-                        "checkpoint_id": row[0],
-                        "task_id": row[1],
-                        "workflow_status": row[2],
-                        "current_step": row[3],
-                        "retry_count": row[4],
-                        "created_at": row[5].isoformat() if row[5] else None,
-                        "metadata": row[6]
-                    })
+        try:
+            rows = await self._query(query)
+            checkpoints = [
+                {
+                    "checkpoint_id": row.latest_checkpoint_id,
+                    "thread_id": row.thread_id,
+                    "task_id": row.task_id,
+                    "workflow_status": row.status,
+                    "current_step": row.current_step,
+                    "retry_count": row.retry_count,
+                    "created_at": _isoformat(row.updated_at),
+                    "metadata": {"step": row.latest_step, "checkpoint_count": row.checkpoint_count}
+                }
+                for row in rows
+            ]
 
-                logger.info(f"Found {len(checkpoints)} checkpoints")
-                return checkpoints
+            logger.info(f"Found {len(checkpoints)} checkpoints")
+            return checkpoints
 
         except Exception as e:
             logger.error(f"Failed to list checkpoints: {e}")
@@ -176,37 +188,28 @@ class CheckpointManager:
         Returns:
             List of workflows in AWAITING_HITL or HITL_REVIEWING status
         """
+        def query(db):
+            return db.query(CheckpointSummary).filter(
+                CheckpointSummary.hitl_pending
+            ).order_by(CheckpointSummary.updated_at.desc()).all()
+
         try:
-            async with engine.begin() as conn:
-                result = await conn.execute(text("""
-                    SELECT DISTINCT ON (checkpoint_id)
-                        checkpoint_id,
-                        checkpoint->'channel_values'->>'task_id' as task_id,
-                        checkpoint->'channel_values'->>'workflow_status' as workflow_status,
-                        checkpoint->'channel_values'->>'hitl_reason' as hitl_reason,
-                        checkpoint->'channel_values'->>'execution_plan' as execution_plan,
-                        created_at
-                    FROM checkpoints
-                    WHERE checkpoint_namespace = 'langconfig_workflows'
-                    AND checkpoint->'channel_values'->>'workflow_status' IN ('AWAITING_HITL', 'HITL_REVIEWING')
-                    ORDER BY checkpoint_id, created_at DESC
-                """))
-
-                rows = result.fetchall()
-
-                hitl_workflows = []
-                for row in rows:
-                    hitl_workflows.append({
-                        "checkpoint_id": row[0],
-                        "task_id": int(row[1]) if row[1] else None,
-                        "workflow_status": row[2],
-                        "hitl_reason": row[3],
-                        "execution_plan": row[4],
-                        "created_at": row[5].isoformat() if row[5] else None
-                    })
-
-                logger.info(f"Found {len(hitl_workflows)} workflows awaiting HITL")
-                return hitl_workflows
+            rows = await self._query(query)
+            hitl_workflows = [
+                {
+                    "checkpoint_id": row.latest_checkpoint_id,
+                    "thread_id": row.thread_id,
+                    "task_id": row.task_id,
+                    "workflow_status": row.status,
+                    "hitl_reason": row.hitl_reason,
+                    "current_step": row.current_step,
+                    "created_at": _isoformat(row.updated_at)
+                }
+                for row in rows
+            ]
+
+            logger.info(f"Found {len(hitl_workflows)} workflows awaiting HITL")
+            return hitl_workflows
 
         except Exception as e:
             logger.error(f"Failed to retrieve HITL pending workflows: {e}")
@@ -225,41 +228,31 @@ class CheckpointManager:
         Returns:
             List of failed workflows
         """
+        def query(db):
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
+            return db.query(CheckpointSummary).filter(
+                CheckpointSummary.status.in_(FAILED_STATUSES),
+                CheckpointSummary.updated_at > since
+            ).order_by(CheckpointSummary.updated_at.desc()).all()
+
         try:
-            async with engine.begin() as conn:
-                result = await conn.execute(text("""
-                    SELECT DISTINCT ON (checkpoint_id)
-                        checkpoint_id,
-                        checkpoint->'channel_values'->>'task_id' as task_id,
-                        checkpoint->'channel_values'->>'workflow_status' as workflow_status,
-                        checkpoint->'channel_values'->>'error_message' as error_message,
-                        checkpoint->'channel_values'->>'retry_count' as retry_count,
-                        checkpoint->'channel_values'->>'current_step' as current_step,
-                        created_at
-                    FROM checkpoints
-                    WHERE checkpoint_namespace = 'langconfig_workflows'
-                    AND checkpoint->'channel_values'->>'workflow_status' IN
-                        ('FAILED_EXECUTION', 'FAILED_VALIDATION', 'TERMINATED')
-                    AND created_at > NOW() - INTERVAL ':hours hours'
-                    ORDER BY checkpoint_id, created_at DESC
-                """), {"hours": hours})
-
-                rows = result.fetchall()
-
-                failed_workflows = []
-                for row in rows:
-                    failed_workflows.append({
-                        "checkpoint_id": row[0],
-                        "task_id": int(row[1]) if row[1] else None,
-                        "workflow_status": row[2],
-                        "error_message": row[3],
-                        "retry_count": int(row[4]) if row[4] else 0,
-                        "current_step": row[5],
-                        "created_at": row[6].isoformat() if row[6] else None
-                    })
-
-                logger.info(f"Found {len(failed_workflows)} failed workflows in last {hours} hours")
-                return failed_workflows
+            rows = await self._query(query)
+            failed_workflows = [
+                {
+                    "checkpoint_id": row.latest_checkpoint_id,
+                    "thread_id": row.thread_id,
+                    "task_id": row.task_id,
+                    "workflow_status": row.status,
+                    "error_message": row.error_message,
+                    "retry_count": row.retry_count,
+                    "current_step": row.current_step,
+                    "created_at": _isoformat(row.updated_at)
+                }
+                for row in rows
+            ]
+
+            logger.info(f"Found {len(failed_workflows)} failed workflows in last {hours} hours")
+            return failed_workflows
 
         except Exception as e:
             logger.error(f"Failed to retrieve failed workflows: {e}")
@@ -336,32 +329,33 @@ class CheckpointManager:
         Get statistics about checkpoints in the database.
 
         Returns:
-            Dictionary with checkpoint counts by status
+            Dictionary with checkpoint and thread counts, threads by latest
+            status, and bytes reclaimed by checkpoint compaction
         """
-        try:
-            async with engine.begin() as conn:
-                result = await conn.execute(text("""
-                    SELECT
-                        checkpoint->'channel_values'->>'workflow_status' as status,
-                        COUNT(*) as count
-                    FROM checkpoints
-                    WHERE checkpoint_namespace = 'langconfig_workflows'
-                    GROUP BY checkpoint->'channel_values'->>'workflow_status'
-                """))
+        def query(db):
+            return db.query(
+                CheckpointSummary.status,
+                func.count(),
+                func.sum(CheckpointSummary.checkpoint_count),
+                func.sum(CheckpointSummary.bytes_reclaimed)
+            ).group_by(CheckpointSummary.status).all()
 
-                rows = result.fetchall()
+        try:
+            rows = await self._query(query)
 
-                stats = {
-                    "total": sum(row[1] for row in rows),
-                    "by_status": {row[0]: row[1] for row in rows if row[0]}
-                }
+            stats = {
+                "total": sum(row[2] or 0 for row in rows),
+                "threads": sum(row[1] for row in rows),
+                "by_status": {row[0]: row[1] for row in rows if row[0]},
+                "bytes_reclaimed": sum(row[3] or 0 for row in rows)
+            }
 
-                logger.debug(f"Checkpoint stats: {stats}")
-                return stats
+            logger.debug(f"Checkpoint stats: {stats}")
+            return stats
 
         except Exception as e:
             logger.error(f"Failed to get checkpoint count: {e}")
-            return {"total": 0, "by_status": {}}
+            return {"total": 0, "threads": 0, "by_status": {}, "bytes_reclaimed": 0}
 
 
 # Global checkpoint manager instance
@@ -452,7 +446,9 @@ async def get_checkpoint_statistics() -> Dict[str, Any]:
 
     return {
         "total_checkpoints": counts["total"],
+        "total_threads": counts["threads"],
         "by_status": counts["by_status"],
+        "bytes_reclaimed": counts["bytes_reclaimed"],
         "hitl_pending": len(hitl_workflows),
         "recent_failures_24h": len(recent_failures),
         "hitl_workflows": hitl_workflows,
@@ -38,6 +38,7 @@ from langchain_core.agents import AgentAction, AgentFinish
 
 # Import artifact store from tool factory
 from core.tools.factory import get_pending_artifacts
+from core.workflows.events.spans import get_recorder, timed
 
 logger = logging.getLogger(__name__)
 
@@ -474,6 +475,12 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
             "node_id": node_id  # Needed to group tools with parent agent in frontend
         }
 
+        self._start_span(
+            f"node:{node_id}" if node_id else f"chain:{node_name}",
+            "node" if node_id else "chain",
+            run_id, parent_run_id
+        )
+
         # SIMPLIFIED EVENT EMISSION:
         # Only emit agent_label (user-friendly name that matches canvas nodes)
         # Removed node_name, node_type, agent_type to prevent duplication/confusion
@@ -505,6 +512,7 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
         Maps to NODE_COMPLETE events for workflow visualization.
         """
         logger.debug(f"[CHAIN END] run_id={run_id}")
+        self._end_span(run_id)
 
         # Sanitize outputs if enabled
         sanitized_outputs = self._sanitize_arguments(outputs) if self.enable_sanitization else outputs
@@ -570,6 +578,7 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
         error_type = type(error).__name__
 
         logger.error(f"[CHAIN ERROR] {error_type}: {error_message} (run_id={run_id})")
+        self._end_span(run_id, error=error_type)
 
         await self._emit_event(
             event_type="CHAIN_ERROR",
@@ -647,6 +656,11 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
         subagent_tool_patterns = ['task', 'delegate', 'handoff', 'invoke_agent', 'call_agent', 'run_agent']
         is_subagent_tool = tool_name.lower() in subagent_tool_patterns or 'subagent' in tool_name.lower()
 
+        self._start_span(
+            f"tool:{tool_name}", "subagent" if is_subagent_tool else "tool",
+            run_id, parent_run_id, node_id=node_id
+        )
+
         # DEBUG: Log all tool calls to help identify subagent patterns
         logger.info(f"[TOOL DEBUG] tool_name={tool_name}, inputs_keys={list(inputs.keys()) if inputs else 'None'}, is_subagent={is_subagent_tool}")
 
@@ -773,6 +787,7 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
         Supports multimodal content (images, audio, files) from MCP tools.
         """
         logger.debug(f"[TOOL END] run_id={run_id}")
+        self._end_span(run_id)
 
         # Look up tool info from on_tool_start (includes tool_name, agent_label, and node_id)
         tool_info = self.current_tool_info.get(run_id, {})
@@ -964,6 +979,7 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
                     )
 
         logger.error(f"[TOOL ERROR] {error_type}: {error_message} (run_id={run_id})")
+        self._end_span(run_id, error=error_type)
 
         # Check if this was a subagent tool - emit SUBAGENT_ERROR instead of TOOL_ERROR
         if run_id in self.active_subagents:
@@ -1093,6 +1109,49 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
     # LLM Hooks (for token tracking)
     # =========================================================================
 
+    async def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        """
+        Called when a chat model call starts.
+
+        Only opens a timing span; the LLM_END event carries the usage.
+        """
+        self._start_span(self._llm_span_name(serialized, metadata), "llm", run_id, parent_run_id)
+
+    async def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        """Called when a completion-style LLM call starts (timing span only)."""
+        self._start_span(self._llm_span_name(serialized, metadata), "llm", run_id, parent_run_id)
+
+    async def on_llm_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any
+    ) -> None:
+        """Called when an LLM call fails (timing span only; the chain error is emitted)."""
+        self._end_span(run_id, error=type(error).__name__)
+
     async def on_llm_end(
         self,
         response: LLMResult,
@@ -1107,6 +1166,7 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
         Tracks token usage for cost monitoring.
         """
         self.llm_call_count += 1
+        self._end_span(run_id)
 
         # Extract token usage if available
         if response.llm_output and "token_usage" in response.llm_output:
@@ -1206,6 +1266,37 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
                 }
             )
 
+    # =========================================================================
+    # Timing Spans (see core/workflows/events/spans.py)
+    # =========================================================================
+
+    def _start_span(
+        self,
+        name: str,
+        kind: str,
+        run_id: UUID,
+        parent_run_id: Optional[UUID],
+        **attributes: Any
+    ) -> None:
+        """Open a span for a callback run, nested under its parent run's span."""
+        recorder = get_recorder(self.task_id)
+        if recorder is not None:
+            recorder.start(
+                name, kind=kind, key=str(run_id),
+                parent_key=str(parent_run_id) if parent_run_id else None,
+                **attributes
+            )
+
+    def _end_span(self, run_id: UUID, error: Optional[str] = None) -> None:
+        recorder = get_recorder(self.task_id)
+        if recorder is not None:
+            recorder.end(str(run_id), error=error)
+
+    @staticmethod
+    def _llm_span_name(serialized: Optional[Dict[str, Any]], metadata: Optional[Dict[str, Any]]) -> str:
+        model = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name") or "unknown"
+        return f"llm:{model}"
+
     def _get_subagent_context_for_run(
         self,
         run_id: UUID,
@@ -1559,6 +1650,8 @@ class ExecutionEventCallbackHandler(AsyncCallbackHandler):
 
         return sanitized
 
+    # Once per event, streamed tokens included: aggregated, not one span each
+    @timed("db.persist_event", kind="db")
     async def _persist_event_to_database(
         self,
         event_type: str,
@@ -0,0 +1,381 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Timing Span Recorder
+
+Records where a workflow run spends its time as a tree of spans, one
+recorder per task. The active recorder and the current parent span live in
+context variables, so anything awaited inside a run (nodes, subagents,
+tools spawned with asyncio.create_task) records into the right tree without
+passing handles around.
+
+Usage:
+
+    from core.workflows.events.spans import record_spans, span, traced
+
+    # Around a workflow run (done by SimpleWorkflowExecutor.execute_workflow)
+    with record_spans(task_id, "workflow:research"):
+        ...
+
+    # Around any block
+    with span("rag.retrieve", kind="retrieval", project_id=7):
+        ...
+
+    # Around a function (sync or async)
+    @traced("agent_factory.create_agent", kind="agent_build")
+    async def create_agent(...): ...
+
+    # High-frequency operations (one per streamed token): aggregate timing
+    # only - count, total and max per name - instead of one span per call
+    @timed("db.persist_event", kind="db")
+    async def persist(...): ...
+
+    # Callback-driven spans that start and end in different calls
+    recorder = get_recorder(task_id)
+    recorder.start("llm:gpt-5.4", kind="llm", key=str(run_id), parent_key=str(parent_run_id))
+    recorder.end(str(run_id))
+
+    # Flame-style summary (GET /api/orchestration/tasks/{task_id}/profile)
+    get_recorder(task_id).summary()
+
+Outside a recording every helper is a no-op.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Spans kept per task (later spans are counted but not stored)
+SPAN_RECORDER_MAX_SPANS = int(os.getenv("SPAN_RECORDER_MAX_SPANS", "20000"))
+# Recorders kept in memory (oldest tasks are dropped first)
+SPAN_RECORDER_MAX_TASKS = int(os.getenv("SPAN_RECORDER_MAX_TASKS", "50"))
+
+_active_recorder: ContextVar[Optional["SpanRecorder"]] = ContextVar("span_recorder", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+    span_id: str
+    name: str
+    kind: str
+    parent_id: Optional[str]
+    start: float
+    end: Optional[float] = None
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def duration_ms(self, now: Optional[float] = None) -> float:
+        end = self.end if self.end is not None else (now or time.perf_counter())
+        return (end - self.start) * 1000
+
+
+class SpanRecorder:
+    """Span tree for one task."""
+
+    def __init__(self, task_id: int, max_spans: int = SPAN_RECORDER_MAX_SPANS):
+        self.task_id = task_id
+        self.max_spans = max_spans
+        self.started_at = time.time()
+        self.root_id: Optional[str] = None
+        self.dropped = 0
+        self._spans: Dict[str, Span] = {}
+        self._keys: Dict[str, str] = {}  # external key (e.g. callback run_id) -> span_id
+        self._timings: Dict[str, Dict[str, Any]] = {}  # name -> aggregate, see observe()
+
+    def start(
+        self,
+        name: str,
+        kind: str = "span",
+        parent_id: Optional[str] = None,
+        key: Optional[str] = None,
+        parent_key: Optional[str] = None,
+        **attributes
+    ) -> Optional[str]:
+        """
+        Open a span and return its id (None once the span limit is hit).
+
+        The parent is, in order: ``parent_id``, the span registered under
+        ``parent_key``, the context's current span, then the root span.
+        """
+        if len(self._spans) >= self.max_spans:
+            self.dropped += 1
+            return None
+
+        if parent_id is None and parent_key is not None:
+            parent_id = self._keys.get(parent_key)
+        if parent_id is None:
+            parent_id = _current_span.get() if _active_recorder.get() is self else None
+        if parent_id not in self._spans:
+            parent_id = self.root_id
+
+        span_id = uuid4().hex[:16]
+        self._spans[span_id] = Span(
+            span_id=span_id, name=name, kind=kind, parent_id=parent_id,
+            start=time.perf_counter(), attributes=attributes
+        )
+        if key is not None:
+            self._keys[key] = span_id
+        if self.root_id is None:
+            self.root_id = span_id
+        return span_id
+
+    def end(self, span_id_or_key: Optional[str], error: Optional[str] = None):
+        """Close a span by id or by the key it was started with."""
+        if span_id_or_key is None:
+            return
+        span_id = self._keys.pop(span_id_or_key, span_id_or_key)
+        span = self._spans.get(span_id)
+        if span is not None and span.end is None:
+            span.end = time.perf_counter()
+            span.error = error
+
+    def observe(self, name: str, seconds: float, kind: str = "span", error: bool = False):
+        """Add one call to the aggregate timing for ``name`` (no span is stored)."""
+        entry = self._timings.get(name)
+        if entry is None:
+            entry = self._timings[name] = {"kind": kind, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0}
+        ms = seconds * 1000
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+        entry["errors"] += bool(error)
+
+    @property
+    def spans(self) -> List[Span]:
+        return list(self._spans.values())
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Flame-style breakdown of the run.
+
+        Returns:
+            {
+              "task_id", "started_at", "span_count", "dropped_spans",
+              "total_ms": root span duration,
+              "tree": {name, kind, count, total_ms, self_ms, errors, children: [...]},
+              "by_kind": {kind: {"count", "total_ms"}},
+              "slowest": [{name, kind, duration_ms, attributes}] (top N),
+              "folded": ["root;child;grandchild <self_ms>", ...],  # flamegraph.pl input
+              "timings": {name: {kind, count, total_ms, max_ms, errors}}  # from timed()
+            }
+
+        Siblings with the same name are merged (count/total summed), so a
+        node that ran 30 tool calls shows one "tool:web_search" entry.
+        """
+        now = time.perf_counter()
+        spans = self.spans
+        children: Dict[Optional[str], List[Span]] = {}
+        for s in spans:
+            children.setdefault(s.parent_id if s.span_id != self.root_id else "__root__", []).append(s)
+
+        def merge(group: List[Span]) -> List[Dict[str, Any]]:
+            by_name: "OrderedDict[str, List[Span]]" = OrderedDict()
+            for s in sorted(group, key=lambda s: s.start):
+                by_name.setdefault(s.name, []).append(s)
+
+            nodes = []
+            for name, same in by_name.items():
+                total = sum(s.duration_ms(now) for s in same)
+                kids = merge([c for s in same for c in children.get(s.span_id, [])])
+                nodes.append({
+                    "name": name,
+                    "kind": same[0].kind,
+                    "count": len(same),
+                    "total_ms": round(total, 3),
+                    # Concurrent children can add up to more than the parent
+                    "self_ms": round(max(0.0, total - sum(k["total_ms"] for k in kids)), 3),
+                    "errors": sum(1 for s in same if s.error),
+                    "open": sum(1 for s in same if s.end is None),
+                    "children": kids,
+                })
+            return nodes
+
+        roots = merge(children.get("__root__", []))
+        tree = roots[0] if roots else None
+
+        by_kind: Dict[str, Dict[str, float]] = {}
+        for s in spans:
+            entry = by_kind.setdefault(s.kind, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + s.duration_ms(now), 3)
+
+        slowest = sorted((s for s in spans if s.span_id != self.root_id),
+                         key=lambda s: s.duration_ms(now), reverse=True)[:top]
+
+        folded: List[str] = []
+
+        def fold(node: Dict[str, Any], path: str):
+            stack = f"{path};{node['name']}" if path else node["name"]
+            if node["self_ms"] >= 1:
+                folded.append(f"{stack} {int(node['self_ms'])}")
+            for child in node["children"]:
+                fold(child, stack)
+
+        if tree:
+            fold(tree, "")
+
+        return {
+            "task_id": self.task_id,
+            "started_at": self.started_at,
+            "span_count": len(spans),
+            "dropped_spans": self.dropped,
+            "total_ms": tree["total_ms"] if tree else 0.0,
+            "tree": tree,
+            "by_kind": by_kind,
+            "slowest": [
+                {"name": s.name, "kind": s.kind, "duration_ms": round(s.duration_ms(now), 3),
+                 "error": s.error, "attributes": s.attributes}
+                for s in slowest
+            ],
+            "folded": folded,
+            "timings": {
+                name: {**entry, "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3)}
+                for name, entry in self._timings.items()
+            },
+        }
+
+
+_recorders: "OrderedDict[int, SpanRecorder]" = OrderedDict()
+
+
+def get_recorder(task_id: Optional[int] = None) -> Optional[SpanRecorder]:
+    """Recorder for a task, or the one active in this context."""
+    if task_id is None:
+        return _active_recorder.get()
+    return _recorders.get(task_id)
+
+
+@contextmanager
+def record_spans(task_id: int, name: str, **attributes) -> Iterator[SpanRecorder]:
+    """Record a task's spans under a root span for the duration of the block."""
+    recorder = SpanRecorder(task_id)
+    _recorders[task_id] = recorder
+    _recorders.move_to_end(task_id)
+    while len(_recorders) > SPAN_RECORDER_MAX_TASKS:
+        _recorders.popitem(last=False)
+
+    recorder_token = _active_recorder.set(recorder)
+    root_id = recorder.start(name, kind="workflow", **attributes)
+    span_token = _current_span.set(root_id)
+    error = None
+    try:
+        yield recorder
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        recorder.end(root_id, error=error)
+        _current_span.reset(span_token)
+        _active_recorder.reset(recorder_token)
+
+
+@contextmanager
+def span(name: str, kind: str = "span", **attributes) -> Iterator[Optional[str]]:
+    """Time a block as a child of the current span (no-op outside a recording)."""
+    recorder = _active_recorder.get()
+    if recorder is None:
+        yield None
+        return
+
+    span_id = recorder.start(name, kind=kind, **attributes)
+    token = _current_span.set(span_id) if span_id else None
+    error = None
+    try:
+        yield span_id
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        if token is not None:
+            _current_span.reset(token)
+        recorder.end(span_id, error=error)
+
+
+def traced(name: Optional[str] = None, kind: str = "span") -> Callable:
+    """Decorator form of span() for sync and async functions."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, kind=kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, kind=kind):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def timing(name: str, kind: str = "span") -> Iterator[None]:
+    """Time a block into the recorder's aggregate timings rather than the span tree."""
+    recorder = _active_recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        recorder.observe(name, time.perf_counter() - started, kind=kind, error=error)
+
+
+def timed(name: Optional[str] = None, kind: str = "span") -> Callable:
+    """Decorator form of timing() for sync and async functions."""
+
+    def decorator(func: Callable) -> Callable:
+        timing_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timing(timing_name, kind=kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timing(timing_name, kind=kind):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+__all__ = [
+    "Span",
+    "SpanRecorder",
+    "get_recorder",
+    "record_spans",
+    "span",
+    "traced",
+    "timing",
+    "timed",
+]
@@ -14,7 +14,8 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, Any, Optional, List, Annotated, TypedDict
+import uuid
+from typing import Dict, Any, Optional, List, Annotated, TypedDict, Callable
 from datetime import datetime, timezone
 import operator
 
@@ -54,9 +55,21 @@ try:
 except ImportError:
     INTERRUPT_AVAILABLE = False
 
+from langgraph.types import Send
+
+from core.workflows.map_node import (
+    DEFAULT_MAX_CONCURRENCY as MAP_DEFAULT_MAX_CONCURRENCY,
+    item_output,
+    merge_map_results,
+    reduce_map_results,
+    reduce_node_id,
+    render_item_prompt,
+    resolve_map_items,
+)
 from models.workflow import WorkflowProfile
 from core.workflows.events.emitter import create_execution_callback_handler
 from core.workflows.events.progress import clear_execution_context
+from core.workflows.events.spans import record_spans, traced
 from core.workflows.checkpointing.manager import get_store
 from core.runtimes.base import normalize_dynamic_subagent_event
 
@@ -154,6 +167,12 @@ class SimpleWorkflowState(TypedDict):
     # Deferred node support: parallel branch outputs merged here
     branch_results: Annotated[Dict[str, Any], operator.ior]
 
+    # MAP_NODE fan-out: {map_id: {"run", "items"}}, {map_id: {index: result}},
+    # and the item a child invocation is handling (only set in Send payloads)
+    map_items: Annotated[Dict[str, Any], operator.ior]
+    map_results: Annotated[Dict[str, Dict[int, Any]], merge_map_results]
+    map_item: Optional[Dict[str, Any]]
+
     # Critic output for conditional routing
     critic_output: Annotated[Optional[str], pick_last]
 
@@ -226,6 +245,9 @@ class SimpleWorkflowExecutor:
         """
         Execute a user-created workflow.
 
+        The run is recorded as a span tree for the profiling endpoint
+        (GET /api/orchestration/tasks/{task_id}/profile).
+
         Args:
             workflow: WorkflowProfile from database with nodes/edges
             input_data: Input data from user (e.g., {"query": "..."})
@@ -235,6 +257,16 @@ class SimpleWorkflowExecutor:
         Returns:
             Final state with results
         """
+        with record_spans(task_id, f"workflow:{workflow.name}", workflow_id=workflow.id):
+            return await self._execute_workflow(workflow, input_data, project_id, task_id)
+
+    async def _execute_workflow(
+        self,
+        workflow: WorkflowProfile,
+        input_data: Dict[str, Any],
+        project_id: int,
+        task_id: int
+    ) -> Dict[str, Any]:
         logger.info(f"Executing workflow '{workflow.name}' (id={workflow.id}) for task {task_id}")
 
         # Get event bus for real-time monitoring
@@ -433,6 +465,8 @@ class SimpleWorkflowExecutor:
                 "custom_output_path": getattr(workflow, 'custom_output_path', None),
                 # Deferred node support: parallel branch outputs merged here
                 "branch_results": {},
+                "map_items": {},
+                "map_results": {},
                 "last_tool_output": None,
                 "tool_result": None,
                 "current_directive": query,
@@ -1539,6 +1573,7 @@ class SimpleWorkflowExecutor:
                 "task_id": task_id
             }
 
+    @traced("executor.build_graph", kind="graph_build")
     async def _build_graph_from_workflow(
         self,
         workflow: WorkflowProfile
@@ -1626,6 +1661,10 @@ class SimpleWorkflowExecutor:
                     "config": raw_config
                 }
 
+        # MAP_NODE: each map's child node and where its reduce node leads
+        map_plans = self._plan_map_nodes(nodes, edges)
+        map_children = {plan["child"]: map_id for map_id, plan in map_plans.items()}
+
         # Store in executor instance for callback access
         self.node_metadata = node_metadata
         logger.debug(f"Built node metadata for {len(node_metadata)} nodes")
@@ -1673,6 +1712,13 @@ class SimpleWorkflowExecutor:
             # Create node executor function for all other node types
             node_executor = self._create_node_executor(node_id, agent_type, node)
 
+            # Children of a MAP_NODE run once per item (via Send)
+            if node_id in map_children:
+                map_id = map_children[node_id]
+                node_executor = self._wrap_map_child_executor(
+                    node_executor, map_id, map_plans[map_id]["config"]
+                )
+
             # Task 3 + Task 6: Build add_node kwargs for caching and deferred support
             node_config = node.get("config", {})
             add_node_kwargs = {}
@@ -1693,6 +1739,11 @@ class SimpleWorkflowExecutor:
 
             logger.info(f"Added node to graph: {node_id} (type: {agent_type})")
 
+        # Synthetic reduce node per MAP_NODE
+        for map_id, plan in map_plans.items():
+            graph.add_node(reduce_node_id(map_id), self._create_map_reduce_executor(map_id, plan["config"]))
+            logger.info(f"Added MAP_NODE reduce node: {reduce_node_id(map_id)}")
+
         # Set entry point (use START_NODE if specified, otherwise find node with no incoming edges)
         if nodes:
             if entry_point_override:
@@ -1768,6 +1819,11 @@ class SimpleWorkflowExecutor:
                 logger.debug(f"Skipping edges from START_NODE: {source_id}")
                 continue
 
+            # A MAP_NODE child's edges leave from the reduce node instead
+            if source_id in map_children:
+                logger.debug(f"Edges from MAP_NODE child {source_id} are routed via its reduce node")
+                continue
+
             # Check if source is a CONDITIONAL_NODE or LOOP_NODE
             if source_type == 'CONDITIONAL_NODE':
                 # Build routing map for conditional edges
@@ -1804,6 +1860,59 @@ class SimpleWorkflowExecutor:
                 graph.add_conditional_edges(source_id, router_func)
                 logger.info(f"Added conditional edges for {source_id} with {len(routing_map)} routes")
 
+            elif source_type == 'MAP_NODE' and source_id in map_plans:
+                plan = map_plans[source_id]
+                child_id = plan["child"]
+                reduce_id = reduce_node_id(source_id)
+
+                # Fan out one Send per item; an empty list goes straight to reduce
+                def create_map_router(map_id_capture, child_capture, map_config):
+                    def route_map(state: SimpleWorkflowState):
+                        entry = (state.get("map_items") or {}).get(map_id_capture) or {}
+                        items = entry.get("items") or []
+                        if not items:
+                            return reduce_node_id(map_id_capture)
+
+                        base = {
+                            key: value for key, value in state.items()
+                            if key not in ("messages", "step_history", "map_items", "map_results")
+                        }
+                        logger.debug(f"[Router] MAP_NODE {map_id_capture} sending {len(items)} items to {child_capture}")
+                        return [
+                            Send(child_capture, {
+                                **base,
+                                "messages": [],
+                                "step_history": [],
+                                "loop_iteration": 0,
+                                "query": render_item_prompt(map_config.get("item_prompt"), item, index),
+                                "map_item": {
+                                    "node_id": map_id_capture,
+                                    "run": entry.get("run"),
+                                    "index": index,
+                                    "total": len(items),
+                                    "item": item,
+                                },
+                            })
+                            for index, item in enumerate(items)
+                        ]
+                    return route_map
+
+                graph.add_conditional_edges(
+                    source_id,
+                    create_map_router(source_id, child_id, plan["config"]),
+                    [child_id, reduce_id]
+                )
+                graph.add_edge(child_id, reduce_id)
+
+                for target in plan["targets"] or ["__END__"]:
+                    target_node_data = next((n for n in nodes if n["id"] == target), {})
+                    target_type = target_node_data.get("type", target_node_data.get("data", {}).get("agentType", "default"))
+                    target_node = END if target_type == 'END_NODE' or target == "__END__" else target
+                    graph.add_edge(reduce_id, target_node)
+                    logger.info(f"Added edge: {reduce_id} -> {target_node}")
+
+                logger.info(f"Added MAP_NODE fan-out: {source_id} -> {child_id} -> {reduce_id}")
+
             elif source_type == 'LOOP_NODE':
                 # Build routing map for loop edges
                 routing_map = {}
@@ -1903,7 +2012,7 @@ class SimpleWorkflowExecutor:
         This function will be called by LangGraph when executing the node.
         """
         # Handle control nodes (START_NODE and END_NODE are filtered out in _build_graph_from_workflow)
-        if agent_type in ['CHECKPOINT_NODE', 'OUTPUT_NODE', 'CONDITIONAL_NODE', 'APPROVAL_NODE', 'LOOP_NODE']:
+        if agent_type in ['CHECKPOINT_NODE', 'OUTPUT_NODE', 'CONDITIONAL_NODE', 'APPROVAL_NODE', 'LOOP_NODE', 'MAP_NODE']:
             return self._create_control_node_executor(node_id, agent_type, node_data)
 
         # Handle TOOL_NODE (direct tool execution)
@@ -3019,8 +3128,31 @@ When your work is complete, deliver the final result and END."""
                             "approval_context": approval_context
                         }
 
+                elif control_type == 'MAP_NODE':
+                    # Resolve the items; the router fans them out with Send
+                    map_config = node_data.get("config", {})
+                    items = resolve_map_items(state, map_config)
+                    run_id = uuid.uuid4().hex[:8]
+                    logger.info(f"[MAP_NODE] Mapping {len(items)} items (run {run_id})")
+
+                    from core.workflows.events.progress import emit_custom_event
+                    await emit_custom_event(
+                        event_type="progress",
+                        event_id=f"map-{node_id}-{run_id}",
+                        data={"label": display_label, "value": 0, "total": len(items),
+                              "message": f"Mapping {len(items)} items"},
+                        node_id=node_id
+                    )
+
+                    return {
+                        "map_items": {node_id: {"run": run_id, "items": items}},
+                        "map_results": {node_id: None},
+                        "current_node": node_id,
+                        "agent_type": control_type
+                    }
+
                 else:
-                    valid_types = ['CHECKPOINT_NODE', 'OUTPUT_NODE', 'CONDITIONAL_NODE', 'APPROVAL_NODE', 'LOOP_NODE']
+                    valid_types = ['CHECKPOINT_NODE', 'OUTPUT_NODE', 'CONDITIONAL_NODE', 'APPROVAL_NODE', 'LOOP_NODE', 'MAP_NODE']
                     logger.error(
                         f"[Control Node: {node_id}] Unknown control type: '{control_type}'. "
                         f"Valid types: {valid_types}"
@@ -3040,6 +3172,129 @@ When your work is complete, deliver the final result and END."""
 
         return control_node_executor
 
+    def _plan_map_nodes(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve each MAP_NODE's child and the targets of its reduce node.
+
+        The child is config.child_node, else the edge labelled "item", else
+        the first outgoing edge. The reduce node leads wherever the MAP_NODE's
+        other edges and the child's own edges lead.
+
+        Returns:
+            {map_id: {"child": child_id, "config": dict, "targets": [node_id, ...]}}
+        """
+        plans = {}
+        for node in nodes:
+            node_type = node.get("type", "default")
+            agent_type = node_type if node_type != "default" else node.get("data", {}).get("agentType", "")
+            if agent_type != 'MAP_NODE':
+                continue
+
+            map_id = node["id"]
+            config = node.get("config", {}) or {}
+            out_edges = [e for e in edges if e["source"] == map_id]
+            child_id = config.get("child_node") or next(
+                (e["target"] for e in out_edges if (e.get("data") or {}).get("label") == "item"),
+                out_edges[0]["target"] if out_edges else None
+            )
+            if not child_id:
+                logger.error(f"MAP_NODE {map_id} has no child node to map over; it will act as a no-op")
+                continue
+
+            targets = [e["target"] for e in out_edges if e["target"] != child_id]
+            targets += [e["target"] for e in edges if e["source"] == child_id and e["target"] not in targets]
+            plans[map_id] = {"child": child_id, "config": config, "targets": targets}
+            logger.info(f"MAP_NODE {map_id}: child={child_id}, then -> {targets or 'END'}")
+
+        return plans
+
+    def _wrap_map_child_executor(
+        self,
+        node_executor: Callable,
+        map_id: str,
+        map_config: Dict[str, Any]
+    ):
+        """
+        Run a MAP_NODE's child once per item under the map's concurrency limit.
+
+        Each invocation's output is returned as a map_results entry (not as
+        messages), and a progress event is emitted as each item finishes.
+        """
+        limit = max(1, int(map_config.get("max_concurrency", MAP_DEFAULT_MAX_CONCURRENCY)))
+        semaphore: Optional[asyncio.Semaphore] = None
+        completed: Dict[str, int] = {}
+
+        async def map_child_executor(state: SimpleWorkflowState, config: dict = None) -> Dict[str, Any]:
+            nonlocal semaphore
+            map_item = state.get("map_item") or {}
+            if map_item.get("node_id") != map_id:
+                return await node_executor(state, config)
+
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(limit)
+            async with semaphore:
+                update = await node_executor(state, config)
+
+            index, total, run_id = map_item["index"], map_item["total"], map_item.get("run")
+            error = update.get("error_message")
+            done = completed.get(run_id, 0) + 1
+            if done >= total:
+                completed.pop(run_id, None)
+            else:
+                completed[run_id] = done
+
+            from core.workflows.events.progress import emit_custom_event
+            await emit_custom_event(
+                event_type="progress",
+                event_id=f"map-{map_id}-{run_id}",
+                data={"label": map_id, "value": done, "total": total,
+                      "message": f"Item {index + 1} {'failed' if error else 'done'} ({done}/{total})"},
+                node_id=map_id,
+                metadata={"item_index": index, "status": "error" if error else "success"}
+            )
+
+            return {"map_results": {map_id: {index: {"output": item_output(update), "error": error}}}}
+
+        return map_child_executor
+
+    def _create_map_reduce_executor(self, map_id: str, map_config: Dict[str, Any]):
+        """Create the node that combines a MAP_NODE's per-item results."""
+
+        async def map_reduce_executor(state: SimpleWorkflowState) -> Dict[str, Any]:
+            results = (state.get("map_results") or {}).get(map_id) or {}
+            reduced = reduce_map_results(results, map_config)
+            logger.info(
+                f"[MAP_NODE] {map_id} reduced {len(results)} items "
+                f"({reduced['succeeded']} ok, {reduced['failed']} failed) "
+                f"with '{map_config.get('reducer', 'concat')}'"
+            )
+
+            update = {
+                "messages": [AIMessage(content=reduced["text"])],
+                "branch_results": {map_id: reduced["value"]},
+                "tool_result": reduced["value"],
+                "map_items": {map_id: None},
+                "map_results": {map_id: None},
+                "step_history": [{
+                    "node_id": map_id,
+                    "agent_type": "MAP_NODE",
+                    "items": len(results),
+                    "succeeded": reduced["succeeded"],
+                    "failed": reduced["failed"],
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }],
+                "current_node": map_id,
+            }
+            if reduced["failed"] and map_config.get("fail_on_error"):
+                update["error_message"] = f"MAP_NODE {map_id}: {reduced['failed']} of {len(results)} items failed"
+            return update
+
+        return map_reduce_executor
+
     def _create_tool_node_executor(
         self,
         node_id: str,
@@ -3083,6 +3338,7 @@ When your work is complete, deliver the final result and END."""
 
         return tool_node_executor
 
+    @traced("executor.init_tools", kind="tool_load")
     async def _validate_and_init_tools(
         self,
         workflow: WorkflowProfile,
@@ -3114,7 +3370,7 @@ When your work is complete, deliver the final result and END."""
             # Skip control nodes
             node_type = node.get("type", "default")
             if node_type in ['START_NODE', 'END_NODE', 'CHECKPOINT_NODE', 'OUTPUT_NODE',
-                            'CONDITIONAL_NODE', 'APPROVAL_NODE']:
+                            'CONDITIONAL_NODE', 'APPROVAL_NODE', 'MAP_NODE']:
                 continue
 
             # Get tools from node config
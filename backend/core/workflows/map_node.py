@@ -0,0 +1,172 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+MAP_NODE support for the workflow executor.
+
+A MAP_NODE reads a list from workflow state and fans it out to a child node
+with LangGraph ``Send``, one invocation per item, all in the same superstep.
+Per-item outputs are merged into ``map_results`` and a synthetic reduce node
+combines them once every item is done:
+
+    MAP_NODE --Send x N--> child --> <map_id>__reduce --> next node(s)
+
+Node config:
+    items_key:       dotted state path holding the list (default "tool_result")
+    item_prompt:     prompt template for each item; "{item}" and "{index}"
+                     are substituted (default "{item}")
+    max_concurrency: child invocations allowed to run at once (default 5)
+    max_items:       items beyond this are dropped with a warning (default 1000)
+    reducer:         "concat" | "list" | "json_merge" (default "concat")
+    separator:       joiner for "concat" (default two newlines)
+    fail_on_error:   set error_message if any item failed (default False)
+    child_node:      child node id; otherwise the edge labelled "item", or
+                     the MAP_NODE's first edge
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REDUCE_SUFFIX = "__reduce"
+
+DEFAULT_ITEMS_KEY = "tool_result"
+DEFAULT_MAX_CONCURRENCY = 5
+DEFAULT_MAX_ITEMS = 1000
+REDUCERS = ("concat", "list", "json_merge")
+
+
+def reduce_node_id(map_node_id: str) -> str:
+    """Id of the synthetic reduce node for a MAP_NODE."""
+    return f"{map_node_id}{REDUCE_SUFFIX}"
+
+
+def merge_map_results(
+    left: Optional[Dict[str, Dict[int, Any]]],
+    right: Optional[Dict[str, Optional[Dict[int, Any]]]]
+) -> Dict[str, Dict[int, Any]]:
+    """
+    State reducer for map_results ({map_node_id: {item_index: result}}).
+
+    Parallel item updates merge per map node; a ``None`` value for a map
+    node clears its results (written when the map starts and after reduce).
+    """
+    merged = dict(left or {})
+    for map_node_id, results in (right or {}).items():
+        if results is None:
+            merged.pop(map_node_id, None)
+        else:
+            merged[map_node_id] = {**merged.get(map_node_id, {}), **results}
+    return merged
+
+
+def resolve_map_items(state: Dict[str, Any], config: Dict[str, Any]) -> List[Any]:
+    """
+    Read the list to map over from state.
+
+    Strings are parsed as a JSON list when possible, otherwise split into
+    non-empty lines. Other non-list values become a single item.
+    """
+    value: Any = state
+    for part in (config.get("items_key") or DEFAULT_ITEMS_KEY).split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            value = None
+        if value is None:
+            return []
+
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            parsed = None
+        value = parsed if isinstance(parsed, list) else [line for line in value.splitlines() if line.strip()]
+
+    items = list(value) if isinstance(value, (list, tuple)) else [value]
+
+    max_items = config.get("max_items", DEFAULT_MAX_ITEMS)
+    if len(items) > max_items:
+        logger.warning(f"[MAP_NODE] {len(items)} items exceeds max_items={max_items}; truncating")
+        items = items[:max_items]
+    return items
+
+
+def render_item_prompt(template: Optional[str], item: Any, index: int) -> str:
+    """Prompt for one item ("{item}" / "{index}" placeholders)."""
+    text = item if isinstance(item, str) else json.dumps(item, default=str)
+    return (template or "{item}").replace("{item}", text).replace("{index}", str(index))
+
+
+def item_output(update: Dict[str, Any]) -> str:
+    """Text of the last message a child node produced for one item."""
+    for message in reversed(update.get("messages") or []):
+        content = getattr(message, "content", message)
+        if isinstance(content, list):
+            content = "".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        if content:
+            return str(content)
+    return ""
+
+
+def reduce_map_results(results: Dict[int, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine per-item results in item order.
+
+    Args:
+        results: {index: {"output": str, "error": Optional[str]}}
+        config: MAP_NODE config (reducer, separator)
+
+    Returns:
+        {"value": reduced value, "text": value as message text,
+         "succeeded": int, "failed": int}
+    """
+    ordered = [results[i] for i in sorted(results)]
+    outputs = [r.get("output", "") for r in ordered if not r.get("error")]
+    failed = len(ordered) - len(outputs)
+
+    reducer = config.get("reducer", "concat")
+    if reducer not in REDUCERS:
+        logger.warning(f"[MAP_NODE] Unknown reducer '{reducer}', using 'concat'")
+        reducer = "concat"
+
+    if reducer == "list":
+        value: Any = outputs
+    elif reducer == "json_merge":
+        value = {}
+        for output in outputs:
+            try:
+                parsed = json.loads(output)
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, dict):
+                value.update(parsed)
+            else:
+                logger.warning("[MAP_NODE] json_merge skipped an item output that is not a JSON object")
+    else:
+        value = config.get("separator", "\n\n").join(outputs)
+
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return {"value": value, "text": text, "succeeded": len(outputs), "failed": failed}
+
+
+__all__ = [
+    "REDUCE_SUFFIX",
+    "REDUCERS",
+    "DEFAULT_MAX_CONCURRENCY",
+    "reduce_node_id",
+    "merge_map_results",
+    "resolve_map_items",
+    "render_item_prompt",
+    "item_output",
+    "reduce_map_results",
+]
@@ -30,7 +30,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
-from .agent_delegation import (
+from core.agents.delegation import (
     AgentCapability,
     AgentRegistry,
     DelegationBroker,
@@ -39,7 +39,7 @@ from .agent_delegation import (
     get_agent_registry,
     get_delegation_broker
 )
-from .graph_state import HandoffSummary, create_handoff_summary
+from .state import HandoffSummary, create_handoff_summary
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +55,7 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     DELEGATED = "delegated"
+    CANCELLED = "cancelled"
 
 
 @dataclass
@@ -80,13 +81,28 @@ class SwarmTask:
 
     # Timing
     created_at: datetime = field(default_factory=datetime.utcnow)
-    started_at: Optional[datetime] = None
+    ready_at: Optional[datetime] = None  # Dependencies satisfied
+    started_at: Optional[datetime] = None  # Concurrency slot acquired
     completed_at: Optional[datetime] = None
 
     # Context
     input_context: Dict[str, Any] = field(default_factory=dict)
     output_context: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def wait_ms(self) -> Optional[float]:
+        """Time spent waiting for a concurrency slot after becoming ready."""
+        if self.ready_at and self.started_at:
+            return (self.started_at - self.ready_at).total_seconds() * 1000
+        return None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Execution time once started."""
+        if self.started_at and self.completed_at:
+            return (self.completed_at - self.started_at).total_seconds() * 1000
+        return None
+
 
 @dataclass
 class SwarmWorkflow:
@@ -101,6 +117,7 @@ class SwarmWorkflow:
     status: str = "active"  # active, completed, failed
 
     created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
     # Aggregate results
@@ -118,6 +135,7 @@ class SwarmCoordinator:
 
     Features:
     - Task decomposition and dependency management
+    - Wavefront execution of independent tasks (bounded by max_concurrent_tasks)
     - Dynamic agent selection and load balancing
     - Context aggregation across agents
     - Failure handling and recovery
@@ -165,71 +183,46 @@ class SwarmCoordinator:
         """
         Execute a swarm workflow with dependency-aware task execution.
 
-        Tasks are executed in order, respecting dependencies.
-        Context flows from task to task via handoff summaries.
+        Tasks run as a wavefront: every task whose dependencies have
+        completed starts immediately, up to max_concurrent_tasks at once, so
+        a wide decomposition finishes in roughly critical-path time.
+
+        Each task sees the workflow context plus the outputs of its
+        (transitive) dependencies, merged in topological order, so results
+        don't depend on which sibling happens to finish first. If a task
+        fails, in-flight tasks are cancelled and unstarted ones are marked
+        cancelled.
         """
         logger.info(f"Starting swarm workflow {workflow.workflow_id}")
+        workflow.started_at = datetime.utcnow()
 
         try:
             # Build dependency graph
             dependency_graph = self._build_dependency_graph(workflow)
 
-            # Execute tasks in topological order
+            # Topological order fixes the merge order (and rejects cycles)
             execution_order = self._topological_sort(dependency_graph)
+            rank = {task_id: i for i, task_id in enumerate(execution_order)}
 
             logger.info(f"Execution order: {execution_order}")
 
-            # Accumulated context from all previous tasks
-            accumulated_context = workflow_context.copy()
+            await self._run_wavefront(workflow, dependency_graph, rank, workflow_context)
 
-            for task_id in execution_order:
-                task = workflow.tasks[task_id]
+            ordered_tasks = [workflow.tasks[task_id] for task_id in execution_order]
+            workflow.all_handoffs.extend(t.handoff_summary for t in ordered_tasks if t.handoff_summary)
 
-                # Check if dependencies are completed
-                if not self._dependencies_met(task, workflow):
-                    logger.error(f"Dependencies not met for task {task_id}")
-                    task.status = TaskStatus.FAILED
-                    task.error = "Dependencies not satisfied"
-                    continue
-
-                # Update task context with results from dependencies
-                for dep_id in task.depends_on:
-                    dep_task = workflow.tasks[dep_id]
-                    if dep_task.output_context:
-                        accumulated_context.update(dep_task.output_context)
-
-                # Execute task
-                result = await self._execute_task(task, accumulated_context, workflow.source_task_id)
-
-                # Update accumulated context
-                if result.status == "SUCCESS" and result.result:
-                    accumulated_context.update(result.result)
-                    task.output_context = result.result
-
-                    # Store handoff summary
-                    if result.handoff_summary:
-                        handoff = create_handoff_summary(
-                            task_id=workflow.source_task_id,
-                            attempt=1,
-                            actions_taken=result.handoff_summary.get("actions_taken", []),
-                            rationale=result.handoff_summary.get("rationale", ""),
-                            pending_items=result.handoff_summary.get("pending_items", []),
-                            status=result.handoff_summary.get("status", "SUCCESS")
-                        )
-                        task.handoff_summary = handoff
-                        workflow.all_handoffs.append(handoff)
-
-                # Check for failure
-                if result.status != "SUCCESS":
-                    logger.error(f"Task {task_id} failed: {result.error}")
-                    workflow.status = "failed"
-                    break
+            busy_ms = sum(t.duration_ms or 0 for t in ordered_tasks)
+            elapsed_ms = (datetime.utcnow() - workflow.started_at).total_seconds() * 1000
+            logger.info(
+                f"Swarm workflow {workflow.workflow_id}: {len(ordered_tasks)} tasks, "
+                f"{elapsed_ms:.0f}ms wall time for {busy_ms:.0f}ms of task time"
+            )
 
             # Mark workflow as completed if all tasks succeeded
-            if all(t.status == TaskStatus.COMPLETED for t in workflow.tasks.values()):
+            if all(t.status == TaskStatus.COMPLETED for t in ordered_tasks):
                 workflow.status = "completed"
                 workflow.completed_at = datetime.utcnow()
-                workflow.final_result = accumulated_context
+                workflow.final_result = self._merge_outputs(workflow_context, ordered_tasks)
                 logger.info(f"Swarm workflow {workflow.workflow_id} completed successfully")
             else:
                 workflow.status = "failed"
@@ -242,6 +235,147 @@ class SwarmCoordinator:
             workflow.status = "failed"
             return workflow
 
+    async def _run_wavefront(
+        self,
+        workflow: SwarmWorkflow,
+        graph: Dict[str, List[str]],
+        rank: Dict[str, int],
+        workflow_context: Dict[str, Any]
+    ):
+        """Run tasks as their dependencies complete; stop at the first failure."""
+        remaining = {task_id: 0 for task_id in graph}
+        for children in graph.values():
+            for child in children:
+                remaining[child] += 1
+
+        ancestors: Dict[str, Set[str]] = {}
+        ready = sorted((t for t in graph if remaining[t] == 0), key=rank.get)
+        running: Dict[asyncio.Task, str] = {}
+        failed_task_id: Optional[str] = None
+
+        while ready or running:
+            for task_id in ready:
+                task = workflow.tasks[task_id]
+                task.ready_at = datetime.utcnow()
+
+                if not self._dependencies_met(task, workflow):
+                    logger.error(f"Dependencies not met for task {task_id}")
+                    task.status = TaskStatus.FAILED
+                    task.error = "Dependencies not satisfied"
+                    failed_task_id = task_id
+                    break
+
+                ancestors[task_id] = self._ancestors(task, workflow, ancestors)
+                upstream = sorted(ancestors[task_id], key=rank.get)
+                context = self._merge_outputs(workflow_context, [workflow.tasks[a] for a in upstream])
+                running[asyncio.create_task(
+                    self._execute_task(task, context, workflow.source_task_id)
+                )] = task_id
+            ready = []
+
+            if failed_task_id or not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+            # Process completions in topological order for determinism
+            for future in sorted(done, key=lambda f: rank[running[f]]):
+                task_id = running.pop(future)
+                task = workflow.tasks[task_id]
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    task.status = TaskStatus.FAILED
+                    task.error = str(e)
+                    task.completed_at = datetime.utcnow()
+                    logger.error(f"Task {task_id} raised: {e}")
+                    failed_task_id = failed_task_id or task_id
+                    continue
+
+                if result.status != "SUCCESS":
+                    logger.error(f"Task {task_id} failed: {result.error}")
+                    failed_task_id = failed_task_id or task_id
+                    continue
+
+                self._record_success(task, result, workflow.source_task_id)
+
+                for child in graph[task_id]:
+                    remaining[child] -= 1
+                    if remaining[child] == 0:
+                        ready.append(child)
+
+            ready.sort(key=rank.get)
+            if failed_task_id:
+                break
+
+        if failed_task_id:
+            await self._cancel_remaining(workflow, running, failed_task_id)
+
+    async def _cancel_remaining(
+        self,
+        workflow: SwarmWorkflow,
+        running: Dict[asyncio.Task, str],
+        failed_task_id: str
+    ):
+        """Cancel in-flight tasks and mark everything unfinished as cancelled."""
+        for future in running:
+            future.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+        now = datetime.utcnow()
+        for task in workflow.tasks.values():
+            if task.status in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+                if task.status == TaskStatus.IN_PROGRESS:
+                    task.completed_at = now
+                task.status = TaskStatus.CANCELLED
+                task.error = f"Cancelled: task {failed_task_id} failed"
+
+        if running:
+            logger.warning(
+                f"Cancelled {len(running)} in-flight swarm tasks after {failed_task_id} failed"
+            )
+
+    def _record_success(self, task: SwarmTask, result: DelegationResult, source_task_id: int):
+        """Store a successful task's output and handoff summary."""
+        if not result.result:
+            return
+
+        task.output_context = result.result
+
+        if result.handoff_summary:
+            task.handoff_summary = create_handoff_summary(
+                task_id=source_task_id,
+                attempt=1,
+                actions_taken=result.handoff_summary.get("actions_taken", []),
+                rationale=result.handoff_summary.get("rationale", ""),
+                pending_items=result.handoff_summary.get("pending_items", []),
+                status=result.handoff_summary.get("status", "SUCCESS")
+            )
+
+    @staticmethod
+    def _ancestors(
+        task: SwarmTask,
+        workflow: SwarmWorkflow,
+        known: Dict[str, Set[str]]
+    ) -> Set[str]:
+        """Transitive dependencies of a task (dependencies are already in ``known``)."""
+        result: Set[str] = set()
+        for dep_id in task.depends_on:
+            if dep_id in workflow.tasks:
+                result.add(dep_id)
+                result |= known.get(dep_id, set())
+        return result
+
+    @staticmethod
+    def _merge_outputs(base: Dict[str, Any], tasks: List[SwarmTask]) -> Dict[str, Any]:
+        """Base context updated with each task's output, in the given order."""
+        merged = base.copy()
+        for task in tasks:
+            if task.output_context:
+                merged.update(task.output_context)
+        return merged
+
     async def _execute_task(
         self,
         task: SwarmTask,
@@ -249,11 +383,6 @@ class SwarmCoordinator:
         source_task_id: int
     ) -> DelegationResult:
         """Execute a single swarm task via delegation."""
-        logger.info(f"Executing swarm task {task.task_id}: {task.description}")
-
-        task.status = TaskStatus.IN_PROGRESS
-        task.started_at = datetime.utcnow()
-
         # Create delegation request
         delegation_request = DelegationRequest(
             request_id=f"swarm_{task.task_id}",
@@ -267,6 +396,9 @@ class SwarmCoordinator:
 
         # Delegate to appropriate agent
         async with self._task_semaphore:  # Limit concurrency
+            logger.info(f"Executing swarm task {task.task_id}: {task.description}")
+            task.status = TaskStatus.IN_PROGRESS
+            task.started_at = datetime.utcnow()
             result = await self.broker.delegate_with_retry(delegation_request)
 
         # Update task based on result
@@ -348,7 +480,10 @@ class SwarmCoordinator:
                 "status": task.status.value,
                 "assigned_agent": task.assigned_agent_id,
                 "started_at": task.started_at.isoformat() if task.started_at else None,
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None
+                "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+                "wait_ms": task.wait_ms,
+                "duration_ms": task.duration_ms,
+                "error": task.error
             }
             for task_id, task in workflow.tasks.items()
         }
@@ -359,6 +494,7 @@ class SwarmCoordinator:
             "total_tasks": len(workflow.tasks),
             "completed_tasks": sum(1 for t in workflow.tasks.values() if t.status == TaskStatus.COMPLETED),
             "failed_tasks": sum(1 for t in workflow.tasks.values() if t.status == TaskStatus.FAILED),
+            "cancelled_tasks": sum(1 for t in workflow.tasks.values() if t.status == TaskStatus.CANCELLED),
             "task_statuses": task_statuses,
             "handoff_count": len(workflow.all_handoffs)
         }
@@ -501,7 +637,7 @@ async def example_swarm_workflow():
     3. Creating a workflow with dependencies
     4. Executing the workflow with automatic delegation
     """
-    from .agent_delegation import register_agent_from_template, AgentProfile
+    from core.agents.delegation import register_agent_from_template, AgentProfile
 
     # Step 1: Register specialized agents
     # (In production, these would be registered at startup)
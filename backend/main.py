@@ -32,6 +32,7 @@ warnings.filterwarnings("ignore", message=".*validate_default.*")
 
 # Import settings for environment configuration
 from config import settings
+from core.utils.startup_timing import startup_timer
 
 # Configure logging based on environment
 log_level = logging.DEBUG if settings.debug else logging.INFO
@@ -57,7 +58,8 @@ async def lifespan(app: FastAPI):
 
     # Initialize PostgreSQL database (unified database for everything)
     try:
-        await async_init_db()
+        with startup_timer.phase("db_init"):
+            await async_init_db()
         logger.info("PostgreSQL database initialized successfully")
     except Exception as e:
         logger.error(f"PostgreSQL initialization failed: {e}")
@@ -66,8 +68,9 @@ async def lifespan(app: FastAPI):
 
     # Initialize LangGraph checkpointing for workflow persistence and HITL
     try:
-        from core.workflows.checkpointing.manager import setup_checkpointing
-        await setup_checkpointing()
+        with startup_timer.phase("checkpointing"):
+            from core.workflows.checkpointing.manager import setup_checkpointing
+            await setup_checkpointing()
         logger.info("LangGraph checkpointing initialized successfully")
     except Exception as e:
         logger.error(f"LangGraph checkpointing initialization failed: {e}")
@@ -77,26 +80,37 @@ async def lifespan(app: FastAPI):
 
     # Initialize MCP Manager
     try:
-        await get_mcp_manager()
+        with startup_timer.phase("mcp"):
+            await get_mcp_manager()
         logger.info("MCP Manager initialized successfully")
     except Exception as e:
         logger.warning(f"MCP Manager initialization failed: {e}. MCP tools may not be available.")
 
     # Start chat session manager for automatic cleanup
     try:
-        from services.chat_session_manager import start_session_manager
-        await start_session_manager()
+        with startup_timer.phase("chat_sessions"):
+            from services.chat_session_manager import start_session_manager
+            await start_session_manager()
         logger.info("Chat session manager started successfully")
     except Exception as e:
         logger.warning(f"Chat session manager failed to start: {e}. Abandoned sessions won't be cleaned up automatically.")
 
+    # Start checkpoint compaction for finished workflow threads
+    try:
+        with startup_timer.phase("checkpoint_compaction"):
+            from core.workflows.checkpointing.compaction import start_checkpoint_compaction
+            await start_checkpoint_compaction()
+    except Exception as e:
+        logger.warning(f"Checkpoint compaction failed to start: {e}. Finished threads will keep all checkpoints.")
+
     # Start background task queue workers
     try:
-        # Import task handlers to register them
-        import core.task_handlers  # noqa - registers handlers via decorators
+        with startup_timer.phase("task_queue"):
+            # Import task handlers to register them
+            import core.task_handlers  # noqa - registers handlers via decorators
 
-        from core.task_queue import task_queue
-        task_queue.start_workers(num_workers=2)
+            from core.task_queue import task_queue
+            task_queue.start_workers(num_workers=2)
         logger.info("Background task queue workers started (2 workers)")
     except Exception as e:
         logger.error(f"Failed to start background workers: {e}")
@@ -105,22 +119,26 @@ async def lifespan(app: FastAPI):
 
     # Start workflow scheduler service
     try:
-        from services.scheduler_service import start_scheduler
-        await start_scheduler()
+        with startup_timer.phase("scheduler"):
+            from services.scheduler_service import start_scheduler
+            await start_scheduler()
         logger.info("Workflow scheduler service started")
     except Exception as e:
         logger.warning(f"Workflow scheduler failed to start: {e}. Scheduled workflows will not run automatically.")
 
     # Start file watcher service for file-based triggers
     try:
-        from services.triggers.file_watcher import start_file_watchers
-        await start_file_watchers()
+        with startup_timer.phase("file_watchers"):
+            from services.triggers.file_watcher import start_file_watchers
+            await start_file_watchers()
         logger.info("File watcher service started")
     except ImportError:
         logger.info("File watcher service not started (watchdog package not installed - optional)")
     except Exception as e:
         logger.warning(f"File watcher service failed to start: {e}. File triggers will not work.")
 
+    startup_timer.mark_ready()
+    startup_timer.log_summary()
     logger.info("LangConfig API startup complete")
 
     yield  # Server is running
@@ -160,6 +178,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping chat session manager: {e}")
 
+    # Stop checkpoint compaction (before closing checkpointing)
+    try:
+        from core.workflows.checkpointing.compaction import stop_checkpoint_compaction
+        await stop_checkpoint_compaction()
+    except Exception as e:
+        logger.error(f"Error stopping checkpoint compaction: {e}")
+
     # Shutdown LangGraph checkpointing
     try:
         from core.workflows.checkpointing.manager import cleanup_checkpointing
@@ -178,6 +203,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping MCP Manager: {e}")
 
+    # Close pooled HTTP clients used by generated tools
+    try:
+        from core.http.clients import close_http_clients
+        await close_http_clients()
+    except Exception as e:
+        logger.error(f"Error closing pooled HTTP clients: {e}")
+
     # Dispose database engines
     try:
         await dispose_engines()
@@ -260,72 +292,16 @@ async def root():
         "description": "Local-first AI Workflow Builder + RAG Database"
     }
 
-# Import and register API routers (domain-based organization)
-from api.workflows import routes as workflows
-from api.projects import routes as projects
-from api.tasks import routes as tasks
-from api.knowledge import rag, store
-from api.system import settings, health, debug, background_tasks
-from api.models import local as local_models
-from api.models import servers as model_servers
-from api.models import capabilities as model_capabilities
-from api.workflows import execution as orchestration, checkpoints
-from api.agents import deep_agents as deepagents, routes as agents, generator as agent_generator
-from api.chat import routes as chat
-from api.hitl import routes as hitl
-from api.tools import routes as custom_tools
-from api.images import routes as images
-from api.memory import routes as memory
-from api.workspace import routes as workspace
-from api.presets import actions as action_presets
-from api.skills import routes as skills
-from api import schemas
-from api.auth import google_router as google_auth
-from api.presentations import router as presentations
-from api.schedules import router as schedules
-from api.triggers import router as triggers
-from api.webhooks import router as webhooks
-from api.audio import routes as audio
-from api.pii_profiles import routes as pii_profiles
-from api.repositories import routes as repositories
-
-# Health check endpoints
+# Health check endpoints (always eager so /health answers immediately)
+from api.system import health
 app.include_router(health.router)
 
-app.include_router(workflows.router)
-app.include_router(orchestration.router)  # ✓ Simplified orchestration enabled
-app.include_router(hitl.router)  # Human-in-the-loop approval endpoints
-app.include_router(checkpoints.router)  # Checkpoint management endpoints
-app.include_router(store.router)  # Store (long-term memory) management endpoints
-app.include_router(memory.router)  # Agent memory management and viewing
-app.include_router(projects.router)
-app.include_router(tasks.router)
-app.include_router(rag.router)
-app.include_router(background_tasks.router)  # Background task queue management
-app.include_router(workspace.router)  # Workspace file management
-app.include_router(settings.router)
-app.include_router(local_models.router, prefix="/api/local-models", tags=["local-models"])  # Local model configurations
-app.include_router(model_servers.router, prefix="/api/model-servers", tags=["model-servers"])  # Local model server discovery
-app.include_router(model_capabilities.router, prefix="/api/models", tags=["models"])  # Model capability profiles
-app.include_router(agents.router)  # Agent templates (preset agents)
-app.include_router(action_presets.router)  # Action presets library with enhanced metadata
-app.include_router(custom_tools.router)  # Custom user-defined tools
-app.include_router(skills.router)  # Skills system - modular, context-aware capabilities
-app.include_router(images.router)  # Image storage and serving (for AI-generated images)
-app.include_router(deepagents.router)  # DeepAgents configuration and export
-app.include_router(chat.router)  # DeepAgents chat testing
-app.include_router(agent_generator.router)  # AI-powered agent generation
-app.include_router(debug.router)  # Debug endpoints for development
-
-app.include_router(schemas.router)  # Structured output schemas
-app.include_router(google_auth)  # Google OAuth for presentations
-app.include_router(presentations)  # Presentation generation
-app.include_router(schedules)  # Workflow cron scheduling
-app.include_router(triggers)  # Workflow event triggers (file watch, etc.)
-app.include_router(webhooks)  # Webhook receiver endpoints
-app.include_router(audio.router)  # Local audio upload/transcription
-app.include_router(pii_profiles.router)  # PII redaction profiles
-app.include_router(repositories.router)  # Git repository browser (read-only) + knowledge-base ingestion
+# Register API routers (domain-based organization, see api/router_loader.py).
+# With LAZY_ROUTERS=true each group is imported on its first request instead
+# of at startup, deferring LangChain/LlamaIndex/ADK imports.
+from api.router_loader import get_router_loader, LAZY_ROUTERS
+with startup_timer.phase("routers"):
+    get_router_loader().install(app, lazy=LAZY_ROUTERS)
 
 if __name__ == "__main__":
     import sys
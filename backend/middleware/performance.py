@@ -7,14 +7,15 @@
 Performance Monitoring Middleware
 
 
-Tracks request duration, logs slow requests, and provides performance insights.
+Tracks request duration, logs slow requests, and records latency histograms
+per route template.
 
 Features:
-- Automatic request timing
+- Pure ASGI (no BaseHTTPMiddleware task/memory-stream hop, SSE-safe)
+- Automatic request timing with X-Response-Time header (time to first byte)
 - Slow request detection and logging
-- Response status code tracking
-- Optional metrics collection
-- Integration with audit logging
+- Fixed-bucket latency histograms per route template ("GET /api/workflows/{workflow_id}")
+- Metrics exposed via GET /health/metrics and GET /health/latency
 
 Usage:
     from fastapi import FastAPI
@@ -24,13 +25,13 @@ Usage:
     app.add_middleware(PerformanceMiddleware)
 """
 
+import bisect
 import logging
 import time
 import os
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+import threading
+from typing import Dict, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
@@ -39,82 +40,93 @@ PERFORMANCE_MONITORING_ENABLED = os.getenv("PERFORMANCE_MONITORING_ENABLED", "tr
 SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))  # 1 second default
 LOG_ALL_REQUESTS = os.getenv("LOG_ALL_REQUESTS", "false").lower() == "true"
 
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+# Requests that matched no route share one key so 404 scans can't grow the table
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
     """
-    Middleware for monitoring request performance.
+    Route template for a handled request, e.g. "GET /api/workflows/{workflow_id}".
 
-    Measures request duration, logs slow requests, and tracks response codes.
+    Starlette's router stores the matched route in the scope, so this is only
+    meaningful after the app has handled the request.
     """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if not path:
+        return UNMATCHED_ROUTE
+    return f"{scope.get('method', '')} {scope.get('root_path', '')}{path}"
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        logger.info(f"Performance monitoring enabled (slow request threshold: {SLOW_REQUEST_THRESHOLD_MS}ms)")
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process request and measure performance.
+class PerformanceMiddleware:
+    """
+    Middleware for monitoring request performance.
 
-        Args:
-            request: FastAPI request
-            call_next: Next middleware in chain
+    Measures request duration, logs slow requests, and feeds the global
+    performance_metrics histograms.
+    """
 
-        Returns:
-            Response: FastAPI response with performance headers
-        """
-        # Skip if disabled
-        if not PERFORMANCE_MONITORING_ENABLED:
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, metrics: Optional["PerformanceMetrics"] = None):
+        self.app = app
+        self.metrics = metrics or performance_metrics
+        logger.info(f"Performance monitoring enabled (slow request threshold: {SLOW_REQUEST_THRESHOLD_MS}ms)")
 
-        # Record start time
-        start_time = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip if disabled or not HTTP (websocket, lifespan)
+        if scope["type"] != "http" or not PERFORMANCE_MONITORING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                first_byte_ms = (time.perf_counter() - start_time) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-response-time", f"{first_byte_ms:.2f}ms".encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
 
-        # Process request
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Log error and re-raise
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.metrics.record_request(route_template(scope), 500, duration_ms,
+                                        is_slow=duration_ms >= SLOW_REQUEST_THRESHOLD_MS)
             logger.error(
-                f"Request failed: {request.method} {request.url.path} ({duration_ms:.2f}ms)",
+                f"Request failed: {scope.get('method')} {scope.get('path')} ({duration_ms:.2f}ms)",
                 exc_info=True,
                 extra={
-                    "method": request.method,
-                    "path": request.url.path,
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
                     "duration_ms": duration_ms,
                     "error": str(e)
                 }
             )
             raise
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-
-        # Add performance header to response
-        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-        # Log request
-        self._log_request(request, response, duration_ms)
-
-        return response
+        # Full duration, including streamed bodies
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        is_slow = duration_ms >= SLOW_REQUEST_THRESHOLD_MS
+        self.metrics.record_request(route_template(scope), status_code, duration_ms, is_slow=is_slow)
+        self._log_request(scope, status_code, duration_ms, is_slow)
 
-    def _log_request(self, request: Request, response: Response, duration_ms: float):
+    def _log_request(self, scope: Scope, status_code: int, duration_ms: float, is_slow: bool):
         """
         Log request with performance metrics.
 
         Args:
-            request: FastAPI request
-            response: FastAPI response
+            scope: ASGI scope
+            status_code: Response status code
             duration_ms: Request duration in milliseconds
+            is_slow: Whether the request crossed SLOW_REQUEST_THRESHOLD_MS
         """
-        # Determine if request is slow
-        is_slow = duration_ms >= SLOW_REQUEST_THRESHOLD_MS
-
-        # Build log message
-        method = request.method
-        path = request.url.path
-        status_code = response.status_code
-
         # Log level based on status code and duration
         if status_code >= 500:
             log_level = logging.ERROR
@@ -127,12 +139,16 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         else:
             log_level = logging.DEBUG
 
-        # Log message
+        if not logger.isEnabledFor(log_level):
+            return
+
+        method = scope.get("method")
+        path = scope.get("path")
         message = f"{method} {path} → {status_code} ({duration_ms:.2f}ms)"
         if is_slow:
             message += " [SLOW REQUEST]"
 
-        # Log with context
+        query_string = scope.get("query_string", b"").decode("latin-1")
         logger.log(
             log_level,
             message,
@@ -142,27 +158,85 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
                 "status_code": status_code,
                 "duration_ms": duration_ms,
                 "is_slow": is_slow,
-                "query_params": dict(request.query_params) if request.query_params else None
+                "query_params": query_string or None
             }
         )
 
 
 # =============================================================================
-# Performance Metrics Collector (Optional)
+# Performance Metrics Collector
 # =============================================================================
 
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram (constant memory per route).
+
+    Percentiles are estimated by linear interpolation inside the bucket that
+    contains the requested rank, clamped to the observed min/max.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms < self.min_ms:
+            self.min_ms = duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def percentile(self, q: float) -> float:
+        """Estimated q-th percentile (0-100) in milliseconds."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                value = lower + (upper - lower) * ((rank - seen) / bucket_count)
+                return min(max(value, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        buckets = {f"le_{bound}": n for bound, n in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "min_ms": round(self.min_ms, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": round(self.percentile(50), 2),
+            "p90_ms": round(self.percentile(90), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "buckets": buckets,
+        }
+
+
 class PerformanceMetrics:
     """
     Collects and aggregates performance metrics.
 
     Tracks:
-    - Request counts by endpoint and status code
-    - Average/min/max response times
+    - Request counts by route template and status code
+    - Latency histograms (avg/min/max/p50/p90/p99) per route template
     - Slow request counts
     - Error rates
     """
 
     def __init__(self):
+        self._lock = threading.Lock()
         self.metrics = {
             "total_requests": 0,
             "total_duration_ms": 0,
@@ -171,6 +245,7 @@ class PerformanceMetrics:
             "by_endpoint": {},  # {endpoint: {count, total_duration, errors}}
             "by_status_code": {}  # {status_code: count}
         }
+        self.histograms: Dict[str, LatencyHistogram] = {}
 
     def record_request(
         self,
@@ -180,44 +255,50 @@ class PerformanceMetrics:
         is_slow: bool = False
     ):
         """Record a request in the metrics."""
-        # Update totals
-        self.metrics["total_requests"] += 1
-        self.metrics["total_duration_ms"] += duration_ms
-
-        if is_slow:
-            self.metrics["slow_requests"] += 1
-
-        if status_code >= 400:
-            self.metrics["errors"] += 1
-
-        # Update by endpoint
-        if endpoint not in self.metrics["by_endpoint"]:
-            self.metrics["by_endpoint"][endpoint] = {
-                "count": 0,
-                "total_duration_ms": 0,
-                "errors": 0,
-                "slow_requests": 0
-            }
-
-        endpoint_metrics = self.metrics["by_endpoint"][endpoint]
-        endpoint_metrics["count"] += 1
-        endpoint_metrics["total_duration_ms"] += duration_ms
-
-        if status_code >= 400:
-            endpoint_metrics["errors"] += 1
-
-        if is_slow:
-            endpoint_metrics["slow_requests"] += 1
+        with self._lock:
+            metrics = self.metrics
+            metrics["total_requests"] += 1
+            metrics["total_duration_ms"] += duration_ms
+
+            if is_slow:
+                metrics["slow_requests"] += 1
+
+            if status_code >= 400:
+                metrics["errors"] += 1
+
+            endpoint_metrics = metrics["by_endpoint"].get(endpoint)
+            if endpoint_metrics is None:
+                endpoint_metrics = metrics["by_endpoint"][endpoint] = {
+                    "count": 0,
+                    "total_duration_ms": 0,
+                    "errors": 0,
+                    "slow_requests": 0
+                }
+                self.histograms[endpoint] = LatencyHistogram()
 
-        # Update by status code
-        if status_code not in self.metrics["by_status_code"]:
-            self.metrics["by_status_code"][status_code] = 0
+            endpoint_metrics["count"] += 1
+            endpoint_metrics["total_duration_ms"] += duration_ms
+            if status_code >= 400:
+                endpoint_metrics["errors"] += 1
+            if is_slow:
+                endpoint_metrics["slow_requests"] += 1
+            self.histograms[endpoint].observe(duration_ms)
 
-        self.metrics["by_status_code"][status_code] += 1
+            by_status = metrics["by_status_code"]
+            by_status[status_code] = by_status.get(status_code, 0) + 1
 
     def get_metrics(self) -> dict:
         """Get current metrics."""
-        metrics = self.metrics.copy()
+        with self._lock:
+            metrics = {
+                **self.metrics,
+                "by_endpoint": {k: dict(v) for k, v in self.metrics["by_endpoint"].items()},
+                "by_status_code": dict(self.metrics["by_status_code"]),
+            }
+            percentiles = {
+                endpoint: (hist.percentile(50), hist.percentile(99))
+                for endpoint, hist in self.histograms.items()
+            }
 
         # Calculate averages
         if metrics["total_requests"] > 0:
@@ -236,9 +317,16 @@ class PerformanceMetrics:
             if data["count"] > 0:
                 data["avg_duration_ms"] = data["total_duration_ms"] / data["count"]
                 data["error_rate"] = data["errors"] / data["count"]
+                data["p50_ms"], data["p99_ms"] = percentiles[endpoint]
 
         return metrics
 
+    def get_histograms(self) -> Dict[str, dict]:
+        """Latency histogram per route template, slowest p99 first."""
+        with self._lock:
+            snapshot = {endpoint: hist.to_dict() for endpoint, hist in self.histograms.items()}
+        return dict(sorted(snapshot.items(), key=lambda item: item[1]["p99_ms"], reverse=True))
+
     def reset(self):
         """Reset all metrics."""
         self.__init__()
@@ -255,5 +343,7 @@ performance_metrics = PerformanceMetrics()
 __all__ = [
     "PerformanceMiddleware",
     "PerformanceMetrics",
-    "performance_metrics"
+    "LatencyHistogram",
+    "performance_metrics",
+    "route_template"
 ]
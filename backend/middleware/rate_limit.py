@@ -10,9 +10,10 @@ Rate Limiting Middleware
 Prevents API abuse by limiting requests per IP address.
 
 Features:
-- Configurable rate limits (requests per minute)
-- Per-IP tracking using in-memory cache
-- Automatic cleanup of old entries
+- Pure ASGI (no BaseHTTPMiddleware task/memory-stream hop, SSE-safe)
+- Token bucket per (IP, limit) - O(1) time and memory per key
+- Per-route limits by path prefix (longest prefix wins)
+- Bounded key table: idle buckets expire, LRU eviction past RATE_LIMIT_MAX_KEYS
 - Bypass for health check endpoints
 - Clear error messages when rate limited
 
@@ -26,25 +27,30 @@ Usage:
 Configuration (.env):
     RATE_LIMIT_ENABLED=true
     RATE_LIMIT_REQUESTS_PER_MINUTE=60
-    RATE_LIMIT_CLEANUP_INTERVAL=300  # 5 minutes
+    # Per-route overrides: comma-separated "[METHOD ]/path/prefix=requests_per_minute"
+    RATE_LIMIT_ROUTE_LIMITS=POST /api/chat=30,/api/audio=10
+    # A limit of 0 (default or per route) disables limiting for those requests
+    RATE_LIMIT_MAX_KEYS=10000
 """
 
 import logging
+import math
 import time
 import os
-from typing import Callable
-from collections import defaultdict
-from fastapi import Request, Response
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
 RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "60"))
-RATE_LIMIT_CLEANUP_INTERVAL = int(os.getenv("RATE_LIMIT_CLEANUP_INTERVAL", "300"))  # 5 minutes
+RATE_LIMIT_ROUTE_LIMITS = os.getenv("RATE_LIMIT_ROUTE_LIMITS", "")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
 
 # Endpoints to bypass rate limiting
 RATE_LIMIT_BYPASS_PATHS = [
@@ -54,218 +60,239 @@ RATE_LIMIT_BYPASS_PATHS = [
     "/openapi.json"
 ]
 
+# Every bucket refills completely within one window
+WINDOW_SECONDS = 60.0
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """A requests-per-minute limit for a path prefix (optionally one method)."""
+    prefix: str
+    requests_per_minute: int
+    method: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.prefix}" if self.method else self.prefix
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.method and self.method != method:
+            return False
+        if self.prefix == "/":
+            return True
+        return path == self.prefix or path.startswith(self.prefix.rstrip("/") + "/")
+
+
+def parse_route_limits(spec: str) -> List[RateLimitRule]:
+    """
+    Parse "POST /api/chat=30,/api/audio=10" into rules, most specific first.
+
+    Malformed and negative entries are logged and skipped; 0 means unlimited.
+    """
+    rules = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            target, limit = entry.rsplit("=", 1)
+            parts = target.split()
+            method, prefix = (parts[0].upper(), parts[1]) if len(parts) == 2 else (None, parts[0])
+            if not prefix.startswith("/"):
+                raise ValueError("prefix must start with '/'")
+            requests_per_minute = int(limit)
+            if requests_per_minute < 0:
+                raise ValueError("limit must not be negative")
+            rules.append(RateLimitRule(prefix=prefix, requests_per_minute=requests_per_minute, method=method))
+        except (ValueError, IndexError) as e:
+            logger.warning(f"Ignoring invalid RATE_LIMIT_ROUTE_LIMITS entry {entry!r}: {e}")
+    return sorted(rules, key=lambda r: (len(r.prefix), r.method is not None), reverse=True)
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by (client, rule name).
+
+    Each bucket is [tokens, last_update]. Buckets are kept in least-recently-used
+    order; anything idle for a full window has refilled completely and is
+    dropped, so the table only holds recently active clients.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: Tuple[str, str], capacity: int) -> Tuple[bool, int, float]:
+        """
+        Take one token from the bucket for ``key``.
+
+        Returns:
+            (allowed, remaining, retry_after_seconds)
+        """
+        now = self._clock()
+        rate = capacity / WINDOW_SECONDS
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(capacity), now]
+            self._buckets[key] = bucket
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            allowed, retry_after = True, 0.0
+        else:
+            allowed, retry_after = False, (1 - bucket[0]) / rate
+
+        self._expire(now)
+        return allowed, int(bucket[0]), retry_after
+
+    def _expire(self, now: float):
+        buckets = self._buckets
+        while buckets:
+            _, updated = next(iter(buckets.values()))
+            if now - updated < WINDOW_SECONDS and len(buckets) <= self.max_keys:
+                break
+            buckets.popitem(last=False)
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class RateLimitMiddleware:
     """
     Middleware for rate limiting API requests.
 
     Tracks requests per IP address and blocks excessive requests.
     """
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-        # In-memory storage: {ip_address: [(timestamp, ...)] }
-        self.request_history = defaultdict(list)
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = RATE_LIMIT_REQUESTS_PER_MINUTE,
+        route_limits: Optional[List[RateLimitRule]] = None,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+    ):
+        self.app = app
+        self.default_rule = RateLimitRule(prefix="/", requests_per_minute=requests_per_minute)
+        self.route_limits = (
+            route_limits if route_limits is not None else parse_route_limits(RATE_LIMIT_ROUTE_LIMITS)
+        )
+        self.limiter = TokenBucketLimiter(max_keys=max_keys)
 
-        # Last cleanup timestamp
-        self.last_cleanup = time.time()
+        if requests_per_minute < 0:
+            raise ValueError("requests_per_minute must not be negative (use 0 to disable limiting)")
 
         logger.info(
-            f"Rate limiting enabled: {RATE_LIMIT_REQUESTS_PER_MINUTE} requests/minute per IP"
+            f"Rate limiting enabled: {requests_per_minute or 'unlimited'} requests/minute per IP"
+            + (f", route limits: {[r.name for r in self.route_limits]}" if self.route_limits else "")
         )
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Check rate limit before processing request.
-
-        Args:
-            request: FastAPI request
-            call_next: Next middleware in chain
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip if disabled or not HTTP
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
 
-        Returns:
-            Response: FastAPI response or 429 Too Many Requests
-        """
-        # Skip if disabled
-        if not RATE_LIMIT_ENABLED:
-            return await call_next(request)
+        path = scope["path"]
+        method = scope["method"]
 
         # Bypass rate limiting for certain endpoints
-        if any(request.url.path.startswith(path) for path in RATE_LIMIT_BYPASS_PATHS):
-            return await call_next(request)
+        if any(path.startswith(bypass) for bypass in RATE_LIMIT_BYPASS_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._rule_for(method, path)
+        if rule.requests_per_minute == 0:
+            await self.app(scope, receive, send)
+            return
 
-        # Extract IP address
-        ip_address = self._get_client_ip(request)
+        ip_address = self._get_client_ip(scope)
+        allowed, remaining, retry_after = self.limiter.acquire(
+            (ip_address, rule.name), rule.requests_per_minute
+        )
+        limit = rule.requests_per_minute
 
-        # Check rate limit
-        if self._is_rate_limited(ip_address):
+        if not allowed:
             logger.warning(
-                f"Rate limit exceeded for IP: {ip_address} ({request.method} {request.url.path})",
+                f"Rate limit exceeded for IP: {ip_address} ({method} {path})",
                 extra={
                     "ip_address": ip_address,
-                    "method": request.method,
-                    "path": request.url.path
+                    "method": method,
+                    "path": path,
+                    "rule": rule.name
                 }
             )
-
-            return JSONResponse(
+            retry_after_s = max(1, math.ceil(retry_after))
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": "TooManyRequestsError",
-                    "message": f"Rate limit exceeded. Maximum {RATE_LIMIT_REQUESTS_PER_MINUTE} requests per minute.",
+                    "message": f"Rate limit exceeded. Maximum {limit} requests per minute.",
                     "status_code": 429,
                     "detail": {
-                        "limit": RATE_LIMIT_REQUESTS_PER_MINUTE,
+                        "limit": limit,
                         "window": "1 minute",
-                        "retry_after": 60
+                        "retry_after": retry_after_s
                     }
                 },
                 headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(RATE_LIMIT_REQUESTS_PER_MINUTE),
+                    "Retry-After": str(retry_after_s),
+                    "X-RateLimit-Limit": str(limit),
                     "X-RateLimit-Remaining": "0"
                 }
             )
+            await response(scope, receive, send)
+            return
 
-        # Record request
-        self._record_request(ip_address)
-
-        # Cleanup old entries periodically
-        self._cleanup_old_entries()
+        rate_headers = [
+            (b"x-ratelimit-limit", str(limit).encode("latin-1")),
+            (b"x-ratelimit-remaining", str(max(0, remaining)).encode("latin-1")),
+        ]
 
-        # Process request
-        response = await call_next(request)
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + rate_headers}
+            await send(message)
 
-        # Add rate limit headers to response
-        remaining = self._get_remaining_requests(ip_address)
-        response.headers["X-RateLimit-Limit"] = str(RATE_LIMIT_REQUESTS_PER_MINUTE)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, remaining))
+        await self.app(scope, receive, send_wrapper)
 
-        return response
+    def _rule_for(self, method: str, path: str) -> RateLimitRule:
+        for rule in self.route_limits:
+            if rule.matches(method, path):
+                return rule
+        return self.default_rule
 
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope) -> str:
         """
-        Extract client IP address from request.
+        Extract client IP address from the ASGI scope.
 
-        Checks proxy headers (X-Forwarded-For, X-Real-IP) before falling back to client.host.
+        Checks proxy headers (X-Forwarded-For, X-Real-IP) before falling back to the client address.
 
         Args:
-            request: FastAPI request
+            scope: ASGI scope
 
         Returns:
             str: Client IP address
         """
+        headers = Headers(scope=scope)
+
         # Check X-Forwarded-For header (proxy/load balancer)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get("x-forwarded-for")
         if forwarded_for:
             # Take the first IP in the list (original client)
             return forwarded_for.split(",")[0].strip()
 
         # Check X-Real-IP header
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip
 
-        # Fallback to client.host
-        return request.client.host if request.client else "unknown"
-
-    def _is_rate_limited(self, ip_address: str) -> bool:
-        """
-        Check if IP address has exceeded rate limit.
-
-        Args:
-            ip_address: Client IP address
-
-        Returns:
-            bool: True if rate limited, False otherwise
-        """
-        current_time = time.time()
-        one_minute_ago = current_time - 60
-
-        # Get requests from last minute
-        recent_requests = [
-            timestamp
-            for timestamp in self.request_history[ip_address]
-            if timestamp > one_minute_ago
-        ]
-
-        # Update history (remove old requests)
-        self.request_history[ip_address] = recent_requests
-
-        # Check if exceeded limit
-        return len(recent_requests) >= RATE_LIMIT_REQUESTS_PER_MINUTE
-
-    def _record_request(self, ip_address: str):
-        """
-        Record a request timestamp for an IP address.
-
-        Args:
-            ip_address: Client IP address
-        """
-        self.request_history[ip_address].append(time.time())
-
-    def _get_remaining_requests(self, ip_address: str) -> int:
-        """
-        Get remaining requests for IP address in current window.
-
-        Args:
-            ip_address: Client IP address
-
-        Returns:
-            int: Number of remaining requests
-        """
-        current_time = time.time()
-        one_minute_ago = current_time - 60
-
-        # Count recent requests
-        recent_count = sum(
-            1
-            for timestamp in self.request_history[ip_address]
-            if timestamp > one_minute_ago
-        )
-
-        return RATE_LIMIT_REQUESTS_PER_MINUTE - recent_count
-
-    def _cleanup_old_entries(self):
-        """
-        Periodically cleanup old entries to prevent memory leak.
-
-        Removes entries older than cleanup interval.
-        """
-        current_time = time.time()
-
-        # Only cleanup at intervals
-        if current_time - self.last_cleanup < RATE_LIMIT_CLEANUP_INTERVAL:
-            return
-
-        logger.debug("Running rate limit cleanup...")
-
-        # Cleanup threshold (requests older than 5 minutes)
-        cleanup_threshold = current_time - RATE_LIMIT_CLEANUP_INTERVAL
-
-        # Remove old entries
-        removed_count = 0
-        for ip_address in list(self.request_history.keys()):
-            # Filter out old timestamps
-            recent_requests = [
-                timestamp
-                for timestamp in self.request_history[ip_address]
-                if timestamp > cleanup_threshold
-            ]
-
-            if recent_requests:
-                self.request_history[ip_address] = recent_requests
-            else:
-                # Remove IP if no recent requests
-                del self.request_history[ip_address]
-                removed_count += 1
-
-        self.last_cleanup = current_time
-
-        logger.debug(
-            f"Rate limit cleanup complete: removed {removed_count} IP addresses, "
-            f"{len(self.request_history)} active"
-        )
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
 
 # =============================================================================
@@ -273,5 +300,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 # =============================================================================
 
 __all__ = [
-    "RateLimitMiddleware"
+    "RateLimitMiddleware",
+    "RateLimitRule",
+    "TokenBucketLimiter",
+    "parse_route_limits"
 ]
@@ -18,6 +18,7 @@ from .deep_agent import (
     DeepAgentTemplate,
     AgentExport,
     ChatSession,
+    ChatMessageRecord,
     DeepAgentConfig,
     SubAgentConfig,
     MiddlewareConfig,
@@ -25,6 +26,8 @@ from .deep_agent import (
     GuardrailsConfig
 )
 from .execution_event import ExecutionEvent
+from .agent_usage import AgentUsageRollup
+from .checkpoint_summary import CheckpointSummary
 from .custom_tool import (
     CustomTool,
     ToolExecutionLog,
@@ -60,12 +63,15 @@ __all__ = [
     "DeepAgentTemplate",
     "AgentExport",
     "ChatSession",
+    "ChatMessageRecord",
     "DeepAgentConfig",
     "SubAgentConfig",
     "MiddlewareConfig",
     "BackendConfig",
     "GuardrailsConfig",
     "ExecutionEvent",
+    "AgentUsageRollup",
+    "CheckpointSummary",
     "CustomTool",
     "ToolExecutionLog",
     "ToolType",
@@ -0,0 +1,54 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Agent Usage Model
+Hourly rollups of model token usage, cost and tool calls.
+
+Rows are written by CostTrackingMiddleware as deltas: every flush inserts one
+row per (agent, model) or (agent, tool) that saw activity since the previous
+flush. Readers aggregate with SUM ... GROUP BY, so the write path never needs
+an upsert and the table stays small (one row per key per flush, not per call).
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index
+from db.database import Base
+import datetime
+
+
+class AgentUsageRollup(Base):
+    """
+    Aggregated usage for one agent/model (or agent/tool) within an hour bucket.
+
+    Model rows have ``tool`` NULL and carry token/cost totals; tool rows have
+    ``model`` NULL and only count calls.
+    """
+    __tablename__ = 'agent_usage_rollups'
+
+    id = Column(Integer, primary_key=True, index=True)
+    workflow_id = Column(Integer, ForeignKey('workflow_profiles.id', ondelete='CASCADE'), nullable=True)
+    task_id = Column(Integer, nullable=True, index=True)
+
+    agent = Column(String(255), nullable=False)
+    model = Column(String(255), nullable=True)
+    tool = Column(String(255), nullable=True)
+
+    # Start of the UTC hour the usage falls in
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+
+    calls = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    __table_args__ = (
+        Index('ix_agent_usage_rollups_workflow_bucket', 'workflow_id', 'bucket_start'),
+    )
+
+    def __repr__(self):
+        key = self.tool or self.model
+        return f"<AgentUsageRollup(agent='{self.agent}', key='{key}', calls={self.calls}, cost={self.cost_usd})>"
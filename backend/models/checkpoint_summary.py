@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Checkpoint Summary Model
+One row per LangGraph thread, describing its latest checkpoint.
+
+The LangGraph checkpoint tables hold every checkpoint of every thread with
+workflow fields buried in JSONB, so listing, HITL and failure queries against
+them scan and decode millions of rows. SummarizingCheckpointer upserts this
+row on every root-graph checkpoint write, and CheckpointManager's list/HITL/
+failure/statistics queries read it through the indexes below.
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, Index, text
+from db.database import Base
+import datetime
+
+
+class CheckpointSummary(Base):
+    """Latest checkpoint state of a workflow thread (derived, rebuildable)."""
+    __tablename__ = 'checkpoint_summaries'
+
+    thread_id = Column(String(255), primary_key=True)
+    task_id = Column(Integer, nullable=True, index=True)
+    workflow_id = Column(Integer, nullable=True)
+
+    latest_checkpoint_id = Column(String(255), nullable=False)
+    latest_step = Column(Integer, nullable=True)      # LangGraph superstep (metadata "step")
+    current_step = Column(String(255), nullable=True)  # WorkflowState.current_step
+    status = Column(String(50), nullable=True)         # WorkflowState.workflow_status
+    hitl_pending = Column(Boolean, nullable=False, default=False)
+    hitl_reason = Column(Text, nullable=True)
+    error_message = Column(Text, nullable=True)
+    retry_count = Column(Integer, nullable=False, default=0)
+    checkpoint_count = Column(Integer, nullable=False, default=1)
+
+    # Set by CheckpointCompactor (core/workflows/checkpointing/compaction.py)
+    compacted_at = Column(DateTime(timezone=True), nullable=True)
+    bytes_reclaimed = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    __table_args__ = (
+        # Recent listing
+        Index('ix_checkpoint_summaries_updated_at', 'updated_at'),
+        # Per-workflow listing
+        Index('ix_checkpoint_summaries_workflow_updated', 'workflow_id', 'updated_at'),
+        # Status filters / failure window / compaction candidates; the
+        # trailing columns make the per-status statistics an index-only scan
+        Index('ix_checkpoint_summaries_status_updated', 'status', 'updated_at', 'checkpoint_count', 'bytes_reclaimed'),
+        # Pending HITL is a small subset: partial index (SQLite compares
+        # booleans as integers, so its predicate has to match "= 1")
+        Index(
+            'ix_checkpoint_summaries_hitl_pending', 'updated_at',
+            postgresql_where=text('hitl_pending'),
+            sqlite_where=text('hitl_pending = 1'),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<CheckpointSummary(thread_id='{self.thread_id}', status='{self.status}', step={self.latest_step})>"
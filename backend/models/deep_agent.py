@@ -11,8 +11,8 @@ Supports middleware, subagents, backends, and advanced context management.
 """
 
 from typing import Dict, List, Any, Optional, Literal
-from sqlalchemy import Column, Integer, String, JSON, Boolean, ForeignKey, DateTime, Text, Float, Enum, text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, JSON, Boolean, ForeignKey, DateTime, Text, Float, Enum, Index, text
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from pydantic import BaseModel, Field, model_validator, field_validator
 from db.database import Base
@@ -471,8 +471,11 @@ class ChatSession(Base):
     # Runtime-native session handle (LangGraph thread_id, ADK session name, ...)
     external_session_ref = Column(String(255), nullable=True)
 
-    # Conversation data
-    messages = Column(JSON, nullable=False, default=list)  # List of messages
+    # Conversation data lives in chat_messages (see ChatMessageRecord).
+    # The legacy JSON blob is kept only for migrated/downgraded databases and
+    # is deferred so loading a session never pulls it.
+    legacy_messages = deferred(Column("messages", JSON, nullable=False, default=list))
+    message_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Performance metrics
     metrics = Column(JSON, nullable=True, default=dict)  # Token usage, tool calls, etc.
@@ -503,11 +506,72 @@ class ChatSession(Base):
     # Relationships
     agent = relationship("DeepAgentTemplate", back_populates="chat_sessions")
     documents = relationship("SessionDocument", back_populates="session", cascade="all, delete-orphan")
+    message_records = relationship(
+        "ChatMessageRecord",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="noload",
+    )
 
     def __repr__(self):
         return f"<ChatSession(id={self.id}, session_id='{self.session_id}', active={self.is_active})>"
 
 
+class ChatMessageRecord(Base):
+    """
+    A single persisted chat message.
+
+    Append-only per session: a new turn is one INSERT instead of rewriting the
+    whole conversation. message_index is the position in the conversation
+    (0-based, contiguous); deleting a message shifts later indexes down.
+    """
+    __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_session_index", "session_id", "message_index", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(
+        String(100),
+        ForeignKey("chat_sessions.session_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    message_index = Column(Integer, nullable=False)
+
+    role = Column(String(32), nullable=False)
+    content = Column(Text, nullable=False, default="")
+    timestamp = Column(String(64), nullable=True)  # ISO string, as returned by the API
+    thinking = Column(Text, nullable=True)
+    artifacts = Column(JSON, nullable=True)
+    content_blocks = Column(JSON, nullable=True)
+    has_multimodal = Column(Boolean, nullable=True)
+    banked = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    token_count = Column(Integer, nullable=True)  # content tokens + overhead, filled on insert
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Message in the dict shape the chat API has always returned."""
+        message: Dict[str, Any] = {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "banked": bool(self.banked),
+        }
+        if self.artifacts is not None:
+            message["artifacts"] = self.artifacts
+        if self.content_blocks is not None:
+            message["content_blocks"] = self.content_blocks
+        if self.has_multimodal is not None:
+            message["has_multimodal"] = self.has_multimodal
+        if self.thinking:
+            message["thinking"] = self.thinking
+        return message
+
+    def __repr__(self):
+        return f"<ChatMessageRecord(session_id='{self.session_id}', index={self.message_index}, role='{self.role}')>"
+
+
 class SessionDocument(Base):
     """
     Links uploaded documents to chat sessions.
@@ -9,7 +9,7 @@ FileVersion Model - Tracks edit history for workspace files.
 This model stores version snapshots of files created/edited by agents,
 enabling diff viewing and version comparison in the file viewer.
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, LargeBinary
 from sqlalchemy.orm import relationship
 from db.database import Base
 import datetime
@@ -24,9 +24,16 @@ class FileVersion(Base):
     version_number = Column(Integer, nullable=False)
     content_hash = Column(String(64), nullable=True)  # SHA-256 hash
 
-    # Content snapshot - full content for create/replace operations
+    # Content snapshot - full content for create/replace operations, and for
+    # keyframes in delta storage mode
     content_snapshot = Column(Text, nullable=True)
 
+    # Delta storage (services/file_version_store.py): "keyframe" rows hold
+    # content_snapshot, "delta" rows hold a compressed line delta against the
+    # previous version. NULL for rows written before delta storage.
+    storage_mode = Column(String(20), nullable=True)
+    content_delta = Column(LargeBinary, nullable=True)
+
     # Edit tracking - for edit_file operations
     operation = Column(String(50), nullable=False)  # "create", "edit", "replace"
     old_string = Column(Text, nullable=True)  # For edit_file: the string that was replaced
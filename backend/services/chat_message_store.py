@@ -0,0 +1,239 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Chat message storage (chat_messages table).
+
+Messages are stored one row per message instead of a JSON list on
+chat_sessions, so a chat turn costs one INSERT regardless of how long the
+conversation is, and history can be read a page at a time.
+
+ChatSession.message_count is the next message_index. It is bumped with an
+UPDATE ... RETURNING in the same transaction as the insert, which also locks
+the session row, so concurrent turns on one session get distinct indexes
+((session_id, message_index) is unique). None of these helpers commit -
+callers own the transaction, as with the rest of the chat routes.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.deep_agent import ChatMessageRecord, ChatSession
+
+logger = logging.getLogger(__name__)
+
+# Per-message structural overhead, matching ConversationContextService
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_RECORD_FIELDS = ("role", "content", "timestamp", "thinking", "artifacts",
+                  "content_blocks", "has_multimodal", "banked")
+
+
+def count_message_tokens(content: str) -> int:
+    """Token count stored with each message (content tokens + overhead)."""
+    from services.token_counter import get_token_counter
+    return get_token_counter().count_tokens(content or "") + MESSAGE_OVERHEAD_TOKENS
+
+
+def _record_from_dict(session_id: str, index: int, message: Dict[str, Any]) -> ChatMessageRecord:
+    values = {key: message.get(key) for key in _RECORD_FIELDS}
+    values["content"] = values["content"] if isinstance(values["content"], str) else str(values["content"] or "")
+    values["banked"] = bool(values["banked"])
+    return ChatMessageRecord(
+        session_id=session_id,
+        message_index=index,
+        token_count=count_message_tokens(values["content"]),
+        **values,
+    )
+
+
+def _update_message_count(db: Session, session: ChatSession, count: Any) -> int:
+    """
+    Set chat_sessions.message_count in SQL and return the stored value.
+
+    ``count`` may be an expression of the current value; the row stays
+    locked until the caller's transaction ends.
+    """
+    new_count = db.execute(
+        update(ChatSession)
+        .where(ChatSession.session_id == session.session_id)
+        .values(message_count=count)
+        .returning(ChatSession.message_count)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    set_committed_value(session, "message_count", new_count)
+    return new_count
+
+
+def append_message(db: Session, session: ChatSession, message: Dict[str, Any]) -> ChatMessageRecord:
+    """
+    Append one message to a session.
+
+    Args:
+        db: Database session (not committed here)
+        session: The ChatSession the message belongs to
+        message: Message dict ({role, content, timestamp, ...})
+
+    Returns:
+        The new record; record.message_index is its position in the conversation
+    """
+    index = _update_message_count(db, session, func.coalesce(ChatSession.message_count, 0) + 1) - 1
+    record = _record_from_dict(session.session_id, index, message)
+    db.add(record)
+    return record
+
+
+def get_messages(
+    db: Session,
+    session_id: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> List[ChatMessageRecord]:
+    """Messages for a session in conversation order, optionally one page."""
+    query = (
+        db.query(ChatMessageRecord)
+        .filter(ChatMessageRecord.session_id == session_id)
+        .order_by(ChatMessageRecord.message_index)
+    )
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def get_message(db: Session, session_id: str, message_index: int) -> Optional[ChatMessageRecord]:
+    """A single message by position, or None."""
+    if message_index < 0:
+        return None
+    return (
+        db.query(ChatMessageRecord)
+        .filter(
+            ChatMessageRecord.session_id == session_id,
+            ChatMessageRecord.message_index == message_index,
+        )
+        .first()
+    )
+
+
+def set_banked(db: Session, session_id: str, message_index: int, banked: bool) -> bool:
+    """Update a message's banked flag. Returns False if the message doesn't exist."""
+    updated = db.execute(
+        update(ChatMessageRecord)
+        .where(
+            ChatMessageRecord.session_id == session_id,
+            ChatMessageRecord.message_index == message_index,
+        )
+        .values(banked=banked)
+    )
+    return updated.rowcount > 0
+
+
+def delete_message(db: Session, session: ChatSession, record: ChatMessageRecord):
+    """Delete a message and shift later messages down one position."""
+    _update_message_count(db, session, ChatSession.message_count - 1)
+    message_index = record.message_index
+    db.delete(record)
+    db.flush()
+    # Shift through negative indexes: the unique index is checked row by
+    # row, so a direct "index - 1" can collide with a row not yet moved
+    for condition, new_index in (
+        (ChatMessageRecord.message_index > message_index, -ChatMessageRecord.message_index),
+        (ChatMessageRecord.message_index < 0, -ChatMessageRecord.message_index - 1),
+    ):
+        db.execute(
+            update(ChatMessageRecord)
+            .where(ChatMessageRecord.session_id == session.session_id, condition)
+            .values(message_index=new_index)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def replace_messages(db: Session, session: ChatSession, messages: Iterable[Dict[str, Any]]) -> int:
+    """Replace a session's whole history (checkpoint restore). Returns the new count."""
+    records = [_record_from_dict(session.session_id, i, msg) for i, msg in enumerate(messages)]
+    _update_message_count(db, session, len(records))
+    db.query(ChatMessageRecord).filter(
+        ChatMessageRecord.session_id == session.session_id
+    ).delete(synchronize_session=False)
+    db.add_all(records)
+    return len(records)
+
+
+def last_message_previews(db: Session, sessions: List[ChatSession], length: int = 60) -> Dict[str, str]:
+    """
+    Preview of the last message for each session, in one query.
+
+    Returns {session_id: preview}; previews longer than ``length`` end in "...".
+    """
+    targets = {s.session_id: s.message_count - 1 for s in sessions if s.message_count}
+    if not targets:
+        return {}
+
+    rows = (
+        db.query(
+            ChatMessageRecord.session_id,
+            ChatMessageRecord.message_index,
+            func.substr(ChatMessageRecord.content, 1, length + 1),
+        )
+        .filter(
+            ChatMessageRecord.session_id.in_(list(targets)),
+            ChatMessageRecord.message_index.in_(set(targets.values())),
+        )
+        .all()
+    )
+
+    previews = {}
+    for session_id, message_index, content in rows:
+        if targets.get(session_id) != message_index:
+            continue
+        content = content or ""
+        previews[session_id] = content[:length] + "..." if len(content) > length else content
+    return previews
+
+
+def session_token_count(db: Session, session_id: str) -> int:
+    """
+    Total stored tokens for a session.
+
+    Rows migrated from the legacy JSON column have no token_count yet; they
+    are counted once here and backfilled.
+    """
+    missing = (
+        db.query(ChatMessageRecord)
+        .filter(
+            ChatMessageRecord.session_id == session_id,
+            ChatMessageRecord.token_count.is_(None),
+        )
+        .all()
+    )
+    for record in missing:
+        record.token_count = count_message_tokens(record.content)
+    if missing:
+        db.flush()
+
+    total = (
+        db.query(func.coalesce(func.sum(ChatMessageRecord.token_count), 0))
+        .filter(ChatMessageRecord.session_id == session_id)
+        .scalar()
+    )
+    return int(total or 0)
+
+
+__all__ = [
+    "append_message",
+    "get_messages",
+    "get_message",
+    "set_banked",
+    "delete_message",
+    "replace_messages",
+    "last_message_previews",
+    "session_token_count",
+    "count_message_tokens",
+]
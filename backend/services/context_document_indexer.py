@@ -44,7 +44,8 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from models.core import ContextDocument, IndexingStatus, DocumentType
 from db.database import AsyncSessionLocal
-from services.llama_config import get_vector_store, get_embedding_dimension
+from services.llama_config import get_vector_store, get_embedding_dimension, get_hnsw_kwargs
+from core.workflows.events.spans import traced
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,7 @@ logger = logging.getLogger(__name__)
 CONTEXT_DOCS_TABLE_NAME = "context_documents_embeddings"
 
 
+@traced("rag.search_context_documents", kind="retrieval")
 async def search_context_documents(query: str, top_k: int = 5) -> Dict[str, Any]:
     """
     Search uploaded context documents using semantic similarity.
@@ -85,11 +87,7 @@ async def search_context_documents(query: str, top_k: int = 5) -> Dict[str, Any]
             password=parsed_url.password,
             table_name=CONTEXT_DOCS_TABLE_NAME,
             embed_dim=get_embedding_dimension(),
-            hnsw_kwargs={
-                "hnsw_m": 16,
-                "hnsw_ef_construction": 64,
-                "hnsw_ef_search": 40,
-            }
+            hnsw_kwargs=get_hnsw_kwargs()
         )
 
         # Create index and retriever
@@ -190,11 +188,7 @@ class ContextDocumentIndexer:
             password=parsed_url.password,
             table_name=CONTEXT_DOCS_TABLE_NAME,
             embed_dim=self.embedding_dimension,
-            hnsw_kwargs={
-                "hnsw_m": 16,
-                "hnsw_ef_construction": 64,
-                "hnsw_ef_search": 40,
-            }
+            hnsw_kwargs=get_hnsw_kwargs()
         )
 
     def _get_document_loader(self, file_path: Path, doc_type: DocumentType):
@@ -24,9 +24,10 @@ from llama_index.core.retrievers import BaseRetriever, VectorIndexRetriever
 from llama_index.core.indices import VectorStoreIndex
 
 from config import settings
-from db.database import SessionLocal
+from db.database import AsyncSessionLocal
 from models.core import Project, IndexingStatus
 from services.llama_config import get_vector_store, ensure_initialized
+from core.workflows.events.spans import traced
 
 logger = logging.getLogger(__name__)
 
@@ -152,7 +153,7 @@ class ContextRetriever:
         
         try:
             # Check project indexing status
-            async with SessionLocal() as session:
+            async with AsyncSessionLocal() as session:
                 project = await session.get(Project, project_id)
                 if not project:
                     raise ValueError(f"Project {project_id} not found")
@@ -193,7 +194,7 @@ class ContextRetriever:
             Project DNA summary string, or None if not available
         """
         try:
-            async with SessionLocal() as session:
+            async with AsyncSessionLocal() as session:
                 project = await session.get(Project, project_id)
                 if project and project.dna_summary:
                     logger.debug(f"Retrieved DNA summary for project {project_id} ({len(project.dna_summary)} chars)")
@@ -231,6 +232,7 @@ class ContextRetriever:
             include_original=False  # Use only the hypothesis for retrieval
         )
     
+    @traced("rag.retrieve_context", kind="retrieval")
     async def retrieve_context(
         self,
         project_id: int,
@@ -625,7 +627,7 @@ async def get_project_context_summary(project_id: int) -> Dict[str, Any]:
     """
     try:
         # Get project and indexing status
-        async with SessionLocal() as session:
+        async with AsyncSessionLocal() as session:
             project = await session.get(Project, project_id)
             if not project:
                 raise ValueError(f"Project {project_id} not found")
@@ -11,15 +11,19 @@ Provides intelligent message trimming, filtering, summarization, and
 tool loadout optimization to maximize effective context usage.
 
 Strategies:
-1. trim_messages - Token-based message trimming (LangChain built-in)
+1. Token trimming - prefix-sum cut over cached per-message token counts
 2. filter_messages - Filter by message type/role (LangChain built-in)
 3. Summarization - Compress old context into summaries
 4. Tool Loadout - Dynamic tool selection based on task
 5. Context Quarantine - Isolate large/irrelevant context sections
 """
 
+import bisect
 import logging
-from typing import List, Dict, Any, Optional, Callable, Sequence, Literal, Union
+import threading
+from collections import OrderedDict
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Callable, Sequence, Literal, Union, Tuple
 from enum import Enum
 
 from langchain_core.messages import (
@@ -28,7 +32,6 @@ from langchain_core.messages import (
     AIMessage,
     SystemMessage,
     ToolMessage,
-    trim_messages,
     filter_messages,
 )
 from langchain_core.language_models import BaseChatModel
@@ -36,6 +39,15 @@ import tiktoken
 
 logger = logging.getLogger(__name__)
 
+# Per-message token counts shared across manager instances (the workflow
+# executor builds a fresh manager per model call). Keyed by message id;
+# an entry is reused only while the message still holds the same content object.
+TOKEN_CACHE_SIZE = 16384
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_token_cache: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 
 class ContextStrategy(str, Enum):
     """Available context management strategies"""
@@ -116,6 +128,7 @@ class ContextWindowManager:
             self.encoder = tiktoken.get_encoding("cl100k_base")
         except Exception:
             self.encoder = None
+        self._encoding_name = self.encoder.name if self.encoder else "chars/4"
 
         logger.info(
             f"ContextWindowManager initialized: model={model_name}, "
@@ -139,25 +152,43 @@ class ContextWindowManager:
         Count tokens in a message list.
 
         Uses tiktoken for accurate counting with fallback to character estimation.
+        Each message is tokenized at most once (see message_tokens).
         """
         if not messages:
             return 0
+        return sum(self.token_lengths(messages))
 
-        total_tokens = 0
-
-        for message in messages:
-            content = message.content if hasattr(message, 'content') else str(message)
-
-            if self.encoder:
-                total_tokens += len(self.encoder.encode(str(content)))
-            else:
-                # Fallback: ~4 chars per token
-                total_tokens += len(str(content)) // 4
-
-            # Add overhead for message structure
-            total_tokens += 4
+    def message_tokens(self, message: BaseMessage) -> int:
+        """
+        Token count for a single message, including structural overhead.
 
-        return total_tokens
+        Counts are cached by message id, so a message carried through a long
+        session is only encoded once.
+        """
+        content = message.content if hasattr(message, 'content') else str(message)
+        msg_id = getattr(message, "id", None)
+        key = (self._encoding_name, msg_id) if msg_id else None
+
+        if key is not None:
+            with _token_cache_lock:
+                cached = _token_cache.get(key)
+                if cached is not None and cached[0] is content:
+                    _token_cache.move_to_end(key)
+                    return cached[1]
+
+        tokens = self.count_tokens_str(str(content)) + MESSAGE_OVERHEAD_TOKENS
+
+        if key is not None:
+            with _token_cache_lock:
+                _token_cache[key] = (content, tokens)
+                _token_cache.move_to_end(key)
+                while len(_token_cache) > TOKEN_CACHE_SIZE:
+                    _token_cache.popitem(last=False)
+        return tokens
+
+    def token_lengths(self, messages: Sequence[BaseMessage]) -> List[int]:
+        """Per-message token counts, aligned with ``messages``."""
+        return [self.message_tokens(msg) for msg in messages]
 
     def count_tokens_str(self, text: str) -> int:
         """Count tokens in a string"""
@@ -176,14 +207,18 @@ class ContextWindowManager:
         start_on: Optional[Literal["human", "ai"]] = "human",
     ) -> List[BaseMessage]:
         """
-        Trim messages to fit within token limit using LangChain's trim_messages.
+        Trim messages to fit within token limit.
+
+        Same semantics as LangChain's trim_messages (allow_partial=False), but
+        each message is tokenized once and the cut point is found by binary
+        search over a prefix-sum array instead of re-counting sublists.
 
         Args:
             messages: List of messages to trim
             max_tokens: Max tokens (default: self.available_context_tokens)
             strategy: "first" (keep oldest) or "last" (keep newest)
-            include_system: Keep system message when trimming
-            start_on: Require conversation to start with "human" or "ai"
+            include_system: Keep system message when trimming ("last" only)
+            start_on: Require conversation to start with "human" or "ai" ("last" only)
 
         Returns:
             Trimmed message list within token budget
@@ -192,69 +227,55 @@ class ContextWindowManager:
             return []
 
         max_tokens = max_tokens or self.available_context_tokens
+        lengths = self.token_lengths(messages)
 
-        # Use LangChain's built-in trim_messages
-        try:
-            trimmed = trim_messages(
-                messages,
-                max_tokens=max_tokens,
-                strategy=strategy,
-                token_counter=self.count_tokens,
-                include_system=include_system,
-                start_on=start_on,
-                allow_partial=False,
-            )
-
-            original_tokens = self.count_tokens(messages)
-            trimmed_tokens = self.count_tokens(trimmed)
+        if strategy == "last":
+            kept = self._trim_last(messages, lengths, max_tokens, include_system, start_on)
+        else:
+            kept = self._trim_first(lengths, max_tokens)
 
-            if len(trimmed) < len(messages):
-                logger.info(
-                    f"Trimmed messages: {len(messages)} → {len(trimmed)}, "
-                    f"tokens: {original_tokens} → {trimmed_tokens}"
-                )
+        if len(kept) < len(messages):
+            logger.info(
+                f"Trimmed messages: {len(messages)} → {len(kept)}, "
+                f"tokens: {sum(lengths)} → {sum(lengths[i] for i in kept)}"
+            )
 
-            return trimmed
+        return [messages[i] for i in kept]
 
-        except Exception as e:
-            logger.warning(f"LangChain trim_messages failed: {e}, using fallback")
-            return self._fallback_trim(messages, max_tokens, strategy)
+    @staticmethod
+    def _trim_first(lengths: List[int], max_tokens: int) -> List[int]:
+        """Indices of the longest prefix within max_tokens."""
+        prefix = list(accumulate(lengths, initial=0))
+        end = bisect.bisect_right(prefix, max_tokens) - 1
+        return list(range(end))
 
-    def _fallback_trim(
-        self,
+    @staticmethod
+    def _trim_last(
         messages: List[BaseMessage],
+        lengths: List[int],
         max_tokens: int,
-        strategy: str = "last"
-    ) -> List[BaseMessage]:
-        """Fallback trimming when LangChain trim_messages fails"""
-        if strategy == "last":
-            # Keep most recent messages
-            trimmed = []
-            current_tokens = 0
-
-            for msg in reversed(messages):
-                msg_tokens = self.count_tokens([msg])
-                if current_tokens + msg_tokens <= max_tokens:
-                    trimmed.insert(0, msg)
-                    current_tokens += msg_tokens
-                else:
-                    break
-
-            return trimmed
-        else:
-            # Keep oldest messages
-            trimmed = []
-            current_tokens = 0
-
-            for msg in messages:
-                msg_tokens = self.count_tokens([msg])
-                if current_tokens + msg_tokens <= max_tokens:
-                    trimmed.append(msg)
-                    current_tokens += msg_tokens
-                else:
-                    break
-
-            return trimmed
+        include_system: bool,
+        start_on: Optional[str],
+    ) -> List[int]:
+        """Indices of the (optional) leading system message plus the longest suffix within budget."""
+        head: List[int] = []
+        first = 0
+        budget = max_tokens
+        if include_system and isinstance(messages[0], SystemMessage):
+            head = [0]
+            first = 1
+            budget = max(0, max_tokens - lengths[0])
+
+        # prefix[i] = tokens in messages[first:first + i]; the suffix starting at
+        # i costs prefix[-1] - prefix[i], so the cut is the first i where that fits.
+        prefix = list(accumulate(lengths[first:], initial=0))
+        start = first + bisect.bisect_left(prefix, prefix[-1] - budget)
+
+        if start_on:
+            while start < len(messages) and messages[start].type != start_on:
+                start += 1
+
+        return head + list(range(start, len(messages)))
 
     def filter_by_type(
         self,
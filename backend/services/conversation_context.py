@@ -12,13 +12,13 @@ for injection into workflow execution contexts.
 
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, SystemMessage
 import tiktoken
 
-from models.deep_agent import ChatSession
+from models.deep_agent import ChatSession, ChatMessageRecord
 
 
 class ConversationContextService:
@@ -31,26 +31,14 @@ class ConversationContextService:
         """
         Calculate total token count for a chat session.
         Useful for monitoring context size.
+
+        Reads per-message token counts stored at insert time (sync sessions only).
         """
-        if not session.messages:
+        if not session.message_count:
             return 0
 
-        try:
-            encoding = tiktoken.get_encoding("cl100k_base")
-            total_tokens = 0
-
-            for msg in session.messages:
-                if isinstance(msg, dict):
-                    content = msg.get('content', '')
-                    total_tokens += len(encoding.encode(content)) + 4
-
-            return total_tokens
-
-        except Exception as e:
-            print(f"Token calculation failed: {e}")
-            # Fallback estimate
-            total_chars = sum(len(msg.get('content', '')) for msg in session.messages if isinstance(msg, dict))
-            return total_chars // 4
+        from services.chat_message_store import session_token_count
+        return session_token_count(self.db, session.session_id)
 
     async def get_context_for_agent(
         self,
@@ -100,10 +88,7 @@ class ConversationContextService:
             banked = await self._get_banked_messages(sessions, banked_message_ids)
 
             # Count total messages to decide if we need semantic search
-            total_message_count = sum(
-                len(session.messages) if session.messages else 0
-                for session in sessions
-            )
+            total_message_count = sum(session.message_count or 0 for session in sessions)
 
             # Combine and deduplicate
             seen_indices = set()
@@ -184,36 +169,48 @@ class ConversationContextService:
         sessions = result.scalars().all()
         return list(sessions)
 
-    async def _get_recent_messages(
+    async def _query_messages(
         self,
         sessions: List[ChatSession],
-        limit: int
+        *conditions,
+        newest_first: bool = False,
+        limit: Optional[int] = None
     ) -> List[Dict]:
-        """Get most recent N messages across all sessions"""
-        all_messages = []
-
-        for session in sessions:
-            if not session.messages:
-                continue
-
-            messages = session.messages if isinstance(session.messages, list) else []
+        """
+        Load message rows for the given sessions as API-shaped dicts.
 
-            for idx, msg in enumerate(messages):
-                if isinstance(msg, dict):
-                    # Add session and index info for deduplication
-                    msg_copy = msg.copy()
-                    msg_copy['_session_id'] = session.session_id
-                    msg_copy['_index'] = f"{session.session_id}:{idx}"
-                    all_messages.append(msg_copy)
+        Each dict carries _session_id and _index ("session_id:message_index")
+        for deduplication across recent/banked/semantic selections.
+        """
+        session_ids = [session.session_id for session in sessions if session.message_count]
+        if not session_ids:
+            return []
 
-        # Sort by timestamp (most recent first)
-        all_messages.sort(
-            key=lambda m: m.get('timestamp', ''),
-            reverse=True
+        order = ChatMessageRecord.timestamp.desc() if newest_first else ChatMessageRecord.timestamp
+        stmt = (
+            select(ChatMessageRecord)
+            .where(ChatMessageRecord.session_id.in_(session_ids), *conditions)
+            .order_by(order, ChatMessageRecord.message_index)
         )
+        if limit is not None:
+            stmt = stmt.limit(limit)
 
-        # Take most recent N
-        recent = all_messages[:limit]
+        result = await self.db.execute(stmt)
+        messages = []
+        for record in result.scalars().all():
+            msg = record.to_dict()
+            msg['_session_id'] = record.session_id
+            msg['_index'] = f"{record.session_id}:{record.message_index}"
+            messages.append(msg)
+        return messages
+
+    async def _get_recent_messages(
+        self,
+        sessions: List[ChatSession],
+        limit: int
+    ) -> List[Dict]:
+        """Get most recent N messages across all sessions"""
+        recent = await self._query_messages(sessions, newest_first=True, limit=limit)
 
         # Reverse to get chronological order (oldest first)
         recent.reverse()
@@ -225,25 +222,7 @@ class ConversationContextService:
         sessions: List[ChatSession]
     ) -> List[Dict]:
         """Get all messages from all sessions"""
-        all_messages = []
-
-        for session in sessions:
-            if not session.messages:
-                continue
-
-            messages = session.messages if isinstance(session.messages, list) else []
-
-            for idx, msg in enumerate(messages):
-                if isinstance(msg, dict):
-                    msg_copy = msg.copy()
-                    msg_copy['_session_id'] = session.session_id
-                    msg_copy['_index'] = f"{session.session_id}:{idx}"
-                    all_messages.append(msg_copy)
-
-        # Sort chronologically
-        all_messages.sort(key=lambda m: m.get('timestamp', ''))
-
-        return all_messages
+        return await self._query_messages(sessions)
 
     async def _get_banked_messages(
         self,
@@ -254,29 +233,22 @@ class ConversationContextService:
         if not banked_ids:
             return []
 
-        banked_messages = []
-
-        for session in sessions:
-            if not session.messages:
-                continue
-
-            messages = session.messages if isinstance(session.messages, list) else []
-
-            for idx, msg in enumerate(messages):
-                if isinstance(msg, dict):
-                    msg_index = f"{session.session_id}:{idx}"
-
-                    # Check if this message is banked
-                    if msg.get('banked', False) or msg_index in banked_ids:
-                        msg_copy = msg.copy()
-                        msg_copy['_session_id'] = session.session_id
-                        msg_copy['_index'] = msg_index
-                        banked_messages.append(msg_copy)
-
-        # Sort chronologically
-        banked_messages.sort(key=lambda m: m.get('timestamp', ''))
-
-        return banked_messages
+        # Explicitly requested ids are "session_id:message_index"
+        requested = {}
+        for banked_id in banked_ids:
+            session_id, _, index = str(banked_id).rpartition(":")
+            if session_id and index.isdigit():
+                requested.setdefault(session_id, set()).add(int(index))
+
+        condition = ChatMessageRecord.banked == True
+        for session_id, indexes in requested.items():
+            condition = or_(condition, and_(
+                ChatMessageRecord.session_id == session_id,
+                ChatMessageRecord.message_index.in_(indexes)
+            ))
+
+        # Sorted chronologically
+        return await self._query_messages(sessions, condition)
 
     def _format_as_langchain_messages(
         self,
@@ -8,14 +8,278 @@ Diff Service - Generate diffs for file version comparison.
 
 Provides utilities for generating unified diffs, side-by-side comparisons,
 and diff statistics for the file viewer.
+
+Line diffs use diff_lines(): lines are interned to integers, the common
+prefix/suffix is trimmed, and the rest goes through linear-space Myers
+(middle snake bisection). difflib.SequenceMatcher goes super-linear on
+large or repetitive files; Myers is O((N+M)·D) for D changed lines. When
+DIFF_TIMEOUT_SECONDS runs out, or the trimmed input exceeds DIFF_MAX_LINES,
+the unresolved regions are reported as whole replace blocks (a coarse but
+valid diff) and the result is marked truncated.
 """
 import difflib
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import os
+import time
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Time budget per line diff; past it, remaining regions become replace blocks
+DIFF_TIMEOUT_SECONDS = float(os.getenv("DIFF_TIMEOUT_SECONDS", "2.0"))
+# Size budget: changed regions larger than this (old + new lines) aren't diffed
+DIFF_MAX_LINES = int(os.getenv("DIFF_MAX_LINES", "1000000"))
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+@dataclass
+class LineDiff:
+    """Result of diff_lines(): difflib-style opcodes over two line lists."""
+    opcodes: List[Opcode]
+    matched: int  # lines in 'equal' opcodes
+    truncated: bool = False  # budget ran out; some regions are coarse
+
+    def ratio(self, total: int) -> float:
+        """Similarity like SequenceMatcher.ratio() (2·matches / total lines)."""
+        return 2.0 * self.matched / total if total else 1.0
+
+
+def _bisect(a: Sequence[int], b: Sequence[int], deadline: float) -> Optional[Tuple[int, int]]:
+    """
+    Find the middle snake of the shortest edit script between a and b.
+
+    Returns the split point (x, y), or None if a and b share nothing or the
+    deadline passed (the caller then treats the region as one replace).
+    """
+    n, m = len(a), len(b)
+    max_d = (n + m + 1) // 2
+    offset = max_d
+    size = 2 * max_d + 2
+    v1 = [-1] * size
+    v2 = [-1] * size
+    v1[offset + 1] = 0
+    v2[offset + 1] = 0
+    delta = n - m
+    # Odd delta: the forward path meets the reverse one; even: the reverse
+    front = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+
+    for d in range(max_d):
+        if time.monotonic() > deadline:
+            return None
+
+        # Forward path
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            k1_offset = offset + k1
+            if k1 == -d or (k1 != d and v1[k1_offset - 1] < v1[k1_offset + 1]):
+                x1 = v1[k1_offset + 1]
+            else:
+                x1 = v1[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[x1] == b[y1]:
+                x1 += 1
+                y1 += 1
+            v1[k1_offset] = x1
+            if x1 > n:
+                k1end += 2  # ran off the right
+            elif y1 > m:
+                k1start += 2  # ran off the bottom
+            elif front:
+                k2_offset = offset + delta - k1
+                if 0 <= k2_offset < size and v2[k2_offset] != -1 and x1 >= n - v2[k2_offset]:
+                    return x1, y1
+
+        # Reverse path
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            k2_offset = offset + k2
+            if k2 == -d or (k2 != d and v2[k2_offset - 1] < v2[k2_offset + 1]):
+                x2 = v2[k2_offset + 1]
+            else:
+                x2 = v2[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[n - x2 - 1] == b[m - y2 - 1]:
+                x2 += 1
+                y2 += 1
+            v2[k2_offset] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not front:
+                k1_offset = offset + delta - k2
+                if 0 <= k1_offset < size and v1[k1_offset] != -1:
+                    x1 = v1[k1_offset]
+                    if x1 >= n - x2:
+                        return x1, offset + x1 - k1_offset
+
+    return None
+
+
+def _opcodes_from_blocks(blocks: List[Tuple[int, int, int]], n: int, m: int) -> List[Opcode]:
+    """difflib-style opcodes from sorted, non-overlapping matching blocks."""
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in blocks + [(n, m, 0)]:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def diff_lines(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    timeout: Optional[float] = None,
+    max_lines: Optional[int] = None
+) -> LineDiff:
+    """
+    Diff two line lists within a time and size budget.
+
+    Args:
+        old_lines: Lines of the original content
+        new_lines: Lines of the new content
+        timeout: Seconds before falling back to coarse output
+            (default DIFF_TIMEOUT_SECONDS)
+        max_lines: Largest changed region (old + new lines) that is diffed
+            line by line (default DIFF_MAX_LINES)
+
+    Returns:
+        LineDiff with opcodes in SequenceMatcher.get_opcodes() format
+    """
+    deadline = time.monotonic() + (DIFF_TIMEOUT_SECONDS if timeout is None else timeout)
+    max_lines = DIFF_MAX_LINES if max_lines is None else max_lines
+
+    # Intern lines so the inner loops compare small ints
+    ids: Dict[str, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in old_lines]
+    b = [ids.setdefault(line, len(ids)) for line in new_lines]
+
+    blocks: List[Tuple[int, int, int]] = []
+    truncated = False
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        a_lo, a_hi, b_lo, b_hi = regions.pop()
+
+        # Common prefix / suffix
+        start = 0
+        limit = min(a_hi - a_lo, b_hi - b_lo)
+        while start < limit and a[a_lo + start] == b[b_lo + start]:
+            start += 1
+        if start:
+            blocks.append((a_lo, b_lo, start))
+            a_lo += start
+            b_lo += start
+        end = 0
+        limit = min(a_hi - a_lo, b_hi - b_lo)
+        while end < limit and a[a_hi - 1 - end] == b[b_hi - 1 - end]:
+            end += 1
+        if end:
+            a_hi -= end
+            b_hi -= end
+            blocks.append((a_hi, b_hi, end))
+
+        if a_lo == a_hi or b_lo == b_hi:
+            continue  # pure insert or delete
+        if (a_hi - a_lo) + (b_hi - b_lo) > max_lines:
+            truncated = True
+            continue
+
+        split = _bisect(a[a_lo:a_hi], b[b_lo:b_hi], deadline)
+        if split is None:
+            truncated = truncated or time.monotonic() > deadline
+            continue
+        x, y = split
+        regions.append((a_lo + x, a_hi, b_lo + y, b_hi))
+        regions.append((a_lo, a_lo + x, b_lo, b_lo + y))
+
+    # Merge touching blocks so 'equal' runs come out whole
+    blocks.sort()
+    merged: List[Tuple[int, int, int]] = []
+    for ai, bj, size in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == ai and merged[-1][1] + merged[-1][2] == bj:
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + size)
+        else:
+            merged.append((ai, bj, size))
+
+    if truncated:
+        logger.info(f"Diff budget exceeded ({len(a)} vs {len(b)} lines); returning a coarse diff")
+
+    return LineDiff(
+        opcodes=_opcodes_from_blocks(merged, len(a), len(b)),
+        matched=sum(size for _, _, size in merged),
+        truncated=truncated
+    )
+
+
+def group_opcodes(opcodes: List[Opcode], n: int = 3) -> List[List[Opcode]]:
+    """Hunks of opcodes with n lines of context (SequenceMatcher.get_grouped_opcodes)."""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    groups = []
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _split_line_ending_changes(
+    opcodes: List[Opcode],
+    old_lines: Sequence[str],
+    new_lines: Sequence[str]
+) -> List[Opcode]:
+    """
+    Turn 'equal' lines whose line endings differ into 'replace' runs.
+
+    Opcodes are computed on lines without their endings; the unified diff
+    prints lines with them, so e.g. CRLF -> LF still has to show up there.
+    """
+    out: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag != 'equal':
+            out.append((tag, i1, i2, j1, j2))
+            continue
+        start = 0
+        while start < i2 - i1:
+            same = old_lines[i1 + start] == new_lines[j1 + start]
+            end = start + 1
+            while end < i2 - i1 and (old_lines[i1 + end] == new_lines[j1 + end]) == same:
+                end += 1
+            out.append(('equal' if same else 'replace', i1 + start, i1 + end, j1 + start, j1 + end))
+            start = end
+    return out
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff range ("start,length"), as difflib formats it."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
 
 @dataclass
 class DiffLine:
@@ -44,6 +308,7 @@ class DiffStats:
     lines_changed: int
     total_changes: int
     similarity_ratio: float
+    truncated: bool = False  # diff budget ran out; counts are from a coarse diff
 
 
 @dataclass
@@ -60,14 +325,26 @@ class SideBySideLine:
 class DiffService:
     """Service for generating file diffs."""
 
-    def __init__(self, context_lines: int = 3):
+    def __init__(self, context_lines: int = 3, timeout: Optional[float] = None):
         """
         Initialize the diff service.
 
         Args:
             context_lines: Number of context lines around changes (default: 3)
+            timeout: Time budget per diff in seconds (default: DIFF_TIMEOUT_SECONDS)
         """
         self.context_lines = context_lines
+        self.timeout = timeout
+        self._last: Optional[Tuple[str, str, LineDiff]] = None
+
+    def _diff(self, old_content: str, new_content: str, old_lines: List[str], new_lines: List[str]) -> LineDiff:
+        # Side-by-side and stats for the same pair share one diff
+        last = self._last
+        if last is not None and last[0] is old_content and last[1] is new_content:
+            return last[2]
+        result = diff_lines(old_lines, new_lines, timeout=self.timeout)
+        self._last = (old_content, new_content, result)
+        return result
 
     def generate_unified_diff(
         self,
@@ -91,15 +368,29 @@ class DiffService:
         old_lines = old_content.splitlines(keepends=True)
         new_lines = new_content.splitlines(keepends=True)
 
-        diff = difflib.unified_diff(
-            old_lines,
-            new_lines,
-            fromfile=old_name,
-            tofile=new_name,
-            n=self.context_lines
-        )
+        # Reuses the diff side-by-side and stats use (lines without endings)
+        result = self._diff(old_content, new_content, old_content.splitlines(), new_content.splitlines())
+        opcodes = _split_line_ending_changes(result.opcodes, old_lines, new_lines)
+        groups = group_opcodes(opcodes, self.context_lines)
+        if not groups:
+            return ''
+
+        # difflib.unified_diff's format; hunks come from our own opcodes, so
+        # this is a valid minimal unified diff, not necessarily difflib's bytes
+        out = [f'--- {old_name}\n', f'+++ {new_name}\n']
+        for group in groups:
+            first, last = group[0], group[-1]
+            out.append(f'@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n')
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    out.extend(' ' + line for line in old_lines[i1:i2])
+                    continue
+                if tag in ('replace', 'delete'):
+                    out.extend('-' + line for line in old_lines[i1:i2])
+                if tag in ('replace', 'insert'):
+                    out.extend('+' + line for line in new_lines[j1:j2])
 
-        return ''.join(diff)
+        return ''.join(out)
 
     def generate_structured_diff(
         self,
@@ -119,10 +410,10 @@ class DiffService:
         old_lines = old_content.splitlines()
         new_lines = new_content.splitlines()
 
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        result = self._diff(old_content, new_content, old_lines, new_lines)
         hunks = []
 
-        for group in matcher.get_grouped_opcodes(self.context_lines):
+        for group in group_opcodes(result.opcodes, self.context_lines):
             hunk_lines = []
             old_start = group[0][1]
             old_end = group[-1][2]
@@ -198,10 +489,10 @@ class DiffService:
         old_lines = old_content.splitlines()
         new_lines = new_content.splitlines()
 
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        opcodes = self._diff(old_content, new_content, old_lines, new_lines).opcodes
         result = []
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == 'equal':
                 for i in range(i2 - i1):
                     result.append(SideBySideLine(
@@ -264,13 +555,13 @@ class DiffService:
         old_lines = old_content.splitlines()
         new_lines = new_content.splitlines()
 
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        result = self._diff(old_content, new_content, old_lines, new_lines)
 
         lines_added = 0
         lines_removed = 0
         lines_changed = 0
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in result.opcodes:
             if tag == 'delete':
                 lines_removed += i2 - i1
             elif tag == 'insert':
@@ -289,7 +580,8 @@ class DiffService:
             lines_removed=lines_removed,
             lines_changed=lines_changed,
             total_changes=lines_added + lines_removed + lines_changed,
-            similarity_ratio=matcher.ratio()
+            similarity_ratio=result.ratio(len(old_lines) + len(new_lines)),
+            truncated=result.truncated
         )
 
     def highlight_inline_changes(
@@ -351,20 +643,7 @@ def generate_side_by_side(old: str, new: str) -> List[Dict[str, Any]]:
     Returns:
         List of line dictionaries for side-by-side view
     """
-    service = DiffService()
-    lines = service.generate_side_by_side(old, new)
-
-    return [
-        {
-            'left_num': line.left_num,
-            'left_content': line.left_content,
-            'left_type': line.left_type,
-            'right_num': line.right_num,
-            'right_content': line.right_content,
-            'right_type': line.right_type,
-        }
-        for line in lines
-    ]
+    return _side_by_side_dicts(DiffService().generate_side_by_side(old, new))
 
 
 def get_diff_stats(old: str, new: str) -> Dict[str, Any]:
@@ -378,13 +657,53 @@ def get_diff_stats(old: str, new: str) -> Dict[str, Any]:
     Returns:
         Dictionary with diff statistics
     """
+    return _stats_dict(DiffService().calculate_stats(old, new))
+
+
+def generate_file_diff(old: str, new: str, filename: str = "file") -> Dict[str, Any]:
+    """
+    Unified diff, side-by-side view and statistics in one pass.
+
+    All three share a single line diff, so the whole call stays within one
+    DIFF_TIMEOUT_SECONDS budget. CPU-bound on large files, so async callers
+    should run it in a worker thread.
+
+    Args:
+        old: The original content
+        new: The new content
+        filename: Name to use in diff headers
+
+    Returns:
+        Dictionary with unified_diff, side_by_side and stats
+    """
     service = DiffService()
-    stats = service.calculate_stats(old, new)
+    return {
+        'unified_diff': service.generate_unified_diff(old, new, f"a/{filename}", f"b/{filename}"),
+        'side_by_side': _side_by_side_dicts(service.generate_side_by_side(old, new)),
+        'stats': _stats_dict(service.calculate_stats(old, new)),
+    }
+
+
+def _side_by_side_dicts(lines: List[SideBySideLine]) -> List[Dict[str, Any]]:
+    return [
+        {
+            'left_num': line.left_num,
+            'left_content': line.left_content,
+            'left_type': line.left_type,
+            'right_num': line.right_num,
+            'right_content': line.right_content,
+            'right_type': line.right_type,
+        }
+        for line in lines
+    ]
+
 
+def _stats_dict(stats: DiffStats) -> Dict[str, Any]:
     return {
         'lines_added': stats.lines_added,
         'lines_removed': stats.lines_removed,
         'lines_changed': stats.lines_changed,
         'total_changes': stats.total_changes,
         'similarity_ratio': round(stats.similarity_ratio * 100, 1),
+        'truncated': stats.truncated,
     }
@@ -19,9 +19,13 @@ from pathlib import Path
 from datetime import datetime
 
 from models.deep_agent import DeepAgentConfig, DeepAgentTemplate
+from core.codegen.export_cache import content_key
 
 logger = logging.getLogger(__name__)
 
+# Bump when standalone generator output changes so existing exports are rebuilt
+STANDALONE_EXPORT_VERSION = 1
+
 
 class ExportService:
     """Service for exporting DeepAgent configurations as code or interchange format."""
@@ -43,12 +47,27 @@ class ExportService:
         Returns:
             Path to generated .zip file
         """
-        logger.info(f"Exporting agent '{agent.name}' as standalone repository")
-
         # Create output directory
         if output_dir is None:
             output_dir = f"/tmp/deepagent_exports/{agent.id}"
 
+        # Content-address the export: skip regeneration if nothing that
+        # affects the generated files changed since the last export
+        zip_path = f"{output_dir}.zip"
+        key_path = f"{zip_path}.sha256"
+        export_key = content_key({
+            "format": STANDALONE_EXPORT_VERSION,
+            "agent": {"id": agent.id, "name": agent.name, "description": agent.description},
+            "config": config.dict(),
+        })
+        if os.path.exists(zip_path) and os.path.exists(key_path):
+            with open(key_path, 'r', encoding='utf-8') as f:
+                if f.read().strip() == export_key:
+                    logger.info(f"Standalone export for '{agent.name}' is up to date: {zip_path}")
+                    return zip_path
+
+        logger.info(f"Exporting agent '{agent.name}' as standalone repository")
+
         os.makedirs(output_dir, exist_ok=True)
 
         # Generate all files
@@ -106,12 +125,14 @@ class ExportService:
                 f.write(content)
 
         # Create zip file
-        zip_path = f"{output_dir}.zip"
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for file_path in files.keys():
                 full_path = os.path.join(output_dir, file_path)
                 zipf.write(full_path, file_path)
 
+        with open(key_path, 'w', encoding='utf-8') as f:
+            f.write(export_key)
+
         logger.info(f"✓ Standalone export created: {zip_path}")
         return zip_path
 
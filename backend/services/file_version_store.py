@@ -0,0 +1,224 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+File Version Store - keyframe + delta storage for FileVersion content.
+
+Storing a full content_snapshot per version makes a large, often-edited
+file cost O(versions x size). In "delta" mode every Nth version
+(FILE_VERSION_KEYFRAME_INTERVAL) is a keyframe holding the full text in
+content_snapshot; the versions in between hold a zlib-compressed line delta
+against the previous version in content_delta. Reading any version replays
+at most N-1 deltas from the nearest keyframe.
+
+Rows written before delta storage (storage_mode NULL) and "full" mode rows
+read exactly as before, so callers only need get_version_content().
+
+Delta format (JSON, then zlib): a list of ops applied to the previous
+version's lines (str.splitlines(keepends=True)):
+    [start, count]  copy ``count`` lines starting at ``start``
+    "text"          insert literal text
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# "delta" (keyframes + deltas) or "full" (snapshot per create/replace, as before)
+FILE_VERSION_STORAGE = os.getenv("FILE_VERSION_STORAGE", "delta")
+# Versions per keyframe; bounds the replay length of a read
+FILE_VERSION_KEYFRAME_INTERVAL = max(1, int(os.getenv("FILE_VERSION_KEYFRAME_INTERVAL", "20")))
+
+STORAGE_KEYFRAME = "keyframe"
+STORAGE_DELTA = "delta"
+
+# Above this many line comparisons the changed region is stored as an
+# insert instead of being diffed (SequenceMatcher is quadratic worst case)
+_MAX_MATCH_CELLS = 10_000_000
+
+
+def make_delta(old: str, new: str) -> bytes:
+    """Encode ``new`` as a compressed line delta against ``old``."""
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+
+    # Agent edits are usually local: strip the common head and tail first so
+    # only the changed region goes through SequenceMatcher
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    ops: List[Union[List[int], str]] = []
+    if prefix:
+        ops.append([0, prefix])
+
+    a_mid = a[prefix:len(a) - suffix]
+    b_mid = b[prefix:len(b) - suffix]
+    if a_mid and b_mid and len(a_mid) * len(b_mid) <= _MAX_MATCH_CELLS:
+        matcher = difflib.SequenceMatcher(None, a_mid, b_mid, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([prefix + i1, i2 - i1])
+            elif tag in ("replace", "insert"):
+                ops.append("".join(b_mid[j1:j2]))
+    elif b_mid:
+        ops.append("".join(b_mid))
+
+    if suffix:
+        ops.append([len(a) - suffix, suffix])
+
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"))
+
+
+def _apply_ops(lines: List[str], delta: bytes) -> List[str]:
+    out: List[str] = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            out.extend(op.splitlines(keepends=True))
+        else:
+            start, count = op
+            out.extend(lines[start:start + count])
+    return out
+
+
+def apply_delta(old: str, delta: bytes) -> str:
+    """Rebuild a version from the previous version's text and its delta."""
+    return "".join(_apply_ops(old.splitlines(keepends=True), delta))
+
+
+def build_version_storage(
+    db: Session,
+    workspace_file_id: int,
+    version_number: int,
+    operation: str,
+    content: Optional[str],
+    previous_content: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Storage columns for a new FileVersion row.
+
+    Args:
+        db: Database session
+        workspace_file_id: File the version belongs to
+        version_number: Number of the version being written
+        operation: "create", "edit" or "replace"
+        content: Full file content after the change (None if unknown)
+        previous_content: Content before the change, if the caller has it.
+            Used only when it matches the stored previous version's hash;
+            otherwise the previous version is rebuilt from the table.
+
+    Returns:
+        Column values (content_snapshot / storage_mode / content_delta)
+    """
+    if FILE_VERSION_STORAGE != "delta" or content is None:
+        return {"content_snapshot": content if operation in ("create", "replace") else None}
+
+    keyframe = {"content_snapshot": content, "storage_mode": STORAGE_KEYFRAME}
+    if (version_number - 1) % FILE_VERSION_KEYFRAME_INTERVAL == 0:
+        return keyframe
+
+    from models.file_version import FileVersion
+
+    previous_hash = db.query(FileVersion.content_hash).filter(
+        FileVersion.workspace_file_id == workspace_file_id,
+        FileVersion.version_number == version_number - 1
+    ).scalar()
+
+    if previous_content is None or previous_hash is None or \
+            hashlib.sha256(previous_content.encode("utf-8")).hexdigest() != previous_hash:
+        previous_content = load_version_content(db, workspace_file_id, version_number - 1)
+
+    if previous_content is None:
+        # Previous version can't be rebuilt (legacy edit row): start a new chain
+        return keyframe
+
+    return {
+        "content_snapshot": None,
+        "storage_mode": STORAGE_DELTA,
+        "content_delta": make_delta(previous_content, content),
+    }
+
+
+def load_version_content(db: Session, workspace_file_id: int, version_number: int) -> Optional[str]:
+    """
+    Full content of a version, replaying deltas from the nearest keyframe.
+
+    Returns:
+        The content, or None if the version has no stored content
+    """
+    from models.file_version import FileVersion
+
+    keyframe_number = db.query(FileVersion.version_number).filter(
+        FileVersion.workspace_file_id == workspace_file_id,
+        FileVersion.version_number <= version_number,
+        FileVersion.content_snapshot.isnot(None)
+    ).order_by(FileVersion.version_number.desc()).limit(1).scalar()
+
+    if keyframe_number is None:
+        return None
+
+    rows = db.query(
+        FileVersion.version_number,
+        FileVersion.storage_mode,
+        FileVersion.content_snapshot,
+        FileVersion.content_delta
+    ).filter(
+        FileVersion.workspace_file_id == workspace_file_id,
+        FileVersion.version_number >= keyframe_number,
+        FileVersion.version_number <= version_number
+    ).order_by(FileVersion.version_number).all()
+
+    if rows[-1].version_number != version_number:
+        return None
+    if len(rows) == 1:
+        return rows[0].content_snapshot
+
+    # Replay on line lists and join once at the end
+    lines = rows[0].content_snapshot.splitlines(keepends=True)
+    for row in rows[1:]:
+        if row.storage_mode != STORAGE_DELTA or row.content_delta is None:
+            return None
+        lines = _apply_ops(lines, row.content_delta)
+    return "".join(lines)
+
+
+def get_version_content(db: Session, version) -> Optional[str]:
+    """Full content of a FileVersion row (None if not stored)."""
+    if version.content_snapshot is not None:
+        return version.content_snapshot
+    if version.storage_mode == STORAGE_DELTA:
+        return load_version_content(db, version.workspace_file_id, version.version_number)
+    return None
+
+
+def has_stored_content(version) -> bool:
+    """Whether get_version_content can return this version's content."""
+    return version.content_snapshot is not None or version.storage_mode == STORAGE_DELTA
+
+
+__all__ = [
+    "FILE_VERSION_STORAGE",
+    "FILE_VERSION_KEYFRAME_INTERVAL",
+    "STORAGE_KEYFRAME",
+    "STORAGE_DELTA",
+    "make_delta",
+    "apply_delta",
+    "build_version_storage",
+    "load_version_content",
+    "get_version_content",
+    "has_stored_content",
+]
@@ -36,6 +36,11 @@ except ImportError:
     OpenAI = None
     PGVectorStore = None
 
+# HNSW index parameters for PGVector tables (see benchmarks/rag.py for tuning)
+PGVECTOR_HNSW_M = int(os.getenv("PGVECTOR_HNSW_M", "16"))
+PGVECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("PGVECTOR_HNSW_EF_CONSTRUCTION", "64"))
+PGVECTOR_HNSW_EF_SEARCH = int(os.getenv("PGVECTOR_HNSW_EF_SEARCH", "40"))
+
 # Global flag to track initialization
 _initialized = False
 _multimodal_enabled = False
@@ -100,7 +105,25 @@ def initialize_llama_index_settings(
         raise
 
 
-def get_vector_store(project_id: int, embed_dim: Optional[int] = None) -> PGVectorStore:
+def get_hnsw_kwargs() -> dict:
+    """
+    HNSW parameters for PGVectorStore.from_params(hnsw_kwargs=...).
+
+    hnsw_m and hnsw_ef_construction only apply when a table's index is
+    first created; hnsw_ef_search applies to every query.
+    """
+    return {
+        "hnsw_m": PGVECTOR_HNSW_M,
+        "hnsw_ef_construction": PGVECTOR_HNSW_EF_CONSTRUCTION,
+        "hnsw_ef_search": PGVECTOR_HNSW_EF_SEARCH,
+    }
+
+
+def get_vector_store(
+    project_id: int,
+    embed_dim: Optional[int] = None,
+    hnsw_kwargs: Optional[dict] = None
+) -> PGVectorStore:
     """
     Initialize and return a PGVectorStore for the specified project.
     
@@ -110,6 +133,7 @@ def get_vector_store(project_id: int, embed_dim: Optional[int] = None) -> PGVect
     Args:
         project_id: The project identifier for multi-tenant isolation
         embed_dim: Embedding dimension (default: auto-detect based on current model)
+        hnsw_kwargs: HNSW parameters (default: get_hnsw_kwargs())
         
     Returns:
         PGVectorStore: Configured vector store instance
@@ -151,12 +175,7 @@ def get_vector_store(project_id: int, embed_dim: Optional[int] = None) -> PGVect
             password=parsed_url.password,
             table_name=table_name,
             embed_dim=embed_dim,
-            # Additional configuration for robustness
-            hnsw_kwargs={
-                "hnsw_m": 16,
-                "hnsw_ef_construction": 64,
-                "hnsw_ef_search": 40,
-            }
+            hnsw_kwargs=hnsw_kwargs or get_hnsw_kwargs()
         )
         
         logger.info(f"PGVectorStore initialized successfully for project {project_id}")
@@ -6,11 +6,15 @@
 """
 Workflow Scheduler Service
 
-Polling-based cron scheduler that checks for due workflow schedules
-and enqueues them for execution via the background task queue.
+Timer-driven cron scheduler that enqueues due workflow schedules for
+execution via the background task queue.
 
 Features:
-- 30-second polling interval for schedule checks
+- In-process heap keyed by each schedule's next_run_at; the loop sleeps
+  until exactly the next due time instead of polling
+- Woken early when a schedule is created, edited or deleted
+  (notify_schedule_changed)
+- Periodic resync from the database for changes made by other processes
 - PostgreSQL-based locking (FOR UPDATE SKIP LOCKED) for distributed safety
 - Idempotency key support to prevent duplicate executions
 - Max concurrent runs enforcement
@@ -18,91 +22,236 @@ Features:
 """
 
 import asyncio
+import heapq
 import logging
+import os
+import time
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 from sqlalchemy.orm import Session
 from sqlalchemy import text, and_
 
 logger = logging.getLogger(__name__)
 
+# Full reload of enabled schedules, for edits that bypass this process
+SCHEDULER_RESYNC_SECONDS = float(os.getenv("SCHEDULER_RESYNC_SECONDS", "300"))
+# Delay before re-checking a schedule that was due but not claimed
+# (locked by another worker, or at its max_concurrent_runs limit)
+SCHEDULER_RETRY_SECONDS = float(os.getenv("SCHEDULER_RETRY_SECONDS", "5"))
+
 
 class SchedulerService:
     """
-    Polling-based workflow scheduler.
+    Timer-driven workflow scheduler.
 
-    Periodically checks for due schedules and enqueues workflow executions
-    via the background task queue.
+    Keeps a min-heap of (next_run_at, schedule_id) and sleeps until the
+    head is due. When it fires, the usual FOR UPDATE SKIP LOCKED scan claims
+    and enqueues the due schedules, so PostgreSQL stays the source of truth
+    for claiming; the heap only decides when to look.
 
     Features:
-    - 30-second polling interval
+    - Sub-second firing, no database queries while idle
     - Row-level locking for concurrency safety
     - Idempotency support
     - Concurrent run limiting
     """
 
-    def __init__(self, poll_interval: int = 30):
+    def __init__(
+        self,
+        resync_interval: float = SCHEDULER_RESYNC_SECONDS,
+        retry_interval: float = SCHEDULER_RETRY_SECONDS
+    ):
         """
         Initialize scheduler service.
 
         Args:
-            poll_interval: Seconds between schedule checks (default: 30)
+            resync_interval: Seconds between full reloads of schedule times
+            retry_interval: Seconds before re-checking a due schedule that
+                was not claimed
         """
-        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.retry_interval = retry_interval
         self._is_running = False
-        self._poll_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        # schedule_id -> next run (epoch seconds). Heap entries that no longer
+        # match this map are stale and skipped when popped.
+        self._next_runs: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._wakeup = asyncio.Event()
+        self._next_resync = 0.0
 
-        logger.info(f"SchedulerService initialized (poll interval: {poll_interval}s)")
+        logger.info(
+            f"SchedulerService initialized (resync: {resync_interval}s, retry: {retry_interval}s)"
+        )
 
     async def start(self):
-        """Start the scheduler polling loop."""
+        """Start the scheduler loop."""
         if self._is_running:
             logger.warning("Scheduler already running")
             return
 
         self._is_running = True
-        self._poll_task = asyncio.create_task(self._poll_loop())
+        self._loop_task = asyncio.create_task(self._run_loop())
         logger.info("Scheduler service started")
 
     async def stop(self):
-        """Stop the scheduler polling loop."""
+        """Stop the scheduler loop."""
         if not self._is_running:
             return
 
         self._is_running = False
 
-        if self._poll_task:
-            self._poll_task.cancel()
+        if self._loop_task:
+            self._loop_task.cancel()
             try:
-                await self._poll_task
+                await self._loop_task
             except asyncio.CancelledError:
                 pass
 
         logger.info("Scheduler service stopped")
 
-    async def _poll_loop(self):
-        """Main polling loop that checks for due schedules."""
-        logger.info(f"Starting scheduler poll loop (interval: {self.poll_interval}s)")
+    def notify_schedule_changed(self, schedule_id: int, next_run_at: Optional[datetime]):
+        """
+        Update a schedule's due time and wake the loop.
+
+        Call after a schedule is created, edited or deleted. Pass None for
+        deleted or disabled schedules.
+        """
+        if next_run_at is None:
+            self._next_runs.pop(schedule_id, None)
+        else:
+            self._push(schedule_id, self._to_timestamp(next_run_at))
+        self._wakeup.set()
+
+    def _push(self, schedule_id: int, due: float):
+        self._next_runs[schedule_id] = due
+        heapq.heappush(self._heap, (due, schedule_id))
+
+    def _pop_due(self, now: float) -> List[int]:
+        """Pop every live heap entry due at or before ``now``."""
+        due_ids = []
+        while self._heap and self._heap[0][0] <= now:
+            due, schedule_id = heapq.heappop(self._heap)
+            if self._next_runs.get(schedule_id) == due:
+                del self._next_runs[schedule_id]
+                due_ids.append(schedule_id)
+        return due_ids
+
+    def _next_due(self) -> Optional[float]:
+        """Earliest live due time, dropping stale heap entries on the way."""
+        while self._heap:
+            due, schedule_id = self._heap[0]
+            if self._next_runs.get(schedule_id) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    @staticmethod
+    def _to_timestamp(value: datetime) -> float:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+    async def _run_loop(self):
+        """Sleep until the next due schedule (or a change/resync), then fire."""
+        logger.info("Starting scheduler loop")
 
         while self._is_running:
             try:
-                await self._process_due_schedules()
-                await asyncio.sleep(self.poll_interval)
+                now = time.time()
+                if now >= self._next_resync:
+                    self._resync()
+                    continue
+
+                wake_at = self._next_resync
+                next_due = self._next_due()
+                if next_due is not None and next_due < wake_at:
+                    wake_at = next_due
+
+                if wake_at > now:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=wake_at - now)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._fire_due(now)
 
             except asyncio.CancelledError:
-                logger.info("Scheduler poll loop cancelled")
+                logger.info("Scheduler loop cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in scheduler poll loop: {e}", exc_info=True)
+                logger.error(f"Error in scheduler loop: {e}", exc_info=True)
                 # Continue running even if processing fails
-                await asyncio.sleep(self.poll_interval)
+                await asyncio.sleep(self.retry_interval)
+
+    def _resync(self):
+        """Reload every enabled schedule's next_run_at from the database."""
+        next_runs = self._fetch_next_runs()
+        self._next_runs = {}
+        self._heap = []
+        for schedule_id, next_run_at in next_runs.items():
+            self._push(schedule_id, self._to_timestamp(next_run_at))
+        self._next_resync = time.time() + self.resync_interval
+        logger.debug(f"Scheduler resynced {len(next_runs)} schedule(s)")
+
+    async def _fire_due(self, now: float):
+        """Claim and enqueue due schedules, then re-arm them from the database."""
+        due_ids = self._pop_due(now)
+        if not due_ids:
+            return
+
+        await self._process_due_schedules(datetime.fromtimestamp(now, timezone.utc))
+
+        # _process_schedule advanced next_run_at for the ones it claimed.
+        # Anything still due was skipped (locked elsewhere or at its
+        # concurrency limit) and is re-checked after retry_interval.
+        retry_at = time.time() + self.retry_interval
+        for schedule_id, next_run_at in self._fetch_next_runs(due_ids).items():
+            if schedule_id not in self._next_runs:
+                due = self._to_timestamp(next_run_at)
+                self._push(schedule_id, due if due > now else retry_at)
 
-    async def _process_due_schedules(self):
-        """Find and process all due schedules."""
+    def _fetch_next_runs(self, schedule_ids: Optional[List[int]] = None) -> Dict[int, datetime]:
+        """
+        Read next_run_at for enabled schedules.
+
+        Args:
+            schedule_ids: Restrict to these schedules (default: all)
+
+        Returns:
+            Map of schedule_id to next_run_at
+        """
         from db.database import SessionLocal
-        from models.workflow_schedule import WorkflowSchedule, ScheduledRunLog, ScheduleRunStatus
-        from core.task_queue import task_queue, TaskPriority
+        from models.workflow_schedule import WorkflowSchedule
+
+        db: Session = SessionLocal()
+        try:
+            query = db.query(WorkflowSchedule.id, WorkflowSchedule.next_run_at).filter(
+                WorkflowSchedule.enabled.is_(True),
+                WorkflowSchedule.next_run_at.isnot(None)
+            )
+            if schedule_ids is not None:
+                query = query.filter(WorkflowSchedule.id.in_(schedule_ids))
+            return {schedule_id: next_run_at for schedule_id, next_run_at in query.all()}
+        finally:
+            db.close()
+
+    async def _process_due_schedules(self, now: Optional[datetime] = None):
+        """
+        Find and process all due schedules.
+
+        Args:
+            now: Cutoff for next_run_at (default: current time). Passed by the
+                loop so the scan agrees with the heap's clock.
+        """
+        from db.database import SessionLocal
+
+        if now is None:
+            now = datetime.now(timezone.utc)
 
         db: Session = SessionLocal()
         try:
@@ -113,9 +262,9 @@ class SchedulerService:
                 FROM workflow_schedules
                 WHERE enabled = true
                   AND next_run_at IS NOT NULL
-                  AND next_run_at <= NOW()
+                  AND next_run_at <= :now
                 FOR UPDATE SKIP LOCKED
-            """))
+            """), {"now": now})
 
             schedule_ids = [row[0] for row in result.fetchall()]
 
@@ -337,9 +486,13 @@ class SchedulerService:
         Returns:
             Dictionary with scheduler stats
         """
+        next_due = self._next_due()
         return {
             "is_running": self._is_running,
-            "poll_interval": self.poll_interval
+            "scheduled": len(self._next_runs),
+            "next_due_at": datetime.fromtimestamp(next_due, timezone.utc).isoformat() if next_due else None,
+            "resync_interval": self.resync_interval,
+            "retry_interval": self.retry_interval
         }
 
 
@@ -355,10 +508,21 @@ def get_scheduler() -> SchedulerService:
     """Get the global scheduler instance."""
     global _scheduler
     if _scheduler is None:
-        _scheduler = SchedulerService(poll_interval=30)
+        _scheduler = SchedulerService()
     return _scheduler
 
 
+def notify_schedule_changed(schedule_id: int, next_run_at: Optional[datetime]):
+    """
+    Tell the running scheduler a schedule's due time changed.
+
+    No-op when the scheduler is not running in this process; it picks the
+    change up on its next resync instead.
+    """
+    if _scheduler is not None:
+        _scheduler.notify_schedule_changed(schedule_id, next_run_at)
+
+
 async def start_scheduler():
     """Start the global scheduler service."""
     scheduler = get_scheduler()
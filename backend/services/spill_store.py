@@ -0,0 +1,224 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Spill Store
+
+Content-addressed on-disk storage for large tool results evicted from agent
+context. Blobs are written once under their SHA-256 and read back through
+mmap, so paging through a multi-megabyte result only touches the pages that
+are actually requested. Total size is capped; least recently used blobs are
+deleted first.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPILL_STORE_PATH = os.getenv("SPILL_STORE_PATH", "./data/spill")
+SPILL_STORE_MAX_BYTES = int(os.getenv("SPILL_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Line offset tables kept for this many blobs
+LINE_INDEX_CACHE_SIZE = 8
+
+
+class SpillStore:
+    """Disk-backed, size-capped blob store with mmap-backed ranged reads."""
+
+    def __init__(self, base_dir: str = SPILL_STORE_PATH, max_bytes: int = SPILL_STORE_MAX_BYTES):
+        """
+        Initialize the spill store.
+
+        Args:
+            base_dir: Directory blobs are written to
+            max_bytes: Total size cap; older blobs are evicted past it
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()  # digest -> size, LRU order
+        self._total = 0
+        self._line_index: "OrderedDict[str, array]" = OrderedDict()
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU index from blobs already on disk (oldest first)."""
+        entries = []
+        for path in self.base_dir.glob("*/*"):
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.parent.name + path.name, stat.st_size))
+        for _, digest, size in sorted(entries):
+            self._sizes[digest] = size
+            self._total += size
+        if entries:
+            logger.info(f"Spill store at {self.base_dir} holds {len(entries)} blobs ({self._total} bytes)")
+
+    def _path(self, digest: str) -> Path:
+        return self.base_dir / digest[:2] / digest[2:]
+
+    def put(self, data: str) -> str:
+        """
+        Store a blob and return its digest. Storing identical content again
+        only refreshes its LRU position.
+        """
+        raw = data.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._path(digest)
+
+        with self._lock:
+            if digest in self._sizes and path.exists():
+                self._sizes.move_to_end(digest)
+                os.utime(path)
+                return digest
+
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+
+        with self._lock:
+            if digest not in self._sizes:
+                self._total += len(raw)
+            self._sizes[digest] = len(raw)
+            self._sizes.move_to_end(digest)
+            self._evict_locked(keep=digest)
+        return digest
+
+    def _evict_locked(self, keep: str):
+        while self._total > self.max_bytes and len(self._sizes) > 1:
+            digest, size = next(iter(self._sizes.items()))
+            if digest == keep:
+                break
+            del self._sizes[digest]
+            self._line_index.pop(digest, None)
+            self._total -= size
+            self._path(digest).unlink(missing_ok=True)
+            logger.debug(f"Spill store evicted {digest[:12]} ({size} bytes)")
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._sizes
+
+    def size(self, digest: str) -> Optional[int]:
+        """Blob size in bytes, or None if it isn't stored."""
+        return self._sizes.get(digest)
+
+    def _require(self, digest: str) -> int:
+        size = self._sizes.get(digest)
+        if size is None:
+            raise KeyError(digest)
+        return size
+
+    @contextmanager
+    def _mapped(self, digest: str) -> Iterator[mmap.mmap]:
+        """Map a non-empty blob read-only (callers handle empty blobs)."""
+        with self._lock:
+            if digest not in self._sizes:
+                raise KeyError(digest)
+            self._sizes.move_to_end(digest)
+
+        with open(self._path(digest), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mm
+            finally:
+                mm.close()
+
+    def read_range(self, digest: str, offset: int = 0, length: int = 20000) -> str:
+        """Decode ``length`` bytes starting at byte ``offset``."""
+        if not self._require(digest):
+            return ""
+        with self._mapped(digest) as mm:
+            offset = max(0, offset)
+            return mm[offset:offset + max(0, length)].decode("utf-8", errors="replace")
+
+    def _lines(self, digest: str, mm: mmap.mmap) -> array:
+        """Byte offsets of every line start, built once per blob and cached."""
+        with self._lock:
+            index = self._line_index.get(digest)
+            if index is not None:
+                self._line_index.move_to_end(digest)
+                return index
+
+        index = array("q", [0])
+        pos = mm.find(b"\n")
+        while pos != -1:
+            index.append(pos + 1)
+            pos = mm.find(b"\n", pos + 1)
+
+        with self._lock:
+            self._line_index[digest] = index
+            while len(self._line_index) > LINE_INDEX_CACHE_SIZE:
+                self._line_index.popitem(last=False)
+        return index
+
+    def read_lines(self, digest: str, start_line: int = 0, num_lines: int = 100) -> Tuple[str, int]:
+        """
+        Read a window of lines.
+
+        Returns:
+            (text, total_line_count)
+        """
+        size = self._require(digest)
+        if not size:
+            return "", 0
+        with self._mapped(digest) as mm:
+            index = self._lines(digest, mm)
+            total = len(index) if index[-1] < size else len(index) - 1
+            start = min(max(0, start_line), total)
+            end = min(total, start + max(0, num_lines))
+            if start >= end:
+                return "", total
+            stop = index[end] if end < len(index) else size
+            return mm[index[start]:stop].decode("utf-8", errors="replace"), total
+
+    def grep(self, digest: str, pattern: str, max_matches: int = 50) -> List[Tuple[int, str]]:
+        """
+        Regex search line by line.
+
+        Returns:
+            Up to ``max_matches`` (line_number, line) pairs, 0-based
+        """
+        regex = re.compile(pattern.encode("utf-8"))
+        matches = []
+        if not self._require(digest):
+            return matches
+        with self._mapped(digest) as mm:
+            for line_no, line in enumerate(iter(mm.readline, b"")):
+                if regex.search(line):
+                    matches.append((line_no, line.rstrip(b"\r\n").decode("utf-8", errors="replace")))
+                    if len(matches) >= max_matches:
+                        break
+        return matches
+
+
+_spill_store: Optional[SpillStore] = None
+
+
+def get_spill_store() -> SpillStore:
+    """Get the process-wide spill store."""
+    global _spill_store
+    if _spill_store is None:
+        _spill_store = SpillStore()
+    return _spill_store
+
+
+__all__ = [
+    "SpillStore",
+    "get_spill_store",
+]
@@ -13,20 +13,44 @@ Features:
 - Pattern-based file matching (glob patterns)
 - Debouncing to prevent rapid re-triggers
 - Configurable event types (created, modified, deleted, moved)
+- Batching: events inside a trigger's batch window are coalesced per path
+  and delivered as one workflow run carrying the list of changed files
+- Concurrent run cap per trigger (pending batches wait and keep merging,
+  up to max_held_files; runs left unfinished by a dead worker expire)
+- One shared watchdog Observer with a watch per distinct root directory;
+  events are routed to triggers through a directory/pattern index
 - Automatic cleanup on shutdown
 """
 
 import asyncio
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Dict, Optional, Any
-from threading import Thread
+from typing import Dict, Iterable, List, Optional, Any
 
 logger = logging.getLogger(__name__)
 
+# Defaults for triggers that don't set batch_window_seconds / batch_max_files /
+# max_concurrent_runs in their config
+FILE_WATCH_BATCH_WINDOW_SECONDS = float(os.getenv("FILE_WATCH_BATCH_WINDOW_SECONDS", "2"))
+FILE_WATCH_BATCH_MAX_FILES = int(os.getenv("FILE_WATCH_BATCH_MAX_FILES", "500"))
+FILE_WATCH_MAX_CONCURRENT_RUNS = int(os.getenv("FILE_WATCH_MAX_CONCURRENT_RUNS", "2"))
+# Changes a trigger may hold while at its run cap (max_held_files in config);
+# beyond this the oldest held changes are dropped
+FILE_WATCH_MAX_HELD_FILES = int(os.getenv("FILE_WATCH_MAX_HELD_FILES", "10000"))
+# Pending/running runs older than this no longer count toward the run cap, so
+# a run whose worker died doesn't block its trigger forever
+FILE_WATCH_RUN_STALE_SECONDS = float(os.getenv("FILE_WATCH_RUN_STALE_SECONDS", "3600"))
+
+# A batch is flushed after a quiet batch window, but never later than this
+# many windows after its first event (steady writers still get runs)
+_BATCH_MAX_WAIT_WINDOWS = 5
+
 # Track last trigger times for debouncing
 _last_trigger_times: Dict[str, datetime] = {}
 _debounce_check_counter: int = 0
@@ -49,44 +73,210 @@ def _cleanup_stale_debounce_entries() -> None:
         logger.debug(f"Cleaned up {len(stale_keys)} stale debounce entries")
 
 
+def _coalesce_event(previous: Optional[str], event_type: str) -> Optional[str]:
+    """
+    Merge a new event for a path into the one already pending.
+
+    A file created inside the window stays "created" through later
+    modifications or moves, and cancels out if deleted again. Otherwise the
+    latest event wins. Returns None when the path should be dropped.
+    """
+    if previous == "created":
+        if event_type == "deleted":
+            return None
+        return "created"
+    return event_type
+
+
+class _PendingBatch:
+    """Changes collected for one trigger, waiting for its batch window."""
+
+    def __init__(self):
+        self.changes: "OrderedDict[str, str]" = OrderedDict()  # path -> event_type
+        self.first_event_at: Optional[float] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.flushing = False
+        self.dropped = 0  # changes dropped since the last run (max_held_files)
+
+
+_GLOB_CHARS = set("*?[")
+
+
+class _PatternBucket:
+    """
+    Triggers registered on one directory, indexed by pattern shape.
+
+    Exact names and "*.ext" patterns are dict lookups, "*" matches
+    everything, and only other globs fall back to fnmatch - once per
+    distinct pattern, however many triggers share it.
+    """
+
+    def __init__(self):
+        self.names: Dict[str, List["FileWatchHandler"]] = {}
+        self.suffixes: Dict[str, List["FileWatchHandler"]] = {}
+        self.wildcard: List["FileWatchHandler"] = []
+        self.globs: Dict[str, List["FileWatchHandler"]] = {}
+
+    def add(self, pattern: str, handler: "FileWatchHandler"):
+        pattern = os.path.normcase(pattern)
+        if pattern == "*":
+            self.wildcard.append(handler)
+        elif not _GLOB_CHARS & set(pattern):
+            self.names.setdefault(pattern, []).append(handler)
+        elif pattern.startswith("*.") and not _GLOB_CHARS & set(pattern[1:]):
+            self.suffixes.setdefault(pattern[1:], []).append(handler)
+        else:
+            self.globs.setdefault(pattern, []).append(handler)
+
+    def collect(self, file_name: str, out: Dict[int, "FileWatchHandler"]):
+        file_name = os.path.normcase(file_name)
+        for handler in self.wildcard:
+            out[handler.trigger_id] = handler
+        for handler in self.names.get(file_name, ()):
+            out[handler.trigger_id] = handler
+        if self.suffixes:
+            # Every dotted suffix: "a.tar.gz" -> ".tar.gz", ".gz"
+            dot = file_name.find(".", 1)
+            while dot != -1:
+                for handler in self.suffixes.get(file_name[dot:], ()):
+                    out[handler.trigger_id] = handler
+                dot = file_name.find(".", dot + 1)
+        for pattern, handlers in self.globs.items():
+            if fnmatch(file_name, pattern):
+                for handler in handlers:
+                    out[handler.trigger_id] = handler
+
+
+class _DispatchIndex:
+    """
+    Routes a changed path to the triggers watching it.
+
+    Triggers are bucketed by watch directory (separately for recursive and
+    non-recursive watches). A lookup probes the file's parent directory and,
+    for recursive watches, each ancestor - one dict probe per path level - so
+    per-event cost follows path depth and the number of matching triggers,
+    not the total number of triggers. Built once per trigger change and
+    swapped in whole, so the observer thread never sees a partial index.
+    """
+
+    def __init__(self, handlers: Iterable["FileWatchHandler"] = ()):
+        self.direct: Dict[str, _PatternBucket] = {}
+        self.recursive: Dict[str, _PatternBucket] = {}
+        for handler in handlers:
+            buckets = self.recursive if handler.recursive else self.direct
+            bucket = buckets.setdefault(handler.watch_path, _PatternBucket())
+            for pattern in handler.patterns:
+                bucket.add(pattern, handler)
+
+    def match(self, file_path: str) -> List["FileWatchHandler"]:
+        directory, file_name = os.path.split(file_path)
+        out: Dict[int, FileWatchHandler] = {}
+
+        bucket = self.direct.get(directory)
+        if bucket:
+            bucket.collect(file_name, out)
+
+        if self.recursive:
+            while True:
+                bucket = self.recursive.get(directory)
+                if bucket:
+                    bucket.collect(file_name, out)
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    break
+                directory = parent
+
+        return list(out.values())
+
+
+def _plan_watch_roots(handlers: Iterable["FileWatchHandler"]) -> Dict[str, bool]:
+    """
+    Minimal set of directories to watch, mapped to whether it must be recursive.
+
+    A trigger path inside another trigger's path shares that root; the root
+    becomes recursive if any trigger under it is recursive or nested deeper.
+    """
+    roots: Dict[str, bool] = {}
+    for handler in sorted(handlers, key=lambda h: h.watch_path):
+        path = handler.watch_path
+        root = next(
+            (r for r in roots if path == r or path.startswith(r.rstrip(os.sep) + os.sep)),
+            None
+        )
+        if root is None:
+            roots[path] = handler.recursive
+        elif path != root or handler.recursive:
+            roots[root] = True
+    return roots
+
+
+def _config_value(config: dict, key: str, default: Any) -> Any:
+    value = config.get(key)
+    return default if value is None else value
+
+
 class FileWatchHandler:
     """
     Handles file system events for a specific trigger.
 
-    Filters events based on trigger config (patterns, event types)
-    and triggers workflow execution with debouncing.
+    Filters events based on trigger config (patterns, event types).
+    Dispatched events are coalesced per path in the trigger's batch window,
+    which replaces the per-path ``debounce_seconds`` check.
     """
 
     def __init__(self, trigger_id: int, workflow_id: int, config: dict):
         self.trigger_id = trigger_id
         self.workflow_id = workflow_id
         self.config = config
+        self.watch_path = os.path.abspath(config.get("watch_path") or ".")
+        self.recursive = bool(config.get("recursive", False))
         self.patterns = config.get("patterns", ["*"])
         self.events = config.get("events", ["created"])
         self.debounce_seconds = config.get("debounce_seconds", 5)
         self.input_mapping = config.get("input_mapping", {})
+        self.batch_window_seconds = float(_config_value(
+            config, "batch_window_seconds", FILE_WATCH_BATCH_WINDOW_SECONDS
+        ))
+        self.batch_max_files = max(1, int(_config_value(
+            config, "batch_max_files", FILE_WATCH_BATCH_MAX_FILES
+        )))
+        self.max_concurrent_runs = max(1, int(_config_value(
+            config, "max_concurrent_runs", FILE_WATCH_MAX_CONCURRENT_RUNS
+        )))
+        self.max_held_files = max(self.batch_max_files, int(_config_value(
+            config, "max_held_files", FILE_WATCH_MAX_HELD_FILES
+        )))
 
     def matches_pattern(self, file_path: str) -> bool:
         """Check if file matches any configured patterns."""
         file_name = os.path.basename(file_path)
         return any(fnmatch(file_name, pattern) for pattern in self.patterns)
 
+    def accepts(self, event_type: str, file_path: str) -> bool:
+        """Whether this trigger listens for the event type on this file."""
+        return event_type in self.events and self.matches_pattern(file_path)
+
     def should_trigger(self, event_type: str, file_path: str) -> bool:
-        """Determine if this event should trigger the workflow."""
+        """
+        Determine if this event should trigger the workflow on its own.
+
+        Applies the per-path debounce on top of accepts(); batched dispatch
+        skips it, since the batch window already coalesces repeated events.
+        """
         global _debounce_check_counter
 
         # Periodically clean up stale debounce entries
         _debounce_check_counter += 1
-        if _debounce_check_counter >= _DEBOUNCE_CLEANUP_INTERVAL or len(_last_trigger_times) > _DEBOUNCE_MAX_SIZE:
+        # (amortized: above _DEBOUNCE_MAX_SIZE a bulk copy would otherwise
+        # rescan the whole dict on every event)
+        if _debounce_check_counter >= _DEBOUNCE_CLEANUP_INTERVAL or (
+            len(_last_trigger_times) > _DEBOUNCE_MAX_SIZE
+            and _debounce_check_counter >= _DEBOUNCE_CLEANUP_INTERVAL // 10
+        ):
             _debounce_check_counter = 0
             _cleanup_stale_debounce_entries()
 
-        # Check event type
-        if event_type not in self.events:
-            return False
-
-        # Check pattern match
-        if not self.matches_pattern(file_path):
+        if not self.accepts(event_type, file_path):
             return False
 
         # Check debounce
@@ -106,9 +296,26 @@ class FileWatchHandler:
         _last_trigger_times[debounce_key] = now
         return True
 
-    def build_input_data(self, event_type: str, file_path: str) -> dict:
-        """Build workflow input data from the file event."""
+    def build_input_data(
+        self,
+        event_type: str,
+        file_path: str,
+        changes: Optional[List[Dict[str, str]]] = None
+    ) -> dict:
+        """
+        Build workflow input data from the file event.
+
+        Args:
+            event_type: Event type of the (first) changed file
+            file_path: Path of the (first) changed file
+            changes: Batch mode - every coalesced change in the run as
+                [{"file_path", "event_type"}]. With more than one entry the
+                template variables gain {file_count} and {file_paths}
+                (newline-separated), {dir_path} becomes the common parent and
+                the default input lists all files under context.files.
+        """
         file_path_obj = Path(file_path)
+        is_batch = bool(changes) and len(changes) > 1
 
         # Available template variables
         variables = {
@@ -119,6 +326,17 @@ class FileWatchHandler:
             "dir_path": str(file_path_obj.parent),
             "event_type": event_type,
         }
+        if is_batch:
+            paths = [change["file_path"] for change in changes]
+            try:
+                common_dir = os.path.commonpath([os.path.dirname(p) for p in paths])
+            except ValueError:
+                common_dir = str(file_path_obj.parent)
+            variables.update({
+                "dir_path": common_dir,
+                "file_count": len(changes),
+                "file_paths": "\n".join(paths),
+            })
 
         # Build input data from mapping
         input_data = {}
@@ -138,6 +356,15 @@ class FileWatchHandler:
                         target[part] = {}
                     target = target[part]
                 target[parts[-1]] = value
+        elif is_batch:
+            input_data = {
+                "task": f"Process {len(changes)} changed files in {variables['dir_path']}",
+                "context": {
+                    "dir_path": variables["dir_path"],
+                    "file_count": len(changes),
+                    "files": changes,
+                },
+            }
         else:
             # Default input structure
             input_data = {
@@ -152,16 +379,25 @@ class FileWatcherService:
     """
     Manages file system watchers for all file_watch triggers.
 
-    Loads enabled triggers from database and starts observers
-    for each configured watch path.
+    Loads enabled triggers from database and watches their paths with a
+    single shared watchdog Observer (one watch per distinct root).
     """
 
     def __init__(self):
-        self.observers: Dict[int, Any] = {}  # trigger_id -> Observer
         self.handlers: Dict[int, FileWatchHandler] = {}
+        self._batches: Dict[int, _PendingBatch] = {}
         self._is_running = False
         self._event_loop: Optional[asyncio.AbstractEventLoop] = None
 
+        self._observer = None
+        self._watches: Dict[str, Any] = {}  # root path -> ObservedWatch
+        self._event_handler = None
+        self._index = _DispatchIndex()
+
+        # Dispatch cost, measured on the observer thread
+        self._events_dispatched = 0
+        self._dispatch_cpu_seconds = 0.0
+
         logger.info("FileWatcherService initialized")
 
     async def start(self):
@@ -185,17 +421,15 @@ class FileWatcherService:
 
         self._is_running = False
 
-        # Stop all observers
-        for trigger_id, observer in list(self.observers.items()):
-            try:
-                observer.stop()
-                observer.join(timeout=5)
-                logger.debug(f"Stopped file watcher for trigger {trigger_id}")
-            except Exception as e:
-                logger.error(f"Error stopping watcher for trigger {trigger_id}: {e}")
+        self._stop_observer()
+
+        for batch in self._batches.values():
+            if batch.timer:
+                batch.timer.cancel()
 
-        self.observers.clear()
         self.handlers.clear()
+        self._batches.clear()
+        self._index = _DispatchIndex()
 
         logger.info("File watcher service stopped")
 
@@ -222,11 +456,8 @@ class FileWatcherService:
             db.close()
 
     async def start_watcher(self, trigger_id: int, workflow_id: int, config: dict):
-        """Start a file watcher for a specific trigger."""
+        """Start watching for a specific trigger."""
         try:
-            from watchdog.observers import Observer
-            from watchdog.events import FileSystemEventHandler
-
             watch_path = config.get("watch_path")
             if not watch_path:
                 logger.error(f"Trigger {trigger_id}: No watch_path configured")
@@ -246,37 +477,7 @@ class FileWatcherService:
             # Create handler
             handler = FileWatchHandler(trigger_id, workflow_id, config)
             self.handlers[trigger_id] = handler
-
-            # Create watchdog event handler wrapper
-            service = self
-
-            class WatchdogHandler(FileSystemEventHandler):
-                def on_created(self, event):
-                    if not event.is_directory:
-                        service._handle_event("created", event.src_path, handler)
-
-                def on_modified(self, event):
-                    if not event.is_directory:
-                        service._handle_event("modified", event.src_path, handler)
-
-                def on_deleted(self, event):
-                    if not event.is_directory:
-                        service._handle_event("deleted", event.src_path, handler)
-
-                def on_moved(self, event):
-                    if not event.is_directory:
-                        service._handle_event("moved", event.dest_path, handler)
-
-            # Create and start observer
-            observer = Observer()
-            observer.schedule(
-                WatchdogHandler(),
-                watch_path,
-                recursive=config.get("recursive", False)
-            )
-            observer.start()
-
-            self.observers[trigger_id] = observer
+            self._sync_watches()
 
             logger.info(
                 f"Started file watcher for trigger {trigger_id}: "
@@ -284,6 +485,7 @@ class FileWatcherService:
             )
 
         except ImportError:
+            self.handlers.pop(trigger_id, None)
             logger.error(
                 "watchdog package not installed. "
                 "Install with: pip install watchdog"
@@ -292,47 +494,240 @@ class FileWatcherService:
             logger.error(f"Error starting file watcher for trigger {trigger_id}: {e}", exc_info=True)
 
     async def stop_watcher(self, trigger_id: int):
-        """Stop a specific file watcher."""
-        if trigger_id in self.observers:
+        """Stop watching for a specific trigger."""
+        if trigger_id in self.handlers:
+            del self.handlers[trigger_id]
             try:
-                observer = self.observers[trigger_id]
-                observer.stop()
-                observer.join(timeout=5)
-                del self.observers[trigger_id]
+                self._sync_watches()
                 logger.info(f"Stopped file watcher for trigger {trigger_id}")
             except Exception as e:
                 logger.error(f"Error stopping watcher for trigger {trigger_id}: {e}")
 
-        if trigger_id in self.handlers:
-            del self.handlers[trigger_id]
+        batch = self._batches.pop(trigger_id, None)
+        if batch and batch.timer:
+            batch.timer.cancel()
 
-    def _handle_event(self, event_type: str, file_path: str, handler: FileWatchHandler):
-        """Handle a file system event."""
-        if not handler.should_trigger(event_type, file_path):
+    def _sync_watches(self):
+        """Rebuild the dispatch index and match the observer's watches to the trigger roots."""
+        roots = _plan_watch_roots(self.handlers.values())
+        self._index = _DispatchIndex(self.handlers.values())
+
+        if not roots:
+            self._stop_observer()
             return
 
-        logger.info(
-            f"File trigger {handler.trigger_id} activated: "
-            f"{event_type} {file_path}"
-        )
+        if self._observer is None:
+            from watchdog.observers import Observer
+
+            self._event_handler = self._create_event_handler()
+            self._observer = Observer()
+            self._observer.start()
+
+        for root, watch in list(self._watches.items()):
+            if roots.get(root) != watch.is_recursive:
+                self._observer.unschedule(watch)
+                del self._watches[root]
+
+        for root, recursive in roots.items():
+            if root not in self._watches:
+                self._watches[root] = self._observer.schedule(self._event_handler, root, recursive=recursive)
+                logger.debug(f"Watching {root} (recursive={recursive})")
+
+    def _stop_observer(self):
+        if self._observer is None:
+            return
+        try:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+        except Exception as e:
+            logger.error(f"Error stopping file observer: {e}")
+        self._observer = None
+        self._watches.clear()
+
+    def _create_event_handler(self):
+        """Watchdog handler shared by every watch; routes events through the index."""
+        from watchdog.events import FileSystemEventHandler
+
+        service = self
+
+        class WatchdogHandler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    service._dispatch("created", event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    service._dispatch("modified", event.src_path)
+
+            def on_deleted(self, event):
+                if not event.is_directory:
+                    service._dispatch("deleted", event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    service._dispatch("moved", event.dest_path)
+
+        return WatchdogHandler()
+
+    def _dispatch(self, event_type: str, file_path: str):
+        """Route one filesystem event to the triggers whose path and patterns match."""
+        started = time.thread_time()
+        for handler in self._index.match(file_path):
+            self._handle_event(event_type, file_path, handler)
+        self._dispatch_cpu_seconds += time.thread_time() - started
+        self._events_dispatched += 1
+
+    def _handle_event(self, event_type: str, file_path: str, handler: FileWatchHandler):
+        """Handle a file system event (called on the watchdog observer thread)."""
+        # Deletes always reach the batch so a pending change for a file that
+        # is gone again gets dropped, even if the trigger ignores deletes
+        if event_type != "deleted" and not handler.accepts(event_type, file_path):
+            return
 
-        # Build input data
-        input_data = handler.build_input_data(event_type, file_path)
+        logger.debug(f"File trigger {handler.trigger_id}: {event_type} {file_path}")
 
-        # Schedule the async trigger in the event loop
+        # Hand off to the event loop, which owns all batch state
         if self._event_loop and self._is_running:
-            asyncio.run_coroutine_threadsafe(
-                self._trigger_workflow(handler, file_path, input_data),
-                self._event_loop
+            self._event_loop.call_soon_threadsafe(self._add_change, handler, event_type, file_path)
+
+    def _add_change(self, handler: FileWatchHandler, event_type: str, file_path: str):
+        """Coalesce an event into the trigger's pending batch and arm its flush."""
+        if not self._is_running or self.handlers.get(handler.trigger_id) is not handler:
+            return
+
+        batch = self._batches.setdefault(handler.trigger_id, _PendingBatch())
+        # A change that ends up as an event the trigger ignores is dropped
+        merged = _coalesce_event(batch.changes.pop(file_path, None), event_type)
+        if merged in handler.events:
+            batch.changes[file_path] = merged
+            if batch.first_event_at is None:
+                batch.first_event_at = self._event_loop.time()
+            if len(batch.changes) > handler.max_held_files:
+                # Held at the run cap for too long; keep the newest changes
+                batch.changes.popitem(last=False)
+                if not batch.dropped:
+                    logger.warning(
+                        f"File trigger {handler.trigger_id}: more than {handler.max_held_files} "
+                        f"changes held, dropping the oldest"
+                    )
+                batch.dropped += 1
+
+        if len(batch.changes) >= handler.batch_max_files:
+            self._schedule_flush(handler, 0)
+        elif batch.changes:
+            self._schedule_flush(handler, handler.batch_window_seconds)
+
+    def _schedule_flush(self, handler: FileWatchHandler, delay: float):
+        """(Re)arm the batch timer: after a quiet ``delay``, capped by the max wait."""
+        batch = self._batches.get(handler.trigger_id)
+        if batch is None:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+
+        now = self._event_loop.time()
+        deadline = now + delay
+        if batch.first_event_at is not None:
+            deadline = min(deadline, batch.first_event_at + handler.batch_window_seconds * _BATCH_MAX_WAIT_WINDOWS)
+        batch.timer = self._event_loop.call_later(max(0.0, deadline - now), self._start_flush, handler)
+
+    def _start_flush(self, handler: FileWatchHandler):
+        batch = self._batches.get(handler.trigger_id)
+        if batch is None:
+            return
+        batch.timer = None
+        # A flush in progress re-arms the timer for whatever arrived meanwhile
+        if batch.flushing or not batch.changes:
+            return
+        batch.flushing = True
+        self._event_loop.create_task(self._flush_batch(handler, batch))
+
+    async def _flush_batch(self, handler: FileWatchHandler, batch: _PendingBatch):
+        """Deliver up to batch_max_files coalesced changes as one workflow run."""
+        try:
+            active_runs = await self._count_active_runs(handler.trigger_id)
+            if active_runs >= handler.max_concurrent_runs:
+                # Keep collecting; later events merge into this batch. The
+                # max-wait clock restarts so the retry isn't immediate.
+                batch.first_event_at = self._event_loop.time()
+                logger.debug(
+                    f"File trigger {handler.trigger_id}: {active_runs} run(s) active, "
+                    f"holding {len(batch.changes)} change(s)"
+                )
+                return
+
+            changes = []
+            while batch.changes and len(changes) < handler.batch_max_files:
+                file_path, event_type = batch.changes.popitem(last=False)
+                changes.append({"file_path": file_path, "event_type": event_type})
+            batch.first_event_at = self._event_loop.time() if batch.changes else None
+
+            if batch.dropped:
+                logger.warning(
+                    f"File trigger {handler.trigger_id}: {batch.dropped} change(s) dropped "
+                    f"while the trigger was at its run cap"
+                )
+                batch.dropped = 0
+
+            first = changes[0]
+            input_data = handler.build_input_data(first["event_type"], first["file_path"], changes=changes)
+
+            logger.info(
+                f"File trigger {handler.trigger_id} activated: {len(changes)} change(s), "
+                f"first: {first['event_type']} {first['file_path']}"
             )
+            await self._trigger_workflow(handler, first["file_path"], input_data, changes=changes)
+
+        except Exception as e:
+            logger.error(f"Error flushing file trigger {handler.trigger_id}: {e}", exc_info=True)
+        finally:
+            batch.flushing = False
+            if batch.changes and batch.timer is None and self._is_running:
+                if len(batch.changes) >= handler.batch_max_files:
+                    self._schedule_flush(handler, 0)
+                else:
+                    self._schedule_flush(handler, max(handler.batch_window_seconds, 1.0))
+
+    async def _count_active_runs(self, trigger_id: int) -> int:
+        """
+        Number of this trigger's runs that are still pending or running.
+
+        Runs triggered more than FILE_WATCH_RUN_STALE_SECONDS ago are
+        ignored: a worker that crashed mid-run never marks its log finished.
+        """
+        return await asyncio.to_thread(self._query_active_runs, trigger_id)
+
+    def _query_active_runs(self, trigger_id: int) -> int:
+        from db.database import SessionLocal
+        from models.workflow_trigger import TriggerLog, TriggerStatus
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=FILE_WATCH_RUN_STALE_SECONDS)
+        db = SessionLocal()
+        try:
+            return db.query(TriggerLog).filter(
+                TriggerLog.trigger_id == trigger_id,
+                TriggerLog.status.in_([TriggerStatus.PENDING.value, TriggerStatus.RUNNING.value]),
+                TriggerLog.triggered_at >= cutoff
+            ).count()
+        finally:
+            db.close()
 
     async def _trigger_workflow(
         self,
         handler: FileWatchHandler,
         file_path: str,
-        input_data: dict
+        input_data: dict,
+        changes: Optional[List[Dict[str, str]]] = None
     ):
-        """Trigger workflow execution via task queue."""
+        """
+        Trigger workflow execution via task queue.
+
+        Args:
+            handler: Trigger handler
+            file_path: First changed file (the trigger source)
+            input_data: Workflow input from build_input_data
+            changes: All coalesced changes delivered by this run
+        """
         from db.database import SessionLocal
         from models.workflow_trigger import WorkflowTrigger, TriggerLog, TriggerStatus
         from core.task_queue import task_queue, TaskPriority
@@ -349,13 +744,19 @@ class FileWatcherService:
                 logger.warning(f"Trigger {handler.trigger_id} not found")
                 return
 
+            trigger_source = file_path
+            trigger_payload = {"file_path": file_path, "input_data": input_data}
+            if changes and len(changes) > 1:
+                trigger_source = f"{file_path} (+{len(changes) - 1} more)"[-255:]
+                trigger_payload["file_paths"] = [change["file_path"] for change in changes]
+
             # Create trigger log
             trigger_log = TriggerLog(
                 trigger_id=handler.trigger_id,
                 triggered_at=datetime.now(timezone.utc),
                 status=TriggerStatus.PENDING.value,
-                trigger_source=file_path,
-                trigger_payload={"file_path": file_path, "input_data": input_data}
+                trigger_source=trigger_source,
+                trigger_payload=trigger_payload
             )
             db.add(trigger_log)
             db.flush()
@@ -369,7 +770,7 @@ class FileWatcherService:
                     "workflow_id": handler.workflow_id,
                     "trigger_type": "file_watch",
                     "input_data": input_data,
-                    "trigger_source": file_path,
+                    "trigger_source": trigger_source,
                 },
                 priority=TaskPriority.NORMAL
             )
@@ -416,10 +817,20 @@ class FileWatcherService:
 
     def get_stats(self) -> dict:
         """Get file watcher statistics."""
+        observer_threads = 0
+        if self._observer is not None:
+            # One dispatcher thread plus one emitter per watched root
+            observer_threads = 1 + len(self._observer.emitters)
+        events = self._events_dispatched
         return {
             "is_running": self._is_running,
-            "active_watchers": len(self.observers),
-            "trigger_ids": list(self.observers.keys()),
+            "active_watchers": len(self.handlers),
+            "trigger_ids": list(self.handlers.keys()),
+            "watched_roots": sorted(self._watches.keys()),
+            "observer_threads": observer_threads,
+            "process_threads": threading.active_count(),
+            "events_dispatched": events,
+            "avg_dispatch_cpu_us": round(self._dispatch_cpu_seconds / events * 1e6, 2) if events else 0.0,
         }
 
 
@@ -0,0 +1,196 @@
+# Copyright (c) 2025 Cade Russell (Ghost Peony)
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Persisted usage rollups (agent_usage_rollups table).
+
+CostTrackingMiddleware aggregates usage in memory and periodically hands the
+deltas to record_usage(); the workflow cost endpoint reads them back with
+workflow_usage_summary() instead of scanning every LLM_END execution event.
+Runs without rollups (older runs, or ones not flushed yet) still come from
+events: rolled_up_tasks() and rolled_up_hours() tell which events the
+rollups already cover.
+"""
+
+import datetime
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.agent_usage import AgentUsageRollup
+
+logger = logging.getLogger(__name__)
+
+
+def hour_bucket(ts: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """Start of the UTC hour containing ``ts`` (default: now)."""
+    ts = ts or datetime.datetime.now(datetime.timezone.utc)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def record_usage(
+    rows: Iterable[Dict[str, Any]],
+    workflow_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    db: Optional[Session] = None,
+) -> int:
+    """
+    Insert usage deltas as rollup rows.
+
+    Args:
+        rows: Dicts with agent plus model or tool, and calls/token/cost fields
+        workflow_id: Workflow the usage belongs to, if any
+        task_id: Task the usage belongs to, if any
+        db: Session to use; a short-lived SessionLocal is opened (and
+            committed) when omitted
+
+    Returns:
+        Number of rows written. Failures are logged, not raised - losing a
+        rollup must never fail an agent run.
+    """
+    bucket = hour_bucket()
+    records = [
+        AgentUsageRollup(
+            workflow_id=workflow_id,
+            task_id=task_id,
+            agent=row["agent"],
+            model=row.get("model"),
+            tool=row.get("tool"),
+            bucket_start=bucket,
+            calls=row.get("calls", 0),
+            prompt_tokens=row.get("prompt_tokens", 0),
+            completion_tokens=row.get("completion_tokens", 0),
+            total_tokens=row.get("total_tokens", 0),
+            cost_usd=row.get("cost_usd", 0.0),
+        )
+        for row in rows
+    ]
+    if not records:
+        return 0
+
+    owns_session = db is None
+    if owns_session:
+        from db.database import SessionLocal
+        db = SessionLocal()
+    try:
+        db.add_all(records)
+        if owns_session:
+            db.commit()
+        return len(records)
+    except Exception as e:
+        logger.warning(f"Failed to persist {len(records)} usage rollups: {e}")
+        db.rollback()
+        return 0
+    finally:
+        if owns_session:
+            db.close()
+
+
+def _rollup_filters(workflow_id: int, since: datetime.datetime) -> tuple:
+    return (
+        AgentUsageRollup.workflow_id == workflow_id,
+        AgentUsageRollup.bucket_start >= hour_bucket(since),
+    )
+
+
+def _naive_utc(ts: datetime.datetime) -> datetime.datetime:
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def rolled_up_tasks(workflow_id: int, since: datetime.datetime):
+    """Subquery of the task ids whose usage is in the workflow's rollups since ``since``."""
+    return (
+        select(AgentUsageRollup.task_id)
+        .where(*_rollup_filters(workflow_id, since), AgentUsageRollup.task_id.isnot(None))
+        .distinct()
+    )
+
+
+def rolled_up_hours(db: Session, workflow_id: int, since: datetime.datetime) -> Set[datetime.datetime]:
+    """
+    Hour buckets (naive UTC) holding rollups that aren't tied to a task.
+
+    Such rows can't be matched to events by task, so every event in their
+    hour is treated as covered; see is_rolled_up_hour().
+    """
+    rows = (
+        db.query(AgentUsageRollup.bucket_start)
+        .filter(*_rollup_filters(workflow_id, since), AgentUsageRollup.task_id.is_(None))
+        .distinct()
+        .all()
+    )
+    return {_naive_utc(bucket) for bucket, in rows}
+
+
+def is_rolled_up_hour(ts: Optional[datetime.datetime], hours: Set[datetime.datetime]) -> bool:
+    """Whether an event timestamp falls in one of ``hours`` (from rolled_up_hours())."""
+    return ts is not None and hour_bucket(_naive_utc(ts)) in hours
+
+
+def workflow_usage_summary(
+    db: Session,
+    workflow_id: int,
+    since: datetime.datetime,
+) -> Optional[Dict[str, Any]]:
+    """
+    Aggregate a workflow's rollups since ``since``.
+
+    Returns:
+        None when no rollups exist for the period, otherwise
+        {total_cost, total_tokens, prompt_tokens, completion_tokens,
+         agents: {name: {cost, tokens}}, tools: {name: count}}
+    """
+    filters = _rollup_filters(workflow_id, since)
+
+    model_rows = (
+        db.query(
+            AgentUsageRollup.agent,
+            func.sum(AgentUsageRollup.cost_usd),
+            func.sum(AgentUsageRollup.total_tokens),
+            func.sum(AgentUsageRollup.prompt_tokens),
+            func.sum(AgentUsageRollup.completion_tokens),
+        )
+        .filter(*filters, AgentUsageRollup.tool.is_(None))
+        .group_by(AgentUsageRollup.agent)
+        .all()
+    )
+    tool_rows = (
+        db.query(AgentUsageRollup.tool, func.sum(AgentUsageRollup.calls))
+        .filter(*filters, AgentUsageRollup.tool.isnot(None))
+        .group_by(AgentUsageRollup.tool)
+        .all()
+    )
+    if not model_rows and not tool_rows:
+        return None
+
+    summary = {
+        "total_cost": 0.0,
+        "total_tokens": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "agents": {},
+        "tools": {tool: int(count or 0) for tool, count in tool_rows},
+    }
+    for agent, cost, total, prompt, completion in model_rows:
+        summary["agents"][agent] = {"cost": float(cost or 0.0), "tokens": int(total or 0)}
+        summary["total_cost"] += float(cost or 0.0)
+        summary["total_tokens"] += int(total or 0)
+        summary["prompt_tokens"] += int(prompt or 0)
+        summary["completion_tokens"] += int(completion or 0)
+    return summary
+
+
+__all__ = [
+    "hour_bucket",
+    "record_usage",
+    "workflow_usage_summary",
+    "rolled_up_tasks",
+    "rolled_up_hours",
+    "is_rolled_up_hour",
+]
@@ -0,0 +1,234 @@
+"""Tests for adaptive polling and callback completion of async API tools."""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.webhooks.routes import router as webhooks_router
+from core.http.clients import close_http_clients
+from core.tools.factory import ToolFactory
+from core.tools.polling import PollPolicy, get_callback_registry, parse_retry_after
+
+
+class _JobHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs?duration=S&hint=H starts a job, answered with 202 + Location.
+
+    Hints: "retry_after" sends Retry-After, "redirect" finishes with 303 to
+    /results/{id}, "callback" POSTs the result to the body's callback_url,
+    "elsewhere" points Location at a second server (another origin).
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, status, data=None, headers=None):
+        body = json.dumps(data or {}).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        query = parse_qs(urlparse(self.path).query)
+        duration = float(query["duration"][0])
+        hint = query.get("hint", [""])[0]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        job_id = str(len(server.jobs) + 1)
+        server.jobs[job_id] = (time.monotonic(), duration, hint)
+        if hint == "callback":
+            callback_path = urlparse(json.loads(body)["callback_url"]).path
+
+            def finish():
+                time.sleep(duration)
+                server.app_client.post(callback_path, json={"status": "done", "result": f"job {job_id}"})
+
+            threading.Thread(target=finish, daemon=True).start()
+
+        headers = {"Location": f"/jobs/{job_id}"}
+        if hint == "elsewhere":
+            headers["Location"] = f"{server.other_base}/jobs/{job_id}"
+        if hint == "retry_after":
+            headers["Retry-After"] = str(int(duration))
+        self._send(202, {"status": "queued"}, headers)
+
+    def do_GET(self):
+        server = self.server
+        kind, job_id = self.path.strip("/").split("/")
+        started, duration, hint = server.jobs[job_id]
+        if kind == "results":
+            return self._send(200, {"status": "done", "result": f"job {job_id}"})
+
+        server.polls += 1
+        server.auth_seen.append(self.headers.get("Authorization"))
+        elapsed = time.monotonic() - started
+        if elapsed < duration:
+            return self._send(202, {"status": "running", "progress": round(elapsed / duration, 3)})
+        if hint == "redirect":
+            return self._send(303, headers={"Location": f"/results/{job_id}"})
+        self._send(200, {"status": "done", "result": f"job {job_id}"})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def job_server():
+    app = FastAPI()
+    app.include_router(webhooks_router)
+    server, other = (ThreadingHTTPServer(("127.0.0.1", 0), _JobHandler) for _ in range(2))
+    jobs = {}
+    for s in (server, other):
+        s.daemon_threads = True
+        s.jobs, s.polls, s.auth_seen, s.app_client = jobs, 0, [], TestClient(app)
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+    server.other, server.other_base = other, f"http://127.0.0.1:{other.server_address[1]}"
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    for s in (server, other):
+        s.shutdown()
+        s.server_close()
+
+
+def _run_job(base, duration, hint="", polling=None, body=None, allow_local=True):
+    """Run one job through a generated API tool; returns (result, seconds).
+
+    ``allow_local=False`` keeps the real SSRF check while the tool runs.
+    """
+    config = {
+        "tool_id": "stub_job",
+        "name": "Stub Job",
+        "description": "Starts a job on the stub server",
+        "input_schema": {"properties": {"duration": {"type": "number"}}, "required": ["duration"]},
+        "implementation_config": {
+            "method": "POST",
+            "url": base + "/jobs?duration={duration}&hint=" + hint,
+            "headers": {"Authorization": "Bearer tool-secret"},
+            "body_template": body or {"input": "x"},
+            "timeout": 5,
+            "polling": polling or {},
+            "response_parser": {"type": "json_path", "path": "result"},
+        },
+    }
+    with patch.object(ToolFactory, "_validate_url_ssrf", return_value=True):
+        tool = asyncio.run(ToolFactory._create_api_tool(config, None))
+
+    async def call():
+        try:
+            started = time.monotonic()
+            return await tool.ainvoke({"duration": duration}), time.monotonic() - started
+        finally:
+            await close_http_clients()
+
+    if not allow_local:
+        return asyncio.run(call())
+    with patch.object(ToolFactory, "_validate_url_ssrf", return_value=True):
+        return asyncio.run(call())
+
+
+class TestAdaptivePolling:
+    def test_backoff_cuts_requests_against_fixed_interval(self, job_server):
+        server, base = job_server
+        fixed = {"interval": 0.05, "backoff": 1, "jitter": 0, "completion_condition": "status == done"}
+        result, fixed_seconds = _run_job(base, 1.5, polling=fixed)
+        fixed_polls, server.polls = server.polls, 0
+
+        adaptive = {"interval": 0.05, "max_interval": 0.5, "jitter": 0, "completion_condition": "status == done"}
+        result, adaptive_seconds = _run_job(base, 1.5, polling=adaptive)
+
+        assert result == "job 2"
+        assert fixed_polls >= 20
+        assert server.polls <= fixed_polls / 3
+        assert adaptive_seconds < 1.5 + 0.5 + 0.3  # overshoot bounded by max_interval
+
+    def test_retry_after_sets_first_poll(self, job_server):
+        server, base = job_server
+        polling = {"interval": 0.05, "backoff": 1, "jitter": 0, "completion_condition": "status == done"}
+        result, seconds = _run_job(base, 1, hint="retry_after", polling=polling)
+
+        assert result == "job 1"
+        assert server.polls == 1
+        assert 1 <= seconds < 1.5
+
+    def test_progress_hint_targets_completion(self, job_server):
+        server, base = job_server
+        polling = {
+            "interval": 0.05, "backoff": 1, "jitter": 0,
+            "completion_condition": "status == done", "progress_path": "progress",
+        }
+        result, seconds = _run_job(base, 1.5, polling=polling)
+
+        assert result == "job 1"
+        assert server.polls <= 4
+        assert seconds < 2.0
+
+    def test_smart_polling_follows_see_other(self, job_server):
+        server, base = job_server
+        result, seconds = _run_job(base, 0.3, hint="redirect")
+
+        assert result == "job 1"
+        assert server.polls == 1  # first smart poll at 0.5s already finds the 303
+        assert seconds < 1.0
+
+    def test_callback_mode_does_not_poll(self, job_server):
+        server, base = job_server
+        result, seconds = _run_job(base, 0.3, hint="callback", polling={"mode": "callback", "timeout": 5})
+
+        assert result == "job 1"
+        assert server.polls == 0
+        assert seconds < 0.8
+        assert not get_callback_registry()._waiters
+
+    def test_credentials_stay_on_the_tool_origin(self, job_server):
+        server, base = job_server
+        polling = {"interval": 0.05, "jitter": 0, "completion_condition": "status == done"}
+        result, _ = _run_job(base, 0.2, hint="redirect", polling=polling)
+        assert result == "job 1"
+        assert set(server.auth_seen) == {"Bearer tool-secret"}
+
+        result, _ = _run_job(base, 0.2, hint="elsewhere", polling=polling)
+        assert result == "job 2"
+        assert server.other.polls >= 1
+        assert set(server.other.auth_seen) == {None}
+
+    def test_location_hops_are_ssrf_checked(self, job_server):
+        server, base = job_server
+        # The tool URL was validated at creation; the 202 Location is checked at runtime
+        result, _ = _run_job(base, 0.2, polling={"interval": 0.05, "completion_condition": "status == done"},
+                             allow_local=False)
+        assert result.startswith("Error: SSRF Protection")
+        assert server.polls == 0
+
+    def test_unknown_callback_token(self, job_server):
+        server, _ = job_server
+        response = server.app_client.post("/api/webhooks/tool-callback/nope", json={})
+        assert response.status_code == 404
+
+
+class TestPollPolicy:
+    def test_delay_backs_off_to_cap_with_bounded_jitter(self):
+        policy = PollPolicy(interval=1, max_interval=8, backoff=2, jitter=0)
+        assert [policy.delay(n) for n in range(5)] == [1, 2, 4, 8, 8]
+
+        jittered = PollPolicy(interval=4, max_interval=30, backoff=2, jitter=0.25)
+        assert all(3 <= jittered.delay(0) <= 5 for _ in range(100))
+
+    def test_parse_retry_after(self):
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        assert parse_retry_after("5") == 5
+        assert parse_retry_after(format_datetime(now + timedelta(seconds=30), usegmt=True), now=now) == 30
+        assert parse_retry_after(format_datetime(now - timedelta(seconds=30), usegmt=True), now=now) == 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
@@ -0,0 +1,35 @@
+"""Tests for the offline benchmark harness and its fakes."""
+import asyncio
+
+from langchain.agents import create_agent
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from benchmarks.fakes import FakeStreamingChatModel, make_fake_tools
+from benchmarks.harness import compare, load_baseline, save_baseline
+
+
+class TestBenchmarkHarness:
+    def test_compare_respects_metric_direction(self):
+        baseline = {"bus": {"events_per_sec": 1000.0, "publish_us": 10.0}}
+        results = {"bus": {"events_per_sec": 700.0, "publish_us": 8.0}}
+        rows = {r["metric"]: r for r in compare(results, baseline, tolerance=0.25)}
+        assert rows["events_per_sec"]["regressed"]
+        assert not rows["publish_us"]["regressed"] and rows["publish_us"]["change"] > 0
+
+    def test_baselines_are_kept_per_mode(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        save_baseline({"bus": {"events_per_sec": 1000.0}}, path, "full")
+        save_baseline({"bus": {"events_per_sec": 50.0}}, path, "quick")
+
+        assert load_baseline(path, "full") == {"bus": {"events_per_sec": 1000.0}}
+        assert load_baseline(path, "quick") == {"bus": {"events_per_sec": 50.0}}
+        assert load_baseline(tmp_path / "missing.json", "quick") == {}
+
+    def test_fake_agent_calls_tools_then_answers(self):
+        model = FakeStreamingChatModel(tokens_per_turn=5, tool_calls_per_run=2)
+        agent = create_agent(model, make_fake_tools(count=2))
+        result = asyncio.run(agent.ainvoke({"messages": [HumanMessage(content="go")]}))
+
+        tool_messages = [m for m in result["messages"] if isinstance(m, ToolMessage)]
+        assert [m.name for m in tool_messages] == ["fake_tool_0", "fake_tool_1"]
+        assert result["messages"][-1].content == "tok0 tok1 tok2 tok3 tok4 "
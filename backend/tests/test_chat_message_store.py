@@ -0,0 +1,125 @@
+"""Tests for append-only chat message storage."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from models.deep_agent import ChatMessageRecord, ChatSession
+from services import chat_message_store as store
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    ChatSession.__table__.create(engine)
+    ChatMessageRecord.__table__.create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def _session(db, session_id="s1"):
+    chat = ChatSession(session_id=session_id, agent_id=1, message_count=0, metrics={})
+    db.add(chat)
+    db.commit()
+    return chat
+
+
+def _append(db, chat, n, role="user"):
+    for i in range(n):
+        store.append_message(db, chat, {"role": role, "content": f"message {i}", "timestamp": f"t{i:04d}"})
+    db.commit()
+
+
+class TestChatMessageStore:
+    def test_append_is_a_single_insert(self, db):
+        chat = _session(db)
+        _append(db, chat, 50)
+
+        db.statements.clear()
+        record = store.append_message(db, chat, {"role": "assistant", "content": "hi", "thinking": "hmm"})
+        db.commit()
+
+        inserts = [s for s in db.statements if s.startswith("INSERT")]
+        assert len(inserts) == 1 and "chat_messages" in inserts[0]
+        assert not any("SELECT" in s and "chat_messages" in s for s in db.statements)
+        assert record.message_index == 50
+        assert chat.message_count == 51
+        assert record.to_dict()["thinking"] == "hmm"
+
+    def test_paginated_history(self, db):
+        chat = _session(db)
+        _append(db, chat, 10)
+
+        page = store.get_messages(db, "s1", offset=4, limit=3)
+        assert [r.message_index for r in page] == [4, 5, 6]
+        assert [r.content for r in store.get_messages(db, "s1")][-1] == "message 9"
+
+    def test_delete_shifts_later_indexes(self, db):
+        chat = _session(db)
+        _append(db, chat, 5)
+
+        store.delete_message(db, chat, store.get_message(db, "s1", 1))
+        db.commit()
+
+        assert chat.message_count == 4
+        assert [(r.message_index, r.content) for r in store.get_messages(db, "s1")] == [
+            (0, "message 0"), (1, "message 2"), (2, "message 3"), (3, "message 4"),
+        ]
+        # Next append continues after the shifted tail
+        assert store.append_message(db, chat, {"role": "user", "content": "new"}).message_index == 4
+
+    def test_bank_and_previews(self, db):
+        first = _session(db, "s1")
+        second = _session(db, "s2")
+        _append(db, first, 3)
+        store.append_message(db, second, {"role": "user", "content": "x" * 100})
+        db.commit()
+
+        assert store.set_banked(db, "s1", 2, True)
+        assert not store.set_banked(db, "s1", 99, True)
+        assert store.get_message(db, "s1", 2).banked is True
+
+        previews = store.last_message_previews(db, [first, second], length=60)
+        assert previews == {"s1": "message 2", "s2": "x" * 60 + "..."}
+
+    def test_token_counts_backfill_missing_rows(self, db):
+        chat = _session(db)
+        _append(db, chat, 2)
+        stored = store.session_token_count(db, "s1")
+
+        db.query(ChatMessageRecord).update({"token_count": None})
+        assert store.session_token_count(db, "s1") == stored > 0
+
+    def test_index_allocation_ignores_stale_session_objects(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'chat.db'}")
+        ChatSession.__table__.create(engine)
+        ChatMessageRecord.__table__.create(engine)
+        make_session = sessionmaker(bind=engine)
+        _session(make_session())
+
+        # Two requests load the session before either appends
+        first, second = make_session(), make_session()
+        first_chat = first.query(ChatSession).one()
+        second_chat = second.query(ChatSession).one()
+        assert first_chat.message_count == second_chat.message_count == 0
+
+        assert store.append_message(first, first_chat, {"role": "user", "content": "a"}).message_index == 0
+        first.commit()
+        assert store.append_message(second, second_chat, {"role": "user", "content": "b"}).message_index == 1
+        second.commit()
+
+        assert [(r.message_index, r.content) for r in store.get_messages(first, "s1")] == [(0, "a"), (1, "b")]
+        assert first.query(ChatSession).one().message_count == 2
+
+    def test_message_index_is_unique(self, db):
+        chat = _session(db)
+        _append(db, chat, 1)
+
+        db.add(ChatMessageRecord(session_id="s1", message_index=0, role="user", content="dup"))
+        with pytest.raises(IntegrityError):
+            db.flush()
@@ -0,0 +1,148 @@
+"""Tests for compaction of finished checkpoint threads."""
+import asyncio
+import datetime
+import json
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.workflows.checkpointing.compaction import CheckpointCompactor, select_kept_checkpoints
+from core.workflows.checkpointing.utils import CheckpointManager
+from models import CheckpointSummary
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+STEPS = 300
+NODES = ["planning", "coding", "review", "coding", "finalize", "done"]  # 50 steps each
+
+# LangGraph's Postgres tables, with JSON stored as text
+LANGGRAPH_TABLES = [
+    "CREATE TABLE checkpoints (thread_id TEXT, checkpoint_ns TEXT DEFAULT '', checkpoint_id TEXT, "
+    "parent_checkpoint_id TEXT, type TEXT, checkpoint TEXT, metadata TEXT, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE checkpoint_blobs (thread_id TEXT, checkpoint_ns TEXT DEFAULT '', channel TEXT, version TEXT, "
+    "type TEXT, blob BLOB, PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE checkpoint_writes (thread_id TEXT, checkpoint_ns TEXT DEFAULT '', checkpoint_id TEXT, "
+    "task_id TEXT, idx INTEGER, channel TEXT, type TEXT, blob BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+]
+
+
+def _seed_thread(conn, thread_id, status):
+    checkpoints, blobs, writes = [], [], []
+    for step in range(STEPS):
+        workflow_status = "AWAITING_HITL" if step == 120 else ("EXECUTING" if step < STEPS - 1 else status)
+        checkpoint = {
+            "id": f"{step:06d}",
+            "channel_values": {"workflow_status": workflow_status, "current_step": NODES[step // 50]},
+            # "messages" changes every step, "context" every 100 steps
+            "channel_versions": {"messages": f"{step:06d}", "context": f"{step // 100:06d}"},
+        }
+        metadata = {"source": "input" if step == 0 else "loop", "step": step}
+        checkpoints.append((thread_id, f"{step:06d}", json.dumps(checkpoint), json.dumps(metadata)))
+        blobs.append((thread_id, "messages", f"{step:06d}", b"m" * 1000))
+        if step % 100 == 0:
+            blobs.append((thread_id, "context", f"{step // 100:06d}", b"c" * 500))
+        writes.append((thread_id, f"{step:06d}", "t", 0, "messages", b"w" * 200))
+    writes.append((thread_id, "000200", "t", 1, "__interrupt__", b"i"))
+
+    conn.exec_driver_sql(
+        "INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, checkpoint, metadata) "
+        "VALUES (?, '', ?, ?, ?)", checkpoints)
+    conn.exec_driver_sql(
+        "INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, blob) VALUES (?, '', ?, ?, ?)", blobs)
+    conn.exec_driver_sql(
+        "INSERT INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, blob) "
+        "VALUES (?, '', ?, ?, ?, ?, ?)", writes)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CheckpointSummary.__table__.create(engine)
+    threads = {
+        "task_1": ("PASSED", NOW - datetime.timedelta(hours=5)),
+        "task_2": ("FAILED_EXECUTION", NOW - datetime.timedelta(hours=3)),
+        "task_3": ("EXECUTING", NOW - datetime.timedelta(hours=5)),  # still running
+        "task_4": ("PASSED", NOW - datetime.timedelta(minutes=5)),   # not idle yet
+    }
+    with engine.begin() as conn:
+        for ddl in LANGGRAPH_TABLES:
+            conn.exec_driver_sql(ddl)
+        for thread_id, (status, updated_at) in threads.items():
+            _seed_thread(conn, thread_id, status)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        CheckpointSummary(thread_id=thread_id, latest_checkpoint_id=f"{STEPS - 1:06d}", status=status,
+                          checkpoint_count=STEPS, updated_at=updated_at)
+        for thread_id, (status, updated_at) in threads.items()
+    )
+    db.commit()
+    db.close()
+    return engine
+
+
+def _count(engine, table, thread_id):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)).scalar()
+
+
+class TestCheckpointCompaction:
+    def test_select_kept_checkpoints(self):
+        rows = [
+            {"checkpoint_id": str(i), "metadata": {"source": "input" if i == 0 else "loop"},
+             "checkpoint": {"channel_values": {"current_step": step, "workflow_status": status}}}
+            for i, (step, status) in enumerate([
+                ("a", "EXECUTING"), ("a", "EXECUTING"), ("b", "AWAITING_HITL"), ("b", "EXECUTING"),
+                ("b", "EXECUTING"), ("c", "PASSED"),
+            ])
+        ]
+        assert select_kept_checkpoints(rows, set(), set()) == {"5"}
+        assert select_kept_checkpoints(rows, {"3"}, {"hitl"}) == {"2", "3", "5"}
+        assert select_kept_checkpoints(rows, set(), {"node"}) == {"1", "4", "5"}
+        assert select_kept_checkpoints(rows, set(), {"input"}) == {"0", "5"}
+
+    def test_compacts_finished_idle_threads_in_batches(self, engine):
+        statements = []
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters)))
+        compactor = CheckpointCompactor(engine=engine, anchors="hitl,node", batch_size=40, min_idle_minutes=60)
+
+        result = compactor.compact()
+
+        # latest + HITL status (120) + interrupt (200) + node boundaries (49, 99, ..., 249)
+        kept = {"000299", "000120", "000200", "000049", "000099", "000149", "000199", "000249"}
+        assert result.threads == 2
+        assert result.checkpoints_deleted == 2 * (STEPS - len(kept))
+        for thread_id in ("task_1", "task_2"):
+            with engine.connect() as conn:
+                ids = {r[0] for r in conn.exec_driver_sql(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ?", (thread_id,))}
+                blobs = {r[0] for r in conn.exec_driver_sql(
+                    "SELECT channel || ':' || version FROM checkpoint_blobs WHERE thread_id = ?", (thread_id,))}
+                write_ids = {r[0] for r in conn.exec_driver_sql(
+                    "SELECT checkpoint_id FROM checkpoint_writes WHERE thread_id = ?", (thread_id,))}
+            assert ids == kept
+            assert write_ids <= kept
+            # Only blob versions some kept checkpoint points at
+            assert blobs == {f"messages:{k}" for k in kept} | {"context:000000", "context:000001", "context:000002"}
+
+        for thread_id in ("task_3", "task_4"):
+            assert _count(engine, "checkpoints", thread_id) == STEPS
+
+        # Each DELETE statement touches at most one batch
+        deletes = [s for s in statements if s[0].lstrip().upper().startswith("DELETE")]
+        assert deletes and all(len(params) <= 40 + 1 for statement, params in deletes if " IN " in statement)
+
+        db = sessionmaker(bind=engine)()
+        row = db.get(CheckpointSummary, "task_1")
+        assert row.checkpoint_count == len(kept) and row.compacted_at is not None
+        assert row.bytes_reclaimed > (STEPS - len(kept)) * 1200
+        db.close()
+
+        counts = asyncio.run(CheckpointManager(session_factory=sessionmaker(bind=engine)).get_checkpoint_count())
+        assert counts["bytes_reclaimed"] == result.bytes_reclaimed
+
+        # Nothing left to do until the threads change again
+        assert compactor.compact().threads == 0
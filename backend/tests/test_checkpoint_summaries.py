@@ -0,0 +1,146 @@
+"""Tests for the checkpoint summary table and the CheckpointManager queries on it."""
+import asyncio
+import datetime
+import re
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.workflows.checkpointing.summary import UPSERT_SUMMARY_SQL, summarize_checkpoint
+from core.workflows.checkpointing.utils import CheckpointManager
+from core.workflows.state import WorkflowStatus
+from models import CheckpointSummary
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+# psycopg named parameters -> SQLite named parameters
+SQLITE_UPSERT = re.sub(r"%\((\w+)\)s", r":\1", UPSERT_SUMMARY_SQL)
+
+
+def _checkpoint(n, status, step="coding", **values):
+    ts = NOW - datetime.timedelta(minutes=n)
+    return {
+        "id": f"1ef{10_000_000 - n:08d}",  # time-ordered like uuid6
+        "ts": ts.isoformat(),
+        "channel_values": {"workflow_status": status, "current_step": step, **values},
+    }
+
+
+def _upsert(conn, thread_id, checkpoint, step=0):
+    params = summarize_checkpoint(thread_id, checkpoint, {"step": step})
+    conn.exec_driver_sql(SQLITE_UPSERT, params)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    CheckpointSummary.__table__.create(engine)
+    return engine
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    """100k checkpoints over 20k threads, written through the upsert."""
+    # CheckpointManager queries from a worker thread
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CheckpointSummary.__table__.create(engine)
+    threads = 20_000
+    rows = []
+    for n in range(100_000, 0, -1):  # oldest first
+        thread = n % threads
+        if thread % 100 == 0:
+            status = WorkflowStatus.AWAITING_HITL.value
+        elif thread % 50 == 1:
+            status = WorkflowStatus.FAILED_EXECUTION.value
+        else:
+            status = WorkflowStatus.EXECUTING.value if n > threads else WorkflowStatus.PASSED.value
+        params = summarize_checkpoint(
+            f"workflow_{thread % 40}_task_{thread}", _checkpoint(n // 10, status), {"step": n}
+        )
+        params["checkpoint_id"] = f"1ef{10_000_000 - n:08d}"
+        rows.append(params)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(SQLITE_UPSERT, rows)
+        conn.exec_driver_sql("ANALYZE")
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters)))
+    return engine, statements
+
+
+class TestCheckpointSummaries:
+    def test_summarize_checkpoint(self):
+        checkpoint = _checkpoint(0, WorkflowStatus.AWAITING_HITL, hitl_reason="approve plan", retry_count=2)
+        params = summarize_checkpoint("workflow_7_task_42", checkpoint, {"step": 3})
+
+        assert params["task_id"] == 42 and params["workflow_id"] == 7
+        assert params["status"] == "AWAITING_HITL" and params["hitl_pending"]
+        assert params["hitl_reason"] == "approve plan" and params["retry_count"] == 2
+        assert params["step"] == 3 and params["ts"] == NOW
+
+    def test_upsert_tracks_latest_checkpoint(self, engine):
+        with engine.begin() as conn:
+            _upsert(conn, "task_1", _checkpoint(3, "EXECUTING"), step=1)
+            _upsert(conn, "task_1", _checkpoint(2, "AWAITING_HITL", hitl_reason="review"), step=2)
+            _upsert(conn, "task_1", _checkpoint(2, "AWAITING_HITL", hitl_reason="review"), step=2)  # re-put
+            _upsert(conn, "task_1", _checkpoint(5, "EXECUTING"), step=0)  # older, arrives late
+
+        db = sessionmaker(bind=engine)()
+        row = db.get(CheckpointSummary, "task_1")
+        assert (row.task_id, row.status, row.hitl_pending, row.latest_step) == (1, "AWAITING_HITL", True, 2)
+        assert row.checkpoint_count == 2
+
+    def test_manager_reads_summaries(self, seeded):
+        engine, _ = seeded
+        manager = CheckpointManager(session_factory=sessionmaker(bind=engine))
+
+        listed = asyncio.run(manager.list_checkpoints(workflow_id=3, limit=20))
+        assert len(listed) == 20
+        assert all(cp["thread_id"].startswith("workflow_3_task_") for cp in listed)
+        assert [cp["created_at"] for cp in listed] == sorted((cp["created_at"] for cp in listed), reverse=True)
+
+        hitl = asyncio.run(manager.get_hitl_pending_workflows())
+        assert len(hitl) == 200 and {cp["workflow_status"] for cp in hitl} == {"AWAITING_HITL"}
+
+        failed = asyncio.run(manager.get_failed_workflows(hours=24))
+        assert failed and {cp["workflow_status"] for cp in failed} == {"FAILED_EXECUTION"}
+
+        counts = asyncio.run(manager.get_checkpoint_count())
+        assert counts["total"] == 100_000 and counts["threads"] == 20_000
+        assert counts["by_status"]["AWAITING_HITL"] == 200
+
+    def test_index_plans_and_latency(self, seeded):
+        engine, statements = seeded
+        manager = CheckpointManager(session_factory=sessionmaker(bind=engine))
+        calls = {
+            "list": lambda: manager.list_checkpoints(limit=50),
+            "list_workflow": lambda: manager.list_checkpoints(workflow_id=5, limit=50),
+            "list_status": lambda: manager.list_checkpoints(status=WorkflowStatus.PASSED, limit=50),
+            "hitl": manager.get_hitl_pending_workflows,
+            "failed": lambda: manager.get_failed_workflows(hours=24),
+            "counts": manager.get_checkpoint_count,
+        }
+
+        for name, call in calls.items():
+            asyncio.run(call())  # warm up
+            statements.clear()
+            # Best of several runs, so a busy machine doesn't fail the bound
+            timings = []
+            for _ in range(5):
+                started = time.perf_counter()
+                asyncio.run(call())
+                timings.append((time.perf_counter() - started) * 1000)
+            elapsed_ms = min(timings)
+
+            select = next(s for s in statements if s[0].lstrip().upper().startswith("SELECT"))
+            with engine.connect() as conn:
+                plan = " | ".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + select[0], select[1]))
+
+            assert "USING" in plan and "INDEX" in plan, f"{name}: {plan}"
+            if name == "counts":
+                assert "COVERING INDEX ix_checkpoint_summaries_status_updated" in plan
+            if name == "hitl":
+                assert "ix_checkpoint_summaries_hitl_pending" in plan
+            assert elapsed_ms < 50, f"{name}: {elapsed_ms:.1f} ms"
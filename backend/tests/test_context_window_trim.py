@@ -0,0 +1,73 @@
+"""Tests for prefix-sum context trimming in ContextWindowManager."""
+import random
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage, trim_messages
+
+from services.context_window_manager import ContextStrategy, ContextWindowManager
+
+
+def _conversation(n, seed=0):
+    rng = random.Random(seed)
+    messages = [SystemMessage(content="You are helpful. " * 20, id="sys")]
+    for i in range(n):
+        words = " ".join(rng.choice(["alpha", "beta", "gamma", "delta"]) for _ in range(rng.randint(1, 80)))
+        if i % 3 == 0:
+            messages.append(HumanMessage(content=words, id=f"h{i}"))
+        elif i % 3 == 1:
+            messages.append(AIMessage(content=words, id=f"a{i}"))
+        else:
+            messages.append(ToolMessage(content=words, tool_call_id=f"t{i}", id=f"t{i}"))
+    return messages
+
+
+@pytest.fixture
+def manager():
+    return ContextWindowManager(max_tokens=100000, model_name="gpt-5.4")
+
+
+class TestTrimToTokenLimit:
+    @pytest.mark.parametrize("include_system", [True, False])
+    @pytest.mark.parametrize("start_on", ["human", "ai", None])
+    @pytest.mark.parametrize("budget", [10, 150, 900, 2500, 100000])
+    def test_matches_langchain_trim_last(self, manager, include_system, start_on, budget):
+        messages = _conversation(60)
+        expected = trim_messages(
+            messages,
+            max_tokens=budget,
+            strategy="last",
+            token_counter=manager.count_tokens,
+            include_system=include_system,
+            start_on=start_on,
+            allow_partial=False,
+        )
+        actual = manager.trim_to_token_limit(
+            messages, max_tokens=budget, include_system=include_system, start_on=start_on
+        )
+        assert [m.id for m in actual] == [m.id for m in expected]
+
+    def test_first_keeps_longest_prefix(self, manager):
+        messages = _conversation(40)
+        trimmed = manager.trim_to_token_limit(messages, max_tokens=1000, strategy="first")
+        assert trimmed == messages[:len(trimmed)]
+        assert manager.count_tokens(trimmed) <= 1000
+        assert manager.count_tokens(messages[:len(trimmed) + 1]) > 1000
+
+    def test_each_message_is_encoded_once(self, manager, monkeypatch):
+        messages = _conversation(200, seed=1)
+        calls = []
+        real = manager.count_tokens_str
+        monkeypatch.setattr(manager, "count_tokens_str", lambda text: calls.append(1) or real(text))
+
+        manager.apply_strategy(messages, ContextStrategy.RECENT, max_tokens=2000)
+        first_pass = len(calls)
+        assert first_pass <= len(messages)
+
+        manager.apply_strategy(messages, ContextStrategy.RECENT, max_tokens=2000)
+        assert len(calls) == first_pass
+
+    def test_changed_content_is_recounted(self, manager):
+        message = HumanMessage(content="short", id="edit-me")
+        before = manager.count_tokens([message])
+        message.content = "much longer content " * 50
+        assert manager.count_tokens([message]) > before
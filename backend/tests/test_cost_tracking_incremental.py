@@ -0,0 +1,163 @@
+"""Tests for incremental cost tracking and persisted usage rollups."""
+import asyncio
+import datetime
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.workflows.routes import get_workflow_cost_metrics
+from core.middleware.core import CostTrackingMiddleware
+from db.database import Base
+from models.agent_usage import AgentUsageRollup
+from models.core import Task
+from models.execution_event import ExecutionEvent
+from models.workflow import WorkflowExecution, WorkflowProfile
+from services import usage_store
+
+
+class _Runtime:
+    model = "gpt-5.4-mini"
+
+
+def _tool_turn(i):
+    return [
+        AIMessage(content="", id=f"ai{i}", tool_calls=[{"name": "search", "args": {}, "id": f"call{i}"}]),
+        ToolMessage(content="result", tool_call_id=f"call{i}", id=f"tool{i}"),
+    ]
+
+
+def _reply(tokens):
+    return AIMessage(
+        content="done",
+        response_metadata={"token_usage": {"total_tokens": tokens, "prompt_tokens": tokens - 10, "completion_tokens": 10}},
+    )
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    AgentUsageRollup.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestCostTrackingMiddleware:
+    def test_tool_calls_counted_once_across_turns(self):
+        tracker = CostTrackingMiddleware(persist=False)
+        messages = [HumanMessage(content="hi", id="h0")]
+        for i in range(20):
+            messages.extend(_tool_turn(i))
+            tracker.before_model({"messages": messages, "current_step": "researcher"}, None)
+
+        stats = tracker.get_stats()
+        assert stats["tool_calls_count"] == 20
+        assert stats["tool_calls_by_agent"] == {"researcher": {"search": 20}}
+
+    def test_rewritten_history_is_not_double_counted(self):
+        tracker = CostTrackingMiddleware(persist=False)
+        messages = [HumanMessage(content="hi", id="h0")] + _tool_turn(0) + _tool_turn(1)
+        tracker.before_model({"messages": messages}, None)
+
+        # Summarization replaces the history but keeps the latest turn
+        summarized = [HumanMessage(content="summary", id="s0")] + _tool_turn(1) + _tool_turn(2)
+        tracker.before_model({"messages": summarized}, None)
+
+        assert tracker.get_stats()["tool_calls_by_name"] == {"search": 3}
+
+    def test_history_is_bounded(self):
+        tracker = CostTrackingMiddleware(history_size=5, persist=False)
+        for _ in range(50):
+            tracker.after_model({"messages": [_reply(500)], "current_step": "writer"}, _Runtime())
+
+        stats = tracker.get_stats()
+        assert len(stats["cost_history"]) == 5
+        assert stats["total_tokens"] == 50 * 500
+        [usage] = stats["usage_by_model"]
+        assert (usage["agent"], usage["model"], usage["calls"]) == ("writer", "gpt-5.4-mini", 50)
+        assert usage["tokens_per_call"]["le_1024"] == 50
+
+    def test_flush_hands_off_deltas(self, monkeypatch):
+        written = []
+        monkeypatch.setattr(usage_store, "record_usage", lambda rows, *args: written.append(rows))
+        tracker = CostTrackingMiddleware(flush_every=3)
+
+        for _ in range(7):
+            tracker.after_model({"messages": [_reply(100)], "current_step": "writer"}, _Runtime())
+        tracker.after_agent({"messages": _tool_turn(0), "current_step": "writer"}, None)
+
+        assert [sum(r["calls"] for r in rows if "model" in r) for rows in written] == [3, 3, 1]
+        assert {"agent": "writer", "tool": "search", "calls": 1} in written[-1]
+        assert tracker.flush() == 0
+
+
+class TestUsageStore:
+    def test_summary_aggregates_deltas(self, db):
+        model_row = {"agent": "writer", "model": "gpt-5.4-mini", "calls": 2,
+                     "prompt_tokens": 150, "completion_tokens": 50, "total_tokens": 200, "cost_usd": 0.5}
+        usage_store.record_usage([model_row, {"agent": "writer", "tool": "search", "calls": 3}], 7, db=db)
+        usage_store.record_usage([model_row], 7, db=db)
+        usage_store.record_usage([model_row], 8, db=db)
+        db.commit()
+
+        since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1)
+        summary = usage_store.workflow_usage_summary(db, 7, since)
+        assert summary["total_tokens"] == 400
+        assert summary["agents"] == {"writer": {"cost": 1.0, "tokens": 400}}
+        assert summary["tools"] == {"search": 3}
+        assert usage_store.workflow_usage_summary(db, 9, since) is None
+
+    def test_cost_endpoint_adds_runs_missing_from_rollups(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[
+            model.__table__ for model in (WorkflowProfile, WorkflowExecution, Task, ExecutionEvent, AgentUsageRollup)
+        ])
+        db = sessionmaker(bind=engine)()
+        db.add(WorkflowProfile(id=1, name="costs", configuration={}))
+
+        def llm_end(task_id, tokens):
+            return ExecutionEvent(task_id=task_id, workflow_id=1, event_type="LLM_END", event_data={
+                "agent_label": "writer", "model": "gpt-5.4-mini", "tokens_used": tokens,
+                "prompt_tokens": tokens - 10, "completion_tokens": 10,
+            })
+
+        def tool_start(task_id):
+            return ExecutionEvent(task_id=task_id, workflow_id=1, event_type="on_tool_start",
+                                  event_data={"tool_name": "search"})
+
+        # Task 1 was flushed to rollups; task 2 (older run) only has events
+        db.add_all([llm_end(1, 100), llm_end(1, 100), tool_start(1), llm_end(2, 300), tool_start(2)])
+        db.commit()
+        events_only = asyncio.run(get_workflow_cost_metrics(workflow_id=1, days=30, db=db))
+
+        usage_store.record_usage([
+            {"agent": "writer", "model": "gpt-5.4-mini", "calls": 2,
+             "prompt_tokens": 180, "completion_tokens": 20, "total_tokens": 200, "cost_usd": 0.5},
+            {"agent": "writer", "tool": "search", "calls": 1},
+        ], workflow_id=1, task_id=1, db=db)
+        db.commit()
+        mixed = asyncio.run(get_workflow_cost_metrics(workflow_id=1, days=30, db=db))
+
+        assert (mixed.totalTokens, mixed.promptTokens, mixed.completionTokens) == \
+            (events_only.totalTokens, events_only.promptTokens, events_only.completionTokens) == (500, 470, 30)
+        assert [(t.name, t.count) for t in mixed.tools] == [(t.name, t.count) for t in events_only.tools] == [("search", 2)]
+        [writer] = mixed.agents
+        assert writer.tokens == 500
+        task2_cost = events_only.totalCost * 300 / 500
+        assert mixed.totalCost == pytest.approx(0.5 + task2_cost, abs=1e-3)
+        db.close()
+
+    def test_rollups_without_task_cover_their_hour(self, db):
+        usage_store.record_usage([{"agent": "writer", "tool": "search", "calls": 1}], 7, db=db)
+        usage_store.record_usage([{"agent": "writer", "tool": "search", "calls": 1}], 7, task_id=3, db=db)
+        db.commit()
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        hours = usage_store.rolled_up_hours(db, 7, now - datetime.timedelta(days=1))
+        assert len(hours) == 1
+        assert usage_store.is_rolled_up_hour(now, hours)
+        assert usage_store.is_rolled_up_hour(now.replace(tzinfo=None), hours)
+        assert not usage_store.is_rolled_up_hour(now - datetime.timedelta(hours=2), hours)
+        assert db.execute(usage_store.rolled_up_tasks(7, now - datetime.timedelta(days=1))).scalars().all() == [3]
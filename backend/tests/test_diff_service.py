@@ -0,0 +1,132 @@
+"""Tests and large-file benchmarks for the DiffService line diff engine."""
+import difflib
+import random
+import time
+
+import pytest
+
+from services import diff_service
+from services.diff_service import DiffService, diff_lines, generate_file_diff
+
+
+def _apply(a, b, opcodes):
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+            out += a[i1:i2]
+        else:
+            out += b[j1:j2]
+    return out
+
+
+def _edited_file(lines, edits, repetitive=False, seed=3):
+    rng = random.Random(seed)
+    old = [("    return None\n" if repetitive and i % 3 else f"line {i} {rng.random()}\n") for i in range(lines)]
+    new = list(old)
+    for e in range(edits):
+        at = rng.randrange(len(new))
+        if e % 10 == 0:
+            new[at:at] = [f"inserted {e}\n"] * 3
+        elif e % 10 == 1:
+            del new[at:at + 2]
+        else:
+            new[at] = f"edited {e}\n"
+    return old, new
+
+
+class TestDiffEngine:
+    def test_opcodes_rebuild_new_and_are_minimal(self):
+        rng = random.Random(1)
+        for _ in range(2000):
+            alphabet = "abcde"[:rng.randint(1, 5)]
+            a = [rng.choice(alphabet) for _ in range(rng.randint(0, 30))]
+            b = [rng.choice(alphabet) for _ in range(rng.randint(0, 30))]
+            result = diff_lines(a, b)
+            assert _apply(a, b, result.opcodes) == b
+            matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+            assert result.matched >= sum(block.size for block in matcher.get_matching_blocks())
+
+    @pytest.mark.parametrize("old,new", [
+        ("a\nb\nc\n", "a\nB\nc\nd\n"),
+        ("", "x\n"),
+        ("x\n", ""),
+        ("same\n", "same\n"),
+        ("a\nb", "a\nc"),
+        ("".join(f"{i}\n" for i in range(40)), "".join(f"{i}\n" for i in range(40) if i not in (5, 30))),
+    ])
+    def test_unified_diff_matches_difflib(self, old, new):
+        # Each case has a single minimal diff, so difflib's hunks agree with ours
+        expected = "".join(difflib.unified_diff(
+            old.splitlines(keepends=True), new.splitlines(keepends=True), fromfile="a/f", tofile="b/f"
+        ))
+        assert DiffService().generate_unified_diff(old, new, "a/f", "b/f") == expected
+
+    def test_unified_diff_shows_line_ending_changes(self):
+        service = DiffService()
+        unified = service.generate_unified_diff("a\r\nb\r\n", "a\nb\n", "a/f", "b/f")
+        assert unified == "--- a/f\n+++ b/f\n@@ -1,2 +1,2 @@\n-a\r\n-b\r\n+a\n+b\n"
+        assert service.calculate_stats("a\r\nb\r\n", "a\nb\n").total_changes == 0
+
+    def test_file_diff_runs_the_engine_once(self, monkeypatch):
+        calls = []
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return diff_lines(*args, **kwargs)
+
+        monkeypatch.setattr(diff_service, "diff_lines", counting)
+        diff = generate_file_diff("a\nb\nc\n", "a\nB\nc\n")
+        assert diff["unified_diff"] and diff["stats"]["lines_changed"] == 1
+        assert len(calls) == 1
+
+    def test_stats(self):
+        stats = DiffService().calculate_stats("a\nb\nc\n", "a\nB\nc\nd\n")
+        assert (stats.lines_added, stats.lines_removed, stats.lines_changed) == (1, 0, 1)
+        assert stats.similarity_ratio == pytest.approx(4 / 7)
+        assert not stats.truncated
+
+    def test_budget_returns_coarse_diff(self):
+        rng = random.Random(5)
+        old = [f"{rng.random()}\n" for _ in range(200_000)]
+        new = [f"{rng.random()}\n" for _ in range(200_000)]
+        old[:10] = new[:10] = ["header\n"] * 10
+
+        started = time.perf_counter()
+        result = diff_lines(old, new, timeout=0.2)
+        assert time.perf_counter() - started < 1.0
+        assert result.truncated
+        assert result.opcodes[0] == ("equal", 0, 10, 0, 10)
+        assert _apply(old, new, result.opcodes) == new
+
+    def test_size_budget(self):
+        old, new = _edited_file(1000, 20)
+        result = diff_lines(old, new, max_lines=100)
+        assert result.truncated
+        assert _apply(old, new, result.opcodes) == new
+
+
+class TestDiffBenchmark:
+    @pytest.mark.parametrize("lines", [10_000, 50_000, 200_000])
+    @pytest.mark.parametrize("repetitive", [False, True])
+    def test_large_file(self, lines, repetitive):
+        old, new = _edited_file(lines, 100, repetitive)
+
+        started = time.perf_counter()
+        result = diff_lines(old, new)
+        elapsed = time.perf_counter() - started
+
+        assert not result.truncated
+        assert _apply(old, new, result.opcodes) == new
+        # O((N+M)·D): ~0.3-0.5 s at 200k lines here; difflib needs ~1 s
+        # for the repetitive 50k-line case alone
+        assert elapsed < lines / 200_000 * 3 + 0.5
+
+    def test_file_diff_end_to_end(self):
+        old, new = _edited_file(200_000, 100)
+        started = time.perf_counter()
+        diff = generate_file_diff("".join(old), "".join(new), "big.txt")
+        assert time.perf_counter() - started < 10
+        assert diff["unified_diff"].startswith("--- a/big.txt\n+++ b/big.txt\n")
+        assert len(diff["side_by_side"]) >= 200_000
+        assert diff["stats"]["lines_changed"] > 0 and not diff["stats"]["truncated"]
@@ -0,0 +1,188 @@
+"""Tests for pooled, streaming executor calls in the HTTP bridge."""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from core.http import bridge
+from core.http.clients import close_http_clients
+
+
+class _ExecutorHandler(BaseHTTPRequestHandler):
+    """
+    Stub executor. Directives: "steps=N delay=S" emits N outputs S seconds
+    apart, "fail" answers 422, "crash" streams an error event and
+    "nostream" answers plain JSON even when SSE is requested.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        self._json(200, {"status": "healthy"})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/validate"):
+            return self._json(200, {"task_id": payload["task_id"], "valid": True})
+        directive = payload["directive"]
+        if directive == "fail":
+            return self._json(422, {"detail": "bad directive"})
+
+        params = dict(part.split("=") for part in directive.split() if "=" in part)
+        steps, delay = int(params.get("steps", 1)), float(params.get("delay", 0))
+        result = {"task_id": payload["task_id"], "status": "success"}
+
+        if "text/event-stream" not in self.headers.get("Accept", "") or directive == "nostream":
+            time.sleep(steps * delay)
+            return self._json(200, result)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for step in range(steps):
+            time.sleep(delay)
+            self._chunk(f"event: output\ndata: {json.dumps({'line': step})}\n\n".encode())
+        if directive == "crash":
+            self._chunk(b'event: error\ndata: {"detail": "executor crashed"}\n\n')
+        else:
+            self._chunk(f"event: complete\ndata: {json.dumps(result)}\n\n".encode())
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def executor():
+    server = _CountingServer(("127.0.0.1", 0), _ExecutorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with patch.object(bridge, "EXECUTOR_ENVIRONMENT", "local"), \
+            patch.object(bridge, "EXECUTOR_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}"):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _run(coro_fn):
+    async def run():
+        try:
+            return await coro_fn()
+        finally:
+            await close_http_clients()
+    return asyncio.run(run())
+
+
+def _task(task_id, directive):
+    return {"project_id": 1, "task_id": task_id, "directive": directive}
+
+
+class TestExecutorBridge:
+    def test_parallel_results_arrive_as_they_finish_over_pooled_connections(self, executor):
+        # Later tasks are shorter, so completion order differs from task order
+        tasks = [_task(i, f"steps=1 delay={(10 - i) * 0.03:.2f}") for i in range(10)]
+
+        async def run_twice():
+            order = []
+            for _ in range(2):
+                async for index, result in bridge.execute_tasks_parallel(tasks):
+                    assert result == {"task_id": index, "status": "success"}
+                    order.append(index)
+            return order
+
+        order = _run(run_twice)
+        assert sorted(order[:10]) == list(range(10))
+        assert order[0] == 4  # shortest of the first five admitted
+        assert executor.connections <= bridge.EXECUTOR_MAX_CONCURRENT
+
+    def test_streamed_output_arrives_before_result(self, executor):
+        seen = []
+
+        async def execute():
+            started = time.monotonic()
+            result = await bridge.execute_development_task(
+                **_task(7, "steps=3 delay=0.2"),
+                on_output=lambda event: seen.append((time.monotonic() - started, event["data"]))
+            )
+            return result, time.monotonic() - started
+
+        result, finished = _run(execute)
+        assert result == {"task_id": 7, "status": "success"}
+        assert [data for _, data in seen] == [{"line": 0}, {"line": 1}, {"line": 2}]
+        assert seen[0][0] < finished - 0.3
+
+    def test_parallel_streaming_tags_output_with_task_index(self, executor):
+        outputs = []
+
+        async def execute():
+            return [
+                index async for index, _ in bridge.execute_tasks_parallel(
+                    [_task(i, "steps=2 delay=0.05") for i in range(3)],
+                    on_output=lambda index, event: outputs.append(index)
+                )
+            ]
+
+        assert sorted(_run(execute)) == [0, 1, 2]
+        assert sorted(outputs) == [0, 0, 1, 1, 2, 2]
+
+    def test_errors(self, executor):
+        async def failing():
+            return [result async for _, result in bridge.execute_tasks_parallel([_task(1, "fail")])]
+
+        [error] = _run(failing)
+        assert isinstance(error, bridge.ExecutorValidationError)
+        assert error.status_code == 422
+
+        with pytest.raises(bridge.ExecutorServerError, match="executor crashed"):
+            _run(lambda: bridge.execute_development_task(**_task(2, "crash"), on_output=lambda event: None))
+
+    def test_plain_json_executor_streams_single_result(self, executor):
+        async def stream():
+            return [event async for event in bridge.stream_development_task(**_task(3, "nostream"))]
+
+        assert _run(stream) == [{"type": "complete", "data": {"task_id": 3, "status": "success"}}]
+
+    def test_validation_does_not_queue_behind_executions(self, executor):
+        async def validate_while_busy():
+            executions = [
+                asyncio.ensure_future(bridge.execute_development_task(**_task(i, "steps=1 delay=1")))
+                for i in range(bridge.EXECUTOR_MAX_CONCURRENT)
+            ]
+            await asyncio.sleep(0.2)  # every execution connection is now in use
+            started = time.monotonic()
+            validation = await bridge.validate_code_changes(1, 99, "feature/x")
+            waited = time.monotonic() - started
+            await asyncio.gather(*executions)
+            return validation, waited
+
+        validation, waited = _run(validate_while_busy)
+        assert validation == {"task_id": 99, "valid": True}
+        assert waited < 0.5
+
+    def test_health_check(self, executor):
+        assert _run(lambda: bridge.check_executor_health(1)) is True
@@ -0,0 +1,104 @@
+"""Tests for keyframe + delta storage of file versions."""
+import hashlib
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from models import FileVersion
+from services import file_version_store as store
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(store, "FILE_VERSION_STORAGE", "delta")
+    monkeypatch.setattr(store, "FILE_VERSION_KEYFRAME_INTERVAL", 5)
+    engine = create_engine("sqlite://")
+    FileVersion.__table__.create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def _revisions(count):
+    lines = [f"line {i}\n" for i in range(200)]
+    versions = ["".join(lines)]
+    for n in range(1, count):
+        lines[(n * 37) % len(lines)] = f"edited in {n}\n"
+        if n % 4 == 0:
+            lines.insert(n % len(lines), f"inserted in {n}\n")
+        if n % 7 == 0:
+            del lines[(n * 3) % len(lines)]
+        versions.append("".join(lines))
+    return versions
+
+
+def _write(db, versions, operation="replace"):
+    previous = None
+    for number, content in enumerate(versions, start=1):
+        storage = store.build_version_storage(db, 1, number, operation, content, previous_content=previous)
+        db.add(FileVersion(
+            workspace_file_id=1, version_number=number, operation=operation,
+            content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(), **storage
+        ))
+        db.commit()
+        previous = content
+
+
+class TestFileVersionStore:
+    @pytest.mark.parametrize("old,new", [
+        ("", "a\nb\n"),
+        ("a\nb\n", ""),
+        ("a\nb\nc", "a\nB\nc"),
+        ("same\n", "same\n"),
+        ("x\r\ny\n", "x\r\nz\ny\nno newline"),
+    ])
+    def test_delta_round_trip(self, old, new):
+        assert store.apply_delta(old, store.make_delta(old, new)) == new
+
+    def test_keyframes_every_interval(self, db):
+        versions = _revisions(23)
+        _write(db, versions)
+
+        rows = db.query(FileVersion).order_by(FileVersion.version_number).all()
+        keyframes = [r.version_number for r in rows if r.storage_mode == store.STORAGE_KEYFRAME]
+        assert keyframes == [1, 6, 11, 16, 21]
+        assert all(r.content_snapshot is None and r.content_delta for r in rows
+                   if r.storage_mode == store.STORAGE_DELTA)
+        for row in rows:
+            assert store.has_stored_content(row)
+            assert store.get_version_content(db, row) == versions[row.version_number - 1]
+
+    def test_read_replays_at_most_one_interval(self, db, monkeypatch):
+        _write(db, _revisions(23))
+        row = db.query(FileVersion).filter(FileVersion.version_number == 20).one()
+
+        replayed = []
+        original = store._apply_ops
+        monkeypatch.setattr(store, "_apply_ops", lambda lines, delta: replayed.append(delta) or original(lines, delta))
+        db.statements.clear()
+        store.get_version_content(db, row)
+        assert len(db.statements) == 2  # nearest keyframe, then its chain
+        assert len(replayed) == 4  # versions 17-20 on top of keyframe 16
+
+    def test_legacy_rows_start_a_new_chain(self, db):
+        db.add(FileVersion(workspace_file_id=1, version_number=1, operation="create", content_snapshot="a\n"))
+        db.add(FileVersion(workspace_file_id=1, version_number=2, operation="edit",
+                           old_string="a", new_string="b"))
+        db.commit()
+
+        # Previous content can't be rebuilt, so version 3 becomes a keyframe
+        storage = store.build_version_storage(db, 1, 3, "edit", "c\n", previous_content="b\n")
+        assert storage["storage_mode"] == store.STORAGE_KEYFRAME
+        legacy = db.query(FileVersion).filter(FileVersion.version_number == 2).one()
+        assert not store.has_stored_content(legacy)
+        assert store.get_version_content(db, legacy) is None
+
+    def test_full_mode_keeps_legacy_columns(self, db, monkeypatch):
+        monkeypatch.setattr(store, "FILE_VERSION_STORAGE", "full")
+        assert store.build_version_storage(db, 1, 2, "edit", "x") == {"content_snapshot": None}
+        assert store.build_version_storage(db, 1, 2, "replace", "x") == {"content_snapshot": "x"}
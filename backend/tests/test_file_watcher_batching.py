@@ -0,0 +1,190 @@
+"""Tests for batched, coalesced dispatch of file watch triggers."""
+
+import asyncio
+import resource
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.workflow_trigger import TriggerLog, TriggerStatus
+from services.triggers import file_watcher
+from services.triggers.file_watcher import FileWatchHandler, FileWatcherService, _coalesce_event
+
+
+class RecordingFileWatcher(FileWatcherService):
+    """FileWatcherService whose runs are recorded in memory instead of enqueued."""
+
+    def __init__(self, run_seconds=0.1):
+        super().__init__()
+        self.run_seconds = run_seconds
+        self.runs = []
+        self.active = 0
+        self.max_active = 0
+
+    async def _count_active_runs(self, trigger_id):
+        return self.active
+
+    async def _trigger_workflow(self, handler, file_path, input_data, changes=None):
+        self.runs.append(changes)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        asyncio.get_running_loop().call_later(self.run_seconds, self._finish_run)
+
+    def _finish_run(self):
+        self.active -= 1
+
+
+@pytest.fixture
+def trigger_logs(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TriggerLog.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr("db.database.SessionLocal", session_factory)
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class TestFileWatcherBatching:
+    def test_coalesce_event(self):
+        assert _coalesce_event(None, "modified") == "modified"
+        assert _coalesce_event("created", "modified") == "created"
+        assert _coalesce_event("created", "deleted") is None
+        assert _coalesce_event("modified", "deleted") == "deleted"
+
+    def test_batch_input_data(self):
+        handler = FileWatchHandler(1, 1, {"watch_path": "/in", "input_mapping": {"files": "{file_paths}"}})
+        changes = [
+            {"file_path": "/in/a/1.csv", "event_type": "created"},
+            {"file_path": "/in/b/2.csv", "event_type": "modified"},
+        ]
+
+        data = handler.build_input_data("created", "/in/a/1.csv", changes=changes)
+        assert data == {"files": "/in/a/1.csv\n/in/b/2.csv"}
+
+        default = FileWatchHandler(1, 1, {"watch_path": "/in"}).build_input_data("created", "/in/a/1.csv", changes)
+        assert default["context"] == {"dir_path": "/in", "file_count": 2, "files": changes}
+
+        single = FileWatchHandler(1, 1, {"watch_path": "/in"})
+        assert single.build_input_data("created", "/in/x.txt", changes=changes[:1]) == \
+            single.build_input_data("created", "/in/x.txt")
+
+    def test_bulk_copy_gives_bounded_runs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_watcher, "_last_trigger_times", {})
+        file_count = 5000
+        config = {
+            "watch_path": str(tmp_path),
+            "events": ["created", "modified"],
+            "batch_window_seconds": 0.3,
+            "batch_max_files": 1000,
+            "max_concurrent_runs": 2,
+        }
+
+        async def run():
+            watcher = RecordingFileWatcher(run_seconds=0.2)
+            watcher._is_running = True
+            watcher._event_loop = asyncio.get_running_loop()
+            await watcher.start_watcher(1, 1, config)
+
+            rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            for i in range(file_count):
+                (tmp_path / f"file_{i:05d}.txt").write_text("x")
+                if i % 500 == 0:
+                    await asyncio.sleep(0)
+
+            for _ in range(100):
+                await asyncio.sleep(0.1)
+                delivered = sum(len(changes) for changes in watcher.runs)
+                if delivered >= file_count and not watcher.active:
+                    break
+            rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+            await watcher.stop()
+            return watcher, rss_growth_kb
+
+        watcher, rss_growth_kb = asyncio.run(run())
+
+        delivered = [change["file_path"] for changes in watcher.runs for change in changes]
+        assert len(delivered) == len(set(delivered)) == file_count
+        assert all(change["event_type"] == "created" for changes in watcher.runs for change in changes)
+        assert len(watcher.runs) <= 10
+        assert all(len(changes) <= 1000 for changes in watcher.runs)
+        assert watcher.max_active <= 2
+        assert rss_growth_kb < 64 * 1024
+
+    def test_active_runs_ignore_finished_and_stale_logs(self, trigger_logs):
+        now = datetime.now(timezone.utc)
+        rows = [
+            (1, TriggerStatus.PENDING, now),
+            (1, TriggerStatus.RUNNING, now - timedelta(minutes=5)),
+            (1, TriggerStatus.SUCCESS, now),
+            (1, TriggerStatus.FAILED, now),
+            (1, TriggerStatus.RUNNING, now - timedelta(seconds=file_watcher.FILE_WATCH_RUN_STALE_SECONDS + 60)),
+            (2, TriggerStatus.RUNNING, now),
+        ]
+        trigger_logs.add_all(
+            TriggerLog(trigger_id=trigger_id, status=status.value, triggered_at=triggered_at)
+            for trigger_id, status, triggered_at in rows
+        )
+        trigger_logs.commit()
+
+        watcher = FileWatcherService()
+        assert asyncio.run(watcher._count_active_runs(1)) == 2
+        assert asyncio.run(watcher._count_active_runs(3)) == 0
+
+    def test_batched_events_coalesce_with_default_debounce(self, monkeypatch):
+        monkeypatch.setattr(file_watcher, "_last_trigger_times", {})
+        config = {"watch_path": "/in", "events": ["created", "modified"], "batch_window_seconds": 0.05}
+        created_only = {"watch_path": "/in", "batch_window_seconds": 0.05}
+
+        async def run():
+            watcher = RecordingFileWatcher()
+            watcher._is_running = True
+            watcher._event_loop = asyncio.get_running_loop()
+            runs = {}
+            for trigger_id, trigger_config in ((1, config), (2, created_only)):
+                watcher.runs = []
+                handler = FileWatchHandler(trigger_id, 1, trigger_config)
+                assert handler.debounce_seconds == 5
+                watcher.handlers[trigger_id] = handler
+                for event_type, path in [
+                    ("created", "/in/kept.txt"), ("modified", "/in/kept.txt"),
+                    ("created", "/in/tmp.txt"), ("deleted", "/in/tmp.txt"),
+                    ("modified", "/in/edited.txt"), ("deleted", "/in/edited.txt"),
+                ]:
+                    watcher._handle_event(event_type, path, handler)
+                await asyncio.sleep(0.2)
+                runs[trigger_id] = watcher.runs
+            await watcher.stop()
+            return runs
+
+        runs = asyncio.run(run())
+        # Both triggers ignore deletes, yet a deleted file never reaches a run
+        assert runs[1] == [[{"file_path": "/in/kept.txt", "event_type": "created"}]]
+        assert runs[2] == [[{"file_path": "/in/kept.txt", "event_type": "created"}]]
+
+    def test_held_batch_is_bounded(self):
+        config = {"watch_path": "/in", "batch_max_files": 5, "max_held_files": 10, "max_concurrent_runs": 1}
+
+        async def run():
+            watcher = RecordingFileWatcher()
+            watcher.active = 1  # at the run cap: every flush holds the batch
+            watcher._is_running = True
+            watcher._event_loop = asyncio.get_running_loop()
+            handler = FileWatchHandler(1, 1, config)
+            watcher.handlers[1] = handler
+            for i in range(30):
+                watcher._add_change(handler, "created", f"/in/{i}.txt")
+                await asyncio.sleep(0)
+            batch = watcher._batches[1]
+            held, dropped = list(batch.changes), batch.dropped
+            await watcher.stop()
+            return watcher, held, dropped
+
+        watcher, held, dropped = asyncio.run(run())
+        assert held == [f"/in/{i}.txt" for i in range(20, 30)]
+        assert dropped == 20
+        assert watcher.runs == []
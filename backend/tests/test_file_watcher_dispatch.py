@@ -0,0 +1,120 @@
+"""Tests for the shared observer and path/pattern dispatch index of file watch triggers."""
+
+import asyncio
+import os
+import random
+import time
+from fnmatch import fnmatch
+
+from services.triggers import file_watcher
+from services.triggers.file_watcher import FileWatchHandler, FileWatcherService, _DispatchIndex, _plan_watch_roots
+
+PATTERNS = [["*"], ["*.csv"], ["*.txt", "*.md"], ["report_*"], ["data.json"], ["*.tar.gz"], ["?.log"]]
+
+
+def _brute_force(handlers, file_path):
+    directory, name = os.path.split(file_path)
+    return {
+        h.trigger_id for h in handlers
+        if (directory == h.watch_path or (h.recursive and directory.startswith(h.watch_path + os.sep)))
+        and any(fnmatch(name, p) for p in h.patterns)
+    }
+
+
+def _overlapping_triggers(root, count):
+    rng = random.Random(43)
+    dirs = [root] + [os.path.join(root, f"d{i}") for i in range(10)] + \
+        [os.path.join(root, f"d{i}", "inner") for i in range(10)]
+    return [
+        (i, {
+            "watch_path": rng.choice(dirs),
+            "recursive": rng.random() < 0.3,
+            "patterns": rng.choice(PATTERNS),
+            "events": ["created"],
+        })
+        for i in range(count)
+    ]
+
+
+class TestFileWatcherDispatch:
+    def test_index_matches_brute_force(self, tmp_path):
+        root = str(tmp_path)
+        handlers = [FileWatchHandler(i, 1, config) for i, config in _overlapping_triggers(root, 500)]
+        index = _DispatchIndex(handlers)
+
+        names = ["a.csv", "notes.txt", "readme.md", "report_q3.pdf", "data.json", "x.tar.gz", "b.log", "bb.log"]
+        dirs = [root, os.path.join(root, "d3"), os.path.join(root, "d3", "inner"), os.path.join(root, "d3", "inner", "deep")]
+        for directory in dirs:
+            for name in names:
+                path = os.path.join(directory, name)
+                assert {h.trigger_id for h in index.match(path)} == _brute_force(handlers, path)
+
+    def test_nested_paths_share_a_root(self, tmp_path):
+        root = str(tmp_path)
+        handlers = [
+            FileWatchHandler(1, 1, {"watch_path": os.path.join(root, "a")}),
+            FileWatchHandler(2, 1, {"watch_path": os.path.join(root, "a", "b")}),
+            FileWatchHandler(3, 1, {"watch_path": os.path.join(root, "ab")}),
+        ]
+        assert _plan_watch_roots(handlers) == {os.path.join(root, "a"): True, os.path.join(root, "ab"): False}
+
+    def test_500_overlapping_triggers_share_one_observer(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_watcher, "_last_trigger_times", {})
+        root = str(tmp_path)
+        triggers = _overlapping_triggers(root, 500)
+        handlers = [FileWatchHandler(i, 1, config) for i, config in triggers]
+
+        async def run():
+            watcher = FileWatcherService()
+            watcher._is_running = True
+            watcher._event_loop = asyncio.get_running_loop()
+            delivered = []
+            watcher._add_change = lambda handler, event_type, path: delivered.append((handler.trigger_id, path))
+
+            for trigger_id, config in triggers:
+                await watcher.start_watcher(trigger_id, 1, config)
+            stats = watcher.get_stats()
+
+            paths = [
+                os.path.join(root, "d7", "inner", "report_1.csv"),
+                os.path.join(root, "d2", "data.json"),
+                os.path.join(root, "notes.txt"),
+            ]
+            for path in paths:
+                with open(path, "w") as f:
+                    f.write("x")
+            for _ in range(50):
+                await asyncio.sleep(0.05)
+                if {p for _, p in delivered} == set(paths):
+                    break
+            await asyncio.sleep(0.1)
+
+            final_stats = watcher.get_stats()
+            await watcher.stop()
+            return stats, final_stats, delivered, paths
+
+        stats, final_stats, delivered, paths = asyncio.run(run())
+
+        assert stats["active_watchers"] == 500
+        assert stats["watched_roots"] == [root]
+        assert stats["observer_threads"] == 2  # dispatcher + one emitter
+        for path in paths:
+            assert {t for t, p in delivered if p == path} == _brute_force(handlers, path)
+        assert final_stats["events_dispatched"] >= len(paths)
+        assert final_stats["avg_dispatch_cpu_us"] > 0
+
+    def test_match_cost_does_not_grow_with_trigger_count(self, tmp_path):
+        root = str(tmp_path)
+        path = os.path.join(root, "d4", "inner", "unmatched.bin")
+
+        def cost(count):
+            index = _DispatchIndex(FileWatchHandler(i, 1, c) for i, c in _overlapping_triggers(root, count))
+            started = time.perf_counter()
+            for _ in range(2000):
+                index.match(path)
+            return time.perf_counter() - started
+
+        cost(50)
+        # Lookups are dict probes per path level (plus one fnmatch per distinct
+        # glob); only the "*" triggers that really match grow with the count
+        assert cost(5000) < cost(500) * 3
@@ -0,0 +1,145 @@
+"""Tests for the shared keep-alive HTTP clients used by generated tools."""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from core.http.clients import HttpClientRegistry, close_http_clients
+from core.tools.factory import ToolFactory
+
+CALLS = 1000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+        body = json.dumps({"path": self.path, "status": "done", "cookie": self.headers.get("Cookie")}).encode()
+        self.send_response(200)
+        if self.path == "/login/1":
+            self.send_header("Set-Cookie", "session=user-a; Path=/")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1  # one call per accepted TCP connection
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def stub_server():
+    server = _CountingServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _api_tool(url: str, timeout: float, polling=None):
+    config = {
+        "tool_id": "stub_api",
+        "name": "Stub API",
+        "description": "Calls the local stub server",
+        "input_schema": {"properties": {"n": {"type": "integer"}}, "required": ["n"]},
+        "implementation_config": {"method": "GET", "url": url, "timeout": timeout, "polling": polling or {}},
+    }
+    with patch.object(ToolFactory, "_validate_url_ssrf", return_value=True):
+        return asyncio.run(ToolFactory._create_api_tool(config, None))
+
+
+class TestPooledHttpClients:
+    def test_api_tool_reuses_connections(self, stub_server):
+        server, base = stub_server
+        tool = _api_tool(base + "/items/{n}", timeout=5)
+
+        async def calls():
+            try:
+                results = [await tool.ainvoke({"n": i}) for i in range(CALLS)]
+                results += await asyncio.gather(*(tool.ainvoke({"n": i}) for i in range(50)))
+                return results
+            finally:
+                await close_http_clients()
+
+        results = asyncio.run(calls())
+        assert all('"status": "done"' in r for r in results)
+        # Previously one connection per call; now bounded by the per-host pool
+        assert server.connections <= 20
+
+    def test_polling_reuses_connection(self, stub_server):
+        server, base = stub_server
+        polling = {"url": base + "/jobs/{n}", "interval": 0, "completion_condition": "status == done"}
+        tool = _api_tool(base + "/start/{n}", timeout=5, polling=polling)
+
+        async def calls():
+            try:
+                return [await tool.ainvoke({"n": i}) for i in range(20)]
+            finally:
+                await close_http_clients()
+
+        assert all("/jobs/" in r for r in asyncio.run(calls()))
+        assert server.connections == 1
+
+    def test_per_tool_timeout_is_kept(self, stub_server):
+        _, base = stub_server
+        slow = _api_tool(base + "/slow/{n}", timeout=0.1)
+        patient = _api_tool(base + "/slow/{n}", timeout=5)
+
+        async def calls():
+            try:
+                return await slow.ainvoke({"n": 1}), await patient.ainvoke({"n": 2})
+            finally:
+                await close_http_clients()
+
+        slow_result, patient_result = asyncio.run(calls())
+        assert slow_result == "Error: Request timed out after 0.1 seconds"
+        assert '"status": "done"' in patient_result
+
+    def test_registry_is_per_origin_and_lru_capped(self):
+        registry = HttpClientRegistry(max_hosts=2)
+
+        async def clients():
+            async with registry.lease("https://a.example.com/x") as a:
+                async with registry.lease("https://a.example.com:443/y") as same:
+                    assert same is a
+                async with registry.lease("http://a.example.com/x") as other:
+                    assert other is not a
+                async with registry.lease("https://b.example.com/"):
+                    pass
+                # Evicted while leased: closed only when the lease ends
+                closed_while_leased = a.is_closed
+            closed = a.is_closed
+            await registry.close()
+            return closed_while_leased, closed
+
+        assert asyncio.run(clients()) == (False, True)
+
+    def test_cookies_are_not_shared_between_calls(self, stub_server):
+        _, base = stub_server
+        tool = _api_tool(base + "/login/{n}", timeout=5)
+
+        async def calls():
+            try:
+                return await tool.ainvoke({"n": 1}), await tool.ainvoke({"n": 2})
+            finally:
+                await close_http_clients()
+
+        _, echoed = asyncio.run(calls())
+        assert json.loads(echoed)["cookie"] is None
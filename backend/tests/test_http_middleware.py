@@ -0,0 +1,142 @@
+"""Tests for the pure-ASGI performance and rate limiting middleware."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.performance import LatencyHistogram, PerformanceMetrics, PerformanceMiddleware
+from middleware.rate_limit import (
+    RateLimitMiddleware,
+    RateLimitRule,
+    TokenBucketLimiter,
+    parse_route_limits,
+)
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield f"data: {i}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class TestPerformanceMiddleware:
+    def test_records_histograms_per_route_template(self):
+        metrics = PerformanceMetrics()
+        app = _app()
+        app.add_middleware(PerformanceMiddleware, metrics=metrics)
+        client = TestClient(app)
+
+        for item_id in range(5):
+            response = client.get(f"/api/items/{item_id}")
+            assert response.headers["x-response-time"].endswith("ms")
+        client.get("/nope/1")
+        client.get("/nope/2")
+
+        histograms = metrics.get_histograms()
+        assert histograms["GET /api/items/{item_id}"]["count"] == 5
+        assert histograms["<unmatched>"]["count"] == 2
+        assert metrics.get_metrics()["by_status_code"] == {200: 5, 404: 2}
+
+    def test_streaming_response_passes_through(self):
+        metrics = PerformanceMetrics()
+        app = _app()
+        app.add_middleware(PerformanceMiddleware, metrics=metrics)
+
+        response = TestClient(app).get("/api/stream")
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+        assert metrics.get_histograms()["GET /api/stream"]["count"] == 1
+
+    def test_histogram_percentiles(self):
+        hist = LatencyHistogram()
+        for ms in [1] * 90 + [400] * 10:
+            hist.observe(ms)
+        assert hist.percentile(50) <= 5
+        assert 250 <= hist.percentile(99) <= 400
+        assert sum(hist.to_dict()["buckets"].values()) == 100
+
+
+class TestTokenBucket:
+    def test_refills_over_time(self):
+        now = [0.0]
+        limiter = TokenBucketLimiter(clock=lambda: now[0])
+        results = [limiter.acquire(("ip", "/"), 3)[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+
+        now[0] = 20.0  # 3/min -> one token per 20s
+        assert limiter.acquire(("ip", "/"), 3)[0] is True
+        assert limiter.acquire(("ip", "/"), 3)[0] is False
+
+    def test_key_table_is_bounded(self):
+        now = [0.0]
+        limiter = TokenBucketLimiter(max_keys=10, clock=lambda: now[0])
+        for i in range(100):
+            limiter.acquire((f"ip{i}", "/"), 5)
+        assert len(limiter) == 10
+
+        now[0] = 61.0
+        limiter.acquire(("fresh", "/"), 5)
+        assert len(limiter) == 1
+
+
+class TestRateLimitMiddleware:
+    def test_per_route_limit(self):
+        app = _app()
+        app.add_middleware(
+            RateLimitMiddleware,
+            requests_per_minute=100,
+            route_limits=[RateLimitRule(prefix="/api/items", requests_per_minute=2)],
+        )
+        client = TestClient(app)
+
+        assert client.get("/api/items/1").headers["x-ratelimit-limit"] == "2"
+        assert client.get("/api/items/2").status_code == 200
+        blocked = client.get("/api/items/3")
+        assert blocked.status_code == 429
+        assert int(blocked.headers["retry-after"]) >= 1
+        assert blocked.json()["detail"]["limit"] == 2
+
+        # Default limit is a separate bucket
+        assert client.get("/api/stream").headers["x-ratelimit-limit"] == "100"
+
+    def test_zero_limit_disables_limiting(self):
+        app = _app()
+        app.add_middleware(
+            RateLimitMiddleware,
+            requests_per_minute=0,
+            route_limits=[RateLimitRule(prefix="/api/stream", requests_per_minute=1)],
+        )
+        client = TestClient(app)
+
+        responses = [client.get(f"/api/items/{i}") for i in range(5)]
+        assert [r.status_code for r in responses] == [200] * 5
+        assert "x-ratelimit-limit" not in responses[0].headers
+        # Route overrides still apply on top of an unlimited default
+        assert client.get("/api/stream").status_code == 200
+        assert client.get("/api/stream").status_code == 429
+
+        with pytest.raises(ValueError):
+            RateLimitMiddleware(app, requests_per_minute=-1)
+
+    def test_parse_route_limits(self):
+        rules = parse_route_limits("/api=50, POST /api/chat=5,bogus,/api/chat=10,/api/x=-1,/api/audio=0")
+        assert [(r.method, r.prefix, r.requests_per_minute) for r in rules] == [
+            (None, "/api/audio", 0),
+            ("POST", "/api/chat", 5),
+            (None, "/api/chat", 10),
+            (None, "/api", 50),
+        ]
+        assert not rules[2].matches("GET", "/api/chatter")
@@ -0,0 +1,115 @@
+"""Tests for MAP_NODE item resolution, result merging and reduction."""
+import asyncio
+import operator
+from typing import Annotated, Any, Dict, List, Optional, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from core.workflows.map_node import (
+    merge_map_results,
+    reduce_map_results,
+    reduce_node_id,
+    render_item_prompt,
+    resolve_map_items,
+)
+
+
+class TestMapNodeHelpers:
+    def test_resolve_items(self):
+        state = {"tool_result": '["a", "b"]', "branch_results": {"search": {"hits": [1, 2, 3]}}}
+        assert resolve_map_items(state, {}) == ["a", "b"]
+        assert resolve_map_items(state, {"items_key": "branch_results.search.hits", "max_items": 2}) == [1, 2]
+        assert resolve_map_items({"tool_result": "one\n\ntwo\n"}, {}) == ["one", "two"]
+        assert resolve_map_items(state, {"items_key": "missing.key"}) == []
+
+    def test_render_prompt(self):
+        assert render_item_prompt("Summarize #{index}: {item}", {"id": 1}, 3) == 'Summarize #3: {"id": 1}'
+        assert render_item_prompt(None, "plain", 0) == "plain"
+
+    def test_merge_and_reduce(self):
+        merged = merge_map_results({"m": {0: {"output": "a"}}}, {"m": {2: {"output": "c"}}})
+        merged = merge_map_results(merged, {"m": {1: {"output": "", "error": "boom"}}})
+        reduced = reduce_map_results(merged["m"], {"separator": "|"})
+        assert (reduced["value"], reduced["succeeded"], reduced["failed"]) == ("a|c", 2, 1)
+        assert merge_map_results(merged, {"m": None}) == {}
+
+        json_results = {0: {"output": '{"a": 1}'}, 1: {"output": "not json"}, 2: {"output": '{"b": 2}'}}
+        assert reduce_map_results(json_results, {"reducer": "json_merge"})["value"] == {"a": 1, "b": 2}
+
+
+class _State(TypedDict, total=False):
+    items: List[str]
+    map_results: Annotated[Dict[str, Dict[int, Any]], merge_map_results]
+    map_item: Optional[Dict[str, Any]]
+    output: Annotated[List[Any], operator.add]
+
+
+class TestMapNodeFanOut:
+    def test_send_fan_out_reduces_once_in_order(self):
+        def route(state):
+            return [Send("child", {"map_item": {"index": i, "item": item}}) for i, item in enumerate(state["items"])]
+
+        def child(state):
+            item = state["map_item"]
+            return {"map_results": {"map": {item["index"]: {"output": item["item"].upper()}}}}
+
+        def reduce(state):
+            return {"output": [reduce_map_results(state["map_results"]["map"], {"reducer": "list"})["value"]]}
+
+        graph = StateGraph(_State)
+        graph.add_node("map", lambda state: {"map_results": {"map": None}})
+        graph.add_node("child", child)
+        graph.add_node(reduce_node_id("map"), reduce)
+        graph.add_edge(START, "map")
+        graph.add_conditional_edges("map", route, ["child"])
+        graph.add_edge("child", reduce_node_id("map"))
+        graph.add_edge(reduce_node_id("map"), END)
+
+        result = graph.compile().invoke({"items": ["x", "y", "z"]})
+        assert result["output"] == [["X", "Y", "Z"]]
+
+
+class TestMapNodeWorkflowGraph:
+    def test_executor_builds_fan_out_and_ordered_reduce(self):
+        from types import SimpleNamespace
+
+        from langchain_core.messages import AIMessage
+        from core.workflows.executor import SimpleWorkflowExecutor
+
+        workflow = SimpleNamespace(name="map", configuration={
+            "nodes": [
+                {"id": "map", "type": "MAP_NODE", "config": {"reducer": "list", "item_prompt": "#{index} {item}"}},
+                {"id": "worker", "type": "default", "data": {"agentType": "default"}, "config": {}},
+            ],
+            "edges": [{"id": "e1", "source": "map", "target": "worker"}],
+        })
+        calls = []
+
+        executor = SimpleWorkflowExecutor()
+        create_node_executor = executor._create_node_executor
+
+        def create_stub_executor(node_id, agent_type, node):
+            if node_id != "worker":
+                return create_node_executor(node_id, agent_type, node)
+
+            async def worker(state, config=None):
+                item = state["map_item"]
+                calls.append((item["index"], state["query"]))
+                # Later items finish first, so results arrive out of order
+                await asyncio.sleep(0.01 * (item["total"] - item["index"]))
+                return {"messages": [AIMessage(content=state["query"].upper())]}
+            return worker
+
+        executor._create_node_executor = create_stub_executor
+
+        async def run():
+            graph = await executor._build_graph_from_workflow(workflow)
+            return await graph.compile().ainvoke({"messages": [], "tool_result": '["a", "b", "c"]'})
+
+        result = asyncio.run(run())
+
+        assert sorted(calls) == [(0, "#0 a"), (1, "#1 b"), (2, "#2 c")]
+        assert result["branch_results"]["map"] == ["#0 A", "#1 B", "#2 C"]
+        assert result["messages"][-1].content == '["#0 A", "#1 B", "#2 C"]'
+        assert not result.get("map_results")
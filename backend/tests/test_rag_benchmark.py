@@ -0,0 +1,34 @@
+"""Tests for the RAG benchmark's synthetic corpus and scoring helpers."""
+from benchmarks.rag import hash_embedding, make_corpus, percentile, retrieved_docs
+
+
+def _dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+class TestRagBenchmarkHelpers:
+    def test_corpus_is_deterministic_and_labeled(self):
+        corpus = make_corpus(num_docs=20, num_queries=10, seed=3)
+        assert corpus == make_corpus(num_docs=20, num_queries=10, seed=3)
+        names = {d["name"] for d in corpus["docs"]}
+        assert all(q["doc"] in names for q in corpus["queries"])
+
+    def test_exact_search_finds_labeled_docs(self):
+        corpus = make_corpus(num_docs=50, num_queries=20)
+        doc_vectors = {d["name"]: hash_embedding(d["text"]) for d in corpus["docs"]}
+        hits = 0
+        for query in corpus["queries"]:
+            q = hash_embedding(query["text"])
+            ranked = sorted(doc_vectors, key=lambda name: -_dot(q, doc_vectors[name]))
+            hits += query["doc"] in ranked[:5]
+        assert hits / len(corpus["queries"]) >= 0.9
+
+    def test_percentile_and_result_parsing(self):
+        assert percentile(list(range(1, 101)), 95) == 95
+        assert percentile([], 50) == 0.0
+        package = {"components": {"code_chunks": [
+            {"content": "File: doc_00003.txt | Similarity: 0.91"},
+            {"content": "File: doc_00003.txt | Similarity: 0.80"},
+            {"content": "File: doc_00012.txt | Similarity: 0.75"},
+        ]}}
+        assert retrieved_docs(package) == ["doc_00003", "doc_00012"]
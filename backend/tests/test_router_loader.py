@@ -0,0 +1,111 @@
+"""Tests for lazy router group loading and startup timing."""
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.router_loader import (
+    RouterGroup,
+    RouterLoader,
+    RouterSpec,
+    parse_importtime,
+    summarize_importtime,
+)
+from core.utils.startup_timing import StartupTimer
+
+
+def _fake_router_module(name, prefix):
+    module = types.ModuleType(name)
+    module.router = APIRouter(prefix=prefix)
+
+    @module.router.get("/ping")
+    async def ping():
+        return {"module": name}
+
+    sys.modules[name] = module
+    return module
+
+
+@pytest.fixture
+def loader():
+    _fake_router_module("_lazy_test_alpha", "/api/alpha")
+    _fake_router_module("_lazy_test_beta", "/api/beta")
+    loader = RouterLoader()
+    loader.groups = [
+        RouterGroup("alpha", ("/api/alpha",), (RouterSpec("_lazy_test_alpha"),)),
+        RouterGroup("beta", ("/api/beta",), (RouterSpec("_lazy_test_beta"),)),
+    ]
+    yield loader
+    sys.modules.pop("_lazy_test_alpha", None)
+    sys.modules.pop("_lazy_test_beta", None)
+
+
+class TestRouterLoader:
+    def test_eager_install_registers_everything(self, loader):
+        app = FastAPI()
+        loader.install(app, lazy=False)
+        assert all(g.loaded for g in loader.groups)
+        assert TestClient(app).get("/api/beta/ping").json() == {"module": "_lazy_test_beta"}
+
+    def test_lazy_install_loads_group_on_first_request(self, loader):
+        app = FastAPI()
+        loader.install(app, lazy=True)
+        client = TestClient(app)
+        assert not any(g.loaded for g in loader.groups)
+
+        assert client.get("/api/alpha/ping").status_code == 200
+        loaded = {g.name: g.loaded for g in loader.groups}
+        assert loaded == {"alpha": True, "beta": False}
+
+    def test_openapi_loads_all_groups(self, loader):
+        app = FastAPI()
+        loader.install(app, lazy=True)
+        paths = TestClient(app).get("/openapi.json").json()["paths"]
+        assert "/api/alpha/ping" in paths and "/api/beta/ping" in paths
+
+    def test_prefix_matching_is_segment_aware(self):
+        group = RouterGroup("models", ("/api/models",), ())
+        assert group.matches("/api/models")
+        assert group.matches("/api/models/gpt")
+        assert not group.matches("/api/models-extra")
+
+    def test_stats_report_import_time(self, loader):
+        app = FastAPI()
+        loader.install(app, lazy=False)
+        stats = loader.stats()
+        assert stats["lazy"] is False
+        assert all(g["import_ms"] is not None for g in stats["groups"])
+
+
+class TestImportTimeParsing:
+    SAMPLE = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      3000 |       5000 | langchain_core\n"
+        "import time:      2000 |       2000 |   langchain_core.messages\n"
+    )
+
+    def test_parse_and_summarize(self):
+        rows = parse_importtime(self.SAMPLE)
+        assert rows[1] == ("langchain_core", 3000, 5000, 0)
+        summary = summarize_importtime(rows)
+        assert summary["modules"] == 3
+        assert summary["top_packages"][0] == {"package": "langchain_core", "self_ms": 5.0}
+
+
+class TestStartupTimer:
+    def test_phases_are_recorded_in_order(self):
+        timer = StartupTimer()
+        with timer.phase("db_init"):
+            pass
+        with pytest.raises(RuntimeError):
+            with timer.phase("mcp"):
+                raise RuntimeError("boom")
+        timer.mark_ready()
+
+        summary = timer.summary()
+        assert [p["name"] for p in summary["phases"]] == ["db_init", "mcp"]
+        assert summary["phases"][1]["status"] == "failed"
+        assert summary["ready_after_ms"] is not None
@@ -104,6 +104,7 @@ class FakeDB:
     def __init__(self, session_obj, agent_obj):
         self._session_obj = session_obj
         self._agent_obj = agent_obj
+        self.added: List[Any] = []
 
     def query(self, model):
         name = getattr(model, "__name__", str(model))
@@ -113,6 +114,9 @@ class FakeDB:
             return FakeQuery(self._agent_obj)
         return FakeQuery(None)
 
+    def add(self, obj):
+        self.added.append(obj)
+
     def commit(self):
         pass
 
@@ -129,7 +133,7 @@ def _fake_session():
         agent_id=1,
         project_id=None,  # keeps the RAG retrieval path disabled (hermetic test)
         is_active=True,
-        messages=[],
+        message_count=0,
         metrics={},
         runtime="langgraph",
     )
@@ -168,6 +172,16 @@ def fake_agent(monkeypatch):
     import sqlalchemy.orm.attributes as sa_attributes
     monkeypatch.setattr(sa_attributes, "flag_modified", lambda instance, key: None)
 
+    # The message counter is bumped with UPDATE ... RETURNING; only appends
+    # reach it in this route, so count them on the fake session directly.
+    from services import chat_message_store
+
+    def fake_update_message_count(db, session, count):
+        session.message_count += 1
+        return session.message_count
+
+    monkeypatch.setattr(chat_message_store, "_update_message_count", fake_update_message_count)
+
     # Force a fresh agent build (no cross-test cache hits) and a no-op cache.
     from services.chat_session_manager import get_session_manager
     manager = get_session_manager()
@@ -275,8 +289,9 @@ async def test_chat_sse_frame_semantics_and_agent_invocation(fake_agent):
     assert call["input"]["messages"][0].content == "run the contract"
 
     # DB persistence stays in the route: user + assistant message appended.
-    assert len(session_obj.messages) == 2
-    user_msg, assistant_msg = session_obj.messages
+    assert session_obj.message_count == 2
+    assert [record.message_index for record in db.added] == [0, 1]
+    user_msg, assistant_msg = [record.to_dict() for record in db.added]
     assert user_msg["role"] == "user"
     assert user_msg["content"] == "run the contract"
     assert assistant_msg["role"] == "assistant"
@@ -0,0 +1,104 @@
+"""Tests for the timer-driven SchedulerService loop."""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from services.scheduler_service import SchedulerService
+
+
+class InMemorySchedulerService(SchedulerService):
+    """SchedulerService over a dict of schedule_id -> next_run_at instead of PostgreSQL."""
+
+    def __init__(self, next_runs, **kwargs):
+        super().__init__(**kwargs)
+        self.table = dict(next_runs)
+        self.fired = {}
+        self.queries = 0
+
+    def _fetch_next_runs(self, schedule_ids=None):
+        self.queries += 1
+        ids = self.table.keys() if schedule_ids is None else schedule_ids
+        return {i: self.table[i] for i in ids if self.table.get(i) is not None}
+
+    async def _process_due_schedules(self, now=None):
+        self.queries += 1
+        fired_at = time.time()
+        for schedule_id, next_run_at in self.table.items():
+            if next_run_at is not None and next_run_at <= now:
+                self.fired[schedule_id] = fired_at - next_run_at.timestamp()
+                self.table[schedule_id] = None
+
+
+def _at(seconds_from_now):
+    return datetime.fromtimestamp(time.time() + seconds_from_now, timezone.utc)
+
+
+class TestSchedulerService:
+    def test_thousands_of_schedules_fire_on_time_without_idle_queries(self):
+        count = 3000
+        rng = random.Random(7)
+        schedules = {i: _at(0.2 + rng.random()) for i in range(count)}
+
+        async def run():
+            scheduler = InMemorySchedulerService(schedules, resync_interval=3600)
+            await scheduler.start()
+            await asyncio.sleep(1.5)
+            busy_queries = scheduler.queries
+            await asyncio.sleep(1.0)
+            idle_queries = scheduler.queries - busy_queries
+            await scheduler.stop()
+            return scheduler, idle_queries
+
+        scheduler, idle_queries = asyncio.run(run())
+
+        jitter = sorted(scheduler.fired.values())
+        assert len(jitter) == count
+        assert min(jitter) >= 0
+        assert statistics.median(jitter) < 0.05
+        assert jitter[int(count * 0.99)] < 0.25
+        # Nothing due and no resync pending: the loop just sleeps (the old
+        # poll loop ran the due-schedule scan twice a minute regardless)
+        assert idle_queries == 0
+
+    def test_change_notification_wakes_the_loop(self):
+        async def run():
+            scheduler = InMemorySchedulerService({1: _at(3600)}, resync_interval=3600)
+            await scheduler.start()
+            await asyncio.sleep(0.05)
+
+            scheduler.table[2] = _at(0.1)
+            scheduler.notify_schedule_changed(2, scheduler.table[2])
+            scheduler.table[1] = None
+            scheduler.notify_schedule_changed(1, None)
+
+            await asyncio.sleep(0.4)
+            await scheduler.stop()
+            return scheduler
+
+        scheduler = asyncio.run(run())
+
+        assert list(scheduler.fired) == [2]
+        assert scheduler.fired[2] < 0.1
+        assert scheduler.get_stats()["scheduled"] == 0
+
+    def test_unclaimed_schedule_is_retried_later(self):
+        class LockedElsewhere(InMemorySchedulerService):
+            async def _process_due_schedules(self, now=None):
+                self.queries += 1
+
+        async def run():
+            scheduler = LockedElsewhere({1: _at(0.05)}, resync_interval=3600, retry_interval=10)
+            await scheduler.start()
+            await asyncio.sleep(0.3)
+            stats = scheduler.get_stats()
+            await scheduler.stop()
+            return scheduler, stats
+
+        scheduler, stats = asyncio.run(run())
+
+        assert stats["scheduled"] == 1
+        assert datetime.fromisoformat(stats["next_due_at"]).timestamp() > time.time() + 5
+        assert scheduler.queries == 3  # resync, scan, re-arm
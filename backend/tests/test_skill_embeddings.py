@@ -0,0 +1,140 @@
+"""Tests for the precomputed skill embedding matrix."""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.skills.embeddings import SkillEmbeddingIndex
+from core.skills.matcher import SkillMatcher
+from core.skills.registry import get_skill_registry
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings: one axis per known keyword."""
+
+    VOCAB = ["python", "testing", "docker", "sql", "react"]
+
+    def __init__(self):
+        self.document_calls = []
+
+    def _vec(self, text):
+        text = text.lower()
+        return [float(text.count(word)) for word in self.VOCAB]
+
+    async def aembed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [self._vec(t) for t in texts]
+
+    async def aembed_query(self, text):
+        return self._vec(text)
+
+
+def _skill(skill_id, description, tags=None):
+    return SimpleNamespace(skill_id=skill_id, name=skill_id, description=description, tags=tags or [])
+
+
+SKILLS = [
+    _skill("pytest", "python testing with pytest", ["python", "testing"]),
+    _skill("compose", "docker compose setups", ["docker"]),
+    _skill("queries", "sql query tuning", ["sql"]),
+]
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestSkillEmbeddingIndex:
+    def test_build_embeds_in_one_batch(self):
+        fake = FakeEmbeddings()
+        index = SkillEmbeddingIndex(index_path=None, embeddings=fake)
+        assert _run(index.build(SKILLS)) == 3
+        assert len(fake.document_calls) == 1
+        assert len(index) == 3
+
+    def test_search_ranks_by_cosine(self):
+        index = SkillEmbeddingIndex(index_path=None, embeddings=FakeEmbeddings())
+        _run(index.build(SKILLS))
+        query = _run(index.embed_query("write python testing code"))
+        results = index.search(query, k=2)
+        assert results[0][0] == "pytest"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert all(score > 0 for _, score in results)
+
+    def test_search_restrict_to(self):
+        index = SkillEmbeddingIndex(index_path=None, embeddings=FakeEmbeddings())
+        _run(index.build(SKILLS))
+        query = _run(index.embed_query("python testing"))
+        results = index.search(query, k=3, restrict_to={"compose", "queries"})
+        assert "pytest" not in [sid for sid, _ in results]
+
+    def test_upsert_only_reembeds_changed_skill(self):
+        fake = FakeEmbeddings()
+        index = SkillEmbeddingIndex(index_path=None, embeddings=fake)
+        _run(index.build(SKILLS))
+        assert _run(index.upsert(SKILLS[1])) is False
+
+        changed = _skill("compose", "react frontends", [])
+        assert _run(index.upsert(changed)) is True
+        assert fake.document_calls[-1] == ["compose: react frontends"]
+
+        query = _run(index.embed_query("react"))
+        assert index.search(query, k=1)[0][0] == "compose"
+
+    def test_remove(self):
+        index = SkillEmbeddingIndex(index_path=None, embeddings=FakeEmbeddings())
+        _run(index.build(SKILLS))
+        assert index.remove("queries") is True
+        assert "queries" not in index
+        assert index.remove("queries") is False
+        assert len(index) == 2
+
+    def test_persisted_matrix_is_reused(self, tmp_path):
+        path = tmp_path / "skills.npz"
+        _run(SkillEmbeddingIndex(index_path=str(path), embeddings=FakeEmbeddings()).build(SKILLS))
+        assert path.exists()
+
+        fake = FakeEmbeddings()
+        index = SkillEmbeddingIndex(index_path=str(path), embeddings=fake)
+        assert _run(index.build(SKILLS + [_skill("ui", "react components")])) == 1
+        assert fake.document_calls == [["ui: react components"]]
+        assert index._matrix.dtype == np.float32
+
+    def test_incremental_saves_are_coalesced_off_the_loop(self, tmp_path):
+        path = tmp_path / "skills.npz"
+        index = SkillEmbeddingIndex(index_path=str(path), embeddings=FakeEmbeddings(), save_delay=0.05)
+        writes = []
+        write = index._write
+
+        def recording_write(snapshot):
+            writes.append(threading.get_ident())
+            write(snapshot)
+
+        index._write = recording_write
+
+        async def run():
+            await index.build(SKILLS)
+            for i in range(5):
+                await index.upsert(_skill(f"extra{i}", "react components"))
+            index.remove("queries")
+            assert len(writes) == 1  # only the build so far
+            await asyncio.sleep(0.2)
+
+        _run(run())
+        assert len(writes) == 2
+        assert threading.get_ident() not in writes
+
+        reloaded = SkillEmbeddingIndex(index_path=str(path), embeddings=FakeEmbeddings())
+        assert _run(reloaded.build([s for s in SKILLS if s.skill_id != "queries"])) == 0
+
+
+class TestSkillMatcherModel:
+    def test_embedding_model_is_honoured(self):
+        registry_index = get_skill_registry().embedding_index
+
+        assert SkillMatcher()._index is registry_index
+        matcher = SkillMatcher(embedding_model="text-embedding-3-large")
+        assert matcher._index is not registry_index
+        assert matcher._index.embedding_model == "text-embedding-3-large"
@@ -0,0 +1,115 @@
+"""Tests for the per-task timing span recorder."""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.workflows.execution import router as execution_router
+from core.workflows.events.spans import get_recorder, record_spans, span, timed, traced
+
+
+def _child(node, name):
+    return next(c for c in node["children"] if c["name"] == name)
+
+
+class TestSpanRecorder:
+    def test_span_is_noop_outside_recording(self):
+        with span("orphan") as span_id:
+            assert span_id is None
+
+    def test_nesting_follows_context_across_tasks(self):
+        @traced("tool:search", kind="tool")
+        async def search():
+            await asyncio.sleep(0.001)
+
+        async def node(name):
+            with span(name, kind="node"):
+                await asyncio.gather(search(), search())
+
+        async def run():
+            with record_spans(101, "workflow:test") as recorder:
+                await asyncio.gather(node("node:a"), node("node:b"))
+            return recorder
+
+        summary = asyncio.run(run()).summary()
+
+        tree = summary["tree"]
+        assert tree["name"] == "workflow:test"
+        assert {c["name"] for c in tree["children"]} == {"node:a", "node:b"}
+        assert _child(_child(tree, "node:a"), "tool:search")["count"] == 2
+        assert summary["by_kind"]["tool"]["count"] == 4
+        assert any(line.startswith("workflow:test;node:a;tool:search ") for line in summary["folded"])
+
+    def test_keyed_spans_nest_under_parent_run(self):
+        async def run():
+            with record_spans(102, "workflow:callbacks") as recorder:
+                chain, llm = str(uuid.uuid4()), str(uuid.uuid4())
+                recorder.start("node:agent", kind="node", key=chain)
+                recorder.start("llm:gpt", kind="llm", key=llm, parent_key=chain)
+                recorder.end(llm, error="RateLimitError")
+                recorder.end(chain)
+            return recorder
+
+        recorder = asyncio.run(run())
+        agent = _child(recorder.summary()["tree"], "node:agent")
+        llm = _child(agent, "llm:gpt")
+
+        assert llm["errors"] == 1
+        assert agent["self_ms"] <= agent["total_ms"]
+        assert get_recorder(102) is recorder
+
+    def test_error_marks_span_and_propagates(self):
+        with pytest.raises(ValueError):
+            with record_spans(103, "workflow:fails"):
+                with span("db.persist_event", kind="db"):
+                    raise ValueError("boom")
+
+        summary = get_recorder(103).summary()
+        assert summary["tree"]["errors"] == 1
+        assert _child(summary["tree"], "db.persist_event")["errors"] == 1
+        assert get_recorder() is None
+
+    def test_timed_aggregates_without_spans(self):
+        @timed("db.persist_event", kind="db")
+        async def persist(fail=False):
+            if fail:
+                raise RuntimeError("db down")
+
+        async def run():
+            with record_spans(104, "workflow:stream") as recorder:
+                await asyncio.gather(*(persist() for _ in range(500)))
+                with pytest.raises(RuntimeError):
+                    await persist(fail=True)
+            return recorder
+
+        summary = asyncio.run(run()).summary()
+        assert summary["span_count"] == 1
+        timing = summary["timings"]["db.persist_event"]
+        assert timing["kind"] == "db"
+        assert timing["count"] == 501
+        assert timing["errors"] == 1
+        assert 0 <= timing["max_ms"] <= timing["total_ms"]
+
+
+class TestProfileEndpoint:
+    def test_output_format_and_top_bound(self):
+        with record_spans(4242, "workflow:profiled"):
+            with span("node:a", kind="node"):
+                time.sleep(0.002)
+
+        app = FastAPI()
+        app.include_router(execution_router)
+        client = TestClient(app)
+        url = "/api/orchestration/tasks/4242/profile"
+
+        assert client.get(url).json()["tree"]["name"] == "workflow:profiled"
+        folded = client.get(url, params={"output_format": "folded"})
+        assert folded.headers["content-type"].startswith("text/plain")
+        assert "workflow:profiled;node:a" in folded.text
+        assert client.get(url, params={"output_format": "xml"}).status_code == 400
+        assert client.get(url, params={"top": 100_000}).status_code == 422
+        assert client.get(url, params={"top": 0}).status_code == 422
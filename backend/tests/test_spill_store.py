@@ -0,0 +1,72 @@
+"""Tests for the disk-backed spill store and evicted-result tools."""
+import asyncio
+
+import pytest
+
+from core.middleware.deep import FilesystemMiddleware
+from services.spill_store import SpillStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SpillStore(base_dir=str(tmp_path / "spill"), max_bytes=10_000)
+
+
+def _log(n):
+    return "".join(f"line {i} status={'ERROR' if i % 97 == 0 else 'ok'}\n" for i in range(n))
+
+
+class TestSpillStore:
+    def test_content_addressed_and_ranged(self, store):
+        text = _log(300)
+        digest = store.put(text)
+        assert store.put(text) == digest
+        assert store.size(digest) == len(text)
+
+        assert store.read_range(digest, 5, 10) == text[5:15]
+        window, total = store.read_lines(digest, 10, 3)
+        assert total == 300
+        assert window == "line 10 status=ok\nline 11 status=ok\nline 12 status=ok\n"
+        assert store.read_lines(digest, 299, 10)[0] == "line 299 status=ok\n"
+
+        assert [n for n, _ in store.grep(digest, r"ERROR")] == [0, 97, 194, 291]
+        assert store.grep(digest, r"ERROR", max_matches=2)[1] == (97, "line 97 status=ERROR")
+
+    def test_lru_size_cap(self, store):
+        first = store.put("a" * 4000)
+        second = store.put("b" * 4000)
+        store.read_range(first, 0, 1)  # touch: second is now least recent
+        third = store.put("c" * 4000)
+
+        assert first in store and third in store
+        assert second not in store
+        with pytest.raises(KeyError):
+            store.read_range(second)
+
+    def test_index_survives_restart(self, store, tmp_path):
+        digest = store.put("no trailing newline")
+        reopened = SpillStore(base_dir=str(tmp_path / "spill"))
+        assert reopened.read_lines(digest, 0, 5) == ("no trailing newline", 1)
+
+
+class TestFilesystemMiddlewareEviction:
+    def test_evicted_result_is_paged_from_disk(self, store):
+        middleware = FilesystemMiddleware(config={"eviction_threshold_bytes": 1000}, spill_store=store)
+        text = _log(200)
+        reference = middleware.maybe_evict_result(text, "shell")
+
+        [(result_id, entry)] = middleware.evicted_results.items()
+        assert entry["bytes"] == len(text) and result_id in reference
+        assert isinstance(middleware.get_state()["evicted_results"][result_id], dict)
+
+        tools = {t.name: t for t in asyncio.run(middleware.create_tools())}
+        assert "line 5 status" in tools["read_evicted_lines"].invoke(
+            {"result_id": result_id, "start_line": 5, "num_lines": 1}
+        )
+        assert "continue with offset=100" in tools["get_evicted_result"].invoke(
+            {"result_id": result_id, "length": 100}
+        )
+        assert "194: line 194 status=ERROR" in tools["grep_evicted_result"].invoke(
+            {"result_id": result_id, "pattern": "ERROR"}
+        )
+        assert tools["grep_evicted_result"].invoke({"result_id": result_id, "pattern": "("}).startswith("Error")
@@ -0,0 +1,117 @@
+"""Tests for rolling and background summarization in SummarizationMiddleware."""
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core.middleware.core import SummarizationMiddleware
+
+
+class _FakeSummarizer:
+    def __init__(self, delay=0.0):
+        self.prompts = []
+        self.delay = delay
+
+    def _respond(self, messages):
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=f"summary #{len(self.prompts)}")
+
+    def invoke(self, messages):
+        return self._respond(messages)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.delay)
+        return self._respond(messages)
+
+
+def _middleware(**kwargs):
+    middleware = SummarizationMiddleware(
+        model="unused", max_tokens_before_summary=100, keep_last_n_messages=2, **kwargs
+    )
+    middleware._summarizer = _FakeSummarizer()
+    return middleware
+
+
+def _messages(start, end):
+    return [HumanMessage(content=f"message {i} " + "x" * 40, id=f"m{i}") for i in range(start, end)]
+
+
+class TestSummarizationMiddleware:
+    def test_below_threshold_is_untouched(self):
+        middleware = _middleware()
+        assert middleware.before_model({"messages": _messages(0, 4)}, None) is None
+        assert middleware._summarizer.prompts == []
+
+    def test_rolling_summary_only_folds_new_messages(self):
+        middleware = _middleware()
+        history = _messages(0, 12)
+
+        first = middleware.before_model({"messages": history}, None)["messages"]
+        assert first[0].content.endswith("summary #1")
+        assert [m.id for m in first[1:]] == ["m10", "m11"]
+
+        # Agent keeps going on top of the summarized state
+        history = first + _messages(12, 18)
+        second = middleware.before_model({"messages": history}, None)["messages"]
+
+        prompt = middleware._summarizer.prompts[1]
+        assert "summary #1" in prompt
+        assert "message 10 " in prompt and "message 15 " in prompt
+        assert "message 3 " not in prompt and "message 16 " not in prompt
+        assert [m.id for m in second[1:]] == ["m16", "m17"]
+
+    def test_async_prefetch_is_reused(self):
+        middleware = _middleware(background=True, prefetch_ratio=0.5)
+
+        async def run():
+            # ~66 tokens: past the prefetch ratio, below the threshold
+            assert await middleware.abefore_model({"messages": _messages(0, 5)}, None) is None
+            assert middleware._prefetch is not None
+            await asyncio.sleep(0)
+            return await middleware.abefore_model({"messages": _messages(0, 10)}, None)
+
+        result = asyncio.run(run())
+        prompts = middleware._summarizer.prompts
+        assert len(prompts) == 2
+        # Second call only folds what aged out after the prefetch
+        assert "summary #1" in prompts[1]
+        assert "message 2 " not in prompts[1] and "message 3 " in prompts[1]
+        assert [m.id for m in result["messages"][1:]] == ["m8", "m9"]
+
+    def test_stale_prefetch_is_replaced_and_cancelled_on_teardown(self):
+        middleware = _middleware(background=True, prefetch_ratio=0.5)
+        middleware._summarizer.delay = 1
+
+        async def run():
+            await middleware.abefore_model({"messages": _messages(0, 5)}, None)
+            first = middleware._prefetch
+            # A different conversation: the pending prefetch no longer applies
+            await middleware.abefore_model({"messages": _messages(100, 105)}, None)
+            second = middleware._prefetch
+            await middleware.aafter_agent({}, None)
+            await asyncio.sleep(0)
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is not second
+        assert first.cancelled() and second.cancelled()
+        assert middleware._prefetch is None
+
+    def test_unawaited_prefetch_failure_is_consumed(self, caplog):
+        middleware = _middleware(background=True, prefetch_ratio=0.5)
+
+        async def fail(messages):
+            raise RuntimeError("summarizer down")
+
+        middleware._summarizer.ainvoke = fail
+
+        async def run():
+            await middleware.abefore_model({"messages": _messages(0, 5)}, None)
+            prefetch = middleware._prefetch
+            await asyncio.sleep(0.01)
+            return prefetch
+
+        with caplog.at_level("DEBUG", logger="core.middleware.core"):
+            prefetch = asyncio.run(run())
+        assert prefetch.done()
+        assert "summarizer down" in caplog.text
+        assert not [r for r in caplog.records if "never retrieved" in r.getMessage()]
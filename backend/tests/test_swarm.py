@@ -0,0 +1,92 @@
+"""Tests for wavefront scheduling in the swarm coordinator."""
+import asyncio
+
+from core.agents.delegation import AgentCapability, DelegationResult
+from core.workflows.swarm import SwarmCoordinator, SwarmTask, TaskStatus
+
+
+class _RecordingBroker:
+    """Delegation broker that records start/end order instead of calling agents."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.log = []
+        self.contexts = {}
+
+    async def delegate_with_retry(self, request):
+        task_id = request.request_id.removeprefix("swarm_")
+        self.log.append(("start", task_id))
+        self.contexts[task_id] = request.workflow_context
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", task_id))
+        if task_id in self.fail:
+            return DelegationResult(request_id=request.request_id, agent_id="stub", status="FAILURE", error="boom")
+        return DelegationResult(
+            request_id=request.request_id, agent_id="stub", status="SUCCESS", result={f"{task_id}_done": True}
+        )
+
+
+def _task(task_id, *depends_on):
+    return SwarmTask(
+        task_id=task_id,
+        description=task_id,
+        required_capabilities={AgentCapability.CODE_GENERATION},
+        depends_on=list(depends_on),
+    )
+
+
+def _run(broker, tasks, max_concurrent_tasks=10):
+    coordinator = SwarmCoordinator(registry=object(), broker=broker, max_concurrent_tasks=max_concurrent_tasks)
+    workflow = coordinator.create_workflow("wf", "test", 1, tasks)
+    return asyncio.run(coordinator.execute_workflow(workflow, {"project_id": 7}))
+
+
+def _waves(log):
+    """Group task starts by how many tasks had finished when they started."""
+    waves, ended = {}, 0
+    for event, task_id in log:
+        if event == "end":
+            ended += 1
+        else:
+            waves.setdefault(ended, set()).add(task_id)
+    return list(waves.values())
+
+
+class TestSwarmWavefront:
+    def test_tasks_start_in_dependency_waves(self):
+        # a   b
+        # |\ /
+        # e c
+        #   |
+        #   d
+        broker = _RecordingBroker()
+        workflow = _run(broker, [_task("d", "c"), _task("c", "a", "b"), _task("e", "a"), _task("a"), _task("b")])
+
+        assert workflow.status == "completed"
+        assert _waves(broker.log) == [{"a", "b"}, {"c", "e"}, {"d"}]
+        # Context carries transitive dependencies only
+        assert broker.contexts["d"] == {"project_id": 7, "a_done": True, "b_done": True, "c_done": True}
+        assert workflow.final_result == {
+            "project_id": 7, "a_done": True, "b_done": True, "c_done": True, "d_done": True, "e_done": True
+        }
+
+    def test_concurrency_limit_holds_ready_tasks(self):
+        broker = _RecordingBroker()
+        workflow = _run(broker, [_task(str(i)) for i in range(4)], max_concurrent_tasks=2)
+
+        assert workflow.status == "completed"
+        running = peak = 0
+        for event, _ in broker.log:
+            running += 1 if event == "start" else -1
+            peak = max(peak, running)
+        assert peak == 2
+
+    def test_failure_cancels_downstream(self):
+        broker = _RecordingBroker(fail={"a"})
+        workflow = _run(broker, [_task("a"), _task("b", "a"), _task("c")])
+
+        assert workflow.status == "failed"
+        assert workflow.tasks["a"].status == TaskStatus.FAILED
+        assert workflow.tasks["b"].status == TaskStatus.CANCELLED
+        assert ("start", "b") not in broker.log
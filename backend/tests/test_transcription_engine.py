@@ -0,0 +1,147 @@
+"""Tests for the chunked audio transcription engine."""
+import asyncio
+import random
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tools import transcription_engine as engine
+
+SR = engine.SAMPLING_RATE
+
+
+class TestPlanChunks:
+    def test_short_audio_is_one_chunk(self):
+        assert engine.plan_chunks([(0, 100)], 1000, 5000) == [(0, 1000)]
+
+    def test_cuts_fall_inside_silence(self):
+        # Speech every 10s for 8s, 60s total, 25s chunks
+        speech = [(i * 10 * SR, (i * 10 + 8) * SR) for i in range(6)]
+        chunks = engine.plan_chunks(speech, 60 * SR, 25 * SR)
+
+        assert chunks[0][0] == 0 and chunks[-1][1] == 60 * SR
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            assert end == start
+            assert not any(s < end < e for s, e in speech)
+        assert all(end - start <= 25 * SR for start, end in chunks)
+
+    def test_long_speech_region_is_hard_split(self):
+        chunks = engine.plan_chunks([(0, 100 * SR)], 100 * SR, 30 * SR)
+        assert len(chunks) == 4
+        assert chunks[-1] == (90 * SR, 100 * SR)
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    """Fake faster_whisper: audio is a list of ints, one 'word' per second."""
+    audio_mod = types.ModuleType("faster_whisper.audio")
+    audio_mod.decode_audio = lambda path, sampling_rate: list(range(95 * sampling_rate))
+    vad_mod = types.ModuleType("faster_whisper.vad")
+    vad_mod.VadOptions = lambda **kwargs: None
+    vad_mod.get_speech_timestamps = lambda audio, opts: [
+        {"start": i * 10 * SR, "end": (i * 10 + 8) * SR} for i in range(10)
+    ]
+    root = types.ModuleType("faster_whisper")
+    root.audio, root.vad = audio_mod, vad_mod
+    monkeypatch.setitem(sys.modules, "faster_whisper", root)
+    monkeypatch.setitem(sys.modules, "faster_whisper.audio", audio_mod)
+    monkeypatch.setitem(sys.modules, "faster_whisper.vad", vad_mod)
+
+    def fake_chunk(audio, offset, model_size, cpu_threads, language, beam_size):
+        time.sleep(random.uniform(0, 0.02))  # Finish out of order
+        seconds = len(audio) // SR
+        return [(offset + s, offset + s + 1, f"w{int(offset) + s}") for s in range(0, seconds, 10)], "en"
+
+    monkeypatch.setattr(engine, "_transcribe_chunk", fake_chunk)
+    monkeypatch.setattr(engine, "_get_pool", lambda workers: ThreadPoolExecutor(workers))
+
+
+class TestTranscribe:
+    def test_chunks_are_delivered_in_order(self, fake_whisper, tmp_path):
+        audio_file = tmp_path / "long.wav"
+        audio_file.write_bytes(b"")
+        delivered = []
+
+        async def on_segments(index, count, segments):
+            delivered.append(index)
+
+        result = asyncio.run(engine.transcribe(
+            str(audio_file), workers=4, chunk_seconds=20, on_segments=on_segments
+        ))
+
+        assert result.chunk_count > 1
+        assert delivered == list(range(result.chunk_count))
+        starts = [seg.start for seg in result.segments]
+        assert starts == sorted(starts)
+        assert result.language == "en"
+        assert result.duration == pytest.approx(95)
+
+    def test_worker_count_does_not_change_chunking(self, fake_whisper, tmp_path):
+        audio_file = tmp_path / "long.wav"
+        audio_file.write_bytes(b"")
+
+        serial = asyncio.run(engine.transcribe(str(audio_file), workers=1, chunk_seconds=20))
+        parallel = asyncio.run(engine.transcribe(str(audio_file), workers=4, chunk_seconds=20))
+
+        assert serial.chunk_count == parallel.chunk_count > 1
+        assert serial.transcript == parallel.transcript
+
+    def test_language_is_detected_once_from_first_chunk(self, fake_whisper, monkeypatch, tmp_path):
+        audio_file = tmp_path / "long.wav"
+        audio_file.write_bytes(b"")
+        requested = {}
+
+        def fake_chunk(audio, offset, model_size, cpu_threads, language, beam_size):
+            time.sleep(0.02 if offset == 0 else 0)  # first chunk finishes last if run together
+            requested[offset] = language
+            return [(offset, offset + 1, "w")], language or ("en" if offset == 0 else "de")
+
+        monkeypatch.setattr(engine, "_transcribe_chunk", fake_chunk)
+        result = asyncio.run(engine.transcribe(str(audio_file), language=None, workers=4, chunk_seconds=20))
+
+        assert result.language == "en"
+        assert requested.pop(0.0) is None
+        assert set(requested.values()) == {"en"}
+
+    def test_missing_file(self):
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(engine.transcribe("/nonexistent/audio.wav"))
+
+
+class TestPool:
+    def test_pools_are_kept_per_worker_count(self):
+        try:
+            one, two = engine._get_pool(1), engine._get_pool(2)
+            assert one is not two
+            assert engine._get_pool(1) is one
+            # Asking for another size leaves the first pool usable
+            assert one.submit(abs, -3).result(timeout=60) == 3
+        finally:
+            engine.shutdown_pool()
+        assert engine._pools == {}
+
+
+class TestModelCache:
+    def test_lru_keeps_recent_sizes(self, monkeypatch):
+        loads = []
+
+        class FakeModel:
+            def __init__(self, size, **kwargs):
+                loads.append(size)
+
+        root = types.ModuleType("faster_whisper")
+        root.WhisperModel = FakeModel
+        monkeypatch.setitem(sys.modules, "faster_whisper", root)
+        monkeypatch.setattr(engine, "_models", engine.OrderedDict())
+        monkeypatch.setattr(engine, "MODEL_CACHE_SIZE", 2)
+
+        engine.get_model("tiny")
+        engine.get_model("base")
+        engine.get_model("tiny")
+        engine.get_model("small")  # evicts base
+        engine.get_model("tiny")
+        engine.get_model("base")
+        assert loads == ["tiny", "base", "small", "base"]
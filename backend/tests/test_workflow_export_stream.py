@@ -0,0 +1,124 @@
+"""Tests for streamed, content-addressed workflow export packages."""
+import asyncio
+import io
+import time
+import zipfile
+
+import pytest
+
+from core.codegen.export_cache import ExportCache
+from core.codegen.workflow_exporter import ExecutableWorkflowExporter
+
+
+WORKFLOW = {
+    "id": 7,
+    "name": "Research Flow",
+    "configuration": {
+        "nodes": [
+            {
+                "id": "researcher",
+                "type": "agent",
+                "config": {"model": "gpt-5.4-mini", "system_prompt": "Research things."},
+                "data": {"label": "Researcher"},
+            }
+        ],
+        "edges": [],
+    },
+}
+
+
+def _collect(exporter, cache):
+    async def run():
+        return b"".join([chunk async for chunk in exporter.stream_zip(cache)])
+    return asyncio.run(run())
+
+
+def _delayed_jobs(exporter, delay_for):
+    """Make job ``i`` of ``n`` sleep ``delay_for(i, n)`` seconds; returns the original jobs."""
+    jobs = exporter._generator_jobs()
+
+    def delayed(job, delay):
+        def run():
+            time.sleep(delay)
+            return job()
+        return run
+
+    exporter._generator_jobs = lambda: [
+        (name, delayed(job, delay_for(i, len(jobs)))) for i, (name, job) in enumerate(jobs)
+    ]
+    return jobs
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExportCache(cache_dir=str(tmp_path / "exports"))
+
+
+class TestWorkflowExportStream:
+    def test_streamed_archive_is_valid_zip(self, cache):
+        exporter = ExecutableWorkflowExporter(WORKFLOW, project_id=1)
+        data = _collect(exporter, cache)
+
+        names = zipfile.ZipFile(io.BytesIO(data)).namelist()
+        prefix = "workflow_research_flow_7/"
+        for expected in ("README.md", "workflow/nodes.py", "workflow/routing.py",
+                         "tools/native.py", "tools/custom.py", "streamlit_app.py", "api_server.py"):
+            assert prefix + expected in names
+
+    def test_second_export_is_served_from_cache(self, cache, monkeypatch):
+        first = _collect(ExecutableWorkflowExporter(WORKFLOW, project_id=1), cache)
+
+        exporter = ExecutableWorkflowExporter(WORKFLOW, project_id=1)
+        monkeypatch.setattr(exporter, "_generator_jobs", lambda: pytest.fail("should not regenerate"))
+        assert _collect(exporter, cache) == first
+
+    def test_options_change_the_key(self):
+        async def keys():
+            with_ui = await ExecutableWorkflowExporter(WORKFLOW, project_id=1).export_key()
+            without_ui = await ExecutableWorkflowExporter(WORKFLOW, project_id=1, include_ui=False).export_key()
+            return with_ui, without_ui
+        with_ui, without_ui = asyncio.run(keys())
+        assert with_ui != without_ui
+
+    def test_failed_generation_is_not_cached(self, cache, monkeypatch):
+        exporter = ExecutableWorkflowExporter(WORKFLOW, project_id=1)
+
+        def boom():
+            raise RuntimeError("generator failed")
+        monkeypatch.setattr(exporter, "_generator_jobs", lambda: [("broken", boom)])
+
+        with pytest.raises(RuntimeError):
+            _collect(exporter, cache)
+        assert list(cache.cache_dir.iterdir()) == []
+
+    def test_archive_bytes_do_not_depend_on_generator_timing(self, tmp_path):
+        def export(cache_dir, reverse):
+            exporter = ExecutableWorkflowExporter(WORKFLOW, project_id=1)
+            jobs = _delayed_jobs(exporter, lambda i, n: 0.02 * (n - i if reverse else i))
+            return _collect(exporter, ExportCache(cache_dir=str(tmp_path / cache_dir))), jobs
+
+        # First export finishes generators in job order, the second in reverse;
+        # the second also starts in a later wall-clock second
+        first, jobs = export("a", reverse=False)
+        time.sleep(1.05 - time.time() % 1)
+        second, _ = export("b", reverse=True)
+        assert first == second
+
+        names = zipfile.ZipFile(io.BytesIO(first)).namelist()
+        expected = [path for _, job in jobs for path in sorted(job())]
+        assert names == ["workflow_research_flow_7/" + path for path in expected]
+
+    def test_entries_stream_before_later_jobs_finish(self, cache):
+        exporter = ExecutableWorkflowExporter(WORKFLOW, project_id=1)
+        _delayed_jobs(exporter, lambda i, n: 0.5 if i == n - 1 else 0)
+
+        async def first_chunk_after():
+            started = time.monotonic()
+            stream = exporter.stream_zip(cache)
+            await stream.__anext__()
+            elapsed = time.monotonic() - started
+            async for _ in stream:
+                pass
+            return elapsed
+
+        assert asyncio.run(first_chunk_after()) < 0.4
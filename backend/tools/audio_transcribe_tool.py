@@ -5,6 +5,10 @@ Audio Transcription Tool (Local STT)
 Local speech-to-text using faster-whisper (CTranslate2-optimized Whisper).
 Runs entirely on-device — audio never leaves the machine.
 
+Long recordings are split on VAD silence and transcribed in parallel worker
+processes; see tools/transcription_engine.py for the pipeline and its
+AUDIO_TRANSCRIBE_* settings.
+
 Models (downloaded on first use):
   - tiny:  ~75MB, fastest, lower accuracy
   - base:  ~150MB, good balance for demos
@@ -13,25 +17,24 @@ Models (downloaded on first use):
   - large-v3: ~3GB, best accuracy
 """
 
+import asyncio
 import logging
 import tempfile
 import os
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 from langchain_core.tools import tool
 
+from tools import transcription_engine
+from tools.transcription_engine import TranscriptSegment, TranscriptionResult
+
 logger = logging.getLogger(__name__)
 
 # Prefix used by backend/api/audio/routes.py when persisting uploads to temp.
 # Only files matching this prefix inside the system temp dir may ever be deleted.
 UPLOAD_TEMP_PREFIX = "lc_audio_"
 
-# Lazy-loaded model singleton
-_model = None
-_model_size = None
-
-
 def _is_deletable_temp_upload(path: Path) -> bool:
     """True only for files the audio upload API wrote to the system temp dir.
 
@@ -51,25 +54,55 @@ def _is_deletable_temp_upload(path: Path) -> bool:
 
 
 def _get_model(model_size: str = "base"):
-    """Get or create the cached WhisperModel instance."""
-    global _model, _model_size
+    """Get a cached WhisperModel instance (small LRU of loaded sizes)."""
+    return transcription_engine.get_model(model_size)
 
-    if _model is not None and _model_size == model_size:
-        return _model
 
-    try:
-        from faster_whisper import WhisperModel
-    except ImportError:
-        raise RuntimeError(
-            "faster-whisper is not installed. "
-            "Run: pip install faster-whisper"
-        )
+def _cleanup_upload(path: Path, delete_after: bool) -> None:
+    """Delete a temp upload after a successful transcription (gated)."""
+    # Delete only after a successful transcription (never in finally, so a
+    # failed transcription preserves the source), and only for temp uploads.
+    if delete_after:
+        if _is_deletable_temp_upload(path):
+            try:
+                path.unlink()
+                logger.info(f"Deleted temp upload audio file: {path}")
+            except Exception as e:
+                logger.warning(f"Failed to delete audio file {path}: {e}")
+        else:
+            logger.debug(
+                f"Skipping deletion of {path}: not a temp upload "
+                f"({UPLOAD_TEMP_PREFIX}* in {tempfile.gettempdir()})"
+            )
+
+
+async def transcribe_audio(
+    file_path: str,
+    model_size: str = "base",
+    language: Optional[str] = "en",
+    delete_after: bool = False,
+    on_segments: Optional[transcription_engine.SegmentCallback] = None,
+) -> TranscriptionResult:
+    """
+    Transcribe an audio file with the chunked engine.
+
+    Args:
+        file_path: Path to the audio file (wav, mp3, m4a, webm, etc.)
+        model_size: Whisper model size (tiny, base, small, medium, large-v3)
+        language: Language code or None for auto-detect
+        delete_after: Delete the source afterwards if it is a temp upload
+            (see transcribe_audio_file)
+        on_segments: Optional async callback for segments as they complete
 
-    logger.info(f"Loading Whisper model '{model_size}' (first load downloads the model)...")
-    _model = WhisperModel(model_size, device="cpu", compute_type="int8")
-    _model_size = model_size
-    logger.info(f"Whisper model '{model_size}' loaded.")
-    return _model
+    Returns:
+        TranscriptionResult with ordered segments and metadata
+    """
+    path = Path(file_path)
+    result = await transcription_engine.transcribe(
+        str(path), model_size=model_size, language=language, on_segments=on_segments
+    )
+    _cleanup_upload(path, delete_after)
+    return result
 
 
 def transcribe_audio_file(
@@ -93,50 +126,8 @@ def transcribe_audio_file(
     Returns:
         Full transcript text with timestamps.
     """
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Audio file not found: {file_path}")
-
-    model = _get_model(model_size)
-
-    segments, info = model.transcribe(
-        str(path),
-        language=language,
-        beam_size=5,
-        word_timestamps=False,
-        vad_filter=True,  # Skip silence
-    )
-
-    lines = []
-    for segment in segments:
-        mins = int(segment.start // 60)
-        secs = int(segment.start % 60)
-        timestamp = f"[{mins:02d}:{secs:02d}]"
-        lines.append(f"{timestamp} {segment.text.strip()}")
-
-    transcript = "\n".join(lines)
-
-    logger.info(
-        f"Transcribed {path.name}: {info.duration:.1f}s audio, "
-        f"{len(lines)} segments, language={info.language}"
-    )
-
-    # Delete only after a successful transcription (never in finally, so a
-    # failed transcription preserves the source), and only for temp uploads.
-    if delete_after:
-        if _is_deletable_temp_upload(path):
-            try:
-                path.unlink()
-                logger.info(f"Deleted temp upload audio file: {path}")
-            except Exception as e:
-                logger.warning(f"Failed to delete audio file {path}: {e}")
-        else:
-            logger.debug(
-                f"Skipping deletion of {path}: not a temp upload "
-                f"({UPLOAD_TEMP_PREFIX}* in {tempfile.gettempdir()})"
-            )
-
-    return transcript
+    result = asyncio.run(transcribe_audio(file_path, model_size, language, delete_after))
+    return result.transcript
 
 
 @tool
@@ -166,18 +157,41 @@ async def audio_transcribe(
     Returns:
         Full transcript with timestamps.
     """
-    import asyncio
+    from core.workflows.events.progress import emit_tool_progress
 
     if model_size not in ("tiny", "base", "small", "medium", "large-v3"):
         return f"Error: model_size must be one of: tiny, base, small, medium, large-v3"
 
+    async def report(chunk_index: int, chunk_count: int, segments: List[TranscriptSegment]):
+        await emit_tool_progress(
+            tool_name="audio_transcribe",
+            message=f"Transcribed part {chunk_index + 1}/{chunk_count}",
+            progress_type="update",
+            percent_complete=int((chunk_index + 1) / chunk_count * 100),
+            current_step=chunk_index + 1,
+            total_steps=chunk_count,
+            metadata={"segments": [seg.format_line() for seg in segments]},
+        )
+
     try:
-        # Run in thread to avoid blocking the event loop during transcription.
-        # delete_after=True only ever removes gated temp uploads (lc_audio_*
-        # inside tempfile.gettempdir()) so workflow-uploaded audio doesn't
-        # persist on disk; all other paths are never deleted.
-        transcript = await asyncio.to_thread(
-            transcribe_audio_file, file_path, model_size, language, True
+        await emit_tool_progress(
+            tool_name="audio_transcribe",
+            message="Starting transcription...",
+            progress_type="started",
+        )
+
+        # Heavy work runs in worker processes/threads, so the event loop stays
+        # free. delete_after=True only ever removes gated temp uploads
+        # (lc_audio_* inside tempfile.gettempdir()) so workflow-uploaded audio
+        # doesn't persist on disk; all other paths are never deleted.
+        result = await transcribe_audio(file_path, model_size, language, True, on_segments=report)
+        transcript = result.transcript
+
+        await emit_tool_progress(
+            tool_name="audio_transcribe",
+            message=f"Transcribed {result.duration:.0f}s of audio ({len(result.segments)} segments)",
+            progress_type="completed",
+            percent_complete=100,
         )
 
         if not transcript.strip():
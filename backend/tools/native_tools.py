@@ -625,7 +625,8 @@ def _record_file_version(
     old_string: str = None,
     new_string: str = None,
     workspace_context: dict = None,
-    agent_context: dict = None
+    agent_context: dict = None,
+    previous_content: str = None
 ) -> None:
     """
     Record a file version in the database for diff viewing.
@@ -641,6 +642,8 @@ def _record_file_version(
         new_string: For edit operations, the replacement string
         workspace_context: Context about the workspace (project_id, workflow_id, task_id)
         agent_context: Context about the agent making the change
+        previous_content: File content before the change, if known (saves
+            rebuilding the previous version when storing a delta)
     """
     try:
         import hashlib
@@ -648,6 +651,7 @@ def _record_file_version(
         from models.workspace_file import WorkspaceFile
         from models.file_version import FileVersion
         from services.workspace_manager import get_workspace_manager
+        from services.file_version_store import build_version_storage
 
         # Compute relative path from outputs/ directory
         workspace_mgr = get_workspace_manager()
@@ -698,12 +702,18 @@ def _record_file_version(
                 lines_added = content.count('\n') + 1 if content else 0
                 change_summary = f"Replaced entire file ({lines_added} lines)"
 
+            # Full snapshot, or keyframe/delta (FILE_VERSION_STORAGE)
+            storage = build_version_storage(
+                db, workspace_file.id, new_version_number, operation, content,
+                previous_content=previous_content
+            )
+
             # Create the version record
             file_version = FileVersion(
                 workspace_file_id=workspace_file.id,
                 version_number=new_version_number,
                 content_hash=content_hash,
-                content_snapshot=content if operation in ("create", "replace") else None,
+                **storage,
                 operation=operation,
                 old_string=old_string,
                 new_string=new_string,
@@ -1010,7 +1020,8 @@ def _edit_file_impl(
             old_string=old_string,
             new_string=new_string,
             workspace_context=_workspace_context,
-            agent_context=_agent_context
+            agent_context=_agent_context,
+            previous_content=content
         )
 
         return f"Successfully replaced string in {path.name}"
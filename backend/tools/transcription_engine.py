@@ -0,0 +1,359 @@
+"""
+Transcription Engine (Local STT, chunked)
+==========================================
+
+Long-audio pipeline behind audio_transcribe_tool and the /api/audio routes.
+
+Pipeline:
+  1. Decode the file once to 16 kHz mono (faster-whisper's decoder).
+  2. Run Silero VAD and cut the audio into ~AUDIO_TRANSCRIBE_CHUNK_SECONDS
+     chunks, splitting only inside silence so no word straddles a boundary.
+     Chunking depends only on duration, so the worker count never changes
+     the transcript.
+  3. Transcribe chunks in a process pool (each worker keeps its own model,
+     limited to AUDIO_TRANSCRIBE_CPU_THREADS threads).
+  4. Hand segments back in audio order as soon as the next contiguous chunk
+     finishes, so callers can stream progress instead of waiting for the end.
+
+Short audio (a single chunk) skips the pool and runs in-process.
+
+Configuration (environment):
+  AUDIO_TRANSCRIBE_WORKERS       Process pool size (default: cpu_count // 2, max 4)
+  AUDIO_TRANSCRIBE_CPU_THREADS   CTranslate2 threads per worker (default: cpu_count // workers)
+  AUDIO_TRANSCRIBE_CHUNK_SECONDS Target chunk length in seconds (default: 300)
+  AUDIO_TRANSCRIBE_BEAM_SIZE     Whisper beam size (default: 5)
+  AUDIO_MODEL_CACHE_SIZE         Loaded model sizes kept per process (default: 2)
+
+Each worker holds its own copy of the model, so memory scales with
+AUDIO_TRANSCRIBE_WORKERS x model size.
+
+This module must stay importable without LangChain: pool workers are
+spawned processes that import it fresh.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SAMPLING_RATE = 16000
+
+_CPU_COUNT = os.cpu_count() or 2
+TRANSCRIBE_WORKERS = int(os.getenv("AUDIO_TRANSCRIBE_WORKERS", str(max(1, min(4, _CPU_COUNT // 2)))))
+TRANSCRIBE_CPU_THREADS = int(os.getenv("AUDIO_TRANSCRIBE_CPU_THREADS", str(max(1, _CPU_COUNT // TRANSCRIBE_WORKERS))))
+CHUNK_SECONDS = float(os.getenv("AUDIO_TRANSCRIBE_CHUNK_SECONDS", "300"))
+BEAM_SIZE = int(os.getenv("AUDIO_TRANSCRIBE_BEAM_SIZE", "5"))
+MODEL_CACHE_SIZE = int(os.getenv("AUDIO_MODEL_CACHE_SIZE", "2"))
+
+
+@dataclass
+class TranscriptSegment:
+    """One Whisper segment, with times relative to the start of the file."""
+    start: float
+    end: float
+    text: str
+
+    def format_line(self) -> str:
+        mins = int(self.start // 60)
+        secs = int(self.start % 60)
+        return f"[{mins:02d}:{secs:02d}] {self.text.strip()}"
+
+
+@dataclass
+class TranscriptionResult:
+    """Full transcript plus the metadata the audio API reports."""
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    duration: float = 0.0
+    language: Optional[str] = None
+    chunk_count: int = 0
+
+    @property
+    def transcript(self) -> str:
+        return "\n".join(seg.format_line() for seg in self.segments)
+
+
+# Called with (chunk_index, chunk_count, segments) in audio order
+SegmentCallback = Callable[[int, int, List[TranscriptSegment]], Awaitable[None]]
+
+
+# =============================================================================
+# Model cache (per process)
+# =============================================================================
+
+_models: "OrderedDict[Tuple[str, int], object]" = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def get_model(model_size: str = "base", cpu_threads: int = 0):
+    """
+    Get a cached WhisperModel, loading it on first use.
+
+    Keeps the MODEL_CACHE_SIZE most recently used (model_size, cpu_threads)
+    combinations, so switching between sizes doesn't reload every time.
+    """
+    key = (model_size, cpu_threads)
+    with _models_lock:
+        if key in _models:
+            _models.move_to_end(key)
+            return _models[key]
+
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError(
+                "faster-whisper is not installed. "
+                "Run: pip install faster-whisper"
+            )
+
+        logger.info(f"Loading Whisper model '{model_size}' (first load downloads the model)...")
+        model = WhisperModel(model_size, device="cpu", compute_type="int8", cpu_threads=cpu_threads)
+        _models[key] = model
+        while len(_models) > max(1, MODEL_CACHE_SIZE):
+            evicted, _ = _models.popitem(last=False)
+            logger.info(f"Evicted Whisper model '{evicted[0]}' from cache")
+        logger.info(f"Whisper model '{model_size}' loaded.")
+        return model
+
+
+# =============================================================================
+# Chunk planning
+# =============================================================================
+
+def plan_chunks(
+    speech: List[Tuple[int, int]],
+    total_samples: int,
+    chunk_samples: int,
+) -> List[Tuple[int, int]]:
+    """
+    Split [0, total_samples) into chunks of at most ~chunk_samples, cutting
+    in the middle of silence gaps between VAD speech regions.
+
+    A single speech region longer than chunk_samples is hard-split, since
+    there is no silence to cut on.
+
+    Args:
+        speech: Sorted (start, end) sample ranges containing speech
+        total_samples: Length of the audio in samples
+        chunk_samples: Target maximum chunk length in samples
+
+    Returns:
+        Contiguous (start, end) sample ranges covering the whole audio
+    """
+    if total_samples <= 0:
+        return []
+    if total_samples <= chunk_samples or not speech:
+        return [(0, total_samples)]
+
+    cuts: List[int] = []
+    chunk_start = 0
+    prev_end = None
+
+    for start, end in speech:
+        if prev_end is not None and end - chunk_start > chunk_samples:
+            # Adding this region would overflow: cut in the preceding gap
+            cut = (prev_end + start) // 2
+            if cut > chunk_start:
+                cuts.append(cut)
+                chunk_start = cut
+        while end - chunk_start > chunk_samples:
+            # Region itself is too long: hard split
+            chunk_start += chunk_samples
+            cuts.append(chunk_start)
+        prev_end = end
+
+    bounds = [0] + cuts + [total_samples]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _detect_speech(audio) -> List[Tuple[int, int]]:
+    """Silero VAD speech regions in samples (empty if VAD is unavailable)."""
+    try:
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+    except ImportError:
+        return []
+    regions = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    return [(r["start"], r["end"]) for r in regions]
+
+
+# =============================================================================
+# Chunk transcription (runs in pool workers or in-process)
+# =============================================================================
+
+def _transcribe_chunk(
+    audio,
+    offset_seconds: float,
+    model_size: str,
+    cpu_threads: int,
+    language: Optional[str],
+    beam_size: int,
+) -> Tuple[List[Tuple[float, float, str]], Optional[str]]:
+    """Transcribe one chunk; returns plain tuples so results pickle cheaply."""
+    model = get_model(model_size, cpu_threads)
+    segments, info = model.transcribe(
+        audio,
+        language=language,
+        beam_size=beam_size,
+        word_timestamps=False,
+        vad_filter=True,  # Skip silence inside the chunk
+    )
+    return (
+        [(seg.start + offset_seconds, seg.end + offset_seconds, seg.text) for seg in segments],
+        info.language,
+    )
+
+
+# Shared process pools keyed by worker count, so a call with a different
+# ``workers`` never tears down a pool another transcription is still using
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared process pool; spawned (not forked) so workers don't inherit server threads."""
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return pool
+
+
+def shutdown_pool():
+    """Stop the transcription worker processes (they restart on next use)."""
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+# =============================================================================
+# Engine entry point
+# =============================================================================
+
+async def transcribe(
+    file_path: str,
+    model_size: str = "base",
+    language: Optional[str] = "en",
+    on_segments: Optional[SegmentCallback] = None,
+    workers: Optional[int] = None,
+    cpu_threads: Optional[int] = None,
+    chunk_seconds: Optional[float] = None,
+    beam_size: Optional[int] = None,
+) -> TranscriptionResult:
+    """
+    Transcribe an audio file, splitting long audio across worker processes.
+
+    Args:
+        file_path: Path to the audio file (wav, mp3, m4a, webm, etc.)
+        model_size: Whisper model size (tiny, base, small, medium, large-v3)
+        language: Language code, or None to detect it once from the first
+            chunk and use it for the rest
+        on_segments: Optional async callback receiving each chunk's segments
+            in audio order as soon as they are available
+        workers: Process pool size (default AUDIO_TRANSCRIBE_WORKERS); only
+            controls parallelism, chunk boundaries are the same for any value
+        cpu_threads: CTranslate2 threads per worker (default AUDIO_TRANSCRIBE_CPU_THREADS)
+        chunk_seconds: Target chunk length (default AUDIO_TRANSCRIBE_CHUNK_SECONDS)
+        beam_size: Whisper beam size (default AUDIO_TRANSCRIBE_BEAM_SIZE)
+
+    Returns:
+        TranscriptionResult with ordered segments and metadata
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+    workers = workers or TRANSCRIBE_WORKERS
+    chunk_seconds = chunk_seconds or CHUNK_SECONDS
+    beam_size = beam_size or BEAM_SIZE
+
+    try:
+        from faster_whisper.audio import decode_audio
+    except ImportError:
+        raise RuntimeError(
+            "faster-whisper is not installed. "
+            "Run: pip install faster-whisper"
+        )
+
+    audio = await asyncio.to_thread(decode_audio, str(path), sampling_rate=SAMPLING_RATE)
+    total_samples = len(audio)
+
+    chunks = [(0, total_samples)]
+    if total_samples > chunk_seconds * SAMPLING_RATE:
+        speech = await asyncio.to_thread(_detect_speech, audio)
+        chunks = plan_chunks(speech, total_samples, int(chunk_seconds * SAMPLING_RATE))
+
+    result = TranscriptionResult(duration=total_samples / SAMPLING_RATE, chunk_count=len(chunks))
+    loop = asyncio.get_running_loop()
+
+    if len(chunks) == 1:
+        # Not worth a process hop: transcribe in-process on a thread
+        # (cpu_threads=0 lets CTranslate2 pick, as the single-model path always did)
+        futures = [loop.run_in_executor(
+            None, _transcribe_chunk, audio, 0.0, model_size, cpu_threads or 0, language, beam_size
+        )]
+    else:
+        cpu_threads = cpu_threads or TRANSCRIBE_CPU_THREADS
+        pool = _get_pool(workers)
+
+        def submit(index: int, chunk_language: Optional[str]):
+            start, end = chunks[index]
+            return loop.run_in_executor(
+                pool, _transcribe_chunk, audio[start:end], start / SAMPLING_RATE,
+                model_size, cpu_threads, chunk_language, beam_size
+            )
+
+        futures = [submit(0, language)]
+        logger.info(
+            f"Transcribing {path.name}: {result.duration:.0f}s audio in {len(chunks)} chunks "
+            f"across {workers} workers ({cpu_threads} threads each)"
+        )
+
+    async def indexed(index: int, future):
+        return index, await future
+
+    # Deliver chunks in audio order as soon as the next contiguous one is done
+    done: Dict[int, List[TranscriptSegment]] = {}
+    next_index = 0
+    try:
+        if len(chunks) > 1:
+            if language is None:
+                # Detect the language once, on the first chunk, and hold the
+                # rest to it so chunks can't disagree
+                await asyncio.wait(futures)
+                if futures[0].exception() is None:
+                    language = futures[0].result()[1]
+            futures += [submit(i, language) for i in range(1, len(chunks))]
+
+        for next_done in asyncio.as_completed([indexed(i, fut) for i, fut in enumerate(futures)]):
+            index, (raw_segments, chunk_language) = await next_done
+            done[index] = [TranscriptSegment(s, e, t) for s, e, t in raw_segments]
+            if index == 0:
+                result.language = chunk_language
+
+            while next_index in done:
+                segments = done.pop(next_index)
+                result.segments.extend(segments)
+                if on_segments is not None:
+                    await on_segments(next_index, len(chunks), segments)
+                next_index += 1
+    except BaseException:
+        for fut in futures:
+            fut.cancel()
+        raise
+
+    logger.info(
+        f"Transcribed {path.name}: {result.duration:.1f}s audio, "
+        f"{len(result.segments)} segments, language={result.language}"
+    )
+    return result